@@ -4,6 +4,10 @@
 - OPENAI_API_KEY: OpenAI API 키
 - PINECONE_API_KEY: Pinecone API 키
 - PINECONE_INDEX: Pinecone 인덱스명 (기본값: orthocare-diagnosis)
+- ARBITRATION_CACHE_ENABLED: LLM 중재 결과 캐시 사용 여부 (기본값: false)
+- ARBITRATION_CACHE_BACKEND: memory / sqlite / redis (기본값: memory)
+- ARBITRATION_FAST_PATH_ENABLED: 확실한 케이스의 LLM 중재 생략 허용 (기본값: false,
+  부위별 임계값은 data/medical/{부위}/config.json의 inference_settings.arbitration_fast_path)
 """
 
 import os
@@ -50,6 +54,45 @@ class BucketInferenceSettings(BaseSettings):
         description="가중치 대비 검색 비율 (0.6 = 가중치 60%, 검색 40%)"
     )
 
+    # LangGraph 설정
+    langgraph_parallel: bool = Field(
+        default=True,
+        description="가중치 계산/근거 검색/Red Flag 체크 병렬 실행 (False면 순차 그래프)"
+    )
+
+    # Red Flag 설정
+    red_flag_background_search: bool = Field(
+        default=False,
+        description="Red Flag 감지 시 근거 검색을 백그라운드로 실행하여 로그만 남김"
+    )
+
+    # 중재 결과 캐시 (동일 프롬프트 입력의 LLM 결정 재사용)
+    arbitration_cache_enabled: bool = Field(
+        default=False,
+        description="LLM 중재 결과 캐시 사용 여부"
+    )
+    arbitration_cache_backend: str = Field(
+        default="memory",
+        description="중재 캐시 백엔드 (memory / sqlite / redis)"
+    )
+    arbitration_cache_ttl: int = Field(default=86400, description="중재 캐시 TTL (초)")
+    arbitration_cache_max_items: int = Field(default=10000, description="중재 캐시 최대 항목 수")
+    arbitration_cache_path: Optional[Path] = Field(
+        default=None,
+        description="SQLite 캐시 파일 경로 (없으면 .cache/responses/arbitration.sqlite3)"
+    )
+    arbitration_cache_redis_url: str = Field(
+        default="redis://localhost:6379/0",
+        description="Redis 캐시 URL"
+    )
+
+    # 중재 fast path (가중치/검색 순위가 확실히 일치하면 LLM 호출 생략)
+    # 임계값/고정 신뢰도가 골든셋 정확도로 검증되기 전까지 기본 비활성
+    arbitration_fast_path_enabled: bool = Field(
+        default=False,
+        description="부위별 fast path 설정 적용 여부 (기본 false: 항상 LLM 중재)"
+    )
+
     # 데이터 경로
     data_dir: Path = Field(
         default=Path(__file__).parent.parent.parent / "data",
@@ -1,6 +1,6 @@
 """버킷 추론 출력 모델"""
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -75,6 +75,10 @@ class BucketInferenceOutput(BaseModel):
         default_factory=datetime.utcnow,
         description="추론 시간"
     )
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="처리 메타데이터 (캐시 적중 여부/적중률 등)"
+    )
 
     @property
     def has_discrepancy(self) -> bool:
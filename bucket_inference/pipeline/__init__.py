@@ -1,17 +1,22 @@
 """Bucket Inference Pipeline"""
 
-from .inference_pipeline import BucketInferencePipeline
+from .inference_pipeline import ArbitrationInputs, BucketInferencePipeline
+from .batch_runner import BatchDiagnosisRunner
 from .langgraph_pipeline import (
     LangGraphBucketInferencePipeline,
     BucketInferenceState,
     build_bucket_inference_graph,
     compare_pipelines,
+    compare_graph_modes,
 )
 
 __all__ = [
     "BucketInferencePipeline",
+    "ArbitrationInputs",
+    "BatchDiagnosisRunner",
     "LangGraphBucketInferencePipeline",
     "BucketInferenceState",
     "build_bucket_inference_graph",
     "compare_pipelines",
+    "compare_graph_modes",
 ]
@@ -0,0 +1,474 @@
+"""버킷 추론 배치 실행기
+
+가중치/프롬프트 변경 후 과거 설문 내보내기(JSONL)를 다시 추론할 때 사용한다.
+
+- 입력 JSONL을 한 줄씩 읽고, 결과 JSONL을 입력 순서대로 한 줄씩 기록 (메모리 일정)
+- 스레드 풀로 동시 실행하되 미완료 작업 수를 제한 (concurrency * 2)
+- 동일 검색 쿼리 임베딩은 공유 캐시(single-flight)로 한 번만 호출
+- N건마다 체크포인트 저장 → 중단 후 재실행하면 이어서 처리
+- run_llm_batch(): LLM 중재만 OpenAI Batch API로 일괄 제출 (오프라인 재평가용)
+
+입력 줄 형식 (둘 중 하나):
+    {"demographics": {...}, "body_parts": [...], ...}          # BucketInferenceInput
+    {"id": "survey-123", "input": {"demographics": {...}, ...}}  # ID 포함
+
+출력 줄 형식:
+    {"line": 1, "id": "survey-123", "status": "ok", "elapsed_ms": 812.3, "results": {"knee": {...}}}
+    {"line": 2, "id": null, "status": "error", "error": "ValidationError: ..."}
+"""
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.config import BodyPartConfigLoader
+from shared.models import BodyPartInput
+from shared.utils.embedding_cache import get_embedding_cache
+from shared.utils.openai_batch import BatchResultStore, OpenAIBatchRunner, batch_request_line
+from bucket_inference.models import BucketInferenceInput, BucketInferenceOutput, BucketScore
+from bucket_inference.pipeline.inference_pipeline import BucketInferencePipeline
+
+
+class BatchDiagnosisRunner:
+    """JSONL 배치 버킷 추론
+
+    사용 예시:
+        runner = BatchDiagnosisRunner(BucketInferencePipeline(), concurrency=8)
+        summary = runner.run("exports/surveys.jsonl", "exports/surveys.results.jsonl")
+        print(summary["ok"], summary["errors"])
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        concurrency: int = 8,
+        checkpoint_every: int = 100,
+    ):
+        """
+        Args:
+            pipeline: run(BucketInferenceInput)을 제공하는 파이프라인
+                (BucketInferencePipeline / LangGraphBucketInferencePipeline)
+            concurrency: 동시 추론 수
+            checkpoint_every: 체크포인트 저장 간격 (출력 줄 수)
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency는 1 이상이어야 합니다: {concurrency}")
+        self.pipeline = pipeline
+        self.concurrency = concurrency
+        self.checkpoint_every = max(1, checkpoint_every)
+
+    @staticmethod
+    def checkpoint_path_for(output_path: Path) -> Path:
+        """출력 파일의 체크포인트 경로 (<출력>.checkpoint.json)"""
+        return output_path.with_name(output_path.name + ".checkpoint.json")
+
+    # ------------------------------------------------------------------
+    # 입력 / 단건 처리
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _iter_lines(input_path: Path, skip: int) -> Iterator[Tuple[int, str]]:
+        """(줄 번호, 원문) 스트리밍 - 앞의 skip줄은 건너뜀, 빈 줄 제외"""
+        with open(input_path, "r", encoding="utf-8") as f:
+            for line_no, raw in enumerate(f, start=1):
+                if line_no <= skip:
+                    continue
+                raw = raw.strip()
+                if raw:
+                    yield line_no, raw
+
+    @staticmethod
+    def _parse_line(raw: str) -> Tuple[Optional[str], BucketInferenceInput]:
+        """입력 줄 → (ID, BucketInferenceInput)"""
+        data = json.loads(raw)
+        record_id = None
+        if isinstance(data, dict) and "input" in data:
+            record_id = data.get("id")
+            data = data["input"]
+        return record_id, BucketInferenceInput.model_validate(data)
+
+    def _process(self, line_no: int, raw: str) -> Dict[str, Any]:
+        """한 줄 추론 (예외는 error 레코드로 변환)"""
+        record: Dict[str, Any] = {"line": line_no, "id": None}
+        started = time.perf_counter()
+        try:
+            record["id"], input_data = self._parse_line(raw)
+            results = self.pipeline.run(input_data)
+            record["status"] = "ok"
+            record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            record["results"] = {
+                code: output.model_dump(mode="json") for code, output in results.items()
+            }
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    # ------------------------------------------------------------------
+    # 체크포인트
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: Path, input_path: Path) -> Optional[Dict[str, Any]]:
+        if not checkpoint_path.exists():
+            return None
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("input") != str(input_path):
+            raise ValueError(
+                f"체크포인트 입력 파일이 다릅니다: {checkpoint.get('input')} "
+                f"(현재: {input_path}) - restart=True로 처음부터 실행하세요"
+            )
+        return checkpoint
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: Path, checkpoint: Dict[str, Any]) -> None:
+        """임시 파일에 쓰고 교체 (저장 중 중단되어도 이전 체크포인트 유지)"""
+        checkpoint["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        tmp_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, checkpoint_path)
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    def run(
+        self,
+        input_path,
+        output_path,
+        restart: bool = False,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        배치 추론 실행 (체크포인트가 있으면 이어서)
+
+        Args:
+            input_path: 입력 JSONL
+            output_path: 출력 JSONL
+            restart: 체크포인트 무시하고 처음부터
+            limit: 이번 실행에서 처리할 최대 줄 수
+
+        Returns:
+            실행 요약 (처리/성공/오류 건수, 처리량, 임베딩 캐시 통계)
+        """
+        input_path = Path(input_path)
+        output_path = Path(output_path)
+        checkpoint_path = self.checkpoint_path_for(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        checkpoint = None if restart else self._load_checkpoint(checkpoint_path, input_path)
+        if checkpoint is None:
+            checkpoint = {
+                "input": str(input_path),
+                "output": str(output_path),
+                "lines_done": 0,
+                "output_bytes": 0,
+                "ok": 0,
+                "errors": 0,
+            }
+            output_path.write_bytes(b"")
+        elif output_path.exists():
+            # 마지막 체크포인트 이후 기록분은 다시 처리하므로 잘라냄
+            with open(output_path, "r+b") as f:
+                f.truncate(checkpoint["output_bytes"])
+        resumed_from = checkpoint["lines_done"]
+
+        started = time.perf_counter()
+        processed = 0
+        since_checkpoint = 0
+        lines = self._iter_lines(input_path, resumed_from)
+        if limit is not None:
+            lines = islice(lines, limit)
+
+        with open(output_path, "ab") as out, ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="batch-diagnosis"
+        ) as pool:
+            records = self._ordered(pool, self._process, lines)
+            try:
+                for record in records:
+                    out.write(self._dump(record))
+                    checkpoint["lines_done"] = record["line"]
+                    checkpoint["ok" if record["status"] == "ok" else "errors"] += 1
+                    processed += 1
+                    since_checkpoint += 1
+                    if since_checkpoint >= self.checkpoint_every:
+                        self._commit(out, checkpoint_path, checkpoint)
+                        since_checkpoint = 0
+            finally:
+                # 중단 시에도 순서대로 기록된 분량까지는 체크포인트 저장
+                records.close()
+                self._commit(out, checkpoint_path, checkpoint)
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            "input": str(input_path),
+            "output": str(output_path),
+            "resumed_from_line": resumed_from,
+            "processed": processed,
+            "ok": checkpoint["ok"],
+            "errors": checkpoint["errors"],
+            "lines_done": checkpoint["lines_done"],
+            "elapsed_sec": round(elapsed, 2),
+            "rows_per_sec": round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+        cache = get_embedding_cache()
+        if cache is not None:
+            summary["embedding_cache"] = cache.stats()
+        return summary
+
+    # ------------------------------------------------------------------
+    # Batch API 모드 (LLM 중재를 일괄 제출)
+    # ------------------------------------------------------------------
+
+    def run_llm_batch(
+        self,
+        input_path,
+        output_path,
+        work_dir,
+        batch_runner: Optional[OpenAIBatchRunner] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        LLM 중재를 OpenAI Batch API로 처리하는 배치 추론 (비용 50%, 완료까지 최대 24시간)
+
+        1. 준비: 줄마다 pipeline.prepare() (Red Flag/가중치/검색)
+           → work_dir/requests.jsonl (중재 요청), work_dir/contexts.jsonl (결과 조립용)
+        2. 제출: OpenAIBatchRunner로 업로드 → 완료까지 폴링 → custom_id별 결과 적재
+        3. 조립: contexts.jsonl 순서대로 응답을 BucketInferenceOutput으로 변환해 기록
+
+        각 단계 결과가 work_dir에 남으므로 중단 후 같은 work_dir로 다시 실행하면
+        준비/제출을 반복하지 않는다. 출력 줄 형식은 run()과 같다 (elapsed_ms 제외).
+
+        Args:
+            input_path: 입력 JSONL
+            output_path: 출력 JSONL
+            work_dir: 요청/배치 상태/결과 저장 디렉토리
+            batch_runner: Batch API 실행기 (없으면 기본 설정)
+            limit: 처리할 최대 줄 수
+
+        Returns:
+            실행 요약 (요청/캐시 적중 건수, 성공/오류 건수)
+        """
+        if not isinstance(self.pipeline, BucketInferencePipeline):
+            raise TypeError("Batch API 모드는 BucketInferencePipeline만 지원합니다")
+
+        input_path = Path(input_path)
+        output_path = Path(output_path)
+        work_dir = Path(work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+
+        prepared = self._prepare_batch(input_path, work_dir, limit)
+        store = None
+        if prepared["requests"]:
+            store = (batch_runner or OpenAIBatchRunner()).run(
+                work_dir / "requests.jsonl",
+                work_dir,
+                metadata={"source": input_path.name},
+            )
+
+        arbitrator = self.pipeline.bucket_arbitrator
+        ok = errors = 0
+        try:
+            with open(work_dir / "contexts.jsonl", "r", encoding="utf-8") as contexts, open(
+                output_path, "wb"
+            ) as out:
+                for raw in contexts:
+                    record = self._assemble(json.loads(raw), arbitrator, store)
+                    out.write(self._dump(record))
+                    if record["status"] == "ok":
+                        ok += 1
+                    else:
+                        errors += 1
+        finally:
+            if store is not None:
+                store.close()
+
+        return {
+            "input": str(input_path),
+            "output": str(output_path),
+            "work_dir": str(work_dir),
+            "lines": prepared["lines"],
+            "requests": prepared["requests"],
+            "cached": prepared["cached"],
+            "ok": ok,
+            "errors": errors,
+            "elapsed_sec": round(time.perf_counter() - started, 2),
+        }
+
+    def _prepare_batch(self, input_path: Path, work_dir: Path, limit: Optional[int]) -> Dict[str, Any]:
+        """1단계: prepare() 결과를 중재 요청/조립 컨텍스트로 기록 (완료 시 prepared.json)"""
+        marker_path = work_dir / "prepared.json"
+        if marker_path.exists():
+            with open(marker_path, "r", encoding="utf-8") as f:
+                marker = json.load(f)
+            if marker.get("input") != str(input_path):
+                raise ValueError(
+                    f"작업 디렉토리가 다른 입력으로 준비되었습니다: {marker.get('input')} "
+                    f"(현재: {input_path})"
+                )
+            return marker
+
+        marker = {"input": str(input_path), "lines": 0, "requests": 0, "cached": 0}
+        lines = self._iter_lines(input_path, 0)
+        if limit is not None:
+            lines = islice(lines, limit)
+
+        with open(work_dir / "requests.jsonl", "w", encoding="utf-8") as requests, open(
+            work_dir / "contexts.jsonl", "w", encoding="utf-8"
+        ) as contexts, ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="batch-prepare"
+        ) as pool:
+            for context, request_lines in self._ordered(pool, self._prepare_line, lines):
+                for line in request_lines:
+                    requests.write(line + "\n")
+                contexts.write(json.dumps(context, ensure_ascii=False) + "\n")
+                marker["lines"] += 1
+                marker["requests"] += len(request_lines)
+                marker["cached"] += sum(
+                    1 for part in context.get("parts", {}).values() if "cached" in part
+                )
+
+        # 요청/컨텍스트 파일이 모두 기록된 뒤에만 표시 (중간 중단 시 처음부터 다시 준비)
+        self._save_checkpoint(marker_path, marker)
+        return marker
+
+    def _prepare_line(self, line_no: int, raw: str) -> Tuple[Dict[str, Any], List[str]]:
+        """한 줄 준비 → (조립 컨텍스트, Batch API 요청 줄 목록)"""
+        context: Dict[str, Any] = {"line": line_no, "id": None}
+        request_lines: List[str] = []
+        try:
+            context["id"], input_data = self._parse_line(raw)
+            parts: Dict[str, Any] = {}
+            for bp_code, prepared in self.pipeline.prepare(input_data).items():
+                if isinstance(prepared, BucketInferenceOutput):
+                    parts[bp_code] = {"output": prepared.model_dump(mode="json")}
+                    continue
+
+                request = self.pipeline.bucket_arbitrator.build_batch_request(
+                    body_part=prepared.body_part,
+                    bucket_scores=prepared.bucket_scores,
+                    weight_ranking=prepared.weight_ranking,
+                    search_ranking=prepared.search_ranking,
+                    evidence=prepared.evidence,
+                    user_input=input_data,
+                    bp_config=prepared.bp_config,
+                )
+                part = {
+                    "inputs": {
+                        "body_part": prepared.body_part.model_dump(mode="json"),
+                        "bucket_scores": [s.model_dump(mode="json") for s in prepared.bucket_scores],
+                        "weight_ranking": prepared.weight_ranking,
+                        "search_ranking": prepared.search_ranking,
+                    },
+                    "cache_key": request["cache_key"],
+                }
+                if request["cached"] is not None:
+                    part["cached"] = request["cached"]
+                else:
+                    part["custom_id"] = f"{line_no}:{bp_code}"
+                    request_lines.append(batch_request_line(part["custom_id"], request["body"]))
+                parts[bp_code] = part
+            context["parts"] = parts
+        except Exception as e:
+            context["error"] = f"{type(e).__name__}: {e}"
+            request_lines = []
+        return context, request_lines
+
+    @staticmethod
+    def _assemble(
+        context: Dict[str, Any],
+        arbitrator,
+        store: Optional[BatchResultStore],
+    ) -> Dict[str, Any]:
+        """3단계: 조립 컨텍스트 + 배치 결과 → 출력 레코드"""
+        record: Dict[str, Any] = {"line": context["line"], "id": context["id"]}
+        if "error" in context:
+            record["status"] = "error"
+            record["error"] = context["error"]
+            return record
+
+        results: Dict[str, Any] = {}
+        try:
+            for bp_code, part in context["parts"].items():
+                if "output" in part:
+                    results[bp_code] = part["output"]
+                    continue
+
+                inputs = part["inputs"]
+                kwargs = {
+                    "body_part": BodyPartInput.model_validate(inputs["body_part"]),
+                    "bucket_scores": [BucketScore.model_validate(s) for s in inputs["bucket_scores"]],
+                    "weight_ranking": inputs["weight_ranking"],
+                    "search_ranking": inputs["search_ranking"],
+                    "cache_key": part["cache_key"],
+                    "bp_config": BodyPartConfigLoader.load(bp_code),
+                }
+                if "cached" in part:
+                    output = arbitrator.build_output_from_batch(result=part["cached"], **kwargs)
+                else:
+                    content, error = store.get(part["custom_id"])
+                    if error is not None:
+                        raise RuntimeError(f"Batch API 오류 ({part['custom_id']}): {error}")
+                    output = arbitrator.build_output_from_batch(content=content, **kwargs)
+                results[bp_code] = output.model_dump(mode="json")
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+            return record
+
+        record["status"] = "ok"
+        record["results"] = results
+        return record
+
+    # ------------------------------------------------------------------
+    # 공통
+    # ------------------------------------------------------------------
+
+    def _ordered(
+        self,
+        pool: ThreadPoolExecutor,
+        fn: Callable[[int, str], Any],
+        lines: Iterable[Tuple[int, str]],
+    ) -> Iterator[Any]:
+        """fn(줄 번호, 원문)을 스레드 풀로 실행하고 입력 순서대로 반환
+
+        미완료 작업은 concurrency * 2개로 제한하며, 중단(close/예외) 시 남은 작업은 취소한다.
+        """
+        max_pending = self.concurrency * 2
+        pending: "deque[Future]" = deque()
+        try:
+            for line_no, raw in lines:
+                pending.append(pool.submit(fn, line_no, raw))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def _dump(record: Dict[str, Any]) -> bytes:
+        return json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    def _commit(self, out, checkpoint_path: Path, checkpoint: Dict[str, Any]) -> None:
+        """출력 flush + fsync 후 체크포인트 저장"""
+        out.flush()
+        os.fsync(out.fileno())
+        checkpoint["output_bytes"] = out.tell()
+        self._save_checkpoint(checkpoint_path, checkpoint)
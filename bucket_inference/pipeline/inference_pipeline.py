@@ -2,6 +2,7 @@
 
 전체 흐름:
 1. 부위별 설정 로드 (BodyPartConfigLoader)
+   └ Red Flag 체크 (RedFlagService) → 감지 시 검색/LLM 없이 경고 응답
 2. 가중치 계산 (WeightService)
 3. 벡터 검색 (EvidenceSearchService)
 4. 랭킹 통합 (RankingMerger)
@@ -12,7 +13,8 @@ v2.0: Config-Driven Architecture
 - 코드 수정 없이 새 부위 추가 가능
 """
 
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
 
 from langsmith import traceable
 
@@ -21,16 +23,63 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.config import BodyPartConfig, BodyPartConfigLoader
-from bucket_inference.models import BucketInferenceInput, BucketInferenceOutput
+from shared.utils.progress import EVENT_BUCKET, EVENT_RANKING, EVENT_RED_FLAG, emit
+from shared.utils.timing import STAGE_CONFIG_LOAD, span
+from shared.models import BodyPartInput
+from bucket_inference.models import (
+    BucketInferenceInput,
+    BucketInferenceOutput,
+    BucketScore,
+    RedFlagResult,
+)
 from bucket_inference.services import (
     WeightService,
     EvidenceSearchService,
     RankingMerger,
     BucketArbitrator,
+    RedFlagService,
 )
+from bucket_inference.services.evidence_search import EvidenceResult
 from bucket_inference.config import settings
 
 
+@dataclass
+class ArbitrationInputs:
+    """LLM 중재 입력 (prepare 결과, Red Flag 미감지 부위)"""
+
+    body_part: BodyPartInput
+    bp_config: BodyPartConfig
+    bucket_scores: List[BucketScore]
+    weight_ranking: List[str]
+    search_ranking: List[str]
+    evidence: EvidenceResult
+
+
+def emit_ranking(body_part: str, bucket_scores: List[BucketScore], weight_ranking: List[str]) -> None:
+    """진행 이벤트: 가중치 기반 순위 (LLM 중재 전)"""
+    emit(EVENT_RANKING, {
+        "body_part": body_part,
+        "weight_ranking": weight_ranking,
+        "bucket_scores": {bs.bucket: bs.score for bs in bucket_scores},
+    })
+
+
+def emit_red_flag(body_part: str, red_flag: Optional[RedFlagResult]) -> None:
+    """진행 이벤트: Red Flag 감지 (감지되지 않았으면 보내지 않음)"""
+    if red_flag:
+        emit(EVENT_RED_FLAG, {"body_part": body_part, **red_flag.model_dump(mode="json")})
+
+
+def emit_bucket(output: BucketInferenceOutput) -> None:
+    """진행 이벤트: 부위별 최종 버킷"""
+    emit(EVENT_BUCKET, {
+        "body_part": output.body_part,
+        "final_bucket": output.final_bucket,
+        "confidence": output.confidence,
+        "has_red_flag": output.has_red_flag,
+    })
+
+
 class BucketInferencePipeline:
     """버킷 추론 파이프라인
 
@@ -49,6 +98,7 @@ class BucketInferencePipeline:
         self.evidence_service = EvidenceSearchService()
         self.ranking_merger = RankingMerger()
         self.bucket_arbitrator = BucketArbitrator()
+        self.red_flag_service = RedFlagService(self.weight_service)
 
         # 데이터 디렉토리 설정
         BodyPartConfigLoader.set_data_dir(settings.data_dir)
@@ -66,17 +116,68 @@ class BucketInferencePipeline:
         """
         results: Dict[str, BucketInferenceOutput] = {}
 
+        for bp_code, prepared in self.prepare(input_data).items():
+            if isinstance(prepared, BucketInferenceOutput):
+                results[bp_code] = prepared
+                emit_bucket(prepared)
+                continue
+
+            # Step 4: LLM 버킷 중재 (설정 전달)
+            results[bp_code] = self.bucket_arbitrator.arbitrate(
+                body_part=prepared.body_part,
+                bucket_scores=prepared.bucket_scores,
+                weight_ranking=prepared.weight_ranking,
+                search_ranking=prepared.search_ranking,
+                evidence=prepared.evidence,
+                user_input=input_data,
+                bp_config=prepared.bp_config,
+            )
+            emit_bucket(results[bp_code])
+
+        return results
+
+    def prepare(
+        self,
+        input_data: BucketInferenceInput,
+    ) -> Dict[str, Union[BucketInferenceOutput, ArbitrationInputs]]:
+        """
+        LLM 중재 직전까지 실행 (설정 로드 → Red Flag → 가중치 → 검색 → 랭킹 통합)
+
+        Batch API 모드는 이 결과로 중재 요청만 모아 일괄 제출한다.
+
+        Returns:
+            {부위코드: Red Flag 응답(BucketInferenceOutput) 또는 ArbitrationInputs}
+        """
+        prepared: Dict[str, Union[BucketInferenceOutput, ArbitrationInputs]] = {}
+
         for body_part in input_data.body_parts:
             bp_code = body_part.code
 
             # Step 0: 부위별 설정 로드 (트리거)
-            bp_config = BodyPartConfigLoader.load(bp_code)
+            with span(STAGE_CONFIG_LOAD):
+                bp_config = BodyPartConfigLoader.load(bp_code)
+
+            # Red Flag 체크 → 감지 시 벡터 검색/LLM 생략
+            red_flag = self.red_flag_service.check(body_part, bp_config)
+            emit_red_flag(bp_code, red_flag)
+            if red_flag:
+                if settings.red_flag_background_search:
+                    self.red_flag_service.log_evidence_in_background(
+                        self.evidence_service,
+                        self._build_search_query(body_part, input_data),
+                        bp_code,
+                    )
+                prepared[bp_code] = self.red_flag_service.build_response(
+                    body_part, bp_config, red_flag
+                )
+                continue
 
             # Step 1: 가중치 계산 (설정 전달)
             bucket_scores, weight_ranking = self.weight_service.calculate_scores(
                 body_part,
                 bp_config=bp_config,
             )
+            emit_ranking(bp_code, bucket_scores, weight_ranking)
 
             # Step 2: 벡터 검색
             query = self._build_search_query(body_part, input_data)
@@ -89,20 +190,16 @@ class BucketInferencePipeline:
             # Step 3: 랭킹 통합
             merged_ranking = self.ranking_merger.merge(weight_ranking, search_ranking)
 
-            # Step 4: LLM 버킷 중재 (설정 전달)
-            result = self.bucket_arbitrator.arbitrate(
+            prepared[bp_code] = ArbitrationInputs(
                 body_part=body_part,
+                bp_config=bp_config,
                 bucket_scores=bucket_scores,
                 weight_ranking=weight_ranking,
                 search_ranking=search_ranking,
                 evidence=evidence,
-                user_input=input_data,
-                bp_config=bp_config,
             )
 
-            results[bp_code] = result
-
-        return results
+        return prepared
 
     def _build_search_query(
         self,
@@ -5,12 +5,15 @@
 - 조건부 분기 (Red Flag, Discrepancy)
 - 시각화 지원 (LangGraph Studio)
 - 체크포인트/재시도 지원
+- 비동기 실행 (arun: 다중 부위 동시 실행)
 
 v1.0: 파일럿 구현
+v1.1: asyncio 경로 추가 (graph.ainvoke + AsyncOpenAI)
 """
 
 from typing import Dict, List, Optional, Annotated, TypedDict, Literal
 from datetime import datetime
+import asyncio
 import operator
 
 from langgraph.graph import StateGraph, END
@@ -23,6 +26,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.config import BodyPartConfig, BodyPartConfigLoader
 from shared.models import BodyPartInput
+from shared.utils.timing import STAGE_CONFIG_LOAD, span
 from bucket_inference.models import (
     BucketInferenceInput,
     BucketInferenceOutput,
@@ -35,9 +39,11 @@ from bucket_inference.services import (
     EvidenceSearchService,
     RankingMerger,
     BucketArbitrator,
+    RedFlagService,
 )
 from bucket_inference.services.evidence_search import EvidenceResult
 from bucket_inference.config import settings
+from bucket_inference.pipeline.inference_pipeline import emit_bucket, emit_ranking, emit_red_flag
 
 
 # =============================================================================
@@ -96,13 +102,15 @@ class BucketInferenceNodes:
         self.evidence_service = EvidenceSearchService()
         self.ranking_merger = RankingMerger()
         self.bucket_arbitrator = BucketArbitrator()
+        self.red_flag_service = RedFlagService(self.weight_service)
         BodyPartConfigLoader.set_data_dir(settings.data_dir)
 
     @traceable(name="node_load_config")
     def load_config(self, state: BucketInferenceState) -> Dict:
         """Step 0: 부위별 설정 로드"""
         bp_code = state["body_part_code"]
-        bp_config = BodyPartConfigLoader.load(bp_code)
+        with span(STAGE_CONFIG_LOAD):
+            bp_config = BodyPartConfigLoader.load(bp_code)
 
         return {
             "bp_config": bp_config,
@@ -119,6 +127,7 @@ class BucketInferenceNodes:
             body_part,
             bp_config=bp_config,
         )
+        emit_ranking(state["body_part_code"], bucket_scores, weight_ranking)
 
         return {
             "bucket_scores": bucket_scores,
@@ -158,6 +167,20 @@ class BucketInferenceNodes:
             "search_ranking": search_ranking,
         }
 
+    @traceable(name="node_search_evidence_async")
+    async def asearch_evidence(self, state: BucketInferenceState) -> Dict:
+        """Step 2b: 벡터 검색 수행 (Path B, 비동기)"""
+        evidence = await self.evidence_service.asearch(
+            query=state["search_query"],
+            body_part=state["body_part_code"],
+        )
+        search_ranking = self.evidence_service.get_search_ranking(evidence)
+
+        return {
+            "evidence": evidence,
+            "search_ranking": search_ranking,
+        }
+
     @traceable(name="node_merge_rankings")
     def merge_rankings(self, state: BucketInferenceState) -> Dict:
         """Step 3: 랭킹 통합"""
@@ -218,38 +241,16 @@ class BucketInferenceNodes:
 
     @traceable(name="node_check_red_flag")
     def check_red_flag(self, state: BucketInferenceState) -> Dict:
-        """Step 4b: Red Flag 체크"""
-        body_part = state["current_body_part"]
-        bp_config = state["bp_config"]
-
-        # Red Flag 체크 로직
-        red_flag = None
-        has_red_flag = False
-
-        if body_part.red_flags_checked:
-            # 실제 red flag 룰 적용
-            red_flag_rules = bp_config.red_flags if bp_config else {}
-            triggered_flags = []
-            messages = []
-
-            for flag_code in body_part.red_flags_checked:
-                if flag_code in red_flag_rules:
-                    triggered_flags.append(flag_code)
-                    rule = red_flag_rules[flag_code]
-                    messages.append(rule.get("message", f"Red Flag: {flag_code}"))
-
-            if triggered_flags:
-                red_flag = RedFlagResult(
-                    triggered=True,
-                    flags=triggered_flags,
-                    messages=messages,
-                    action="전문의 상담 권장",
-                )
-                has_red_flag = True
+        """Step 0b: Red Flag 체크 (설정 로드 직후, 외부 호출 전)"""
+        red_flag = self.red_flag_service.check(
+            state["current_body_part"],
+            state["bp_config"],
+        )
+        emit_red_flag(state["body_part_code"], red_flag)
 
         return {
             "red_flag": red_flag,
-            "has_red_flag": has_red_flag,
+            "has_red_flag": red_flag is not None,
         }
 
     @traceable(name="node_llm_arbitration")
@@ -266,6 +267,29 @@ class BucketInferenceNodes:
             bp_config=state["bp_config"],
         )
 
+        emit_bucket(result)
+
+        return {
+            "final_result": result,
+            "completed_at": datetime.now(),
+        }
+
+    @traceable(name="node_llm_arbitration_async")
+    async def allm_arbitration(self, state: BucketInferenceState) -> Dict:
+        """Step 5: LLM 버킷 중재 (비동기)"""
+        result = await self.bucket_arbitrator.aarbitrate(
+            body_part=state["current_body_part"],
+            bucket_scores=state["bucket_scores"],
+            weight_ranking=state["weight_ranking"],
+            search_ranking=state["search_ranking"],
+            evidence=state["evidence"],
+            user_input=state["input_data"],
+            red_flag=state["red_flag"],
+            bp_config=state["bp_config"],
+        )
+
+        emit_bucket(result)
+
         return {
             "final_result": result,
             "completed_at": datetime.now(),
@@ -273,31 +297,24 @@ class BucketInferenceNodes:
 
     @traceable(name="node_generate_red_flag_response")
     def generate_red_flag_response(self, state: BucketInferenceState) -> Dict:
-        """Red Flag 감지 시 경고 응답 생성"""
-        bucket_scores = state["bucket_scores"]
-        weight_ranking = state["weight_ranking"]
-        red_flag = state["red_flag"]
-        bp_config = state["bp_config"]
+        """Red Flag 감지 시 경고 응답 생성 (벡터 검색/LLM 생략)"""
+        body_part = state["current_body_part"]
 
-        # Red Flag가 있어도 기본 추론 결과는 제공
-        result = BucketInferenceOutput(
-            body_part=state["body_part_code"],
-            final_bucket=weight_ranking[0] if weight_ranking else bp_config.bucket_order[0],
-            confidence=0.5,  # Red Flag로 인한 낮은 신뢰도
-            bucket_scores={bs.bucket: bs.score for bs in bucket_scores} if bucket_scores else {},
-            weight_ranking=weight_ranking or [],
-            search_ranking=state["search_ranking"] or [],
-            discrepancy=state["discrepancy"],
-            evidence_summary="Red Flag 감지로 인해 전문의 상담이 필요합니다.",
-            llm_reasoning=(
-                f"### Red Flag 감지\n\n"
-                f"다음 위험 신호가 감지되었습니다:\n"
-                f"- {', '.join(red_flag.messages)}\n\n"
-                f"**권장 조치**: {red_flag.action}"
-            ),
-            red_flag=red_flag,
+        if settings.red_flag_background_search:
+            self.red_flag_service.log_evidence_in_background(
+                self.evidence_service,
+                self.build_search_query(state)["search_query"],
+                state["body_part_code"],
+            )
+
+        result = self.red_flag_service.build_response(
+            body_part,
+            state["bp_config"],
+            state["red_flag"],
         )
 
+        emit_bucket(result)
+
         return {
             "final_result": result,
             "completed_at": datetime.now(),
@@ -310,47 +327,70 @@ class BucketInferenceNodes:
 
 def build_bucket_inference_graph(
     checkpointer: Optional[MemorySaver] = None,
+    use_async: bool = False,
+    nodes: Optional[BucketInferenceNodes] = None,
+    parallel: Optional[bool] = None,
 ) -> StateGraph:
     """버킷 추론 LangGraph 구성
 
-    그래프 구조:
+    Args:
+        checkpointer: 체크포인트 저장소
+        use_async: True면 I/O 노드(search_evidence, llm_arbitration)에
+            비동기 구현을 사용 (graph.ainvoke 전용)
+        nodes: 노드 인스턴스 공유 (없으면 새로 생성)
+        parallel: 병렬 그래프 사용 여부 (없으면 settings.langgraph_parallel)
+
+    그래프 구조 (parallel=True):
     ```
     [START]
         │
         ▼
     load_config
         │
-        ├──────────────────────────┐
-        ▼                          ▼
-    calculate_weights         build_search_query
-        │                          │
-        │                          ▼
-        │                    search_evidence
-        │                          │
-        └──────────┬───────────────┘
-                   ▼
-            merge_rankings
-                   │
-           ┌───────┴───────┐
-           ▼               ▼
-    detect_discrepancy  check_red_flag
-           │               │
-           └───────┬───────┘
-                   ▼
-            ┌──────┴──────┐
-            │ has_red_flag?│
-            └──────┬──────┘
-                   │
-        ┌──────────┼──────────┐
-        ▼          │          ▼
-    red_flag_resp  │   llm_arbitration
-        │          │          │
-        └──────────┴──────────┘
-                   ▼
-                 [END]
+        ▼
+    check_red_flag
+        │
+    ┌───┴──────────┐
+    │has_red_flag? │
+    └───┬──────────┘
+        ├─────────────── (Red Flag) ──────────────┐
+        │                                         ▼
+        ├────────────────────┐            red_flag_response
+        ▼                    ▼                    │
+    calculate_weights   build_search_query        │
+        │                    │                    │
+        │                    ▼                    │
+        │              search_evidence            │
+        │                    │                    │
+        ├────────────────────┤                    │
+        ▼                    ▼                    │
+    merge_rankings     detect_discrepancy         │
+        │                    │                    │
+        └─────────┬──────────┘                    │
+                  ▼                               │
+           llm_arbitration                        │
+                  │                               │
+                  └───────────────┬───────────────┘
+                                  ▼
+                                [END]
     ```
+
+    Red Flag 체크는 설정 로드 직후 로컬 룰로만 수행하고, 감지 시
+    임베딩/Pinecone/LLM 호출 없이 경고 응답으로 종료한다.
+    (settings.red_flag_background_search=True면 근거 검색은 로깅용으로만
+    백그라운드 실행)
+
+    Red Flag가 없으면 임베딩 + Pinecone 왕복(search_evidence)이 가중치 계산과
+    같은 슈퍼스텝에서 겹쳐 실행된다. 각 병렬 노드는 서로 다른 상태 필드만
+    갱신하므로 별도 reducer가 필요 없다.
+
+    parallel=False면 Red Flag 분기 이후를 순차 그래프
+    (calculate_weights → build_search_query → search_evidence
+    → merge_rankings → detect_discrepancy → llm_arbitration)로 구성한다.
     """
-    nodes = BucketInferenceNodes()
+    nodes = nodes or BucketInferenceNodes()
+    if parallel is None:
+        parallel = settings.langgraph_parallel
 
     # 그래프 생성
     graph = StateGraph(BucketInferenceState)
@@ -359,50 +399,57 @@ def build_bucket_inference_graph(
     graph.add_node("load_config", nodes.load_config)
     graph.add_node("calculate_weights", nodes.calculate_weights)
     graph.add_node("build_search_query", nodes.build_search_query)
-    graph.add_node("search_evidence", nodes.search_evidence)
+    graph.add_node(
+        "search_evidence",
+        nodes.asearch_evidence if use_async else nodes.search_evidence,
+    )
     graph.add_node("merge_rankings", nodes.merge_rankings)
     graph.add_node("detect_discrepancy", nodes.detect_discrepancy)
     graph.add_node("check_red_flag", nodes.check_red_flag)
-    graph.add_node("llm_arbitration", nodes.llm_arbitration)
+    graph.add_node(
+        "llm_arbitration",
+        nodes.allm_arbitration if use_async else nodes.llm_arbitration,
+    )
     graph.add_node("red_flag_response", nodes.generate_red_flag_response)
 
     # 엣지 정의
     graph.set_entry_point("load_config")
 
-    # load_config → calculate_weights (순차)
-    graph.add_edge("load_config", "calculate_weights")
-
-    # calculate_weights → build_search_query (순차)
-    graph.add_edge("calculate_weights", "build_search_query")
-
-    # build_search_query → search_evidence
-    graph.add_edge("build_search_query", "search_evidence")
-
-    # search_evidence → merge_rankings
-    graph.add_edge("search_evidence", "merge_rankings")
+    # load_config → check_red_flag (외부 호출 전 체크)
+    graph.add_edge("load_config", "check_red_flag")
 
-    # merge_rankings → detect_discrepancy
-    graph.add_edge("merge_rankings", "detect_discrepancy")
+    # check_red_flag → 조건부 분기 (병렬 모드는 가중치/검색 팬아웃)
+    analysis_entry = ["calculate_weights", "build_search_query"] if parallel else ["calculate_weights"]
 
-    # detect_discrepancy → check_red_flag
-    graph.add_edge("detect_discrepancy", "check_red_flag")
-
-    # check_red_flag → 조건부 분기
-    def route_after_red_flag_check(state: BucketInferenceState) -> Literal["llm_arbitration", "red_flag_response"]:
+    def route_after_red_flag_check(state: BucketInferenceState) -> List[str]:
         """Red Flag 여부에 따른 분기"""
         if state.get("has_red_flag", False):
-            return "red_flag_response"
-        return "llm_arbitration"
+            return ["red_flag_response"]
+        return analysis_entry
 
     graph.add_conditional_edges(
         "check_red_flag",
         route_after_red_flag_check,
-        {
-            "llm_arbitration": "llm_arbitration",
-            "red_flag_response": "red_flag_response",
-        },
+        ["red_flag_response", *analysis_entry],
     )
 
+    if parallel:
+        # build_search_query → search_evidence
+        graph.add_edge("build_search_query", "search_evidence")
+
+        # (가중치 + 검색) 팬인 → 랭킹 통합 / 불일치 감지 (병렬)
+        graph.add_edge(["calculate_weights", "search_evidence"], "merge_rankings")
+        graph.add_edge(["calculate_weights", "search_evidence"], "detect_discrepancy")
+
+        # 분석 결과 합류 → LLM 중재
+        graph.add_edge(["merge_rankings", "detect_discrepancy"], "llm_arbitration")
+    else:
+        graph.add_edge("calculate_weights", "build_search_query")
+        graph.add_edge("build_search_query", "search_evidence")
+        graph.add_edge("search_evidence", "merge_rankings")
+        graph.add_edge("merge_rankings", "detect_discrepancy")
+        graph.add_edge("detect_discrepancy", "llm_arbitration")
+
     # 종료 노드
     graph.add_edge("llm_arbitration", END)
     graph.add_edge("red_flag_response", END)
@@ -423,15 +470,68 @@ class LangGraphBucketInferencePipeline:
     기존 BucketInferencePipeline과 동일한 인터페이스 제공
     """
 
-    def __init__(self, use_checkpointer: bool = False):
+    def __init__(
+        self,
+        use_checkpointer: bool = False,
+        parallel: Optional[bool] = None,
+        nodes: Optional[BucketInferenceNodes] = None,
+    ):
         """
         Args:
             use_checkpointer: 체크포인트 사용 여부 (재시도/상태 저장)
+            parallel: 병렬 그래프 사용 여부 (없으면 settings.langgraph_parallel)
+            nodes: 노드 인스턴스 공유 (없으면 새로 생성)
         """
         self.checkpointer = MemorySaver() if use_checkpointer else None
-        self.graph = build_bucket_inference_graph(self.checkpointer)
+        self.parallel = settings.langgraph_parallel if parallel is None else parallel
+        self.nodes = nodes or BucketInferenceNodes()
+        self.graph = build_bucket_inference_graph(
+            self.checkpointer, nodes=self.nodes, parallel=self.parallel
+        )
+        self.async_graph = build_bucket_inference_graph(
+            self.checkpointer, use_async=True, nodes=self.nodes, parallel=self.parallel
+        )
         BodyPartConfigLoader.set_data_dir(settings.data_dir)
 
+    def _initial_state(
+        self,
+        input_data: BucketInferenceInput,
+        body_part: BodyPartInput,
+    ) -> BucketInferenceState:
+        """부위별 초기 상태 구성"""
+        return {
+            "input_data": input_data,
+            "current_body_part": body_part,
+            "body_part_code": body_part.code,
+            "bp_config": None,
+            "bucket_scores": None,
+            "weight_ranking": None,
+            "search_query": None,
+            "evidence": None,
+            "search_ranking": None,
+            "merged_ranking": None,
+            "discrepancy": None,
+            "red_flag": None,
+            "has_red_flag": False,
+            "has_discrepancy": False,
+            "final_result": None,
+            "error": None,
+            "started_at": None,
+            "completed_at": None,
+        }
+
+    @staticmethod
+    def _graph_config(bp_code: str) -> Dict:
+        return {"configurable": {"thread_id": f"{bp_code}_{datetime.now().isoformat()}"}}
+
+    @staticmethod
+    def _extract_result(bp_code: str, final_state: Dict) -> Optional[BucketInferenceOutput]:
+        if final_state.get("final_result"):
+            return final_state["final_result"]
+        if final_state.get("error"):
+            raise RuntimeError(f"버킷 추론 실패: {final_state['error']}")
+        return None
+
     @traceable(name="langgraph_bucket_inference_pipeline")
     def run(self, input_data: BucketInferenceInput) -> Dict[str, BucketInferenceOutput]:
         """
@@ -447,37 +547,47 @@ class LangGraphBucketInferencePipeline:
 
         for body_part in input_data.body_parts:
             bp_code = body_part.code
-
-            # 초기 상태 구성
-            initial_state: BucketInferenceState = {
-                "input_data": input_data,
-                "current_body_part": body_part,
-                "body_part_code": bp_code,
-                "bp_config": None,
-                "bucket_scores": None,
-                "weight_ranking": None,
-                "search_query": None,
-                "evidence": None,
-                "search_ranking": None,
-                "merged_ranking": None,
-                "discrepancy": None,
-                "red_flag": None,
-                "has_red_flag": False,
-                "has_discrepancy": False,
-                "final_result": None,
-                "error": None,
-                "started_at": None,
-                "completed_at": None,
-            }
+            initial_state = self._initial_state(input_data, body_part)
 
             # 그래프 실행
-            config = {"configurable": {"thread_id": f"{bp_code}_{datetime.now().isoformat()}"}}
-            final_state = self.graph.invoke(initial_state, config)
+            final_state = self.graph.invoke(initial_state, self._graph_config(bp_code))
 
-            if final_state.get("final_result"):
-                results[bp_code] = final_state["final_result"]
-            elif final_state.get("error"):
-                raise RuntimeError(f"버킷 추론 실패: {final_state['error']}")
+            result = self._extract_result(bp_code, final_state)
+            if result is not None:
+                results[bp_code] = result
+
+        return results
+
+    @traceable(name="langgraph_bucket_inference_pipeline_async")
+    async def arun(self, input_data: BucketInferenceInput) -> Dict[str, BucketInferenceOutput]:
+        """
+        버킷 추론 실행 (비동기)
+
+        부위별 그래프를 동시에 실행하므로 다중 부위 요청의 지연이
+        부위 수의 합이 아닌 가장 느린 부위 기준이 된다.
+        비동기 호출자용 API로, 게이트웨이는 실행기 스레드에서 run()을 사용한다
+        (앱 진단 요청은 단일 부위).
+
+        Args:
+            input_data: 버킷 추론 입력
+
+        Returns:
+            {부위코드: BucketInferenceOutput} 딕셔너리 (입력 부위 순서 유지)
+        """
+        body_parts = input_data.body_parts
+        final_states = await asyncio.gather(*(
+            self.async_graph.ainvoke(
+                self._initial_state(input_data, body_part),
+                self._graph_config(body_part.code),
+            )
+            for body_part in body_parts
+        ))
+
+        results: Dict[str, BucketInferenceOutput] = {}
+        for body_part, final_state in zip(body_parts, final_states):
+            result = self._extract_result(body_part.code, final_state)
+            if result is not None:
+                results[body_part.code] = result
 
         return results
 
@@ -563,6 +673,55 @@ def compare_pipelines(
     }
 
 
+def compare_graph_modes(
+    input_data: BucketInferenceInput,
+    repeat: int = 1,
+) -> Dict:
+    """순차 그래프와 병렬 그래프의 wall-clock 시간 비교
+
+    두 그래프는 같은 노드 인스턴스(같은 클라이언트)를 공유한다.
+
+    Args:
+        input_data: 버킷 추론 입력
+        repeat: 반복 횟수 (평균 계산용)
+
+    Returns:
+        {
+            "sequential": {"execution_time_ms": ..., "buckets": {...}},
+            "parallel": {"execution_time_ms": ..., "buckets": {...}},
+            "speedup": ...,
+        }
+    """
+    import time
+
+    nodes = BucketInferenceNodes()
+    pipelines = {
+        "sequential": LangGraphBucketInferencePipeline(parallel=False, nodes=nodes),
+        "parallel": LangGraphBucketInferencePipeline(parallel=True, nodes=nodes),
+    }
+
+    report: Dict = {}
+    for mode, pipeline in pipelines.items():
+        elapsed = 0.0
+        results: Dict[str, BucketInferenceOutput] = {}
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            results = pipeline.run(input_data)
+            elapsed += time.perf_counter() - start
+
+        report[mode] = {
+            "execution_time_ms": int(elapsed / max(1, repeat) * 1000),
+            "buckets": {k: v.final_bucket for k, v in results.items()},
+        }
+
+    parallel_ms = report["parallel"]["execution_time_ms"]
+    report["speedup"] = (
+        round(report["sequential"]["execution_time_ms"] / parallel_ms, 2)
+        if parallel_ms else None
+    )
+    return report
+
+
 if __name__ == "__main__":
     # 테스트 실행
     from shared.models import Demographics
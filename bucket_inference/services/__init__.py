@@ -4,10 +4,12 @@ from .weight_service import WeightService
 from .evidence_search import EvidenceSearchService
 from .ranking_merger import RankingMerger
 from .bucket_arbitrator import BucketArbitrator
+from .red_flag_service import RedFlagService
 
 __all__ = [
     "WeightService",
     "EvidenceSearchService",
     "RankingMerger",
     "BucketArbitrator",
+    "RedFlagService",
 ]
@@ -3,12 +3,26 @@
 가중치 점수와 벡터 검색 결과를 비교하여 LLM이 최종 버킷 결정
 
 v2.0: 부위별 설정(BodyPartConfig) 기반 동적 버킷 처리
+
+ARBITRATION_CACHE_ENABLED=true면 동일 프롬프트(모델 + 메시지)의 결정을
+응답 캐시에서 재사용한다 (응답 metadata.arbitration_cache에 적중률 표시).
+
+프롬프트는 고정 부분(역할, 버킷 설명, 요청/인용 규칙, JSON 형식)을 앞에,
+환자별 데이터(환자 정보, 증상, 점수/순위, 근거)를 뒤에 둔다. 같은 부위의 호출은
+앞부분이 바이트 단위로 같아 제공자 측 프롬프트 캐시에 적중한다
+(적중 토큰은 timings.prompt_cache.bucket_arbitration).
+
+Fast path: 가중치/검색 1순위가 같고 불일치 경고가 없으며 1순위 비율이 압도적이면
+LLM 없이 템플릿 결정을 반환한다 (부위별 config.json의
+inference_settings.arbitration_fast_path 임계값, 응답 metadata.arbitration="fast_path").
+골든셋 정확도 비교 전까지 기본 비활성 (ARBITRATION_FAST_PATH_ENABLED=true로 사용).
 """
 
 from typing import List, Optional, Dict, Any
 import json
+import threading
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from langsmith import traceable
 
 import sys
@@ -17,6 +31,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.models import BodyPartInput, Demographics
 from shared.config import BodyPartConfig, BodyPartConfigLoader
+from shared.utils import (
+    ResponseCache,
+    create_response_cache,
+    get_logger,
+    make_response_cache_key,
+    get_openai_client,
+    get_async_openai_client,
+)
+from shared.utils.timing import STAGE_LLM_ARBITRATION, record_usage, timed
 from bucket_inference.models import (
     BucketInferenceInput,
     BucketInferenceOutput,
@@ -28,21 +51,65 @@ from bucket_inference.services.evidence_search import EvidenceResult
 from bucket_inference.config import settings
 
 
+logger = get_logger(__name__)
+
+# LLM 호출 파라미터 (캐시 키에 포함)
+LLM_TEMPERATURE = 0.3
+CACHE_NAMESPACE = "bucket_arbitration"
+
+_arbitration_cache: Optional[ResponseCache] = None
+_arbitration_cache_lock = threading.Lock()
+
+
+def get_arbitration_cache() -> Optional[ResponseCache]:
+    """설정 기반 공유 중재 캐시 반환 (비활성화 시 None)"""
+    global _arbitration_cache
+
+    if not settings.arbitration_cache_enabled:
+        return None
+
+    with _arbitration_cache_lock:
+        if _arbitration_cache is None:
+            _arbitration_cache = create_response_cache(
+                backend=settings.arbitration_cache_backend,
+                ttl_seconds=settings.arbitration_cache_ttl,
+                max_items=settings.arbitration_cache_max_items,
+                path=settings.arbitration_cache_path,
+                redis_url=settings.arbitration_cache_redis_url,
+                name="arbitration",
+            )
+        return _arbitration_cache
+
+
 class BucketArbitrator:
     """LLM Pass #1: 버킷 검증 및 최종 결정
 
     v2.0: 부위별 설정 기반으로 버킷 목록과 프롬프트를 동적으로 구성
     """
 
-    def __init__(self, openai_client: Optional[OpenAI] = None):
+    def __init__(
+        self,
+        openai_client: Optional[OpenAI] = None,
+        async_openai_client: Optional[AsyncOpenAI] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
         """
         Args:
-            openai_client: OpenAI 클라이언트
+            openai_client: OpenAI 클라이언트 (없으면 공용 클라이언트)
+            async_openai_client: AsyncOpenAI 클라이언트 (aarbitrate용, 없으면 공용 클라이언트)
+            response_cache: 중재 결과 캐시 (없으면 설정 기반 공유 캐시, 비활성화 시 미사용)
         """
-        self._openai = openai_client or OpenAI()
+        self._openai = openai_client or get_openai_client()
+        self._async_openai = async_openai_client
         self._model = settings.openai_model
+        self._cache = response_cache if response_cache is not None else get_arbitration_cache()
+
+    def _get_async_openai(self) -> AsyncOpenAI:
+        """AsyncOpenAI 클라이언트 반환 (주입되지 않았으면 현재 이벤트 루프의 공용 클라이언트)"""
+        return self._async_openai or get_async_openai_client()
 
     @traceable(name="bucket_arbitration")
+    @timed(STAGE_LLM_ARBITRATION)
     def arbitrate(
         self,
         body_part: BodyPartInput,
@@ -77,6 +144,15 @@ class BucketArbitrator:
         # 불일치 감지
         discrepancy = self._detect_discrepancy(weight_ranking, search_ranking)
 
+        # 확실한 케이스는 LLM 없이 결정
+        result = self._fast_path_result(
+            body_part, bucket_scores, weight_ranking, search_ranking, discrepancy, evidence, bp_config
+        )
+        if result is not None:
+            return self._build_output(
+                body_part, bucket_scores, weight_ranking, search_ranking, discrepancy, result
+            )
+
         # LLM 호출하여 최종 결정
         result = self._call_llm(
             body_part=body_part,
@@ -89,6 +165,76 @@ class BucketArbitrator:
             bp_config=bp_config,
         )
 
+        return self._build_output(
+            body_part, bucket_scores, weight_ranking, search_ranking, discrepancy, result
+        )
+
+    @traceable(name="bucket_arbitration_async")
+    @timed(STAGE_LLM_ARBITRATION)
+    async def aarbitrate(
+        self,
+        body_part: BodyPartInput,
+        bucket_scores: List[BucketScore],
+        weight_ranking: List[str],
+        search_ranking: List[str],
+        evidence: Optional[EvidenceResult],
+        user_input: BucketInferenceInput,
+        red_flag: Optional[RedFlagResult] = None,
+        bp_config: Optional[BodyPartConfig] = None,
+    ) -> BucketInferenceOutput:
+        """
+        가중치 vs 검색 결과 비교 후 최종 버킷 결정 (비동기)
+
+        인자/반환값은 arbitrate()와 동일
+        """
+        if bp_config is None:
+            bp_config = BodyPartConfigLoader.load(body_part.code)
+
+        discrepancy = self._detect_discrepancy(weight_ranking, search_ranking)
+
+        result = self._fast_path_result(
+            body_part, bucket_scores, weight_ranking, search_ranking, discrepancy, evidence, bp_config
+        )
+        if result is not None:
+            return self._build_output(
+                body_part, bucket_scores, weight_ranking, search_ranking, discrepancy, result
+            )
+
+        result = await self._acall_llm(
+            body_part=body_part,
+            bucket_scores=bucket_scores,
+            weight_ranking=weight_ranking,
+            search_ranking=search_ranking,
+            discrepancy=discrepancy,
+            evidence=evidence,
+            user_input=user_input,
+            bp_config=bp_config,
+        )
+
+        return self._build_output(
+            body_part, bucket_scores, weight_ranking, search_ranking, discrepancy, result
+        )
+
+    def _build_output(
+        self,
+        body_part: BodyPartInput,
+        bucket_scores: List[BucketScore],
+        weight_ranking: List[str],
+        search_ranking: List[str],
+        discrepancy: Optional[DiscrepancyAlert],
+        result: Dict[str, Any],
+    ) -> BucketInferenceOutput:
+        """LLM 결정 결과 → BucketInferenceOutput"""
+        metadata: Dict[str, Any] = {}
+        if result.get("fast_path"):
+            metadata["arbitration"] = "fast_path"
+            metadata["fast_path"] = result["fast_path"]
+        elif self._cache is not None:
+            metadata["arbitration_cache"] = {
+                "hit": result.get("cache_hit", False),
+                **self._cache.stats(include_size=False),
+            }
+
         return BucketInferenceOutput(
             body_part=body_part.code,
             final_bucket=result["final_bucket"],
@@ -100,6 +246,7 @@ class BucketArbitrator:
             evidence_summary=result["evidence_summary"],
             llm_reasoning=result["reasoning"],
             red_flag=None,  # 앱에서만 레드플래그 처리
+            metadata=metadata,
         )
 
     def _detect_discrepancy(
@@ -143,6 +290,99 @@ class BucketArbitrator:
 
         return None
 
+    # ------------------------------------------------------------------
+    # Fast path (LLM 생략)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _fast_path_settings(bp_config: BodyPartConfig) -> Optional[Dict[str, Any]]:
+        """부위별 fast path 설정 (비활성화면 None)"""
+        if not settings.arbitration_fast_path_enabled:
+            return None
+        fast_path = (
+            bp_config.extra_config.get("inference_settings", {}).get("arbitration_fast_path") or {}
+        )
+        if not fast_path.get("enabled", False):
+            return None
+        return fast_path
+
+    def _fast_path_result(
+        self,
+        body_part: BodyPartInput,
+        bucket_scores: List[BucketScore],
+        weight_ranking: List[str],
+        search_ranking: List[str],
+        discrepancy: Optional[DiscrepancyAlert],
+        evidence: Optional[EvidenceResult],
+        bp_config: BodyPartConfig,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        확실한 케이스의 템플릿 결정 (조건 미충족 시 None → LLM 중재)
+
+        조건 (모두 충족):
+        - 검색 1순위 == 가중치 1순위, 불일치 경고 없음
+        - 1순위 비율 >= min_top_percentage, 1·2순위 비율 차 >= min_margin (%p)
+        - 증상 수 >= min_symptoms, 근거 수 >= min_evidence
+
+        Returns:
+            _call_llm()과 같은 형식의 결정 + fast_path 판정 근거
+        """
+        config = self._fast_path_settings(bp_config)
+        if config is None or discrepancy is not None:
+            return None
+        if not weight_ranking or not search_ranking or search_ranking[0] != weight_ranking[0]:
+            return None
+
+        ordered = sorted(bucket_scores, key=lambda bs: bs.percentage, reverse=True)
+        if not ordered or ordered[0].bucket != weight_ranking[0]:
+            return None
+        top = ordered[0]
+        margin = top.percentage - (ordered[1].percentage if len(ordered) > 1 else 0.0)
+        results = evidence.results if evidence else []
+
+        if (
+            top.percentage < config.get("min_top_percentage", 60)
+            or margin < config.get("min_margin", 35)
+            or len(body_part.symptoms) < config.get("min_symptoms", 4)
+            or len(results) < config.get("min_evidence", 1)
+        ):
+            return None
+
+        cited = results[:config.get("cited_evidence", 3)]
+        name_kr = bp_config.bucket_names_kr.get(top.bucket, top.bucket)
+        symptoms = ", ".join(top.contributing_symptoms[:5]) or ", ".join(body_part.symptoms[:5])
+
+        evidence_summary = (
+            f"검색된 근거 {len(results)}건 중 상위 근거가 {name_kr}({top.bucket}) 패턴을 지지합니다: "
+            + "; ".join(f"{r.paper.title} ({r.paper.source_type})" for r in cited)
+        )
+        reasoning = (
+            f"가중치 점수와 근거 검색 결과가 모두 {name_kr}({top.bucket})을 1순위로 지목했습니다. "
+            f"{top.bucket} 비율 {top.percentage:.1f}%로 2순위와 {margin:.1f}%p 차이가 나며, "
+            f"주요 기여 증상은 {symptoms}입니다."
+        )
+        if cited:
+            reasoning += "\n\n### 참고 문헌 인용:\n"
+            for i, r in enumerate(cited, 1):
+                quote = (r.paper.content or "")[:150].replace("\n", " ")
+                reasoning += (
+                    f"{i}. **{r.paper.title}** [{r.paper.source_type}]\n"
+                    f"   > \"{quote}\"\n"
+                    f"   → 유사도 {r.similarity_score:.2f}\n\n"
+                )
+
+        return {
+            "final_bucket": top.bucket,
+            "confidence": config.get("confidence", 0.85),
+            "evidence_summary": evidence_summary,
+            "reasoning": reasoning.rstrip(),
+            "fast_path": {
+                "top_percentage": top.percentage,
+                "margin": round(margin, 1),
+                "evidence": len(results),
+            },
+        }
+
     @traceable(run_type="llm", name="llm_bucket_decision")
     def _call_llm(
         self,
@@ -167,25 +407,216 @@ class BucketArbitrator:
             bp_config=bp_config,
         )
 
-        response = self._openai.chat.completions.create(
-            model=self._model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        f"당신은 정형외과 {bp_config.display_name} 전문의입니다. "
-                        "환자의 증상과 근거 자료를 분석하여 가장 가능성 높은 "
-                        "진단 버킷을 결정합니다. "
-                        "반드시 JSON 형식으로 응답하세요."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.3,
+        messages = self._build_messages(prompt, bp_config)
+        cache_key = self._cache_key(messages)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        response = self._openai.chat.completions.create(**self._request_body(messages))
+        record_usage(getattr(response, "usage", None), call=CACHE_NAMESPACE)
+
+        result = self._parse_llm_result(
+            response.choices[0].message.content, weight_ranking, bp_config
         )
+        self._cache_set(cache_key, result)
+        return result
 
-        result = json.loads(response.choices[0].message.content)
+    @traceable(run_type="llm", name="llm_bucket_decision_async")
+    async def _acall_llm(
+        self,
+        body_part: BodyPartInput,
+        bucket_scores: List[BucketScore],
+        weight_ranking: List[str],
+        search_ranking: List[str],
+        discrepancy: Optional[DiscrepancyAlert],
+        evidence: Optional[EvidenceResult],
+        user_input: BucketInferenceInput,
+        bp_config: BodyPartConfig,
+    ) -> Dict[str, Any]:
+        """LLM 호출하여 최종 결정 (비동기)"""
+        prompt = self._build_prompt(
+            body_part=body_part,
+            bucket_scores=bucket_scores,
+            weight_ranking=weight_ranking,
+            search_ranking=search_ranking,
+            discrepancy=discrepancy,
+            evidence=evidence,
+            user_input=user_input,
+            bp_config=bp_config,
+        )
+
+        messages = self._build_messages(prompt, bp_config)
+        cache_key = self._cache_key(messages)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._get_async_openai().chat.completions.create(
+            **self._request_body(messages)
+        )
+        record_usage(getattr(response, "usage", None), call=CACHE_NAMESPACE)
+
+        result = self._parse_llm_result(
+            response.choices[0].message.content, weight_ranking, bp_config
+        )
+        self._cache_set(cache_key, result)
+        return result
+
+    def _request_body(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """chat completions 요청 본문 (동기/비동기/Batch API 공통)"""
+        return {
+            "model": self._model,
+            "messages": messages,
+            "response_format": {"type": "json_object"},
+            "temperature": LLM_TEMPERATURE,
+        }
+
+    # ------------------------------------------------------------------
+    # Batch API (오프라인 재평가)
+    # ------------------------------------------------------------------
+
+    def build_batch_request(
+        self,
+        body_part: BodyPartInput,
+        bucket_scores: List[BucketScore],
+        weight_ranking: List[str],
+        search_ranking: List[str],
+        evidence: Optional[EvidenceResult],
+        user_input: BucketInferenceInput,
+        bp_config: Optional[BodyPartConfig] = None,
+    ) -> Dict[str, Any]:
+        """
+        Batch API 요청 준비 (arbitrate()의 LLM 호출 전 단계)
+
+        Returns:
+            {"body": 요청 본문, "cache_key": 캐시 키, "cached": 캐시 적중 시 결정 (없으면 None)}
+            cached가 있으면 배치에 넣지 않고 build_output_from_batch(result=cached)로 완료
+            (fast path 결정도 cached로 반환하며, 이때는 프롬프트를 만들지 않아 body/cache_key가 None)
+        """
+        if bp_config is None:
+            bp_config = BodyPartConfigLoader.load(body_part.code)
+
+        discrepancy = self._detect_discrepancy(weight_ranking, search_ranking)
+        fast_path = self._fast_path_result(
+            body_part, bucket_scores, weight_ranking, search_ranking, discrepancy, evidence, bp_config
+        )
+        if fast_path is not None:
+            return {"body": None, "cache_key": None, "cached": fast_path}
+
+        prompt = self._build_prompt(
+            body_part=body_part,
+            bucket_scores=bucket_scores,
+            weight_ranking=weight_ranking,
+            search_ranking=search_ranking,
+            discrepancy=discrepancy,
+            evidence=evidence,
+            user_input=user_input,
+            bp_config=bp_config,
+        )
+        messages = self._build_messages(prompt, bp_config)
+        cache_key = self._cache_key(messages)
+        return {
+            "body": self._request_body(messages),
+            "cache_key": cache_key,
+            "cached": self._cache_get(cache_key),
+        }
+
+    def build_output_from_batch(
+        self,
+        body_part: BodyPartInput,
+        bucket_scores: List[BucketScore],
+        weight_ranking: List[str],
+        search_ranking: List[str],
+        content: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+        cache_key: Optional[str] = None,
+        bp_config: Optional[BodyPartConfig] = None,
+    ) -> BucketInferenceOutput:
+        """
+        Batch API 응답(content) 또는 캐시 결정(result) → BucketInferenceOutput
+
+        content를 파싱한 결정은 cache_key로 응답 캐시에 저장한다 (동기 경로와 동일).
+        """
+        if bp_config is None:
+            bp_config = BodyPartConfigLoader.load(body_part.code)
+
+        if result is None:
+            result = self._parse_llm_result(content, weight_ranking, bp_config)
+            self._cache_set(cache_key, result)
+
+        return self._build_output(
+            body_part,
+            bucket_scores,
+            weight_ranking,
+            search_ranking,
+            self._detect_discrepancy(weight_ranking, search_ranking),
+            result,
+        )
+
+    def _cache_key(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        """캐시 키 (모델 + 메시지 + 호출 파라미터의 정규 해시)
+
+        프롬프트에는 인구통계, 증상 코드, 가중치/검색 순위, 근거가 모두
+        포함되므로 메시지 해시가 곧 입력 전체의 해시가 된다.
+        """
+        if self._cache is None:
+            return None
+        return make_response_cache_key(
+            self._model,
+            {
+                "messages": messages,
+                "temperature": LLM_TEMPERATURE,
+                "response_format": "json_object",
+            },
+            namespace=CACHE_NAMESPACE,
+        )
+
+    def _cache_get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (캐시 오류는 미스로 처리)"""
+        if key is None:
+            return None
+        try:
+            cached = self._cache.get(key)
+        except Exception as e:
+            logger.warning(f"중재 캐시 조회 실패: {e}")
+            return None
+        if cached is None:
+            return None
+        return {**cached, "cache_hit": True}
+
+    def _cache_set(self, key: Optional[str], result: Dict[str, Any]) -> None:
+        """캐시 저장 (실패해도 응답에는 영향 없음)"""
+        if key is None:
+            return
+        try:
+            self._cache.set(key, result)
+        except Exception as e:
+            logger.warning(f"중재 캐시 저장 실패: {e}")
+
+    def _build_messages(self, prompt: str, bp_config: BodyPartConfig) -> List[Dict[str, str]]:
+        """시스템/사용자 메시지 구성"""
+        return [
+            {
+                "role": "system",
+                "content": (
+                    f"당신은 정형외과 {bp_config.display_name} 전문의입니다. "
+                    "환자의 증상과 근거 자료를 분석하여 가장 가능성 높은 "
+                    "진단 버킷을 결정합니다. "
+                    "반드시 JSON 형식으로 응답하세요."
+                ),
+            },
+            {"role": "user", "content": prompt},
+        ]
+
+    def _parse_llm_result(
+        self,
+        content: str,
+        weight_ranking: List[str],
+        bp_config: BodyPartConfig,
+    ) -> Dict[str, Any]:
+        """LLM JSON 응답 파싱 (인용 포맷팅, 버킷 정규화)"""
+        result = json.loads(content)
 
         # 인용 정보 포맷팅
         citations = result.get("citations", [])
@@ -252,7 +683,9 @@ class BucketArbitrator:
         nl_text = user_input.natural_language.to_text() if user_input.natural_language else "없음"
         if user_input.survey_responses:
             try:
-                raw_survey = json.dumps(user_input.survey_responses, ensure_ascii=False, indent=2)
+                raw_survey = json.dumps(
+                    user_input.survey_responses, ensure_ascii=False, indent=2, sort_keys=True
+                )
             except Exception:
                 raw_survey = str(user_input.survey_responses)
         else:
@@ -326,7 +759,7 @@ class BucketArbitrator:
         return evidence_str
 
     def _format_bucket_descriptions(self, bp_config: BodyPartConfig) -> str:
-        """버킷 설명 포맷팅"""
+        """버킷 설명 포맷팅 (bucket_order 순서 고정 - 프롬프트 고정 부분)"""
         lines = []
         for bucket_code in bp_config.bucket_order:
             info = bp_config.bucket_info.get(bucket_code, {})
@@ -357,41 +790,18 @@ class BucketArbitrator:
         natural_language: str,
         raw_survey: str,
     ) -> str:
-        """기본 프롬프트 생성"""
+        """기본 프롬프트 생성 (고정 부분 → 환자 데이터 순)"""
         default_bucket = bp_config.bucket_order[0] if bp_config.bucket_order else "OA"
 
         return f"""
-## 환자 정보
-{patient_info}
-
-## 증상
-{symptoms_str}
-
-## 자연어 설명/병력
-{natural_language}
-
-## 원본 설문 응답 (추출 없이 참고)
-{raw_survey}
-
-## 버킷별 점수 (가중치 기반)
-{scores_str}
-
-## 순위 비교
-- 가중치 순위: {' > '.join(weight_ranking)}
-- 검색 순위: {' > '.join(search_ranking) if search_ranking else '검색 결과 없음'}
-{discrepancy_str}
-
-## 검색된 근거 자료
-{evidence_str}
-
 ## {bp_config.display_name} 진단 버킷 설명
 {bucket_descriptions_str}
 
 ## 요청
-위 정보를 종합하여 가장 가능성 높은 진단 버킷을 결정하세요.
+아래 환자 데이터와 근거 자료를 종합하여 가장 가능성 높은 진단 버킷을 결정하세요.
 
 **인용 규칙**:
-1. 인용은 반드시 위 "검색된 근거 자료"에서만 해야 합니다
+1. 인용은 반드시 아래 "검색된 근거 자료"에서만 해야 합니다
 2. 검색 결과가 없으면 "검색된 근거 자료 없음"이라고 명시하세요
 
 **중요**: final_bucket은 반드시 {valid_buckets_str} 중 하나만 선택하세요. 복수 선택 금지.
@@ -411,4 +821,30 @@ class BucketArbitrator:
         }}
     ]
 }}
+
+---
+# 환자 데이터
+
+## 환자 정보
+{patient_info}
+
+## 증상
+{symptoms_str}
+
+## 자연어 설명/병력
+{natural_language}
+
+## 원본 설문 응답 (추출 없이 참고)
+{raw_survey}
+
+## 버킷별 점수 (가중치 기반)
+{scores_str}
+
+## 순위 비교
+- 가중치 순위: {' > '.join(weight_ranking)}
+- 검색 순위: {' > '.join(search_ranking) if search_ranking else '검색 결과 없음'}
+{discrepancy_str}
+
+## 검색된 근거 자료
+{evidence_str}
 """
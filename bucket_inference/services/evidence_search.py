@@ -4,18 +4,27 @@
 소스: verified_paper, orthobullets, pubmed
 """
 
+import asyncio
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from langsmith import traceable
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from shared.utils import PineconeClient
+from shared.utils import (
+    VectorStore,
+    EmbeddingCache,
+    get_embedding_cache,
+    create_vector_store,
+    get_openai_client,
+    get_async_openai_client,
+)
+from shared.utils.timing import STAGE_EMBEDDING, STAGE_VECTOR_QUERY, record_usage, span, timed
 from bucket_inference.config import settings
 
 
@@ -65,33 +74,76 @@ class EvidenceSearchService:
 
     def __init__(
         self,
-        pinecone_client: Optional[PineconeClient] = None,
+        pinecone_client: Optional[VectorStore] = None,
         openai_client: Optional[OpenAI] = None,
+        async_openai_client: Optional[AsyncOpenAI] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Args:
-            pinecone_client: Pinecone 클라이언트 (없으면 자동 생성)
-            openai_client: OpenAI 클라이언트 (임베딩용)
+            pinecone_client: 벡터 스토어 (없으면 VECTOR_STORE_BACKEND에 따라 자동 생성)
+            openai_client: OpenAI 클라이언트 (임베딩용, 없으면 공용 클라이언트)
+            async_openai_client: AsyncOpenAI 클라이언트 (asearch용, 없으면 공용 클라이언트)
+            embedding_cache: 임베딩 캐시 (없으면 공유 캐시, 비활성화 시 미사용)
         """
         self._pc = pinecone_client
-        self._openai = openai_client or OpenAI()
+        self._openai = openai_client or get_openai_client()
+        self._async_openai = async_openai_client
+        self._embedding_cache = embedding_cache or get_embedding_cache()
         self._min_score = settings.min_search_score
         self._top_k = settings.search_top_k
 
-    def _get_client(self) -> PineconeClient:
-        """Pinecone 클라이언트 반환 (지연 초기화)"""
+    def _get_client(self) -> VectorStore:
+        """벡터 스토어 반환 (지연 초기화, VECTOR_STORE_BACKEND에 따라 Pinecone/로컬)"""
         if self._pc is None:
-            self._pc = PineconeClient(index_name=settings.pinecone_index)
+            self._pc = create_vector_store(settings.pinecone_index)
         return self._pc
 
+    @timed(STAGE_EMBEDDING)
     def _embed(self, text: str) -> List[float]:
-        """텍스트 임베딩"""
+        """텍스트 임베딩 (캐시 우선)"""
+        if self._embedding_cache is None:
+            return self._embed_uncached(text)
+        return self._embedding_cache.get_or_compute(
+            settings.embedding_model, text, self._embed_uncached
+        )
+
+    def _embed_uncached(self, text: str) -> List[float]:
+        """텍스트 임베딩 (API 호출)"""
         response = self._openai.embeddings.create(
             model=settings.embedding_model,
             input=text,
         )
+        record_usage(getattr(response, "usage", None), kind="embedding")
         return response.data[0].embedding
 
+    def _get_async_openai(self) -> AsyncOpenAI:
+        """AsyncOpenAI 클라이언트 반환 (주입되지 않았으면 현재 이벤트 루프의 공용 클라이언트)"""
+        return self._async_openai or get_async_openai_client()
+
+    @timed(STAGE_EMBEDDING)
+    async def _aembed(self, text: str) -> List[float]:
+        """텍스트 임베딩 (비동기, 캐시 우선)
+
+        캐시 디스크 계층(SQLite)은 블로킹 I/O이므로 조회/저장을 스레드에서 실행한다.
+        """
+        cache = self._embedding_cache
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, settings.embedding_model, text)
+            if cached is not None:
+                return cached
+
+        response = await self._get_async_openai().embeddings.create(
+            model=settings.embedding_model,
+            input=text,
+        )
+        record_usage(getattr(response, "usage", None), kind="embedding")
+        vector = response.data[0].embedding
+
+        if cache is not None:
+            await asyncio.to_thread(cache.put, settings.embedding_model, text, vector)
+        return vector
+
     @traceable(name="evidence_vector_search")
     def search(
         self,
@@ -119,13 +171,45 @@ class EvidenceSearchService:
         filters = {"body_part": body_part}
 
         # 벡터 검색
-        raw_results = client.query(
-            vector=query_vector,
-            top_k=self._top_k,
-            filter=filters,
-            min_score=self._min_score,
-        )
+        with span(STAGE_VECTOR_QUERY):
+            raw_results = client.query(
+                vector=query_vector,
+                top_k=self._top_k,
+                filter=filters,
+                min_score=self._min_score,
+            )
+
+        return self._build_evidence(query, body_part, raw_results)
+
+    @traceable(name="evidence_vector_search_async")
+    async def asearch(
+        self,
+        query: str,
+        body_part: str,
+        buckets: Optional[List[str]] = None,
+    ) -> EvidenceResult:
+        """
+        벡터 검색 수행 (비동기)
+
+        인자/반환값은 search()와 동일
+        """
+        client = self._get_client()
+
+        query_vector = await self._aembed(query)
+        filters = {"body_part": body_part}
+
+        with span(STAGE_VECTOR_QUERY):
+            raw_results = await client.aquery(
+                vector=query_vector,
+                top_k=self._top_k,
+                filter=filters,
+                min_score=self._min_score,
+            )
+
+        return self._build_evidence(query, body_part, raw_results)
 
+    def _build_evidence(self, query: str, body_part: str, raw_results) -> EvidenceResult:
+        """Pinecone 검색 결과 → EvidenceResult 변환"""
         # SearchResult로 변환
         results = []
         for item in raw_results.items:
@@ -0,0 +1,194 @@
+"""Red Flag 서비스
+
+부위별 설정(red_flags.json) 기반 위험 신호 체크 및 경고 응답 생성.
+Red Flag 응답은 LLM/벡터 검색 없이 가중치 점수만으로 구성한다.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.config import BodyPartConfig
+from shared.models import BodyPartInput
+from shared.utils import get_logger
+from bucket_inference.models import BucketInferenceOutput, RedFlagResult
+from bucket_inference.services.weight_service import WeightService
+
+
+logger = get_logger(__name__)
+
+# Red Flag 경로의 로깅용 근거 검색 (응답 지연과 무관하게 백그라운드 실행)
+# 첫 사용 시 생성, 서비스 종료 시 shutdown_background_pool()로 정리
+_background_pool: Optional[ThreadPoolExecutor] = None
+_background_pool_lock = threading.Lock()
+
+# 즉시 의뢰 대상 목록 그룹 (그 밖의 목록은 severity가 있는 항목만 Red Flag)
+RED_FLAG_GROUPS = ("immediate_referral", "red_flags")
+
+
+def _get_background_pool() -> ThreadPoolExecutor:
+    """백그라운드 근거 검색 풀 반환 (없거나 종료됐으면 생성)"""
+    global _background_pool
+
+    with _background_pool_lock:
+        if _background_pool is None:
+            _background_pool = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="red-flag-evidence"
+            )
+        return _background_pool
+
+
+def shutdown_background_pool() -> None:
+    """백그라운드 근거 검색 풀 종료 (대기 중인 검색은 취소, 앱 종료 시 호출)"""
+    global _background_pool
+
+    with _background_pool_lock:
+        pool, _background_pool = _background_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class RedFlagService:
+    """Red Flag 체크 및 경고 응답 생성"""
+
+    def __init__(self, weight_service: Optional[WeightService] = None):
+        """
+        Args:
+            weight_service: 가중치 서비스 (없으면 자동 생성)
+        """
+        self.weight_service = weight_service or WeightService()
+
+    def check(
+        self,
+        body_part: BodyPartInput,
+        bp_config: Optional[BodyPartConfig],
+    ) -> Optional[RedFlagResult]:
+        """Red Flag 체크
+
+        Returns:
+            RedFlagResult (감지된 플래그가 없으면 None)
+        """
+        if not body_part.red_flags_checked:
+            return None
+
+        # 실제 red flag 룰 적용
+        red_flag_rules = self._index_rules(bp_config.red_flags if bp_config else {})
+        triggered_flags = []
+        messages = []
+
+        for flag_code in body_part.red_flags_checked:
+            rule = red_flag_rules.get(flag_code)
+            if rule is not None:
+                triggered_flags.append(flag_code)
+                messages.append(self._rule_message(flag_code, rule))
+
+        if not triggered_flags:
+            return None
+
+        return RedFlagResult(
+            triggered=True,
+            flags=triggered_flags,
+            messages=messages,
+            action="전문의 상담 권장",
+        )
+
+    @staticmethod
+    def _index_rules(red_flags: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """red_flags.json → {플래그 코드: 룰} 인덱스
+
+        지원 형식:
+        - {"코드": {"message": ...}} (코드 키 직접 정의)
+        - {"immediate_referral": [{"code": ...}, ...]} (무릎, 그룹별 목록)
+        - {"red_flags": [{"code": ...}, ...]} (어깨)
+        - {"survey_mapping": {"설문 문항 ID": "코드"}} (문항 ID로도 조회)
+
+        additional_evaluation(무릎) 같은 추가 평가 권고는 즉시 의뢰가 아니므로
+        조기 종료 대상에서 제외한다 (severity가 없는 그룹 외 항목은 무시).
+        """
+        rules: Dict[str, Dict[str, Any]] = {}
+
+        for key, value in red_flags.items():
+            if key.startswith("_") or key == "survey_mapping":
+                continue
+            if isinstance(value, list):
+                for rule in value:
+                    if not isinstance(rule, dict) or not rule.get("code"):
+                        continue
+                    if key in RED_FLAG_GROUPS or rule.get("severity"):
+                        rules[rule["code"]] = rule
+            elif isinstance(value, dict):
+                rules[key] = value
+
+        for question_id, code in (red_flags.get("survey_mapping") or {}).items():
+            if code in rules:
+                rules.setdefault(question_id, rules[code])
+
+        return rules
+
+    @staticmethod
+    def _rule_message(flag_code: str, rule: Dict[str, Any]) -> str:
+        """룰 → 경고 메시지"""
+        if rule.get("message"):
+            return rule["message"]
+        label = rule.get("label_kr")
+        if label:
+            return label
+        return f"Red Flag: {flag_code}"
+
+    def build_response(
+        self,
+        body_part: BodyPartInput,
+        bp_config: BodyPartConfig,
+        red_flag: RedFlagResult,
+    ) -> BucketInferenceOutput:
+        """Red Flag 감지 시 경고 응답 생성 (가중치 점수만 사용)"""
+        bucket_scores, weight_ranking = self.weight_service.calculate_scores(
+            body_part,
+            bp_config=bp_config,
+        )
+
+        # Red Flag가 있어도 기본 추론 결과는 제공
+        return BucketInferenceOutput(
+            body_part=body_part.code,
+            final_bucket=weight_ranking[0] if weight_ranking else bp_config.bucket_order[0],
+            confidence=0.5,  # Red Flag로 인한 낮은 신뢰도
+            bucket_scores={bs.bucket: bs.score for bs in bucket_scores},
+            weight_ranking=weight_ranking,
+            search_ranking=[],
+            discrepancy=None,
+            evidence_summary="Red Flag 감지로 인해 전문의 상담이 필요합니다.",
+            llm_reasoning=(
+                f"### Red Flag 감지\n\n"
+                f"다음 위험 신호가 감지되었습니다:\n"
+                f"- {', '.join(red_flag.messages)}\n\n"
+                f"**권장 조치**: {red_flag.action}"
+            ),
+            red_flag=red_flag,
+        )
+
+    def log_evidence_in_background(
+        self,
+        evidence_service,
+        query: str,
+        body_part_code: str,
+    ) -> None:
+        """Red Flag 케이스의 근거 검색을 백그라운드로 실행하여 로그만 남김
+
+        응답에는 포함되지 않으며, 실패해도 요청에 영향을 주지 않는다.
+        """
+        def _search() -> None:
+            try:
+                evidence = evidence_service.search(query=query, body_part=body_part_code)
+                ranking = evidence_service.get_search_ranking(evidence)
+                logger.info(
+                    f"[red_flag] {body_part_code} 근거 검색 {len(evidence.results)}건, "
+                    f"검색 순위: {ranking}"
+                )
+            except Exception as e:
+                logger.warning(f"[red_flag] {body_part_code} 백그라운드 근거 검색 실패: {e}")
+
+        _get_background_pool().submit(_search)
@@ -0,0 +1,93 @@
+"""증상×버킷 가중치 행렬
+
+weights.json(증상 → 버킷별 가중치 벡터)을 부위별 밀집 행렬 하나로 컴파일한다.
+(행 = 증상 코드, 열 = bucket_order 순서의 버킷)
+
+- 0 이하 가중치는 점수/기여 증상에 반영하지 않으므로 0으로 고정
+- 가중치 벡터가 bucket_order보다 짧으면 나머지 버킷은 0
+- 증상 집합 N개는 (증상 등장 위치) 희소 행렬 × 가중치 행렬 곱 한 번으로 점수화
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.config import BodyPartConfig
+
+
+class WeightMatrix:
+    """부위별 증상×버킷 가중치 행렬
+
+    사용 예시:
+        matrix = WeightMatrix(BodyPartConfigLoader.load("knee"))
+        scores = matrix.score([["age_gte_50", "stairs_down"], ["trauma"]])
+        scores.shape  # (2, 4) - 열 순서는 matrix.buckets
+    """
+
+    def __init__(self, bp_config: BodyPartConfig):
+        """
+        Args:
+            bp_config: 부위별 설정 (weights, bucket_order 사용)
+        """
+        self.body_part = bp_config.code
+        self.weights = bp_config.weights
+        self.buckets: List[str] = list(bp_config.bucket_order)
+        self.symptoms: List[str] = list(bp_config.weights.keys())
+        self.symptom_index: Dict[str, int] = {s: i for i, s in enumerate(self.symptoms)}
+
+        width = len(self.buckets)
+        self.matrix = np.zeros((len(self.symptoms), width), dtype=np.float64)
+        for row, symptom in enumerate(self.symptoms):
+            vector = bp_config.weights[symptom][:width]
+            self.matrix[row, : len(vector)] = vector
+        np.maximum(self.matrix, 0.0, out=self.matrix)
+        # 행별 양수 가중치 열 (기여 증상 계산용)
+        self.positive_columns: List[Tuple[int, ...]] = [
+            tuple(np.flatnonzero(row).tolist()) for row in self.matrix
+        ]
+
+    def rows_for(self, symptoms: Sequence[str]) -> List[int]:
+        """증상 코드 → 행 번호 (가중치 없는 코드는 제외, 중복은 유지)"""
+        index = self.symptom_index
+        return [index[s] for s in symptoms if s in index]
+
+    def score_one(self, symptoms: Sequence[str]) -> Tuple[List[float], List[List[str]]]:
+        """증상 집합 하나의 버킷별 점수 + 기여 증상
+
+        Returns:
+            (bucket_order 순 점수, 버킷별 기여 증상 - 첫 등장 순, 중복 제거)
+        """
+        rows = self.rows_for(symptoms)
+        scores = self.matrix[rows].sum(axis=0).tolist()
+
+        contributing: List[Dict[str, None]] = [{} for _ in self.buckets]
+        for row in rows:
+            for column in self.positive_columns[row]:
+                contributing[column][self.symptoms[row]] = None
+        return scores, [list(symptoms) for symptoms in contributing]
+
+    def score(self, symptom_sets: Sequence[Sequence[str]]) -> np.ndarray:
+        """증상 집합 N개 일괄 점수화
+
+        Returns:
+            (N, 버킷 수) 점수 행렬 - 열 순서는 self.buckets
+        """
+        positions: List[int] = []
+        rows: List[int] = []
+        index = self.symptom_index
+        for position, symptoms in enumerate(symptom_sets):
+            for symptom in symptoms:
+                row = index.get(symptom)
+                if row is not None:
+                    positions.append(position)
+                    rows.append(row)
+
+        scores = np.zeros((len(symptom_sets), len(self.buckets)), dtype=np.float64)
+        if rows:
+            # 희소(증상 등장) × 밀집(가중치) 곱 = 등장 위치별 가중치 행 누적
+            np.add.at(scores, np.asarray(positions), self.matrix[np.asarray(rows)])
+        return scores
@@ -1,10 +1,12 @@
 """가중치 계산 서비스 (버킷 추론용)
 
 v2.0: BodyPartConfig 통합으로 일관된 설정 관리
+v3.2: 증상×버킷 가중치 행렬 + 일괄 계산 (calculate_scores_batch)
 """
 
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Sequence, Tuple, Optional
 
+import numpy as np
 from langsmith import traceable
 
 import sys
@@ -13,21 +15,34 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.models import BodyPartInput
 from shared.config import BodyPartConfig, BodyPartConfigLoader
+from shared.utils.timing import STAGE_WEIGHT_SCORING, timed
 from bucket_inference.models import BucketScore
 from bucket_inference.config import settings
+from bucket_inference.services.weight_matrix import WeightMatrix
 
 
 class WeightService:
     """가중치 기반 버킷 점수 계산
 
     v2.0: BodyPartConfig를 통해 설정 로드
+    weights.json은 부위별 증상×버킷 행렬(WeightMatrix)로 한 번 컴파일하여
+    단건/일괄 계산이 같은 행렬을 사용한다.
     """
 
     def __init__(self):
-        # 캐시는 BodyPartConfigLoader에서 관리하므로 제거
-        pass
+        # 설정 캐시는 BodyPartConfigLoader에서 관리, 여기서는 컴파일된 행렬만 보관
+        self._matrix_cache: Dict[str, WeightMatrix] = {}
+
+    def get_matrix(self, bp_config: BodyPartConfig) -> WeightMatrix:
+        """부위별 가중치 행렬 (첫 요청 시 컴파일, 설정 객체가 바뀌면 재컴파일)"""
+        matrix = self._matrix_cache.get(bp_config.code)
+        if matrix is None or matrix.weights is not bp_config.weights:
+            matrix = WeightMatrix(bp_config)
+            self._matrix_cache[bp_config.code] = matrix
+        return matrix
 
     @traceable(name="weight_score_calculation")
+    @timed(STAGE_WEIGHT_SCORING)
     def calculate_scores(
         self,
         body_part: BodyPartInput,
@@ -47,38 +62,25 @@ class WeightService:
         if bp_config is None:
             bp_config = BodyPartConfigLoader.load(body_part.code)
 
-        weights = bp_config.weights
-        bucket_order = bp_config.bucket_order
-
-        # 버킷별 점수 초기화
-        scores = {bucket: 0.0 for bucket in bucket_order}
-        contributing = {bucket: [] for bucket in bucket_order}
+        matrix = self.get_matrix(bp_config)
 
-        # 각 증상의 가중치 합산
-        for symptom in body_part.symptoms:
-            if symptom not in weights:
-                continue
-
-            weight_vector = weights[symptom]
-            for i, bucket in enumerate(bucket_order):
-                if i < len(weight_vector) and weight_vector[i] > 0:
-                    scores[bucket] += weight_vector[i]
-                    contributing[bucket].append(symptom)
+        # 각 증상의 가중치 합산 (양수 가중치만)
+        scores, contributing = matrix.score_one(body_part.symptoms)
 
         # 총점 계산
-        total = sum(scores.values())
+        total = sum(scores)
         if total == 0:
             total = 1  # 0 나눗셈 방지
 
         # BucketScore 리스트 생성
         bucket_scores = []
-        for bucket in bucket_order:
+        for bucket, score, symptoms in zip(matrix.buckets, scores, contributing):
             bucket_scores.append(
                 BucketScore(
                     bucket=bucket,
-                    score=round(scores[bucket], 2),
-                    percentage=round((scores[bucket] / total) * 100, 1),
-                    contributing_symptoms=list(set(contributing[bucket])),
+                    score=round(score, 2),
+                    percentage=round((score / total) * 100, 1),
+                    contributing_symptoms=symptoms,
                 )
             )
 
@@ -90,6 +92,47 @@ class WeightService:
 
         return bucket_scores, ranking
 
+    @traceable(name="weight_score_batch_calculation")
+    def calculate_scores_batch(
+        self,
+        body_parts: Sequence[BodyPartInput],
+        bp_config: Optional[BodyPartConfig] = None,
+    ) -> List[Dict[str, float]]:
+        """
+        증상 집합 일괄 점수 계산 (과거 설문 재채점, 골든셋 평가용)
+
+        부위별로 묶어 증상×버킷 행렬 곱 한 번으로 계산한다.
+        BucketScore/기여 증상은 만들지 않는다.
+
+        Args:
+            body_parts: 부위별 입력 목록 (부위가 섞여 있어도 됨)
+            bp_config: 부위별 설정 (지정 시 모든 입력에 사용)
+
+        Returns:
+            입력 순서대로 {버킷: 점수} - 점수 내림차순(calculate_scores 순위와 동일)
+        """
+        groups: Dict[str, List[int]] = {}
+        for position, body_part in enumerate(body_parts):
+            code = bp_config.code if bp_config is not None else body_part.code
+            groups.setdefault(code, []).append(position)
+
+        results: List[Optional[Dict[str, float]]] = [None] * len(body_parts)
+        for code, positions in groups.items():
+            config = bp_config or BodyPartConfigLoader.load(code)
+            matrix = self.get_matrix(config)
+
+            scores = np.round(
+                matrix.score([body_parts[p].symptoms for p in positions]), 2
+            )
+            # 점수 내림차순, 동점은 bucket_order 순
+            orders = np.argsort(-scores, axis=1, kind="stable")
+
+            buckets = matrix.buckets
+            for position, row, order in zip(positions, scores.tolist(), orders.tolist()):
+                results[position] = {buckets[j]: row[j] for j in order}
+
+        return results
+
     def get_score_dict(
         self,
         body_part: BodyPartInput,
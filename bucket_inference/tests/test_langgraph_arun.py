@@ -0,0 +1,167 @@
+"""LangGraph 비동기 경로(arun) 테스트
+
+arun()은 부위별 그래프를 동시에 실행한다. 게이트웨이는 실행기 스레드에서 run()을 쓰므로
+(앱 진단 요청은 단일 부위) arun()은 비동기 호출자용 라이브러리 API이며, 여기서만 검증한다.
+- 두 부위(무릎/어깨) 입력의 LLM 호출이 동시에 진행되는지 (동시 호출 수 최대값)
+- 결과 부위/순서와 최종 버킷이 동기 run()과 같은지
+- 기본 비동기 클라이언트가 루프별 하나만 생성되는지 (루프 밖 호출은 오류)
+
+OpenAI는 결정적 가짜 클라이언트(중재 응답에 final_bucket 없음 → 가중치 1순위),
+벡터 스토어는 빈 로컬 스토어를 사용한다.
+
+실행:
+    PYTHONPATH=. python -m pytest bucket_inference/tests/test_langgraph_arun.py -q
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["VECTOR_STORE_BACKEND"] = "local"
+os.environ["VECTOR_STORE_DIR"] = tempfile.mkdtemp(prefix="orthocare-test-")
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+os.environ["ARBITRATION_CACHE_ENABLED"] = "false"
+
+from shared.utils.openai_client import set_openai_clients
+
+
+LLM_DELAY_SECONDS = 0.05
+
+
+def _chat_response(model: str):
+    content = json.dumps({"reasoning": "fake", "confidence": 0.7})
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1),
+    )
+
+
+def _embedding_response(input):
+    texts = [input] if isinstance(input, str) else list(input)
+    data = []
+    for text in texts:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        data.append(SimpleNamespace(embedding=[b / 255 for b in digest]))
+    return SimpleNamespace(data=data, usage=SimpleNamespace(prompt_tokens=1))
+
+
+class _AsyncChat:
+    """동시에 진행 중인 호출 수를 기록하는 비동기 chat completions"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def create(self, messages, model: str = "fake", **_):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(LLM_DELAY_SECONDS)
+            return _chat_response(model)
+        finally:
+            self.in_flight -= 1
+
+
+class _AsyncEmbeddings:
+    async def create(self, input, **_):
+        return _embedding_response(input)
+
+
+class _SyncChat:
+    def create(self, messages, model: str = "fake", **_):
+        return _chat_response(model)
+
+
+class _SyncEmbeddings:
+    def create(self, input, **_):
+        return _embedding_response(input)
+
+
+@pytest.fixture(scope="module")
+def clients():
+    async_chat = _AsyncChat()
+    sync_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=_SyncChat()), embeddings=_SyncEmbeddings(), close=lambda: None
+    )
+
+    async def aclose():
+        pass
+
+    async_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=async_chat), embeddings=_AsyncEmbeddings(), close=aclose
+    )
+    set_openai_clients(sync_client, async_client)
+    yield async_chat
+    set_openai_clients(None)
+
+
+@pytest.fixture(scope="module")
+def pipeline(clients):
+    from bucket_inference.pipeline import LangGraphBucketInferencePipeline
+
+    return LangGraphBucketInferencePipeline()
+
+
+def _two_part_input():
+    from bucket_inference.models import BucketInferenceInput
+
+    return BucketInferenceInput.model_validate(
+        {
+            "demographics": {"age": 62, "sex": "female", "height_cm": 158, "weight_kg": 68},
+            "body_parts": [
+                {"code": "knee", "symptoms": ["pain_medial", "age_gte_60", "bmi_gte_27"], "nrs": 5},
+                {
+                    "code": "shoulder",
+                    "primary": False,
+                    "symptoms": ["pain_anterior", "age_gte_60"],
+                    "nrs": 4,
+                },
+            ],
+        }
+    )
+
+
+def test_arun_runs_body_parts_concurrently(pipeline, clients):
+    input_data = _two_part_input()
+
+    results = asyncio.run(pipeline.arun(input_data))
+
+    assert list(results) == ["knee", "shoulder"]
+    assert clients.calls >= 2
+    assert clients.max_in_flight >= 2
+
+    sync_results = pipeline.run(input_data)
+    assert list(sync_results) == list(results)
+    for code, output in results.items():
+        assert output.final_bucket == sync_results[code].final_bucket
+        assert output.weight_ranking == sync_results[code].weight_ranking
+
+
+def test_default_async_client_is_per_loop_singleton():
+    """기본 비동기 클라이언트: 루프 밖 호출은 오류, 같은 루프에서는 같은 인스턴스"""
+    from shared.utils import openai_client
+
+    with pytest.raises(RuntimeError):
+        openai_client._loop_async_client()
+
+    async def fetch_twice():
+        first = openai_client._loop_async_client()
+        second = openai_client._loop_async_client()
+        await openai_client.aclose_openai_clients()
+        return first, second
+
+    first, second = asyncio.run(fetch_twice())
+    assert first is second
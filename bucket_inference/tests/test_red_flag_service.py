@@ -0,0 +1,71 @@
+"""RedFlagService 룰 조회 테스트
+
+red_flags.json(무릎/어깨) 실제 파일 기준으로 조기 종료 여부를 확인한다.
+- 즉시 의뢰 그룹 코드 / 설문 문항 ID → Red Flag (조기 종료)
+- 무릎 additional_evaluation(추가 평가 권고) → 일반 추론 진행
+- 알 수 없는 코드 → 무시
+
+실행:
+    PYTHONPATH=. python -m pytest bucket_inference/tests/test_red_flag_service.py -q
+"""
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.config import BodyPartConfigLoader
+from shared.models import BodyPartInput
+from bucket_inference.services.red_flag_service import RedFlagService
+
+
+@pytest.fixture(scope="module")
+def service() -> RedFlagService:
+    return RedFlagService()
+
+
+def _check(service: RedFlagService, body_part: str, flags):
+    body_part_input = BodyPartInput(code=body_part, nrs=6, red_flags_checked=list(flags))
+    return service.check(body_part_input, BodyPartConfigLoader.load(body_part))
+
+
+@pytest.mark.parametrize(
+    "body_part, flag, message",
+    [
+        ("knee", "severe_hot_swelling", "심한 열감 + 부종"),
+        ("knee", "Q_red_flag_walk", None),
+        ("shoulder", "weakness_numbness", None),
+    ],
+)
+def test_immediate_referral_flag_fires(service, body_part, flag, message):
+    result = _check(service, body_part, [flag])
+
+    assert result is not None
+    assert result.triggered
+    assert result.flags == [flag]
+    if message:
+        assert result.messages == [message]
+
+
+def test_knee_additional_evaluation_does_not_short_circuit(service):
+    assert _check(service, "knee", ["bilateral_with_hand_involvement"]) is None
+    assert _check(service, "knee", ["morning_stiffness_over_1hour"]) is None
+
+
+def test_additional_evaluation_ignored_alongside_real_flag(service):
+    result = _check(service, "knee", ["morning_stiffness_over_1hour", "unable_to_walk"])
+
+    assert result is not None
+    assert result.flags == ["unable_to_walk"]
+
+
+@pytest.mark.parametrize("body_part", ["knee", "shoulder"])
+def test_unknown_code_ignored(service, body_part):
+    assert _check(service, body_part, ["not_a_red_flag"]) is None
+    assert _check(service, body_part, ["_metadata", "survey_mapping", "warning_message"]) is None
+
+
+@pytest.mark.parametrize("body_part", ["knee", "shoulder"])
+def test_no_flags_checked(service, body_part):
+    assert _check(service, body_part, []) is None
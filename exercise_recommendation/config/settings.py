@@ -4,11 +4,14 @@
 - OPENAI_API_KEY: OpenAI API 키
 - PINECONE_API_KEY: Pinecone API 키
 - PINECONE_INDEX: Pinecone 인덱스명 (기본값: orthocare-exercise)
+- RECOMMENDATION_MODE: 운동 선택 방식 (llm/deterministic/hybrid, 기본값: llm, 요청별 recommendation_mode가 우선)
+- ROUTINE_CACHE_ENABLED: 사용자 상태별 루틴 캐시 사용 여부 (기본값: false)
+- ROUTINE_CACHE_BACKEND: memory / sqlite / redis (기본값: sqlite - 사전 계산 작업과 공유)
 """
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -56,6 +59,37 @@ class ExerciseRecommendationSettings(BaseSettings):
     # 운동 추천 설정
     min_exercises: int = Field(default=4, description="최소 운동 수")
     max_exercises: int = Field(default=8, description="최대 운동 수")
+    recommendation_mode: Literal["llm", "deterministic", "hybrid"] = Field(
+        default="llm",
+        description="운동 선택 방식 (llm: LLM 선택, deterministic: 규칙 기반, hybrid: 규칙 기반 선택 + LLM 이유)"
+    )
+    max_same_pattern: int = Field(
+        default=2,
+        description="규칙 기반 선택 시 같은 움직임 패턴 최대 운동 수 (후보 부족 시 완화)"
+    )
+
+    # 루틴 캐시 (사용자 상태가 같으면 이전/사전 계산 루틴 재사용)
+    routine_cache_enabled: bool = Field(
+        default=False,
+        description="루틴 캐시 사용 여부"
+    )
+    routine_cache_backend: str = Field(
+        default="sqlite",
+        description="루틴 캐시 백엔드 (memory / sqlite / redis)"
+    )
+    routine_cache_ttl: int = Field(
+        default=129600,
+        description="루틴 캐시 TTL (초, 기본 36시간 - 전날 사전 계산분이 다음 날 하루 동안 유효)"
+    )
+    routine_cache_max_items: int = Field(default=100000, description="루틴 캐시 최대 항목 수")
+    routine_cache_path: Optional[Path] = Field(
+        default=None,
+        description="SQLite 캐시 파일 경로 (없으면 .cache/responses/routines.sqlite3)"
+    )
+    routine_cache_redis_url: str = Field(
+        default="redis://localhost:6379/0",
+        description="Redis 캐시 URL"
+    )
 
     # 데이터 경로
     data_dir: Path = Field(
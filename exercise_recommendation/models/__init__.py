@@ -4,6 +4,7 @@ from .input import (
     ExerciseRecommendationInput,
     PostAssessmentResult,
     JointStatus,
+    RecommendationMode,
 )
 from .output import (
     ExerciseRecommendationOutput,
@@ -16,6 +17,7 @@ __all__ = [
     "ExerciseRecommendationInput",
     "PostAssessmentResult",
     "JointStatus",
+    "RecommendationMode",
     "ExerciseRecommendationOutput",
     "RecommendedExercise",
     "ExcludedExercise",
@@ -14,6 +14,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.models import Demographics, PhysicalScore
 
 
+# 운동 선택 방식
+# - llm: LLM이 후보 중 운동 선택 + 이유 작성
+# - deterministic: 규칙 기반 선택 + 템플릿 이유 (LLM 호출 없음)
+# - hybrid: 규칙 기반 선택, LLM은 이유/요약 문장만 작성
+RecommendationMode = Literal["llm", "deterministic", "hybrid"]
+
+
 class JointStatus(BaseModel):
     """관절 상태 정보 (v2.0 개인화용)
 
@@ -185,6 +192,12 @@ class ExerciseRecommendationInput(BaseModel):
         description="자주 건너뛴 운동 ID"
     )
 
+    # === 선택 방식 (Optional) ===
+    recommendation_mode: Optional[RecommendationMode] = Field(
+        default=None,
+        description="운동 선택 방식 (llm/deterministic/hybrid, 없으면 RECOMMENDATION_MODE 설정)"
+    )
+
     @property
     def is_first_session(self) -> bool:
         """최초 운동 여부"""
@@ -36,9 +36,15 @@ class ExcludedExercise(BaseModel):
     exercise_id: str = Field(..., description="운동 ID")
     name_kr: str = Field(..., description="한글명")
     reason: str = Field(..., description="제외 사유")
-    exclusion_type: Literal["contraindication", "difficulty", "nrs", "assessment"] = Field(
-        ..., description="제외 유형"
-    )
+    exclusion_type: Literal[
+        "contraindication",
+        "difficulty",
+        "nrs",
+        "assessment",
+        "joint_load",
+        "kinetic_chain",
+        "rom",
+    ] = Field(..., description="제외 유형")
 
 
 class ExerciseRecommendationOutput(BaseModel):
@@ -79,6 +85,12 @@ class ExerciseRecommendationOutput(BaseModel):
 
     # === LLM 추론 ===
     llm_reasoning: str = Field(..., description="LLM 추천 근거")
+    recommendation_mode: Literal["llm", "deterministic", "hybrid"] = Field(
+        default="llm", description="운동 선택 방식"
+    )
+    llm_fallback: bool = Field(
+        default=False, description="LLM 실패로 규칙 기반 선택/템플릿 이유로 대체했는지 여부"
+    )
 
     # 메타데이터
     recommended_at: datetime = Field(
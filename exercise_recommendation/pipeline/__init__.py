@@ -1,5 +1,6 @@
 """Exercise Recommendation Pipeline"""
 
-from .recommendation_pipeline import ExerciseRecommendationPipeline
+from .recommendation_pipeline import ExerciseRecommendationPipeline, PreparedCandidates
+from .batch_runner import BatchRecommendationRunner
 
-__all__ = ["ExerciseRecommendationPipeline"]
+__all__ = ["ExerciseRecommendationPipeline", "PreparedCandidates", "BatchRecommendationRunner"]
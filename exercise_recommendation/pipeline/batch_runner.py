@@ -0,0 +1,212 @@
+"""운동 추천 배치 실행기 (OpenAI Batch API)
+
+골든셋 회귀/과거 요청 재추천처럼 즉시 응답이 필요 없는 경우,
+LLM 운동 선택을 Batch API로 일괄 처리한다 (비용 50%, 완료까지 최대 24시간).
+
+1. 준비: 줄마다 prepare()(사후 설문 → 필터링 → 개인화) 후 LLM 요청 본문 기록
+2. 제출: OpenAIBatchRunner로 업로드 → 완료까지 폴링 → custom_id(줄 번호)별 결과 적재
+3. 조립: 입력을 다시 prepare()하고 배치 응답으로 complete() 실행
+   (prepare는 LLM 없이 결정적이므로 후보를 따로 저장하지 않는다)
+
+입력 줄 형식 (둘 중 하나):
+    {"user_id": "...", "body_part": "knee", "bucket": "OA", ...}          # ExerciseRecommendationInput
+    {"id": "req-123", "input": {"user_id": "...", ...}}                   # ID 포함
+
+출력 줄 형식:
+    {"line": 1, "id": "req-123", "status": "ok", "result": {...}}
+    {"line": 2, "id": null, "status": "error", "error": "ValidationError: ..."}
+
+Batch API 요청 오류는 동기 경로의 LLM 실패와 같이 규칙 기반 선택으로 대체된다.
+recommendation_mode가 deterministic인 줄은 배치에 넣지 않고, hybrid인 줄은
+선택된 운동의 이유 작성 요청만 배치로 보낸다.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.utils.openai_batch import BatchResultStore, OpenAIBatchRunner, batch_request_line
+from exercise_recommendation.models.input import ExerciseRecommendationInput
+
+
+class BatchRecommendationRunner:
+    """JSONL 운동 추천 (LLM 선택은 Batch API)
+
+    사용 예시:
+        runner = BatchRecommendationRunner(ExerciseRecommendationPipeline())
+        summary = runner.run_llm_batch("golden.jsonl", "golden.results.jsonl", "golden.batch")
+    """
+
+    def __init__(self, pipeline, include_excluded: bool = False):
+        """
+        Args:
+            pipeline: ExerciseRecommendationPipeline
+            include_excluded: 결과에 제외 운동 목록 포함 여부
+        """
+        self.pipeline = pipeline
+        self.include_excluded = include_excluded
+
+    @staticmethod
+    def _iter_inputs(
+        input_path: Path, limit: Optional[int]
+    ) -> Iterator[Tuple[int, Optional[str], Any]]:
+        """(줄 번호, ID, ExerciseRecommendationInput 또는 파싱 예외) 스트리밍"""
+        count = 0
+        with open(input_path, "r", encoding="utf-8") as f:
+            for line_no, raw in enumerate(f, start=1):
+                raw = raw.strip()
+                if not raw:
+                    continue
+                if limit is not None and count >= limit:
+                    return
+                count += 1
+                record_id = None
+                try:
+                    data = json.loads(raw)
+                    if isinstance(data, dict) and "input" in data:
+                        record_id = data.get("id")
+                        data = data["input"]
+                    yield line_no, record_id, ExerciseRecommendationInput.model_validate(data)
+                except Exception as e:
+                    yield line_no, record_id, e
+
+    def run_llm_batch(
+        self,
+        input_path,
+        output_path,
+        work_dir,
+        batch_runner: Optional[OpenAIBatchRunner] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        준비 → Batch API 제출/폴링 → 조립
+
+        work_dir에 요청 파일/배치 상태/결과가 남으므로, 중단 후 같은 work_dir로
+        다시 실행하면 준비/제출을 반복하지 않는다.
+
+        Args:
+            input_path: 입력 JSONL
+            output_path: 출력 JSONL
+            work_dir: 요청/배치 상태/결과 저장 디렉토리
+            batch_runner: Batch API 실행기 (없으면 기본 설정)
+            limit: 처리할 최대 줄 수
+
+        Returns:
+            실행 요약 (요청 건수, 성공/오류 건수)
+        """
+        input_path = Path(input_path)
+        output_path = Path(output_path)
+        work_dir = Path(work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+
+        prepared = self._prepare_batch(input_path, work_dir, limit)
+        store = None
+        if prepared["requests"]:
+            store = (batch_runner or OpenAIBatchRunner()).run(
+                work_dir / "requests.jsonl",
+                work_dir,
+                metadata={"source": input_path.name},
+            )
+
+        ok = errors = 0
+        try:
+            with open(output_path, "wb") as out:
+                for line_no, record_id, input_data in self._iter_inputs(input_path, limit):
+                    record = self._assemble(line_no, record_id, input_data, store)
+                    out.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+                    if record["status"] == "ok":
+                        ok += 1
+                    else:
+                        errors += 1
+        finally:
+            if store is not None:
+                store.close()
+
+        return {
+            "input": str(input_path),
+            "output": str(output_path),
+            "work_dir": str(work_dir),
+            "lines": prepared["lines"],
+            "requests": prepared["requests"],
+            "ok": ok,
+            "errors": errors,
+            "elapsed_sec": round(time.perf_counter() - started, 2),
+        }
+
+    def _prepare_batch(self, input_path: Path, work_dir: Path, limit: Optional[int]) -> Dict[str, Any]:
+        """1단계: 줄마다 LLM 요청 기록 (완료 시 prepared.json)"""
+        marker_path = work_dir / "prepared.json"
+        if marker_path.exists():
+            with open(marker_path, "r", encoding="utf-8") as f:
+                marker = json.load(f)
+            if marker.get("input") != str(input_path):
+                raise ValueError(
+                    f"작업 디렉토리가 다른 입력으로 준비되었습니다: {marker.get('input')} "
+                    f"(현재: {input_path})"
+                )
+            return marker
+
+        marker = {"input": str(input_path), "lines": 0, "requests": 0}
+        with open(work_dir / "requests.jsonl", "w", encoding="utf-8") as requests:
+            for line_no, _, input_data in self._iter_inputs(input_path, limit):
+                marker["lines"] += 1
+                if isinstance(input_data, Exception):
+                    continue
+                try:
+                    prepared = self.pipeline.prepare(input_data)
+                    body = self.pipeline.build_batch_request(input_data, prepared)
+                except Exception:
+                    # 조립 단계에서 같은 예외가 다시 발생하여 error 레코드로 기록됨
+                    continue
+                if body is None:
+                    # deterministic 모드: LLM 요청 없음 (조립 단계에서 바로 선택)
+                    continue
+                requests.write(batch_request_line(str(line_no), body) + "\n")
+                marker["requests"] += 1
+
+        tmp_path = marker_path.with_name(marker_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(marker, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(marker_path)
+        return marker
+
+    def _assemble(
+        self,
+        line_no: int,
+        record_id: Optional[str],
+        input_data: Any,
+        store: Optional[BatchResultStore],
+    ) -> Dict[str, Any]:
+        """3단계: 재준비 + 배치 응답 → 출력 레코드"""
+        record: Dict[str, Any] = {"line": line_no, "id": record_id}
+        try:
+            if isinstance(input_data, Exception):
+                raise input_data
+            prepared = self.pipeline.prepare(input_data)
+            if self.pipeline.recommendation_mode(input_data) == "deterministic":
+                content, error = None, None
+            elif store is None:
+                content, error = None, "결과 없음 (배치 미제출)"
+            else:
+                content, error = store.get(str(line_no))
+            output = self.pipeline.complete(
+                input_data,
+                prepared,
+                include_excluded=self.include_excluded,
+                llm_content=content,
+                llm_error=error,
+            )
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+            return record
+
+        record["status"] = "ok"
+        record["result"] = output.model_dump(mode="json")
+        return record
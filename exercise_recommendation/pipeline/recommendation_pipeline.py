@@ -4,11 +4,22 @@
 1. 사후 설문 처리 (AssessmentHandler)
 2. 버킷 기반 필터링 (ExerciseFilter)
 3. 개인화 조정 (PersonalizationService)
-4. LLM 운동 추천 (ExerciseRecommender)
+4. 운동 선택 - recommendation_mode (요청값 > RECOMMENDATION_MODE 설정)
+   - llm: LLM 운동 추천 (ExerciseRecommender, 실패 시 규칙 기반 선택)
+   - deterministic: 규칙 기반 선택 (DeterministicExerciseSelector, LLM 호출 없음)
+   - hybrid: 규칙 기반 선택 + LLM 이유/요약 작성 (실패 시 템플릿 이유)
 5. 최종 세트 구성
+
+ROUTINE_CACHE_ENABLED=true면 run()은 먼저 사용자 상태 digest로 루틴 캐시를 조회하고
+(RoutineCache), 미스일 때만 1~5단계를 실행해 결과를 저장한다.
+
+1~3단계(prepare)는 신체 점수에 허용 난이도로만 의존하므로, 신체 점수를
+LLM으로 추정하는 동안 레벨별 후보를 미리 준비(prepare_for_levels)하고
+점수가 나오면 해당 후보로 4~5단계(complete)만 실행할 수 있다.
 """
 
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from datetime import datetime
 
 from langsmith import traceable
@@ -18,20 +29,53 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.models import PhysicalScore
-from exercise_recommendation.models.input import ExerciseRecommendationInput
+from shared.utils import get_logger
+from shared.utils.progress import EVENT_EXERCISE, EVENT_REASONING, emit, listening
+from shared.utils.timing import (
+    STAGE_EXERCISE_FILTER,
+    STAGE_EXERCISE_SELECTION,
+    STAGE_LLM_RECOMMENDATION,
+    STAGE_PERSONALIZATION,
+    STAGE_ROUTINE_CACHE,
+    span,
+)
+from exercise_recommendation.models.input import ExerciseRecommendationInput, RecommendationMode
 from exercise_recommendation.models.output import (
     ExerciseRecommendationOutput,
+    ExcludedExercise,
     RecommendedExercise,
 )
+from exercise_recommendation.models.assessment import AssessmentProcessResult
 from exercise_recommendation.services import (
     AssessmentHandler,
     ExerciseFilter,
     PersonalizationService,
     ExerciseRecommender,
+    DeterministicExerciseSelector,
+)
+from exercise_recommendation.services.routine_cache import (
+    RoutineCache,
+    get_routine_cache,
+    routine_state,
 )
 from exercise_recommendation.config import settings
 
 
+logger = get_logger(__name__)
+
+# 레벨별 대표 점수 (PhysicalScore.level 경계 내 값)
+LEVEL_REPRESENTATIVE_SCORES: Dict[str, int] = {"A": 100, "B": 75, "C": 50, "D": 25}
+
+
+@dataclass
+class PreparedCandidates:
+    """1~3단계 결과 (사후 설문 처리 → 필터링 → 개인화/정렬)"""
+
+    assessment_result: AssessmentProcessResult
+    ordered: List[Dict] = field(default_factory=list)
+    excluded: Sequence[ExcludedExercise] = field(default_factory=list)  # 접근 시 생성
+
+
 class ExerciseRecommendationPipeline:
     """운동 추천 파이프라인
 
@@ -40,72 +84,236 @@ class ExerciseRecommendationPipeline:
         result = pipeline.run(input_data)
     """
 
-    def __init__(self):
+    def __init__(self, routine_cache: Optional[RoutineCache] = None):
+        """
+        Args:
+            routine_cache: 루틴 캐시 (없으면 설정 기반 공유 캐시, 비활성화 시 None)
+        """
         self.assessment_handler = AssessmentHandler()
         self.exercise_filter = ExerciseFilter()
         self.personalization = PersonalizationService()
         self.recommender = ExerciseRecommender()
+        self.selector = DeterministicExerciseSelector()
+        self.routine_cache = routine_cache or get_routine_cache()
 
     @traceable(name="exercise_recommendation_pipeline")
-    def run(self, input_data: ExerciseRecommendationInput) -> ExerciseRecommendationOutput:
+    def run(
+        self,
+        input_data: ExerciseRecommendationInput,
+        include_excluded: bool = True,
+        refresh: bool = False,
+        prepared: Optional[PreparedCandidates] = None,
+    ) -> ExerciseRecommendationOutput:
         """
         운동 추천 실행
 
         Args:
             input_data: 운동 추천 입력
+            include_excluded: 제외 운동 목록 포함 여부 (False면 제외 사유 생성 생략)
+            refresh: 루틴 캐시를 조회하지 않고 다시 계산해 덮어씀 (사전 계산 작업용)
+            prepared: 미리 계산한 1~3단계 결과 (prepare_for_levels()에서 확정 레벨 선택,
+                input_data의 신체 점수 레벨과 일치해야 함, 없으면 prepare() 실행)
 
         Returns:
             ExerciseRecommendationOutput
         """
-        # Step 1: 사후 설문 처리
-        assessment_result = self.assessment_handler.process(
-            previous_assessments=input_data.previous_assessments,
-            last_assessment_date=input_data.last_assessment_date,
+        if self.routine_cache is None:
+            return self.complete(
+                input_data, prepared or self.prepare(input_data), include_excluded=include_excluded
+            )
+
+        # 사후 설문 조정값이 digest에 들어가므로 1단계는 먼저 실행 (LLM 없음)
+        if prepared is not None:
+            assessment_result = prepared.assessment_result
+        else:
+            assessment_result = self._process_assessment(input_data)
+        digest = self.routine_digest(input_data, assessment_result, include_excluded)
+        if not refresh:
+            with span(STAGE_ROUTINE_CACHE):
+                cached = self.routine_cache.get(input_data, digest)
+            if cached is not None:
+                self._emit_cached(cached)
+                return cached
+
+        if prepared is None:
+            prepared = self.prepare(input_data, assessment_result=assessment_result)
+        output = self.complete(input_data, prepared, include_excluded=include_excluded)
+        if not output.llm_fallback:
+            # LLM 실패로 대체된 루틴은 저장하지 않음 (다음 요청에서 다시 시도)
+            self.routine_cache.put(input_data, digest, output)
+        return output
+
+    @staticmethod
+    def _emit_cached(output: ExerciseRecommendationOutput) -> None:
+        """캐시된 루틴을 스트리밍 이벤트로 전달 (계산 경로와 같은 exercise → llm_reasoning 순서)"""
+        if not listening():
+            return
+        for exercise in output.exercises:
+            emit(EVENT_EXERCISE, {"exercise": exercise.model_dump(mode="json")})
+        if output.llm_reasoning:
+            emit(EVENT_REASONING, {"delta": output.llm_reasoning})
+
+    def routine_digest(
+        self,
+        input_data: ExerciseRecommendationInput,
+        assessment_result: AssessmentProcessResult,
+        include_excluded: bool,
+    ) -> str:
+        """루틴 캐시 상태 digest"""
+        return RoutineCache.digest(
+            routine_state(
+                input_data,
+                assessment_result.adjustments,
+                self.recommendation_mode(input_data),
+                include_excluded,
+            )
         )
 
+    @traceable(name="exercise_recommendation_prepare")
+    def prepare(
+        self,
+        input_data: ExerciseRecommendationInput,
+        assessment_result: Optional[AssessmentProcessResult] = None,
+    ) -> PreparedCandidates:
+        """
+        1~3단계: 사후 설문 처리, 버킷 필터링, 개인화/정렬 (LLM 호출 없음)
+
+        Args:
+            input_data: 운동 추천 입력
+            assessment_result: 사후 설문 처리 결과 (없으면 계산)
+
+        Returns:
+            PreparedCandidates
+        """
+        # Step 1: 사후 설문 처리
+        if assessment_result is None:
+            assessment_result = self._process_assessment(input_data)
+
         # Step 2: 버킷 기반 필터링 (v2.0: joint_status 추가)
-        candidates, excluded = self.exercise_filter.filter_for_bucket(
-            body_part=input_data.body_part,
-            bucket=input_data.bucket,
-            physical_score=input_data.physical_score,
-            nrs=input_data.nrs,
-            adjustments=assessment_result.adjustments,
-            joint_status=input_data.joint_status,
-        )
+        with span(STAGE_EXERCISE_FILTER):
+            candidates, excluded = self.exercise_filter.filter_for_bucket(
+                body_part=input_data.body_part,
+                bucket=input_data.bucket,
+                physical_score=input_data.physical_score,
+                nrs=input_data.nrs,
+                adjustments=assessment_result.adjustments,
+                joint_status=input_data.joint_status,
+            )
 
-        # 조정 적용
-        if assessment_result.adjustments:
-            candidates = [
-                self.exercise_filter.apply_adjustments(ex, assessment_result.adjustments)
-                for ex in candidates
-            ]
+            # 조정 적용
+            if assessment_result.adjustments:
+                candidates = [
+                    self.exercise_filter.apply_adjustments(ex, assessment_result.adjustments)
+                    for ex in candidates
+                ]
 
         # Step 3: 개인화 조정 (v2.0: joint_status 추가)
-        personalized = self.personalization.apply(
-            exercises=candidates,
-            demographics=input_data.demographics,
-            nrs=input_data.nrs,
-            skipped_exercises=input_data.skipped_exercises,
-            joint_status=input_data.joint_status,
+        with span(STAGE_PERSONALIZATION):
+            personalized = self.personalization.apply(
+                exercises=candidates,
+                demographics=input_data.demographics,
+                nrs=input_data.nrs,
+                skipped_exercises=input_data.skipped_exercises,
+                joint_status=input_data.joint_status,
+            )
+
+            # 운동 순서 결정
+            ordered = self.personalization.get_exercise_order(personalized)
+
+        return PreparedCandidates(
+            assessment_result=assessment_result,
+            ordered=ordered,
+            excluded=excluded,
         )
 
-        # 운동 순서 결정
-        ordered = self.personalization.get_exercise_order(personalized)
+    def prepare_for_levels(
+        self,
+        input_data: ExerciseRecommendationInput,
+        levels: Iterable[str] = ("A", "B", "C", "D"),
+    ) -> Dict[str, PreparedCandidates]:
+        """
+        신체 점수 레벨별 1~3단계 결과 미리 계산 (점수 추정과 병행용)
+
+        필터링은 신체 점수를 허용 난이도로만 사용하므로, 허용 난이도가 같은
+        레벨(NRS/사후 설문 제한 적용 후)은 결과를 공유한다.
 
-        # Step 4: LLM 운동 추천
-        try:
-            recommendations, llm_reasoning = self.recommender.recommend(
-                candidates=ordered,
-                user_input=input_data,
-                adjustments=assessment_result.adjustments,
+        Args:
+            input_data: 운동 추천 입력 (physical_score는 무시)
+            levels: 준비할 레벨 목록
+
+        Returns:
+            {레벨: PreparedCandidates}
+        """
+        assessment_result = self._process_assessment(input_data)
+        prepared_by_difficulties: Dict[Tuple[str, ...], PreparedCandidates] = {}
+        prepared: Dict[str, PreparedCandidates] = {}
+
+        for level in levels:
+            level_input = input_data.model_copy(
+                update={
+                    "physical_score": PhysicalScore(
+                        total_score=LEVEL_REPRESENTATIVE_SCORES[level]
+                    )
+                }
+            )
+            difficulties = tuple(
+                self.exercise_filter.allowed_difficulties(
+                    level_input.physical_score,
+                    level_input.nrs,
+                    assessment_result.adjustments,
+                )
+            )
+            if difficulties not in prepared_by_difficulties:
+                prepared_by_difficulties[difficulties] = self.prepare(
+                    level_input, assessment_result=assessment_result
+                )
+            prepared[level] = prepared_by_difficulties[difficulties]
+
+        return prepared
+
+    def _process_assessment(self, input_data: ExerciseRecommendationInput) -> AssessmentProcessResult:
+        """사후 설문 처리"""
+        return self.assessment_handler.process(
+            previous_assessments=input_data.previous_assessments,
+            last_assessment_date=input_data.last_assessment_date,
+        )
+
+    @traceable(name="exercise_recommendation_complete")
+    def complete(
+        self,
+        input_data: ExerciseRecommendationInput,
+        prepared: PreparedCandidates,
+        include_excluded: bool = True,
+        llm_content: Optional[str] = None,
+        llm_error: Optional[str] = None,
+    ) -> ExerciseRecommendationOutput:
+        """
+        4~5단계: 운동 선택 및 최종 세트 구성
+
+        Args:
+            input_data: 운동 추천 입력 (최종 신체 점수 포함)
+            prepared: prepare() 결과 (input_data의 신체 점수 레벨과 일치해야 함)
+            include_excluded: 제외 운동 목록 포함 여부 (False면 제외 사유 생성 생략)
+            llm_content: Batch API 응답 본문 (있으면 LLM 호출 생략, hybrid는 이유 응답)
+            llm_error: Batch API 요청 오류 (있으면 LLM 실패와 동일하게 처리)
+
+        Returns:
+            ExerciseRecommendationOutput
+        """
+        assessment_result = prepared.assessment_result
+        ordered = prepared.ordered
+        excluded = list(prepared.excluded) if include_excluded else []
+        mode = self.recommendation_mode(input_data)
+
+        # Step 4: 운동 선택
+        if mode == "llm":
+            recommendations, llm_reasoning, llm_fallback = self._recommend_llm(
+                input_data, prepared, llm_content, llm_error
             )
-        except Exception as e:
-            # LLM 실패 시 간단 추천
-            recommendations = self.recommender.simple_recommend(
-                candidates=ordered,
-                physical_level=input_data.physical_score.level,
+        else:
+            recommendations, llm_reasoning, llm_fallback = self._recommend_deterministic(
+                input_data, prepared, mode, llm_content, llm_error
             )
-            llm_reasoning = f"LLM 없이 자동 추천 (오류: {str(e)})"
 
         # Step 5: 최종 세트 구성
         routine_order = [r.exercise_id for r in recommendations]
@@ -134,9 +342,101 @@ class ExerciseRecommendationPipeline:
             assessment_status=assessment_result.status,
             assessment_message=assessment_result.message,
             llm_reasoning=llm_reasoning,
+            recommendation_mode=mode,
+            llm_fallback=llm_fallback,
             recommended_at=datetime.utcnow(),
         )
 
+    @staticmethod
+    def recommendation_mode(input_data: ExerciseRecommendationInput) -> RecommendationMode:
+        """요청의 운동 선택 방식 (요청값 > RECOMMENDATION_MODE 설정)"""
+        return input_data.recommendation_mode or settings.recommendation_mode
+
+    def build_batch_request(
+        self,
+        input_data: ExerciseRecommendationInput,
+        prepared: PreparedCandidates,
+    ) -> Optional[Dict[str, Any]]:
+        """Batch API 요청 본문 (deterministic 모드는 LLM 요청이 없으므로 None)"""
+        mode = self.recommendation_mode(input_data)
+        adjustments = prepared.assessment_result.adjustments
+        if mode == "deterministic":
+            return None
+        if mode == "hybrid":
+            recommendations, _ = self.selector.select(prepared.ordered, input_data, adjustments)
+            return self.recommender.build_reasons_batch_request(recommendations, input_data, adjustments)
+        return self.recommender.build_batch_request(prepared.ordered, input_data, adjustments)
+
+    def _recommend_llm(
+        self,
+        input_data: ExerciseRecommendationInput,
+        prepared: PreparedCandidates,
+        llm_content: Optional[str],
+        llm_error: Optional[str],
+    ) -> Tuple[List[RecommendedExercise], str, bool]:
+        """LLM 운동 추천 (실패 시 규칙 기반 선택) → (추천, 근거, 대체 여부)"""
+        with span(STAGE_LLM_RECOMMENDATION):
+            try:
+                if llm_error is not None:
+                    raise RuntimeError(llm_error)
+                recommendations, llm_reasoning = self.recommender.recommend(
+                    candidates=prepared.ordered,
+                    user_input=input_data,
+                    adjustments=prepared.assessment_result.adjustments,
+                    llm_content=llm_content,
+                )
+                return recommendations, llm_reasoning, False
+            except Exception as e:
+                error = e
+
+        # LLM 실패 시 규칙 기반 선택
+        recommendations, _ = self._select(input_data, prepared)
+        return recommendations, f"LLM 없이 자동 추천 (오류: {str(error)})", True
+
+    def _recommend_deterministic(
+        self,
+        input_data: ExerciseRecommendationInput,
+        prepared: PreparedCandidates,
+        mode: RecommendationMode,
+        llm_content: Optional[str],
+        llm_error: Optional[str],
+    ) -> Tuple[List[RecommendedExercise], str, bool]:
+        """규칙 기반 선택 (hybrid면 이유/요약만 LLM, 실패 시 템플릿 유지) → (추천, 근거, 대체 여부)"""
+        recommendations, reasoning = self._select(input_data, prepared)
+        if listening():
+            for rec in recommendations:
+                emit(EVENT_EXERCISE, {"exercise": rec.model_dump(mode="json")})
+
+        if mode == "hybrid":
+            with span(STAGE_LLM_RECOMMENDATION):
+                try:
+                    if llm_error is not None:
+                        raise RuntimeError(llm_error)
+                    # 스트리밍 중이면 LLM 근거 토큰이 llm_reasoning 이벤트로 전달됨
+                    recommendations, reasoning = self.recommender.explain(
+                        recommendations,
+                        input_data,
+                        prepared.assessment_result.adjustments,
+                        llm_content=llm_content,
+                    )
+                    return recommendations, reasoning, False
+                except Exception as e:
+                    logger.warning(f"LLM 추천 이유 생성 실패, 템플릿 이유 사용: {e}")
+
+        emit(EVENT_REASONING, {"delta": reasoning})
+        return recommendations, reasoning, mode == "hybrid"
+
+    def _select(
+        self,
+        input_data: ExerciseRecommendationInput,
+        prepared: PreparedCandidates,
+    ) -> Tuple[List[RecommendedExercise], str]:
+        """규칙 기반 운동 선택"""
+        with span(STAGE_EXERCISE_SELECTION):
+            return self.selector.select(
+                prepared.ordered, input_data, prepared.assessment_result.adjustments
+            )
+
     def _estimate_duration(self, recommendations: list) -> int:
         """예상 소요 시간 계산 (분)"""
         total_seconds = 0
@@ -172,7 +472,8 @@ class ExerciseRecommendationPipeline:
         if not recommendations:
             return "medium"
 
-        difficulties = [r.difficulty for r in recommendations]
+        # v2.0 난이도(beginner/standard/...) → low/medium/high
+        difficulties = [self.exercise_filter._map_difficulty(r.difficulty) for r in recommendations]
         unique = set(difficulties)
 
         if len(unique) == 1:
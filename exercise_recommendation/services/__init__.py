@@ -5,6 +5,7 @@ from .exercise_filter import ExerciseFilter
 from .personalization import PersonalizationService
 from .exercise_search import ExerciseSearchService
 from .recommender import ExerciseRecommender
+from .deterministic_selector import DeterministicExerciseSelector
 
 __all__ = [
     "AssessmentHandler",
@@ -12,4 +13,5 @@ __all__ = [
     "PersonalizationService",
     "ExerciseSearchService",
     "ExerciseRecommender",
+    "DeterministicExerciseSelector",
 ]
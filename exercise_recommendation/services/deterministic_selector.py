@@ -0,0 +1,271 @@
+"""규칙 기반 운동 선택 서비스
+
+개인화(PersonalizationService) 결과만으로 LLM 없이 운동 세트를 구성한다.
+
+선택 규칙:
+1. 운동 수: 신체 레벨별 기본 수(A 7 / B 6 / C 5 / D 4)를 min_exercises~max_exercises로 제한
+2. 카테고리 균형: warmup/main/cooldown 카테고리마다 개인화 점수 1순위를 먼저 배정
+3. 패턴 다양성: 같은 movement_pattern은 max_same_pattern개까지
+   (후보가 부족하거나 카테고리를 채울 후보가 없으면 완화)
+4. 나머지는 개인화 점수(boost - penalty) 순, 동점은 운동 순서 유지
+5. 최종 순서는 get_exercise_order() 순서 (준비 → 본 운동 → 마무리, 쉬운 운동 먼저)
+
+추천 이유와 요약은 기능 태그·근육·환자 프로필로 템플릿 생성한다
+(hybrid 모드에서는 ExerciseRecommender.explain()이 LLM 문장으로 교체).
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from langsmith import traceable
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from exercise_recommendation.models.input import ExerciseRecommendationInput
+from exercise_recommendation.models.output import RecommendedExercise
+from exercise_recommendation.models.assessment import DifficultyAdjustment
+from exercise_recommendation.services.personalization import (
+    EXERCISE_CATEGORIES,
+    exercise_categories,
+)
+from exercise_recommendation.config import settings
+
+
+# 신체 레벨별 기본 운동 수
+LEVEL_EXERCISE_COUNTS: Dict[str, int] = {"A": 7, "B": 6, "C": 5, "D": 4}
+
+CATEGORY_LABELS: Dict[str, str] = {"warmup": "준비", "main": "본 운동", "cooldown": "마무리"}
+
+FUNCTION_LABELS: Dict[str, str] = {
+    "Mobility": "가동성",
+    "Stretching": "유연성",
+    "Flexibility": "유연성",
+    "Strengthening": "근력",
+    "Strength": "근력",
+    "Endurance": "지구력",
+    "Stability": "안정성",
+    "Balance": "균형",
+    "Circulation": "순환",
+}
+
+JOINT_LOAD_LABELS: Dict[str, str] = {
+    "very_low": "관절 부하가 매우 낮아",
+    "low": "관절 부하가 낮아",
+    "medium": "관절 부하가 중간 수준이라",
+    "high": "관절 부하가 높아",
+}
+
+BODY_PART_LABELS: Dict[str, str] = {
+    "knee": "무릎",
+    "shoulder": "어깨",
+    "back": "허리",
+    "neck": "목",
+    "ankle": "발목",
+}
+
+
+def _net_score(ex: Dict) -> float:
+    """개인화 우선순위 점수 (boost - penalty)"""
+    return ex.get("_priority_boost", 0.0) - ex.get("_priority_penalty", 0.0)
+
+
+class DeterministicExerciseSelector:
+    """규칙 기반 운동 선택 (LLM 호출 없음)
+
+    사용 예시:
+        selector = DeterministicExerciseSelector()
+        recommendations, reasoning = selector.select(ordered, input_data)
+    """
+
+    def __init__(
+        self,
+        min_exercises: Optional[int] = None,
+        max_exercises: Optional[int] = None,
+        max_same_pattern: Optional[int] = None,
+    ):
+        """
+        Args:
+            min_exercises: 최소 운동 수 (없으면 설정값)
+            max_exercises: 최대 운동 수 (없으면 설정값)
+            max_same_pattern: 같은 움직임 패턴 최대 운동 수 (없으면 설정값)
+        """
+        self.min_exercises = min_exercises or settings.min_exercises
+        self.max_exercises = max_exercises or settings.max_exercises
+        self.max_same_pattern = max_same_pattern or settings.max_same_pattern
+
+    @traceable(name="deterministic_exercise_selection")
+    def select(
+        self,
+        candidates: List[Dict],
+        user_input: ExerciseRecommendationInput,
+        adjustments: Optional[DifficultyAdjustment] = None,
+    ) -> Tuple[List[RecommendedExercise], str]:
+        """
+        운동 선택
+
+        Args:
+            candidates: get_exercise_order()로 정렬된 후보 운동
+            user_input: 사용자 입력
+            adjustments: 난이도 조정 (요약 문장에만 사용)
+
+        Returns:
+            (추천 운동 목록, 템플릿 추천 근거)
+        """
+        chosen = self.choose(candidates, user_input.physical_score.level)
+        recommendations = [
+            self._build_recommendation(ex, user_input, priority, rank)
+            for priority, (ex, rank) in enumerate(chosen, start=1)
+        ]
+        selected = [ex for ex, _ in chosen]
+        return recommendations, self._format_reasoning(selected, candidates, user_input, adjustments)
+
+    def target_count(self, physical_level: str, available: int) -> int:
+        """선택할 운동 수"""
+        count = LEVEL_EXERCISE_COUNTS.get(physical_level, 5)
+        count = max(self.min_exercises, min(self.max_exercises, count))
+        return min(count, available)
+
+    def choose(self, candidates: List[Dict], physical_level: str) -> List[Tuple[Dict, int]]:
+        """후보 중 운동 선택 → [(운동, 개인화 점수 순위)] (반환 순서는 후보 순서)"""
+        target = self.target_count(physical_level, len(candidates))
+        # 개인화 점수 내림차순 (sorted는 안정 정렬이라 동점은 후보 순서 유지)
+        ranked = sorted(range(len(candidates)), key=lambda i: _net_score(candidates[i]), reverse=True)
+        chosen: List[int] = []
+        patterns: Counter = Counter()
+
+        def take(i: int, pattern_limit: Optional[int]) -> bool:
+            if i in chosen or len(chosen) >= target:
+                return False
+            pattern = candidates[i].get("movement_pattern", "기타")
+            if pattern_limit is not None and patterns[pattern] >= pattern_limit:
+                return False
+            chosen.append(i)
+            patterns[pattern] += 1
+            return True
+
+        # 1) 카테고리별 1순위 (패턴 제한 안에 후보가 없으면 제한 없이)
+        for category in EXERCISE_CATEGORIES:
+            members = [i for i in ranked if category in exercise_categories(candidates[i])]
+            for pattern_limit in (self.max_same_pattern, None):
+                if any(take(i, pattern_limit) for i in members):
+                    break
+
+        # 2) 패턴 제한 내에서 점수 순 → 3) 부족하면 패턴 제한 없이
+        for pattern_limit in (self.max_same_pattern, None):
+            for i in ranked:
+                take(i, pattern_limit)
+
+        rank_of = {i: rank for rank, i in enumerate(ranked)}
+        return [(candidates[i], rank_of[i]) for i in sorted(chosen)]
+
+    def _build_recommendation(
+        self,
+        exercise: Dict,
+        user_input: ExerciseRecommendationInput,
+        priority: int,
+        rank: int,
+    ) -> RecommendedExercise:
+        """선택 운동 → RecommendedExercise (적합도는 개인화 점수 순위 기준)"""
+        return RecommendedExercise(
+            exercise_id=exercise.get("id", f"E{priority:02d}"),
+            name_kr=exercise.get("name_kr", ""),
+            name_en=exercise.get("name_en", ""),
+            difficulty=exercise.get("difficulty", "medium"),
+            function_tags=exercise.get("function_tags", []),
+            target_muscles=exercise.get("target_muscles", []),
+            sets=exercise.get("sets", 2),
+            reps=exercise.get("reps", "10회"),
+            rest=exercise.get("rest", "30초"),
+            reason=self.exercise_reason(exercise, user_input),
+            priority=priority,
+            match_score=round(max(0.5, 0.95 - 0.03 * rank), 2),
+            youtube=exercise.get("youtube"),
+            description=exercise.get("description"),
+        )
+
+    def exercise_reason(self, exercise: Dict, user_input: ExerciseRecommendationInput) -> str:
+        """추천 이유 템플릿: (a) 기능/근육 (b) 환자 적합성 (c) 안전/강도"""
+        functions = []
+        for tag in exercise.get("function_tags", []):
+            label = FUNCTION_LABELS.get(tag, tag)
+            if label not in functions:
+                functions.append(label)
+        function_str = "/".join(functions[:2]) or "기능"
+        muscles = exercise.get("target_muscles") or exercise.get("primary_muscles") or []
+        target = f"{'/'.join(muscles[:2])} 중심의 {function_str} 운동" if muscles else f"{function_str} 운동"
+        body = BODY_PART_LABELS.get(user_input.body_part, user_input.body_part)
+
+        load = JOINT_LOAD_LABELS.get(exercise.get("joint_load", ""), "")
+        fit = f"{load} " if load else ""
+        fit += f"{user_input.bucket} 환자({self._patient_label(user_input)})에게 적합"
+
+        return f"{exercise.get('name_kr', '')}: {target}으로 {body} 기능 회복에 도움, {fit}. {self._safety_note(exercise, user_input)}"
+
+    @staticmethod
+    def _patient_label(user_input: ExerciseRecommendationInput) -> str:
+        """이유 문장용 환자 특성 (나이 · BMI · 통증)"""
+        demo = user_input.demographics
+        parts = [f"{demo.age}세"]
+        if demo.bmi >= 25:
+            parts.append(f"BMI {demo.bmi:.1f}")
+        parts.append(f"NRS {user_input.nrs}")
+        return ", ".join(parts)
+
+    @staticmethod
+    def _safety_note(exercise: Dict, user_input: ExerciseRecommendationInput) -> str:
+        """안전/강도 한 줄"""
+        tags = exercise.get("function_tags", [])
+        if user_input.demographics.age >= 65 and "Balance" in tags:
+            return "낙상 예방을 위해 지지물을 잡고 진행하세요"
+        if user_input.nrs >= 7:
+            return "통증이 심한 시기라 세트를 줄여 저강도로 진행하세요"
+        if user_input.nrs >= 4:
+            return "통증이 늘지 않는 범위에서 천천히 진행하세요"
+        return "정확한 자세를 유지하며 점진적으로 강도를 높이세요"
+
+    def _format_reasoning(
+        self,
+        selected: List[Dict],
+        candidates: List[Dict],
+        user_input: ExerciseRecommendationInput,
+        adjustments: Optional[DifficultyAdjustment],
+    ) -> str:
+        """추천 근거 템플릿 (ExerciseRecommender._format_reasoning과 같은 섹션 구성)"""
+        counts = {name: 0 for name in EXERCISE_CATEGORIES}
+        for ex in selected:
+            for name in exercise_categories(ex):
+                counts[name] += 1
+        category_str = ", ".join(f"{CATEGORY_LABELS[name]} {count}개" for name, count in counts.items())
+        patterns = Counter(ex.get("movement_pattern", "기타") for ex in selected)
+        pattern_str = ", ".join(f"{p} {c}" for p, c in patterns.most_common())
+        demo = user_input.demographics
+        physical = user_input.physical_score
+
+        reasoning = (
+            f"후보 {len(candidates)}개 중 개인화 점수 순으로 {len(selected)}개를 선택했습니다 "
+            f"({category_str}). {user_input.bucket} 버킷과 신체 Lv {physical.level}에 맞춰 "
+            f"준비 → 본 운동 → 마무리 순서로 구성했습니다."
+        )
+
+        reasoning += "\n\n### 운동 조합 근거:\n"
+        reasoning += f"- **카테고리 균형**: {category_str}\n"
+        reasoning += f"- **패턴 다양성**: {pattern_str} (같은 패턴 최대 {self.max_same_pattern}개 우선)\n"
+        reasoning += "- **순서 논리**: 가동성/유연성 → 근력 → 안정성/균형, 같은 단계는 쉬운 운동부터\n"
+
+        reasoning += "\n\n### 환자 맞춤 고려사항:\n"
+        reasoning += f"- **나이 고려**: {demo.age}세"
+        reasoning += " - 세트 감소, 휴식 연장, 균형/안정성 운동 우선\n" if demo.age >= 65 else "\n"
+        reasoning += f"- **BMI 고려**: {demo.bmi:.1f}"
+        reasoning += " - 근력/중간 부하 운동 세트 감소, 저충격 운동 우선\n" if demo.bmi >= 30 else "\n"
+        reasoning += f"- **통증 고려**: NRS {user_input.nrs}/10"
+        reasoning += " - 반복 횟수 감소\n" if user_input.nrs >= 4 else "\n"
+        reasoning += f"- **신체 수준**: Lv {physical.level} ({physical.total_score}점), {len(selected)}개 구성\n"
+        if adjustments and adjustments.has_changes:
+            reasoning += (
+                f"- **사후 설문 반영**: 난이도 {adjustments.difficulty_delta:+d}, "
+                f"세트 {adjustments.sets_delta:+d}, 반복 {adjustments.reps_delta:+d}\n"
+            )
+
+        return reasoning
@@ -1,9 +1,10 @@
 """버킷 기반 운동 필터링 서비스 (v2.0)
 
 v2.0: joint_load, kinetic_chain, required_rom 기반 필터링 추가
+v2.1: 부위별 비트셋 인덱스로 필터링 (운동 목록 선형 순회 제거, 제외 사유 지연 생성)
 """
 
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Sequence, Tuple, Optional
 import json
 from pathlib import Path
 import logging
@@ -17,6 +18,7 @@ from shared.models import PhysicalScore
 from exercise_recommendation.models.input import JointStatus
 from exercise_recommendation.models.output import RecommendedExercise, ExcludedExercise
 from exercise_recommendation.models.assessment import DifficultyAdjustment
+from exercise_recommendation.services.exercise_index import ExerciseBitsetIndex, ExcludedExercises
 from exercise_recommendation.config import settings
 
 logger = logging.getLogger(__name__)
@@ -31,6 +33,7 @@ class ExerciseFilter:
 
     def __init__(self):
         self._exercise_cache = {}
+        self._index_cache: Dict[str, ExerciseBitsetIndex] = {}
 
     @traceable(name="bucket_validation")
     def _validate_and_normalize_bucket(self, bucket: str) -> str:
@@ -97,6 +100,14 @@ class ExerciseFilter:
         self._exercise_cache[body_part] = exercises_list
         return exercises_list
 
+    def _get_index(self, body_part: str) -> ExerciseBitsetIndex:
+        """부위별 비트셋 인덱스 (첫 요청 시 컴파일)"""
+        index = self._index_cache.get(body_part)
+        if index is None:
+            index = ExerciseBitsetIndex(self._load_exercises(body_part), self._map_difficulty)
+            self._index_cache[body_part] = index
+        return index
+
     @traceable(name="exercise_bucket_filtering")
     def filter_for_bucket(
         self,
@@ -106,9 +117,12 @@ class ExerciseFilter:
         nrs: int,
         adjustments: Optional[DifficultyAdjustment] = None,
         joint_status: Optional[JointStatus] = None,
-    ) -> Tuple[List[Dict], List[ExcludedExercise]]:
+    ) -> Tuple[List[Dict], Sequence[ExcludedExercise]]:
         """
-        버킷 및 조건에 맞는 운동 필터링 (v2.0)
+        버킷 및 조건에 맞는 운동 필터링 (v2.1)
+
+        판정 순서는 난이도 → joint_load → kinetic_chain → required_rom이며,
+        각 판정은 속성값 종류마다 한 번만 수행하고 비트마스크로 적용한다.
 
         Args:
             body_part: 부위 코드
@@ -119,7 +133,7 @@ class ExerciseFilter:
             joint_status: 관절 상태 (v2.0)
 
         Returns:
-            (후보 운동 리스트, 제외된 운동 리스트)
+            (후보 운동 리스트, 제외된 운동 시퀀스 - 접근 시 ExcludedExercise 생성)
         """
         # 버킷 검증 및 정규화
         validated_bucket = self._validate_and_normalize_bucket(bucket)
@@ -128,80 +142,28 @@ class ExerciseFilter:
         if joint_status is None:
             joint_status = JointStatus()
 
-        all_exercises = self._load_exercises(body_part)
-        allowed_difficulties = self._get_allowed_difficulties(
+        index = self._get_index(body_part)
+        allowed_difficulties = self.allowed_difficulties(
             physical_score, nrs, adjustments
         )
 
-        candidates = []
-        excluded = []
-
-        for ex in all_exercises:
-            diagnosis_tags = ex.get("diagnosis_tags", [])
-
-            # 버킷 매칭 체크 (정규화된 버킷 사용)
-            if validated_bucket not in diagnosis_tags:
-                continue
-
-            difficulty = ex.get("difficulty", "standard")
-
-            # v2.0 난이도 매핑 (beginner/standard/advanced/expert → low/medium/high)
-            difficulty_mapped = self._map_difficulty(difficulty)
-
-            # 난이도 체크
-            if difficulty_mapped not in allowed_difficulties:
-                excluded.append(
-                    ExcludedExercise(
-                        exercise_id=ex["id"],
-                        name_kr=ex.get("name_kr", ex.get("name_en", "")),
-                        reason=f"난이도 '{difficulty}'는 현재 조건에 부적합",
-                        exclusion_type="difficulty" if nrs <= 4 else "nrs",
-                    )
-                )
-                continue
-
-            # === v2.0: joint_load 체크 ===
-            joint_load = ex.get("joint_load", "medium")
-            if not self._check_joint_load(joint_load, joint_status, nrs):
-                excluded.append(
-                    ExcludedExercise(
-                        exercise_id=ex["id"],
-                        name_kr=ex.get("name_kr", ex.get("name_en", "")),
-                        reason=f"관절 부하 '{joint_load}'는 현재 관절 상태에 부적합",
-                        exclusion_type="joint_load",
-                    )
-                )
-                continue
-
-            # === v2.0: kinetic_chain 체크 (급성기만 엄격하게) ===
-            kinetic_chain = ex.get("kinetic_chain", "OKC")
-            if not self._check_kinetic_chain(kinetic_chain, joint_status):
-                excluded.append(
-                    ExcludedExercise(
-                        exercise_id=ex["id"],
-                        name_kr=ex.get("name_kr", ex.get("name_en", "")),
-                        reason=f"운동 사슬 '{kinetic_chain}'는 급성기에 부적합",
-                        exclusion_type="kinetic_chain",
-                    )
-                )
-                continue
+        # 버킷 매칭 + 난이도 체크
+        in_bucket = index.bucket_mask(validated_bucket)
+        remaining = in_bucket & index.mask_for("difficulty_tier", allowed_difficulties)
+        exclusion_masks = {"difficulty": in_bucket & ~remaining}
 
-            # === v2.0: required_rom 체크 ===
-            required_rom = ex.get("required_rom", "medium")
-            if not self._check_rom(required_rom, joint_status):
-                excluded.append(
-                    ExcludedExercise(
-                        exercise_id=ex["id"],
-                        name_kr=ex.get("name_kr", ex.get("name_en", "")),
-                        reason=f"필요 가동범위 '{required_rom}'는 현재 ROM 상태에 부적합",
-                        exclusion_type="rom",
-                    )
-                )
-                continue
-
-            candidates.append(ex)
+        # === v2.0: joint_load / kinetic_chain / required_rom 체크 ===
+        checks = (
+            ("joint_load", "joint_load", lambda v: self._check_joint_load(v, joint_status, nrs)),
+            ("kinetic_chain", "kinetic_chain", lambda v: self._check_kinetic_chain(v, joint_status)),
+            ("rom", "required_rom", lambda v: self._check_rom(v, joint_status)),
+        )
+        for exclusion_type, column, is_allowed in checks:
+            failing = remaining & index.failing_mask(column, is_allowed)
+            exclusion_masks[exclusion_type] = failing
+            remaining &= ~failing
 
-        return candidates, excluded
+        return index.select(remaining), ExcludedExercises(index, exclusion_masks, nrs)
 
     def _map_difficulty(self, difficulty: str) -> str:
         """v2.0 난이도 → 기존 난이도 매핑"""
@@ -270,13 +232,23 @@ class ExerciseFilter:
         # → 개인화 단계에서 우선순위 조정
         return True
 
-    def _get_allowed_difficulties(
+    def allowed_difficulties(
         self,
         physical_score: PhysicalScore,
         nrs: int,
         adjustments: Optional[DifficultyAdjustment] = None,
     ) -> List[str]:
-        """허용된 난이도 레벨 반환"""
+        """
+        허용된 난이도 레벨 반환 (신체 점수 → NRS 제한 → 사후 설문 조정 순)
+
+        Args:
+            physical_score: 신체 점수
+            nrs: 통증 점수 (0-10)
+            adjustments: 사후 설문 난이도 조정값
+
+        Returns:
+            허용 난이도 목록 (low/medium/high)
+        """
         base_difficulties = physical_score.allowed_difficulties.copy()
 
         # NRS 기반 제한
@@ -0,0 +1,202 @@
+"""운동 비트셋 인덱스
+
+exercises.json을 로드 시점에 속성값별 비트마스크로 컴파일한다.
+(i번째 비트 = 로드 순서 i번째 운동)
+
+- 버킷(diagnosis_tags), 난이도 티어(low/medium/high), joint_load,
+  kinetic_chain, required_rom 값마다 마스크 1개
+- 요청별 필터는 속성값별 판정(값 종류 수만큼) + 정수 AND/OR 몇 번으로 끝나고,
+  운동 수와 무관하게 후보 추출만 통과한 운동 수에 비례한다
+- 제외 사유(ExcludedExercise)는 실제로 접근할 때만 생성 (ExcludedExercises)
+"""
+
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from exercise_recommendation.models.output import ExcludedExercise
+
+
+# 속성 기본값 (exercise_filter의 ex.get(...) 기본값과 동일)
+DEFAULT_DIFFICULTY = "standard"
+DEFAULT_JOINT_LOAD = "medium"
+DEFAULT_KINETIC_CHAIN = "OKC"
+DEFAULT_REQUIRED_ROM = "medium"
+
+# 제외 판정 순서 (먼저 걸린 사유 하나만 기록)
+EXCLUSION_ORDER = ("difficulty", "joint_load", "kinetic_chain", "rom")
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """설정된 비트 위치를 오름차순으로 반환"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class ExerciseBitsetIndex:
+    """부위별 운동 비트셋 인덱스
+
+    사용 예시:
+        index = ExerciseBitsetIndex(exercises, map_difficulty)
+        bucket_mask = index.bucket_mask("OA")
+        allowed = index.mask_for("difficulty_tier", ["low", "medium"])
+        candidates = index.select(bucket_mask & allowed)
+    """
+
+    def __init__(self, exercises: List[Dict], map_difficulty: Callable[[str], str]):
+        """
+        Args:
+            exercises: 운동 목록 (id 포함, 순서 유지)
+            map_difficulty: 난이도 → 티어(low/medium/high) 매핑 함수
+        """
+        self.exercises = exercises
+        self.size = len(exercises)
+        self.all_mask = (1 << self.size) - 1
+
+        self.buckets: Dict[str, int] = {}
+        self.columns: Dict[str, Dict[str, int]] = {
+            "difficulty": {},
+            "difficulty_tier": {},
+            "joint_load": {},
+            "kinetic_chain": {},
+            "required_rom": {},
+        }
+
+        for position, ex in enumerate(exercises):
+            bit = 1 << position
+            for tag in ex.get("diagnosis_tags", []):
+                self.buckets[tag] = self.buckets.get(tag, 0) | bit
+
+            difficulty = ex.get("difficulty", DEFAULT_DIFFICULTY)
+            values = {
+                "difficulty": difficulty,
+                "difficulty_tier": map_difficulty(difficulty),
+                "joint_load": ex.get("joint_load", DEFAULT_JOINT_LOAD),
+                "kinetic_chain": ex.get("kinetic_chain", DEFAULT_KINETIC_CHAIN),
+                "required_rom": ex.get("required_rom", DEFAULT_REQUIRED_ROM),
+            }
+            for column, value in values.items():
+                masks = self.columns[column]
+                masks[value] = masks.get(value, 0) | bit
+
+    def bucket_mask(self, bucket: str) -> int:
+        """버킷 태그가 있는 운동 마스크"""
+        return self.buckets.get(bucket, 0)
+
+    def mask_for(self, column: str, values) -> int:
+        """컬럼 값이 values 중 하나인 운동 마스크"""
+        masks = self.columns[column]
+        mask = 0
+        for value in values:
+            mask |= masks.get(value, 0)
+        return mask
+
+    def failing_mask(self, column: str, is_allowed: Callable[[str], bool]) -> int:
+        """is_allowed(값)이 False인 운동 마스크 (값 종류마다 판정 1회)"""
+        mask = 0
+        for value, value_mask in self.columns[column].items():
+            if not is_allowed(value):
+                mask |= value_mask
+        return mask
+
+    def value_of(self, column: str, position: int) -> Optional[str]:
+        """position 운동의 컬럼 값 (제외 사유 생성용)"""
+        bit = 1 << position
+        for value, mask in self.columns[column].items():
+            if mask & bit:
+                return value
+        return None
+
+    def select(self, mask: int) -> List[Dict]:
+        """마스크에 해당하는 운동 목록 (로드 순서 유지)"""
+        return [self.exercises[i] for i in iter_bits(mask)]
+
+
+class ExcludedExercises(Sequence):
+    """제외 운동 지연 생성 시퀀스
+
+    필터 단계에서는 제외 유형별 마스크만 보관하고, 순회/인덱싱 시점에
+    ExcludedExercise를 만들어 캐시한다 (응답에 제외 목록이 없으면 생성 안 함).
+    """
+
+    def __init__(self, index: ExerciseBitsetIndex, masks: Dict[str, int], nrs: int):
+        """
+        Args:
+            index: 운동 비트셋 인덱스
+            masks: {제외 유형(EXCLUSION_ORDER): 마스크} - 마스크끼리 겹치지 않음
+            nrs: 통증 점수 (난이도 제외 유형 결정용)
+        """
+        self._index = index
+        self._masks = masks
+        self._nrs = nrs
+        self._entries: Optional[List[Tuple[int, str]]] = None
+        self._items: Dict[int, ExcludedExercise] = {}
+
+    def _positions(self) -> List[Tuple[int, str]]:
+        if self._entries is None:
+            owner = {}
+            for kind in EXCLUSION_ORDER:
+                for position in iter_bits(self._masks.get(kind, 0)):
+                    owner[position] = kind
+            self._entries = sorted(owner.items())
+        return self._entries
+
+    @property
+    def exercise_ids(self) -> List[str]:
+        """제외 운동 ID 목록 (ExcludedExercise 생성 없이)"""
+        return [self._index.exercises[p]["id"] for p, _ in self._positions()]
+
+    def __len__(self) -> int:
+        return sum(bin(mask).count("1") for mask in self._masks.values())
+
+    def __getitem__(self, i):
+        entries = self._positions()
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(entries)))]
+        if i < 0:
+            i += len(entries)
+        if i not in self._items:
+            position, kind = entries[i]
+            self._items[i] = self._build(position, kind)
+        return self._items[i]
+
+    def _build(self, position: int, kind: str) -> ExcludedExercise:
+        ex = self._index.exercises[position]
+        name_kr = ex.get("name_kr", ex.get("name_en", ""))
+
+        if kind == "difficulty":
+            difficulty = self._index.value_of("difficulty", position)
+            return ExcludedExercise(
+                exercise_id=ex["id"],
+                name_kr=name_kr,
+                reason=f"난이도 '{difficulty}'는 현재 조건에 부적합",
+                exclusion_type="difficulty" if self._nrs <= 4 else "nrs",
+            )
+        if kind == "joint_load":
+            joint_load = self._index.value_of("joint_load", position)
+            return ExcludedExercise(
+                exercise_id=ex["id"],
+                name_kr=name_kr,
+                reason=f"관절 부하 '{joint_load}'는 현재 관절 상태에 부적합",
+                exclusion_type="joint_load",
+            )
+        if kind == "kinetic_chain":
+            kinetic_chain = self._index.value_of("kinetic_chain", position)
+            return ExcludedExercise(
+                exercise_id=ex["id"],
+                name_kr=name_kr,
+                reason=f"운동 사슬 '{kinetic_chain}'는 급성기에 부적합",
+                exclusion_type="kinetic_chain",
+            )
+        required_rom = self._index.value_of("required_rom", position)
+        return ExcludedExercise(
+            exercise_id=ex["id"],
+            name_kr=name_kr,
+            reason=f"필요 가동범위 '{required_rom}'는 현재 ROM 상태에 부적합",
+            exclusion_type="rom",
+        )
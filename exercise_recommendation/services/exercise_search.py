@@ -15,7 +15,14 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from shared.utils import PineconeClient
+from shared.utils import (
+    VectorStore,
+    EmbeddingCache,
+    get_embedding_cache,
+    create_vector_store,
+    get_openai_client,
+)
+from shared.utils.timing import STAGE_EMBEDDING, STAGE_VECTOR_QUERY, record_usage, span, timed
 from exercise_recommendation.config import settings
 
 logger = logging.getLogger(__name__)
@@ -41,31 +48,44 @@ class ExerciseSearchService:
 
     def __init__(
         self,
-        pinecone_client: Optional[PineconeClient] = None,
+        pinecone_client: Optional[VectorStore] = None,
         openai_client: Optional[OpenAI] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Args:
-            pinecone_client: Pinecone 클라이언트
-            openai_client: OpenAI 클라이언트
+            pinecone_client: 벡터 스토어 (없으면 VECTOR_STORE_BACKEND에 따라 자동 생성)
+            openai_client: OpenAI 클라이언트 (없으면 공용 클라이언트)
+            embedding_cache: 임베딩 캐시 (없으면 공유 캐시, 비활성화 시 미사용)
         """
         self._pc = pinecone_client
-        self._openai = openai_client or OpenAI()
+        self._openai = openai_client or get_openai_client()
+        self._embedding_cache = embedding_cache or get_embedding_cache()
         self._min_score = settings.min_search_score
         self._top_k = settings.search_top_k
 
-    def _get_client(self) -> PineconeClient:
-        """Pinecone 클라이언트 반환 (지연 초기화)"""
+    def _get_client(self) -> VectorStore:
+        """벡터 스토어 반환 (지연 초기화, VECTOR_STORE_BACKEND에 따라 Pinecone/로컬)"""
         if self._pc is None:
-            self._pc = PineconeClient(index_name=settings.pinecone_index)
+            self._pc = create_vector_store(settings.pinecone_index)
         return self._pc
 
+    @timed(STAGE_EMBEDDING)
     def _embed(self, text: str) -> List[float]:
-        """텍스트 임베딩"""
+        """텍스트 임베딩 (캐시 우선)"""
+        if self._embedding_cache is None:
+            return self._embed_uncached(text)
+        return self._embedding_cache.get_or_compute(
+            settings.embedding_model, text, self._embed_uncached
+        )
+
+    def _embed_uncached(self, text: str) -> List[float]:
+        """텍스트 임베딩 (API 호출)"""
         response = self._openai.embeddings.create(
             model=settings.embedding_model,
             input=text,
         )
+        record_usage(getattr(response, "usage", None), kind="embedding")
         return response.data[0].embedding
 
     @traceable(name="exercise_symptom_search")
@@ -101,12 +121,13 @@ class ExerciseSearchService:
         }
 
         # 벡터 검색
-        raw_results = client.query(
-            vector=query_vector,
-            top_k=self._top_k,
-            filter=filters,
-            min_score=self._min_score,
-        )
+        with span(STAGE_VECTOR_QUERY):
+            raw_results = client.query(
+                vector=query_vector,
+                top_k=self._top_k,
+                filter=filters,
+                min_score=self._min_score,
+            )
 
         # 결과 변환
         results = []
@@ -196,12 +217,13 @@ class ExerciseSearchService:
         query = f"{body_part} 재활 운동"
         query_vector = self._embed(query)
 
-        raw_results = client.query(
-            vector=query_vector,
-            top_k=top_k + 1,  # 자기 자신 제외
-            filter=filters,
-            min_score=self._min_score,
-        )
+        with span(STAGE_VECTOR_QUERY):
+            raw_results = client.query(
+                vector=query_vector,
+                top_k=top_k + 1,  # 자기 자신 제외
+                filter=filters,
+                min_score=self._min_score,
+            )
 
         results = []
         for item in raw_results.items:
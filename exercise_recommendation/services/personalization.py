@@ -2,10 +2,17 @@
 
 나이, 통증, 신체 점수 기반 개인화
 + v2.0: joint_load, kinetic_chain, required_rom, movement_pattern 기반 개인화
+
+후보마다 dict를 단계별로 복사하지 않는다. 우선순위 점수는 후보 인덱스에 맞춘
+점수 벡터(array)에 한 번에 누적하고, 세트/반복/휴식/플래그는 변경분만
+PersonalizedExercise(원본 운동 + 변경분 뷰)에 담는다.
 """
 
-from typing import List, Dict, Optional
+import re
+from array import array
 from collections import Counter
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from langsmith import traceable
 
@@ -17,215 +24,378 @@ from shared.models import Demographics
 from exercise_recommendation.models.input import JointStatus
 
 
-class PersonalizationService:
-    """개인화 조정 서비스"""
+# 루틴 카테고리별 기능 태그 (운동 DB는 Strength/Flexibility, 이전 태그는 Strengthening/Stretching)
+EXERCISE_CATEGORIES: Dict[str, List[str]] = {
+    "warmup": ["Mobility", "Stretching", "Flexibility"],
+    "main": ["Strengthening", "Strength", "Endurance"],
+    "cooldown": ["Stability", "Balance"],
+}
 
-    @traceable(name="exercise_personalization")
-    def apply(
-        self,
-        exercises: List[Dict],
-        demographics: Demographics,
-        nrs: int,
-        skipped_exercises: Optional[List[str]] = None,
-        joint_status: Optional[JointStatus] = None,
-    ) -> List[Dict]:
-        """
-        개인화 조정 적용 (v2.0)
 
-        Args:
-            exercises: 운동 목록
-            demographics: 인구통계 정보
-            nrs: 통증 점수
-            skipped_exercises: 자주 건너뛴 운동 ID
-            joint_status: 관절 상태 (v2.0)
+def exercise_categories(ex: Mapping) -> List[str]:
+    """운동이 속한 루틴 카테고리 (기능 태그 기준, 여러 개 가능)"""
+    tags = ex.get("function_tags", [])
+    return [
+        name for name, cat_tags in EXERCISE_CATEGORIES.items()
+        if any(t in cat_tags for t in tags)
+    ]
 
-        Returns:
-            조정된 운동 목록
-        """
-        # joint_status가 없으면 기본값 생성
-        if joint_status is None:
-            joint_status = JointStatus()
 
-        personalized = []
+class PersonalizedExercise(Mapping):
+    """개인화된 운동 (원본 운동 dict + 변경분)
 
-        for ex in exercises:
-            adjusted = ex.copy()
+    원본은 필터 인덱스가 공유하는 dict이므로 수정하지 않는다.
+    조회는 변경분 → 원본 순서, 쓰기(ex["_order_index"] = ...)는 변경분에만 반영.
+    """
 
-            # 나이 기반 조정
-            adjusted = self._adjust_for_age(adjusted, demographics.age)
+    __slots__ = ("base", "overrides")
 
-            # BMI 기반 조정
-            adjusted = self._adjust_for_bmi(adjusted, demographics.bmi)
+    def __init__(self, base: Dict, overrides: Dict):
+        self.base = base
+        self.overrides = overrides
 
-            # 통증 기반 조정
-            adjusted = self._adjust_for_pain(adjusted, nrs)
+    def __getitem__(self, key: str) -> Any:
+        if key in self.overrides:
+            return self.overrides[key]
+        return self.base[key]
 
-            # === v2.0: 새로운 칼럼 기반 조정 ===
-            # 관절 부하 기반 조정
-            adjusted = self._adjust_for_joint_load(adjusted, joint_status, demographics)
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.overrides[key] = value
 
-            # 운동 사슬 기반 조정
-            adjusted = self._adjust_for_kinetic_chain(adjusted, joint_status)
+    def __contains__(self, key: object) -> bool:
+        return key in self.overrides or key in self.base
 
-            # 가동범위 기반 조정
-            adjusted = self._adjust_for_rom(adjusted, joint_status)
+    def __iter__(self) -> Iterator[str]:
+        yield from self.base
+        for key in self.overrides:
+            if key not in self.base:
+                yield key
 
-            # 자주 건너뛴 운동 우선순위 하락
-            if skipped_exercises and ex.get("id") in skipped_exercises:
-                adjusted["_priority_penalty"] = adjusted.get("_priority_penalty", 0) + 0.1
+    def __len__(self) -> int:
+        return len(self.base) + sum(1 for key in self.overrides if key not in self.base)
 
-            # 환자 프로필에 맞는 운동 우선순위 상승
-            adjusted = self._boost_appropriate_exercises(adjusted, demographics, nrs)
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.overrides:
+            return self.overrides[key]
+        return self.base.get(key, default)
 
-            # v2.0: 관절 상태 기반 우선순위 조정
-            adjusted = self._boost_for_joint_status(adjusted, joint_status)
+    def copy(self) -> Dict:
+        """일반 dict로 변환 (원본 + 변경분)"""
+        return {**self.base, **self.overrides}
 
-            personalized.append(adjusted)
+    to_dict = copy
 
-        # 우선순위 정렬
-        personalized.sort(
-            key=lambda x: (
-                x.get("_priority_boost", 0) - x.get("_priority_penalty", 0)
-            ),
-            reverse=True,
-        )
+    def __repr__(self) -> str:
+        return f"PersonalizedExercise({self.copy()!r})"
 
-        # v2.0: 움직임 패턴 다양성 확보
-        personalized = self._ensure_movement_pattern_diversity(personalized)
 
-        return personalized
+class _ScoringContext:
+    """요청 단위 개인화 상수 + 후보 인덱스별 우선순위 점수 벡터
 
-    def _adjust_for_bmi(self, exercise: Dict, bmi: float) -> Dict:
-        """BMI 기반 조정"""
-        adjusted = exercise.copy()
-        function_tags = exercise.get("function_tags", [])
+    요청마다 한 번 만들고 후보마다 score()를 호출한다. 점수는 기존 단계 순서
+    (관절 부하 → 운동 사슬 → 가동범위 → 건너뜀 → 프로필 → 관절 상태)대로
+    누적하므로 부동소수 합과 정렬 결과가 dict 복사 방식과 같다.
+    """
 
-        if bmi >= 30:
-            # 비만: 체중 부하 운동 강도 감소
-            if "Strengthening" in function_tags:
-                current_sets = exercise.get("sets", 2)
-                adjusted["sets"] = max(1, current_sets - 1)
-                adjusted["_bmi_adjustment"] = "reduced_load"
-
-            # 휴식 시간 증가
-            rest_str = exercise.get("rest", "30초")
-            import re
-            match = re.search(r"(\d+)", rest_str)
-            if match:
-                current_rest = int(match.group(1))
-                adjusted["rest"] = f"{current_rest + 15}초"
-
-        elif bmi >= 25:
-            # 과체중: 휴식 시간 약간 증가
-            rest_str = exercise.get("rest", "30초")
-            import re
-            match = re.search(r"(\d+)", rest_str)
-            if match:
-                current_rest = int(match.group(1))
-                adjusted["rest"] = f"{current_rest + 5}초"
-            adjusted["_bmi_adjustment"] = "moderate"
-
-        return adjusted
-
-    def _boost_appropriate_exercises(
+    __slots__ = (
+        "age", "bmi", "nrs", "skipped", "preferred_loads", "preferred_chains",
+        "preferred_rom", "phase", "restricted", "unstable", "profile_flags",
+        "sets_decrement", "rest_for", "reps_for", "boost", "penalty",
+    )
+
+    def __init__(
         self,
-        exercise: Dict,
+        size: int,
         demographics: Demographics,
         nrs: int,
-    ) -> Dict:
+        skipped_exercises: Optional[List[str]],
+        joint_status: JointStatus,
+    ):
+        self.age = demographics.age
+        self.bmi = demographics.bmi
+        self.nrs = nrs
+        self.skipped = set(skipped_exercises or ())
+        self.preferred_loads = joint_status.preferred_joint_load
+        self.preferred_chains = joint_status.preferred_kinetic_chain
+        self.preferred_rom = joint_status.preferred_rom
+        self.phase = joint_status.rehabilitation_phase
+        self.restricted = joint_status.rom_status == "restricted"
+        self.unstable = joint_status.joint_condition == "unstable"
+
+        self.profile_flags = _profile_flags(self.age, self.bmi, nrs)
+        # 모든 후보 공통 세트 감소 (나이 65+, 통증 7+)
+        self.sets_decrement = int(self.age >= 65) + int(nrs >= 7)
+        self.rest_for = _rest_adjuster(self.age, self.bmi)
+        self.reps_for = _reps_adjuster(nrs)
+
+        self.boost = array("d", [0.0]) * size
+        self.penalty = array("d", [0.0]) * size
+
+    def score(self, i: int, ex: Dict) -> Dict[str, Any]:
+        """i번째 후보 점수 누적 + 변경분 반환"""
+        overrides: Dict[str, Any] = dict(self.profile_flags)
+        function_tags = ex.get("function_tags", [])
+        joint_load = ex.get("joint_load", "medium")
+        self._adjust_volume(ex, overrides, function_tags, joint_load)
+
+        boost = 0.0
+        penalty = 0.0
+        penalized = False
+
+        # 관절 부하: 선호 부하와 일치하면 상승 (정확히 맞으면 더 높게), 아니면 페널티
+        if joint_load in self.preferred_loads:
+            boost += 0.2 if joint_load == self.preferred_loads[0] else 0.1
+            overrides["_joint_load_match"] = True
+        else:
+            penalty += 0.15
+            penalized = True
+            overrides["_joint_load_match"] = False
+
+        # 운동 사슬: 급성기에 OKC 우선, CKC는 제외 권장
+        kinetic_chain = ex.get("kinetic_chain", "OKC")
+        if kinetic_chain in self.preferred_chains:
+            boost += 0.15 if self.phase == "acute" and kinetic_chain == "OKC" else 0.05
+            overrides["_kinetic_chain_match"] = True
+        else:
+            if self.phase == "acute" and kinetic_chain == "CKC":
+                penalty += 0.2
+                penalized = True
+                overrides["_kinetic_chain_warning"] = "급성기에 CKC 운동 주의"
+            overrides["_kinetic_chain_match"] = False
+
+        # 가동범위: 제한 환자에게 small ROM 우선, medium ROM은 페널티
+        required_rom = ex.get("required_rom", "medium")
+        if required_rom in self.preferred_rom:
+            boost += 0.15 if self.restricted and required_rom == "small" else 0.05
+            overrides["_rom_match"] = True
+        else:
+            if self.restricted and required_rom == "medium":
+                penalty += 0.1
+                penalized = True
+                overrides["_rom_warning"] = "가동범위 제한 시 주의"
+            overrides["_rom_match"] = False
+
+        # 자주 건너뛴 운동 우선순위 하락
+        if ex.get("id") in self.skipped:
+            penalty += 0.1
+            penalized = True
+
+        boost = self._boost_appropriate(boost, function_tags, ex.get("difficulty", "medium"))
+        boost = self._boost_for_joint_status(boost, function_tags, ex.get("movement_pattern", ""))
+
+        self.boost[i] = boost
+        self.penalty[i] = penalty
+        overrides["_priority_boost"] = boost
+        if penalized:
+            overrides["_priority_penalty"] = penalty
+        return overrides
+
+    def _adjust_volume(
+        self,
+        ex: Dict,
+        overrides: Dict[str, Any],
+        function_tags: List[str],
+        joint_load: str,
+    ) -> None:
+        """세트/반복/휴식 조정 (나이 → BMI → 통증 → 관절 부하 감소량 합산)"""
+        decrement = self.sets_decrement
+        if self.bmi >= 30:
+            # 비만: 근력 운동 / 중간 부하 운동 세트 감소
+            if "Strengthening" in function_tags:
+                decrement += 1
+                overrides["_bmi_adjustment"] = "reduced_load"
+            if joint_load == "medium":
+                decrement += 1
+                overrides["_bmi_joint_load_adjustment"] = True
+        if decrement:
+            overrides["sets"] = max(1, ex.get("sets", 2) - decrement)
+
+        if self.rest_for is not None:
+            rest = self.rest_for(ex.get("rest", "30초"))
+            if rest is not None:
+                overrides["rest"] = rest
+        if self.reps_for is not None:
+            reps = self.reps_for(ex.get("reps", "10회"))
+            if reps is not None:
+                overrides["reps"] = reps
+
+    def _boost_appropriate(self, boost: float, function_tags: List[str], difficulty: str) -> float:
         """환자 프로필에 맞는 운동 우선순위 상승"""
-        adjusted = exercise.copy()
-        function_tags = exercise.get("function_tags", [])
-        difficulty = exercise.get("difficulty", "medium")
-        boost = adjusted.get("_priority_boost", 0)
-
-        age = demographics.age
-        bmi = demographics.bmi
-
         # 고령자: 균형/안정성 운동 우선
-        if age >= 65:
+        if self.age >= 65:
             if "Balance" in function_tags or "Stability" in function_tags:
                 boost += 0.15
             if difficulty == "low":
                 boost += 0.1
 
         # 비만: 저충격 운동 우선
-        if bmi >= 30:
+        if self.bmi >= 30:
             if "Mobility" in function_tags or "Stretching" in function_tags:
                 boost += 0.1
             if difficulty == "low":
                 boost += 0.05
 
         # 고통증: 가동성 운동 우선
-        if nrs >= 6:
+        if self.nrs >= 6:
             if "Mobility" in function_tags:
                 boost += 0.15
             if difficulty == "low":
                 boost += 0.1
 
         # 젊은 층 + 저통증: 근력 운동 우선
-        if age < 40 and nrs < 4:
+        if self.age < 40 and self.nrs < 4:
             if "Strengthening" in function_tags:
                 boost += 0.1
 
-        adjusted["_priority_boost"] = boost
-        return adjusted
-
-    def _adjust_for_age(self, exercise: Dict, age: int) -> Dict:
-        """나이 기반 조정"""
-        adjusted = exercise.copy()
+        return boost
 
-        if age >= 65:
-            # 고령자: 세트 수 감소, 휴식 증가
-            current_sets = exercise.get("sets", 2)
-            adjusted["sets"] = max(1, current_sets - 1)
+    def _boost_for_joint_status(
+        self,
+        boost: float,
+        function_tags: List[str],
+        movement_pattern: str,
+    ) -> float:
+        """관절 상태 종합 우선순위 조정 (v2.0)"""
+        # 재활 단계별 선호 운동
+        if self.phase == "acute":
+            # 급성기: 모빌리티 우선
+            if movement_pattern == "모빌리티" or "Mobility" in function_tags:
+                boost += 0.15
+        elif self.phase == "subacute":
+            # 아급성기: 모빌리티 + 가벼운 근력
+            if movement_pattern in ["모빌리티", "브리지"]:
+                boost += 0.1
+        elif self.phase == "chronic":
+            # 만성기: 근력 + 안정성
+            if movement_pattern in ["스쿼트", "런지", "브리지"]:
+                boost += 0.1
+            if "Strength" in function_tags:
+                boost += 0.05
+        else:  # maintenance
+            # 유지기: 다양한 패턴
+            if "Balance" in function_tags or "Stability" in function_tags:
+                boost += 0.05
 
-            rest_str = exercise.get("rest", "30초")
-            current_rest = int(rest_str.replace("초", "").strip())
-            adjusted["rest"] = f"{current_rest + 15}초"
+        # 불안정 관절: 안정성 운동 우선
+        if self.unstable:
+            if "Stability" in function_tags:
+                boost += 0.15
 
-            adjusted["_age_adjustment"] = "elderly_safe"
+        return boost
+
+
+def _profile_flags(age: int, bmi: float, nrs: int) -> Dict[str, str]:
+    """후보 공통 조정 플래그 (나이/BMI/통증)"""
+    flags = {}
+    if age >= 65:
+        flags["_age_adjustment"] = "elderly_safe"
+    elif age >= 50:
+        flags["_age_adjustment"] = "moderate"
+    if 25 <= bmi < 30:
+        flags["_bmi_adjustment"] = "moderate"
+    if nrs >= 7:
+        flags["_pain_adjustment"] = "reduced_intensity"
+    elif nrs >= 4:
+        flags["_pain_adjustment"] = "moderate_intensity"
+    return flags
+
+
+def _rest_adjuster(age: int, bmi: float) -> Optional[Callable[[str], Optional[str]]]:
+    """휴식 시간 조정 함수 (조정 없으면 None)
+
+    고령자 +15초 / 중년 +10초 (나이), 비만 +15초 / 과체중 +5초 (BMI).
+    같은 휴식 문자열은 한 번만 계산한다.
+    """
+    age_rest = 15 if age >= 65 else 10 if age >= 50 else 0
+    bmi_rest = 15 if bmi >= 30 else 5 if bmi >= 25 else 0
+    if not age_rest and not bmi_rest:
+        return None
+
+    cache: Dict[str, Optional[str]] = {}
+
+    def adjust(rest_str: str) -> Optional[str]:
+        if rest_str not in cache:
+            rest = None
+            if age_rest:
+                rest = f"{int(rest_str.replace('초', '').strip()) + age_rest}초"
+            if bmi_rest:
+                match = re.search(r"(\d+)", rest or rest_str)
+                if match:
+                    rest = f"{int(match.group(1)) + bmi_rest}초"
+            cache[rest_str] = rest
+        return cache[rest_str]
+
+    return adjust
+
+
+def _reps_adjuster(nrs: int) -> Optional[Callable[[str], Optional[str]]]:
+    """반복 횟수 조정 함수 (조정 없으면 None)
+
+    심한 통증(7+) -3회 / 중등도 통증(4+) -2회, 최소 5회.
+    """
+    if nrs >= 7:
+        reduction = 3
+    elif nrs >= 4:
+        reduction = 2
+    else:
+        return None
+
+    cache: Dict[str, Optional[str]] = {}
+
+    def adjust(reps_str: str) -> Optional[str]:
+        if reps_str not in cache:
+            match = re.search(r"(\d+)", reps_str)
+            cache[reps_str] = f"{max(5, int(match.group(1)) - reduction)}회" if match else None
+        return cache[reps_str]
 
-        elif age >= 50:
-            # 중년: 휴식 약간 증가
-            rest_str = exercise.get("rest", "30초")
-            current_rest = int(rest_str.replace("초", "").strip())
-            adjusted["rest"] = f"{current_rest + 10}초"
+    return adjust
 
-            adjusted["_age_adjustment"] = "moderate"
 
-        return adjusted
+class PersonalizationService:
+    """개인화 조정 서비스"""
 
-    def _adjust_for_pain(self, exercise: Dict, nrs: int) -> Dict:
-        """통증 기반 조정"""
-        adjusted = exercise.copy()
+    @traceable(name="exercise_personalization")
+    def apply(
+        self,
+        exercises: List[Dict],
+        demographics: Demographics,
+        nrs: int,
+        skipped_exercises: Optional[List[str]] = None,
+        joint_status: Optional[JointStatus] = None,
+    ) -> List[PersonalizedExercise]:
+        """
+        개인화 조정 적용 (v2.0)
 
-        if nrs >= 7:
-            # 심한 통증: 세트 및 반복 감소
-            current_sets = exercise.get("sets", 2)
-            adjusted["sets"] = max(1, current_sets - 1)
+        Args:
+            exercises: 운동 목록
+            demographics: 인구통계 정보
+            nrs: 통증 점수
+            skipped_exercises: 자주 건너뛴 운동 ID
+            joint_status: 관절 상태 (v2.0)
 
-            reps_str = exercise.get("reps", "10회")
-            import re
-            match = re.search(r"(\d+)", reps_str)
-            if match:
-                current_reps = int(match.group(1))
-                adjusted["reps"] = f"{max(5, current_reps - 3)}회"
+        Returns:
+            조정된 운동 목록 (원본 dict는 수정하지 않음)
+        """
+        # joint_status가 없으면 기본값 생성
+        if joint_status is None:
+            joint_status = JointStatus()
 
-            adjusted["_pain_adjustment"] = "reduced_intensity"
+        context = _ScoringContext(
+            len(exercises), demographics, nrs, skipped_exercises, joint_status
+        )
+        overrides = [context.score(i, ex) for i, ex in enumerate(exercises)]
 
-        elif nrs >= 4:
-            # 중등도 통증: 반복 약간 감소
-            reps_str = exercise.get("reps", "10회")
-            import re
-            match = re.search(r"(\d+)", reps_str)
-            if match:
-                current_reps = int(match.group(1))
-                adjusted["reps"] = f"{max(5, current_reps - 2)}회"
+        # 우선순위 정렬 (boost - penalty 내림차순, 동점은 입력 순서 유지)
+        boost, penalty = context.boost, context.penalty
+        order = sorted(
+            range(len(exercises)), key=lambda i: boost[i] - penalty[i], reverse=True
+        )
+        personalized = [PersonalizedExercise(exercises[i], overrides[i]) for i in order]
 
-            adjusted["_pain_adjustment"] = "moderate_intensity"
+        # v2.0: 움직임 패턴 다양성 확보
+        personalized = self._ensure_movement_pattern_diversity(personalized)
 
-        return adjusted
+        return personalized
 
     @traceable(name="exercise_ordering")
     def get_exercise_order(self, exercises: List[Dict]) -> List[Dict]:
@@ -286,20 +456,9 @@ class PersonalizationService:
         카테고리 균형 확인 및 조정
 
         최소한 각 카테고리에서 min_per_category개씩 포함되도록 함
+        (선택 단계의 카테고리 할당은 DeterministicExerciseSelector 참고)
         """
-        categories = {
-            "warmup": ["Mobility", "Stretching"],
-            "main": ["Strengthening"],
-            "cooldown": ["Stability", "Balance"],
-        }
-
-        category_counts = {"warmup": 0, "main": 0, "cooldown": 0}
-
-        for ex in exercises:
-            tags = ex.get("function_tags", [])
-            for cat_name, cat_tags in categories.items():
-                if any(t in cat_tags for t in tags):
-                    category_counts[cat_name] += 1
+        category_counts = self.category_counts(exercises)
 
         # 카테고리별 부족 여부 체크
         missing = {
@@ -309,173 +468,13 @@ class PersonalizationService:
 
         return exercises  # 현재는 체크만, 추후 자동 추가 로직 구현 가능
 
-    # ============================================================
-    # v2.0: 새로운 칼럼 기반 개인화 메서드
-    # ============================================================
-
-    def _adjust_for_joint_load(
-        self,
-        exercise: Dict,
-        joint_status: JointStatus,
-        demographics: Demographics,
-    ) -> Dict:
-        """관절 부하 기반 조정 (v2.0)
-
-        joint_load 칼럼 활용:
-        - very_low: 매우 낮은 부하 (재활 초기, 고통증)
-        - low: 낮은 부하 (가동범위 제한, 과체중)
-        - medium: 중간 부하 (일반)
-        """
-        adjusted = exercise.copy()
-        joint_load = exercise.get("joint_load", "medium")
-        preferred_loads = joint_status.preferred_joint_load
-
-        # 선호 부하와 일치하면 우선순위 상승
-        if joint_load in preferred_loads:
-            boost = adjusted.get("_priority_boost", 0)
-
-            # 정확히 맞는 경우 더 높은 부스트
-            if joint_load == preferred_loads[0]:
-                boost += 0.2
-            else:
-                boost += 0.1
-
-            adjusted["_priority_boost"] = boost
-            adjusted["_joint_load_match"] = True
-        else:
-            # 선호하지 않는 부하는 페널티
-            penalty = adjusted.get("_priority_penalty", 0)
-            penalty += 0.15
-            adjusted["_priority_penalty"] = penalty
-            adjusted["_joint_load_match"] = False
-
-        # 비만(BMI >= 30) + 중간 부하 = 세트 감소
-        if demographics.bmi >= 30 and joint_load == "medium":
-            current_sets = exercise.get("sets", 2)
-            adjusted["sets"] = max(1, current_sets - 1)
-            adjusted["_bmi_joint_load_adjustment"] = True
-
-        return adjusted
-
-    def _adjust_for_kinetic_chain(
-        self,
-        exercise: Dict,
-        joint_status: JointStatus,
-    ) -> Dict:
-        """운동 사슬 기반 조정 (v2.0)
-
-        kinetic_chain 칼럼 활용:
-        - OKC (Open Kinetic Chain): 열린 사슬, 말단 자유
-          → 재활 초기, 관절 불안정에 적합
-        - CKC (Closed Kinetic Chain): 닫힌 사슬, 말단 고정
-          → 기능적 운동, 안정성 훈련에 적합
-        """
-        adjusted = exercise.copy()
-        kinetic_chain = exercise.get("kinetic_chain", "OKC")
-        preferred_chains = joint_status.preferred_kinetic_chain
-
-        boost = adjusted.get("_priority_boost", 0)
-
-        if kinetic_chain in preferred_chains:
-            # 급성기에 OKC 우선
-            if joint_status.rehabilitation_phase == "acute" and kinetic_chain == "OKC":
-                boost += 0.15
-            elif kinetic_chain in preferred_chains:
-                boost += 0.05
-
-            adjusted["_kinetic_chain_match"] = True
-        else:
-            # 급성기에 CKC는 제외 권장
-            if joint_status.rehabilitation_phase == "acute" and kinetic_chain == "CKC":
-                penalty = adjusted.get("_priority_penalty", 0)
-                penalty += 0.2
-                adjusted["_priority_penalty"] = penalty
-                adjusted["_kinetic_chain_warning"] = "급성기에 CKC 운동 주의"
-
-            adjusted["_kinetic_chain_match"] = False
-
-        adjusted["_priority_boost"] = boost
-        return adjusted
-
-    def _adjust_for_rom(
-        self,
-        exercise: Dict,
-        joint_status: JointStatus,
-    ) -> Dict:
-        """가동범위 기반 조정 (v2.0)
-
-        required_rom 칼럼 활용:
-        - small: 작은 가동범위 필요
-        - medium: 중간 가동범위 필요
-        """
-        adjusted = exercise.copy()
-        required_rom = exercise.get("required_rom", "medium")
-        preferred_rom = joint_status.preferred_rom
-
-        boost = adjusted.get("_priority_boost", 0)
-
-        if required_rom in preferred_rom:
-            # 가동범위 제한 환자에게 small ROM 운동 우선
-            if joint_status.rom_status == "restricted" and required_rom == "small":
-                boost += 0.15
-            else:
-                boost += 0.05
-
-            adjusted["_rom_match"] = True
-        else:
-            # 가동범위 제한인데 medium ROM 필요한 운동
-            if joint_status.rom_status == "restricted" and required_rom == "medium":
-                penalty = adjusted.get("_priority_penalty", 0)
-                penalty += 0.1
-                adjusted["_priority_penalty"] = penalty
-                adjusted["_rom_warning"] = "가동범위 제한 시 주의"
-
-            adjusted["_rom_match"] = False
-
-        adjusted["_priority_boost"] = boost
-        return adjusted
-
-    def _boost_for_joint_status(
-        self,
-        exercise: Dict,
-        joint_status: JointStatus,
-    ) -> Dict:
-        """관절 상태 종합 우선순위 조정 (v2.0)"""
-        adjusted = exercise.copy()
-        boost = adjusted.get("_priority_boost", 0)
-
-        movement_pattern = exercise.get("movement_pattern", "")
-        function_tags = exercise.get("function_tags", [])
-
-        # 재활 단계별 선호 운동
-        phase = joint_status.rehabilitation_phase
-
-        if phase == "acute":
-            # 급성기: 모빌리티 우선
-            if movement_pattern == "모빌리티" or "Mobility" in function_tags:
-                boost += 0.15
-        elif phase == "subacute":
-            # 아급성기: 모빌리티 + 가벼운 근력
-            if movement_pattern in ["모빌리티", "브리지"]:
-                boost += 0.1
-        elif phase == "chronic":
-            # 만성기: 근력 + 안정성
-            if movement_pattern in ["스쿼트", "런지", "브리지"]:
-                boost += 0.1
-            if "Strength" in function_tags:
-                boost += 0.05
-        else:  # maintenance
-            # 유지기: 다양한 패턴
-            if "Balance" in function_tags or "Stability" in function_tags:
-                boost += 0.05
-
-        # 불안정 관절: 안정성 운동 우선
-        if joint_status.joint_condition == "unstable":
-            if "Stability" in function_tags:
-                boost += 0.15
-
-        adjusted["_priority_boost"] = boost
-        return adjusted
+    def category_counts(self, exercises: List[Dict]) -> Dict[str, int]:
+        """루틴 카테고리별 운동 수 (warmup/main/cooldown)"""
+        counts = {name: 0 for name in EXERCISE_CATEGORIES}
+        for ex in exercises:
+            for name in exercise_categories(ex):
+                counts[name] += 1
+        return counts
 
     def _ensure_movement_pattern_diversity(
         self,
@@ -1,4 +1,9 @@
-"""LLM 운동 추천 서비스"""
+"""LLM 운동 추천 서비스
+
+프롬프트는 고정 지침(선택 기준, 개인화 가이드, reason 규칙, JSON 형식)을 앞에,
+환자별 데이터를 뒤에 두어 제공자 측 프롬프트 캐시에 적중하도록 구성한다
+(적중 토큰은 timings.prompt_cache.exercise_recommendation).
+"""
 
 from typing import List, Dict, Optional, Any, TYPE_CHECKING
 import json
@@ -10,21 +15,31 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from shared.utils import get_openai_client
+from shared.utils.json_stream import JsonFieldScanner
+from shared.utils.progress import EVENT_EXERCISE, EVENT_REASONING, emit, listening
+from shared.utils.timing import record_usage
 from exercise_recommendation.models.input import ExerciseRecommendationInput
 from exercise_recommendation.models.output import RecommendedExercise
 from exercise_recommendation.models.assessment import DifficultyAdjustment
 from exercise_recommendation.config import settings
 
 
+# 토큰 집계용 호출 지점 이름 (timings.prompt_cache 키)
+LLM_CALL = "exercise_recommendation"
+# 선택/근거 프롬프트 지침 버전 (지침이나 응답 형식을 바꾸면 올려서 저장된 루틴 캐시를 무효화)
+PROMPT_VERSION = 1
+
+
 class ExerciseRecommender:
     """LLM 기반 운동 추천 서비스"""
 
     def __init__(self, openai_client: Optional[OpenAI] = None):
         """
         Args:
-            openai_client: OpenAI 클라이언트
+            openai_client: OpenAI 클라이언트 (없으면 공용 클라이언트)
         """
-        self._openai = openai_client or OpenAI()
+        self._openai = openai_client or get_openai_client()
         self._model = settings.openai_model
 
     @traceable(name="exercise_recommendation_flow")
@@ -33,6 +48,7 @@ class ExerciseRecommender:
         candidates: List[Dict],
         user_input: ExerciseRecommendationInput,
         adjustments: Optional[DifficultyAdjustment] = None,
+        llm_content: Optional[str] = None,
     ) -> tuple:
         """
         LLM 운동 추천
@@ -41,18 +57,24 @@ class ExerciseRecommender:
             candidates: 후보 운동 목록
             user_input: 사용자 입력
             adjustments: 난이도 조정
+            llm_content: 이미 받은 LLM 응답 본문 (Batch API 결과, 있으면 LLM 호출 생략)
 
         Returns:
             (추천 운동 목록, LLM 추론)
         """
-        # Step 1: 프롬프트 구성
-        prompt = self._build_prompt(candidates, user_input, adjustments)
-
-        # Step 2: 후보 운동 분석
+        # Step 1: 후보 운동 분석
         candidate_analysis = self._analyze_candidates(candidates, user_input)
 
-        # Step 3: LLM 호출
-        result = self._call_llm(prompt)
+        # Step 2~3: 프롬프트 구성 및 LLM 호출
+        # (진행 이벤트 리스너가 있으면 스트리밍 호출로 운동/근거를 도착 순서대로 전달)
+        if llm_content is None:
+            prompt = self._build_prompt(candidates, user_input, adjustments)
+            if listening():
+                result = self._call_llm_stream(prompt, candidates)
+            else:
+                result = self._call_llm(prompt)
+        else:
+            result = json.loads(llm_content)
 
         # Step 4: 응답 파싱 및 운동 매칭
         recommendations = self._parse_recommendations(result, candidates)
@@ -94,9 +116,61 @@ class ExerciseRecommender:
     @traceable(run_type="llm", name="llm_exercise_selection")
     def _call_llm(self, prompt: str) -> Dict:
         """LLM 호출"""
-        response = self._openai.chat.completions.create(
-            model=self._model,
-            messages=[
+        response = self._openai.chat.completions.create(**self._request_body(prompt))
+        record_usage(getattr(response, "usage", None), call=LLM_CALL)
+
+        return json.loads(response.choices[0].message.content)
+
+    @traceable(run_type="llm", name="llm_exercise_selection_stream")
+    def _call_llm_stream(self, prompt: str, candidates: List[Dict]) -> Dict:
+        """LLM 스트리밍 호출 (SSE 응답용)
+
+        selected_exercises 원소가 완성될 때마다 exercise 이벤트,
+        reasoning 값은 토큰 조각마다 llm_reasoning 이벤트를 보낸다.
+        응답 JSON에서 reasoning이 마지막 필드이므로 근거 텍스트가 가장 늦게 도착한다.
+        """
+        stream = self._openai.chat.completions.create(
+            **self._request_body(prompt),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        by_id = {c.get("id"): c for c in candidates}
+        scanner = JsonFieldScanner(array_keys=("selected_exercises",), string_keys=("reasoning",))
+        emitted_ids = set()
+        position = 0  # selected_exercises 내 순서 (_parse_recommendations의 priority와 동일)
+        streamed_reasoning = ""
+
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                record_usage(chunk.usage, call=LLM_CALL)
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if not content:
+                continue
+            for kind, _, value in scanner.feed(content):
+                if kind == "delta":
+                    streamed_reasoning += value
+                    emit(EVENT_REASONING, {"delta": value})
+                    continue
+                position += 1
+                if value in by_id and value not in emitted_ids:
+                    emitted_ids.add(value)
+                    recommendation = self._build_recommendation(value, by_id[value], {}, position)
+                    emit(EVENT_EXERCISE, {"exercise": recommendation.model_dump(mode="json")})
+
+        result = json.loads(scanner.text)
+        # 조합 근거/환자 적합성 섹션은 reasoning 뒤에 붙는 부분만 이어서 전달
+        formatted = self._format_reasoning(result)
+        if formatted.startswith(streamed_reasoning) and len(formatted) > len(streamed_reasoning):
+            emit(EVENT_REASONING, {"delta": formatted[len(streamed_reasoning):]})
+        return result
+
+    def _request_body(self, prompt: str) -> Dict[str, Any]:
+        """chat completions 요청 본문 (동기/Batch API 공통)"""
+        return {
+            "model": self._model,
+            "messages": [
                 {
                     "role": "system",
                     "content": (
@@ -108,11 +182,64 @@ class ExerciseRecommender:
                 },
                 {"role": "user", "content": prompt},
             ],
-            response_format={"type": "json_object"},
-            temperature=0.4,
-        )
+            "response_format": {"type": "json_object"},
+            "temperature": 0.4,
+        }
 
-        return json.loads(response.choices[0].message.content)
+    def build_batch_request(
+        self,
+        candidates: List[Dict],
+        user_input: ExerciseRecommendationInput,
+        adjustments: Optional[DifficultyAdjustment] = None,
+    ) -> Dict[str, Any]:
+        """Batch API 요청 본문 (응답은 recommend(llm_content=...)로 전달)"""
+        return self._request_body(self._build_prompt(candidates, user_input, adjustments))
+
+    @traceable(name="exercise_reason_generation")
+    def explain(
+        self,
+        recommendations: List[RecommendedExercise],
+        user_input: ExerciseRecommendationInput,
+        adjustments: Optional[DifficultyAdjustment] = None,
+        llm_content: Optional[str] = None,
+    ) -> tuple:
+        """
+        이미 선택된 운동의 이유/요약만 LLM으로 작성 (hybrid 모드)
+
+        Args:
+            recommendations: 규칙 기반 선택 결과 (템플릿 이유 포함)
+            user_input: 사용자 입력
+            adjustments: 난이도 조정
+            llm_content: 이미 받은 LLM 응답 본문 (Batch API 결과, 있으면 LLM 호출 생략)
+
+        Returns:
+            (이유가 교체된 추천 운동 목록, LLM 추론) - 응답에 없는 운동은 템플릿 이유 유지
+        """
+        if llm_content is None:
+            prompt = self._build_reasons_prompt(recommendations, user_input, adjustments)
+            if listening():
+                result = self._call_llm_stream(prompt, [])
+            else:
+                result = self._call_llm(prompt)
+        else:
+            result = json.loads(llm_content)
+
+        reasons = result.get("reasons", {})
+        explained = [
+            rec.model_copy(update={"reason": reasons[rec.exercise_id]})
+            if reasons.get(rec.exercise_id) else rec
+            for rec in recommendations
+        ]
+        return explained, self._format_reasoning(result)
+
+    def build_reasons_batch_request(
+        self,
+        recommendations: List[RecommendedExercise],
+        user_input: ExerciseRecommendationInput,
+        adjustments: Optional[DifficultyAdjustment] = None,
+    ) -> Dict[str, Any]:
+        """hybrid 모드 Batch API 요청 본문 (응답은 explain(llm_content=...)로 전달)"""
+        return self._request_body(self._build_reasons_prompt(recommendations, user_input, adjustments))
 
     @traceable(name="recommendation_parsing")
     def _parse_recommendations(
@@ -129,53 +256,68 @@ class ExerciseRecommender:
                 (c for c in candidates if c.get("id") == ex_id), None
             )
             if exercise:
-                # LLM 이유가 없으면 기본 템플릿으로 보강
-                reason = result.get("reasons", {}).get(ex_id)
-                if not reason:
-                    fn = ", ".join(exercise.get("function_tags", [])[:2]) or "기능 운동"
-                    diff = exercise.get("difficulty", "medium")
-                    reason = f"{exercise.get('name_kr', '')}: {fn}에 좋고 현재 난이도({diff})에서 무릎 통증을 악화시키지 않아 권장"
-                match_score = result.get("scores", {}).get(ex_id, 0.8)
-
-                recommendations.append(
-                    RecommendedExercise(
-                        exercise_id=ex_id,
-                        name_kr=exercise.get("name_kr", ""),
-                        name_en=exercise.get("name_en", ""),
-                        difficulty=exercise.get("difficulty", "medium"),
-                        function_tags=exercise.get("function_tags", []),
-                        target_muscles=exercise.get("target_muscles", []),
-                        sets=exercise.get("sets", 2),
-                        reps=exercise.get("reps", "10회"),
-                        rest=exercise.get("rest", "30초"),
-                        reason=reason,
-                        priority=i + 1,
-                        match_score=match_score,
-                        youtube=exercise.get("youtube"),
-                        description=exercise.get("description"),
-                    )
-                )
+                recommendations.append(self._build_recommendation(ex_id, exercise, result, i + 1))
 
         return recommendations
 
+    def _build_recommendation(
+        self,
+        ex_id: str,
+        exercise: Dict,
+        result: Dict,
+        priority: int,
+    ) -> RecommendedExercise:
+        """후보 운동 + LLM 응답(이유/점수) → RecommendedExercise"""
+        # LLM 이유가 없으면 기본 템플릿으로 보강
+        reason = result.get("reasons", {}).get(ex_id)
+        if not reason:
+            fn = ", ".join(exercise.get("function_tags", [])[:2]) or "기능 운동"
+            diff = exercise.get("difficulty", "medium")
+            reason = f"{exercise.get('name_kr', '')}: {fn}에 좋고 현재 난이도({diff})에서 무릎 통증을 악화시키지 않아 권장"
+        match_score = result.get("scores", {}).get(ex_id, 0.8)
+
+        return RecommendedExercise(
+            exercise_id=ex_id,
+            name_kr=exercise.get("name_kr", ""),
+            name_en=exercise.get("name_en", ""),
+            difficulty=exercise.get("difficulty", "medium"),
+            function_tags=exercise.get("function_tags", []),
+            target_muscles=exercise.get("target_muscles", []),
+            sets=exercise.get("sets", 2),
+            reps=exercise.get("reps", "10회"),
+            rest=exercise.get("rest", "30초"),
+            reason=reason,
+            priority=priority,
+            match_score=match_score,
+            youtube=exercise.get("youtube"),
+            description=exercise.get("description"),
+        )
+
     def _build_prompt(
         self,
         candidates: List[Dict],
         user_input: ExerciseRecommendationInput,
         adjustments: Optional[DifficultyAdjustment],
     ) -> str:
-        """LLM 프롬프트 구성 - 개인화 강화 버전"""
+        """LLM 프롬프트 구성 - 개인화 강화 버전
+
+        고정 지침 → 후보 운동(ID 순) → 환자별 데이터 순으로 배치한다.
+        지침은 모든 호출에서, 후보 목록은 같은 버킷/레벨 호출끼리 앞부분이 같아
+        제공자 측 프롬프트 캐시에 적중한다. 개인화 순서는 뒤쪽 우선순위 줄로 전달.
+        """
         demo = user_input.demographics
         physical = user_input.physical_score
 
-        # 후보 운동 목록 (상세 정보 포함)
+        # 후보 운동 목록 (상세 정보 포함, ID 순 고정)
         candidates_str = "\n".join(
             f"- {e['id']}: {e.get('name_kr', e.get('name_en', ''))} "
             f"(난이도: {e.get('difficulty', 'medium')}, "
             f"기능: {', '.join(e.get('function_tags', []))}, "
             f"대상근육: {', '.join(e.get('target_muscles', [])[:2])})"
-            for e in candidates
+            for e in sorted(candidates, key=lambda e: e["id"])
         )
+        # 개인화 우선순위 (get_exercise_order 순서: 준비 → 본 운동 → 마무리, 쉬운 운동 먼저)
+        priority_str = " > ".join(e["id"] for e in candidates)
 
         # 환자 특성 분석
         patient_profile = self._analyze_patient_profile(demo, user_input.nrs, physical)
@@ -206,7 +348,14 @@ class ExerciseRecommender:
         preference_str = ""
         if user_input.skipped_exercises:
             preference_str += f"\n- 자주 건너뛴 운동: {', '.join(user_input.skipped_exercises[:5])}"
-        prompt = f"""
+        prompt = f"""{self._selection_instructions()}
+---
+## 후보 운동 ({len(candidates)}개, ID 순)
+{candidates_str}
+
+---
+# 환자 데이터
+
 ## 환자 정보
 - 나이: {demo.age}세
 - 성별: {demo.sex}
@@ -223,14 +372,19 @@ class ExerciseRecommender:
 {adjustment_str}
 {assessment_str}
 
-## 후보 운동 ({len(candidates)}개)
-{candidates_str}
+## 개인화 우선순위 (준비 → 본 운동 → 마무리, 쉬운 운동 먼저)
+{priority_str}
+"""
+        return prompt
 
+    def _selection_instructions(self) -> str:
+        """운동 선택 프롬프트 고정 부분 (환자별 값 없음)"""
+        return f"""
 ## 선택 기준 (중요도 순)
 1. **환자 특성 맞춤**: 나이/BMI/통증에 따른 운동 강도 조절
 2. **기능 균형**: 가동성, 근력, 안정성 운동을 균형 있게 포함
 3. **다양성**: 같은 기능의 운동만 선택하지 말고 다양하게 선택
-4. **진행성**: 쉬운 운동 → 어려운 운동 순서로 배치
+4. **진행성**: 쉬운 운동 → 어려운 운동 순서로 배치 (아래 개인화 우선순위 참고)
 
 ## 개인화 가이드
 - 고령자(65+): 균형/안정성 운동 우선, 고강도 제외
@@ -244,8 +398,8 @@ class ExerciseRecommender:
 - 예시: "브리지: 둔근/햄스트링 강화로 무릎 안정성에 도움, OA 환자이며 NRS 5로 저충격 코어 운동이 적합"
 
 ## 요청
-환자에게 **최적화된** 운동 {settings.min_exercises}~{settings.max_exercises}개를 선택하세요.
-반드시 환자 특성을 고려하여 **개인화된** 조합을 구성하세요.
+아래 후보 운동 중 환자에게 **최적화된** 운동 {settings.min_exercises}~{settings.max_exercises}개를 선택하세요.
+반드시 아래 환자 데이터를 고려하여 **개인화된** 조합을 구성하세요.
 
 다음 JSON 형식으로 응답하세요:
 {{
@@ -260,19 +414,96 @@ class ExerciseRecommender:
     }},
     "combination_rationale": {{
         "why_together": "이 운동들의 시너지 효과",
-        "bucket_coverage": "{user_input.bucket} 치료에 적합한 이유",
+        "bucket_coverage": "진단 버킷 치료에 적합한 이유",
         "progression_logic": "순서 배치 논리"
     }},
     "patient_fit": {{
-        "age_consideration": "나이({demo.age}세) 고려 내용",
-        "bmi_consideration": "BMI({demo.bmi:.1f}) 고려 내용",
-        "nrs_consideration": "통증({user_input.nrs}/10) 고려 내용",
-        "physical_level_fit": "신체 Lv {physical.level} 적합성"
+        "age_consideration": "환자 나이 고려 내용",
+        "bmi_consideration": "환자 BMI 고려 내용",
+        "nrs_consideration": "통증(NRS) 고려 내용",
+        "physical_level_fit": "신체 레벨 적합성"
     }},
     "reasoning": "전체 추천 요약 (2-3문장)"
 }}
 """
-        return prompt
+
+    def _build_reasons_prompt(
+        self,
+        recommendations: List[RecommendedExercise],
+        user_input: ExerciseRecommendationInput,
+        adjustments: Optional[DifficultyAdjustment],
+    ) -> str:
+        """LLM 프롬프트 구성 - 선택된 운동의 이유/요약 작성용 (운동 선택 없음)
+
+        _build_prompt와 같이 고정 지침을 앞에, 환자별 데이터를 뒤에 둔다.
+        """
+        demo = user_input.demographics
+        physical = user_input.physical_score
+
+        exercises_str = "\n".join(
+            f"{r.priority}. {r.exercise_id}: {r.name_kr} "
+            f"(난이도: {r.difficulty}, 기능: {', '.join(r.function_tags)}, "
+            f"세트: {r.sets}x{r.reps}, 휴식: {r.rest})"
+            for r in recommendations
+        )
+        patient_profile = self._analyze_patient_profile(demo, user_input.nrs, physical)
+
+        adjustment_str = ""
+        if adjustments and adjustments.has_changes:
+            adjustment_str = (
+                f"\n## 사후 설문 기반 조정\n"
+                f"- 난이도 {adjustments.difficulty_delta:+d}, 세트 {adjustments.sets_delta:+d}, "
+                f"반복 {adjustments.reps_delta:+d}\n"
+            )
+
+        return f"""
+## reason 작성 규칙
+- 각 운동마다 1~2문장으로 작성
+- 포함 필수: (a) 어떤 기능/근육을 강화하는지, (b) 통증/나이/BMI/버킷에 왜 맞는지, (c) 안전성/강도 배려 한 줄
+
+## 요청
+운동 선택과 순서는 이미 확정되었습니다. 운동을 추가/제외하지 말고 추천 이유와 요약만 작성하세요.
+reasons에는 아래 확정된 운동마다 운동 ID를 키로 한 항목을 작성하세요.
+
+다음 JSON 형식으로 응답하세요:
+{{
+    "reasons": {{
+        "E01": "이 환자에게 추천하는 구체적 이유",
+        "E02": "이 환자에게 추천하는 구체적 이유"
+    }},
+    "combination_rationale": {{
+        "why_together": "이 운동들의 시너지 효과",
+        "bucket_coverage": "진단 버킷 치료에 적합한 이유",
+        "progression_logic": "순서 배치 논리"
+    }},
+    "patient_fit": {{
+        "age_consideration": "환자 나이 고려 내용",
+        "bmi_consideration": "환자 BMI 고려 내용",
+        "nrs_consideration": "통증(NRS) 고려 내용",
+        "physical_level_fit": "신체 레벨 적합성"
+    }},
+    "reasoning": "전체 추천 요약 (2-3문장)"
+}}
+
+---
+# 환자 데이터
+
+## 환자 정보
+- 나이: {demo.age}세
+- 성별: {demo.sex}
+- BMI: {demo.bmi:.1f}
+- 신체 점수: Lv {physical.level} ({physical.total_score}점)
+- 통증 점수 (NRS): {user_input.nrs}/10
+
+## 환자 특성 분석
+{patient_profile}
+
+## 진단 버킷
+{user_input.bucket}
+{adjustment_str}
+## 확정된 운동 루틴 ({len(recommendations)}개, 순서대로)
+{exercises_str}
+"""
 
     def _analyze_patient_profile(
         self,
@@ -359,46 +590,3 @@ class ExerciseRecommender:
                 reasoning += f"- **사후 설문 반영**: {fit['assessment_reflection']}\n"
 
         return reasoning
-
-    def simple_recommend(
-        self,
-        candidates: List[Dict],
-        physical_level: str,
-    ) -> List[RecommendedExercise]:
-        """LLM 없이 간단한 추천"""
-        max_count = {
-            "A": 7,
-            "B": 6,
-            "C": 5,
-            "D": 4,
-        }.get(physical_level, 5)
-
-        # 난이도 순 정렬
-        difficulty_order = {"low": 0, "medium": 1, "high": 2}
-        sorted_candidates = sorted(
-            candidates,
-            key=lambda x: difficulty_order.get(x.get("difficulty", "medium"), 1),
-        )
-
-        recommendations = []
-        for i, ex in enumerate(sorted_candidates[:max_count]):
-            recommendations.append(
-                RecommendedExercise(
-                    exercise_id=ex.get("id", f"E{i+1:02d}"),
-                    name_kr=ex.get("name_kr", ""),
-                    name_en=ex.get("name_en", ""),
-                    difficulty=ex.get("difficulty", "medium"),
-                    function_tags=ex.get("function_tags", []),
-                    target_muscles=ex.get("target_muscles", []),
-                    sets=ex.get("sets", 2),
-                    reps=ex.get("reps", "10회"),
-                    rest=ex.get("rest", "30초"),
-                    reason=f"{ex.get('name_kr', '')}: {', '.join(ex.get('function_tags', []))}",
-                    priority=i + 1,
-                    match_score=0.8 - (i * 0.05),
-                    youtube=ex.get("youtube"),
-                    description=ex.get("description"),
-                )
-            )
-
-        return recommendations
@@ -0,0 +1,246 @@
+"""사용자 상태별 운동 루틴 캐시
+
+운동 추천은 사용자마다 매일 호출되지만 결과를 바꾸는 입력은 드물게 바뀐다.
+(사용자, 부위)마다 마지막 루틴과 그때의 상태 digest를 저장하고,
+digest가 같으면 파이프라인 없이 저장된 루틴을 반환한다.
+
+상태 digest (정규 JSON 해시):
+- 버킷, 신체 레벨(A~D), NRS 구간, 관절 상태, 사후 설문 조정값(난이도/세트/반복/휴식)
+- 자주 건너뛴 운동, 선택 방식(recommendation_mode), 제외 목록 포함 여부
+- 개인화 기준 구간 (나이/BMI), 사후 설문 세션 날짜
+- 부위 운동 DB(exercises.json) 내용 해시, 추천 프롬프트 버전(PROMPT_VERSION)
+
+무효화:
+- 새 버킷/사후 설문 날짜 → digest가 달라져 다음 요청에서 재계산 후 덮어씀
+- 운동 DB 수정/프롬프트 변경 → 해시/버전이 달라져 전체 사용자 루틴이 미스
+- 게이트웨이 postSurvey는 신체 점수에만 반영 → 레벨이 바뀔 때만 digest가 달라짐
+- 그 밖의 강제 재계산 → invalidate() 명시 호출
+
+scripts/precompute_routines.py가 한산한 시간에 활성 사용자 루틴을 미리 채운다
+(프로세스 간 공유를 위해 기본 백엔드는 sqlite).
+"""
+
+import hashlib
+import threading
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.utils import (
+    ResponseCache,
+    create_response_cache,
+    get_logger,
+    make_response_cache_key,
+)
+from exercise_recommendation.models.input import ExerciseRecommendationInput, JointStatus
+from exercise_recommendation.models.output import ExerciseRecommendationOutput
+from exercise_recommendation.models.assessment import DifficultyAdjustment
+from exercise_recommendation.services.recommender import PROMPT_VERSION
+from exercise_recommendation.config import settings
+
+
+logger = get_logger(__name__)
+
+CACHE_NAMESPACE = "routine"
+# digest 구성이 바뀌면 올려서 이전 항목을 모두 미스로 처리
+DIGEST_VERSION = 1
+
+# 구간 경계 (필터/개인화/프롬프트 분기 기준값)
+NRS_BOUNDS: Sequence[int] = (4, 6, 7)            # 0-3 / 4-5 / 6 / 7-10
+AGE_BOUNDS: Sequence[int] = (35, 40, 50, 60, 65, 70)
+BMI_BOUNDS: Sequence[float] = (18.5, 25.0, 30.0, 35.0)
+
+
+def _band(value: float, bounds: Sequence[float]) -> int:
+    """경계값 기준 구간 번호"""
+    return bisect_right(bounds, value)
+
+
+# 부위 → ((mtime_ns, size), 내용 해시), 파일이 바뀔 때만 다시 해시
+_exercise_db_hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_exercise_db_lock = threading.Lock()
+_body_parts: Optional[List[str]] = None
+
+
+def exercise_db_version(body_part: str) -> Optional[str]:
+    """부위 운동 DB 내용 해시 (파일이 없으면 None)"""
+    path = settings.data_dir / "exercise" / body_part / "exercises.json"
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _exercise_db_lock:
+        cached = _exercise_db_hashes.get(body_part)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    content_hash = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+    with _exercise_db_lock:
+        _exercise_db_hashes[body_part] = (signature, content_hash)
+    return content_hash
+
+
+def exercise_body_parts() -> List[str]:
+    """운동 DB가 있는 부위 목록 (최초 호출 시 한 번만 조회)"""
+    global _body_parts
+
+    if _body_parts is None:
+        exercise_dir = settings.data_dir / "exercise"
+        _body_parts = sorted(p.name for p in exercise_dir.iterdir() if p.is_dir())
+    return _body_parts
+
+
+def routine_state(
+    input_data: ExerciseRecommendationInput,
+    adjustments: Optional[DifficultyAdjustment],
+    recommendation_mode: str,
+    include_excluded: bool,
+) -> Dict[str, Any]:
+    """루틴 결과를 결정하는 사용자 상태 (digest 원본)"""
+    joint_status = input_data.joint_status or JointStatus()
+    return {
+        "v": DIGEST_VERSION,
+        "bucket": input_data.bucket,
+        "level": input_data.physical_score.level,
+        "nrs_band": _band(input_data.nrs, NRS_BOUNDS),
+        "age_band": _band(input_data.demographics.age, AGE_BOUNDS),
+        "bmi_band": _band(input_data.demographics.bmi, BMI_BOUNDS),
+        "joint_status": joint_status.model_dump(),
+        "adjustments": adjustments.model_dump() if adjustments else None,
+        "skipped": sorted(set(input_data.skipped_exercises or [])),
+        "sessions": sorted(str(a.session_date) for a in input_data.previous_assessments or []),
+        "last_assessment_date": input_data.last_assessment_date,
+        "mode": recommendation_mode,
+        "include_excluded": include_excluded,
+        "exercise_db": exercise_db_version(input_data.body_part),
+        "prompt_version": PROMPT_VERSION,
+    }
+
+
+class RoutineCache:
+    """(사용자, 부위) → 마지막 루틴 + 상태 digest
+
+    사용 예시:
+        cache = RoutineCache(create_response_cache("sqlite", name="routines"))
+        digest = cache.digest(routine_state(...))
+        output = cache.get(input_data, digest)
+        if output is None:
+            output = pipeline.run(...)
+            cache.put(input_data, digest, output)
+    """
+
+    def __init__(self, store: ResponseCache):
+        """
+        Args:
+            store: 저장소 (ResponseCache 백엔드)
+        """
+        self.store = store
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+
+    @staticmethod
+    def _key(user_id: str, body_part: str) -> str:
+        return make_response_cache_key(
+            "", {"user_id": user_id, "body_part": body_part}, namespace=CACHE_NAMESPACE
+        )
+
+    @staticmethod
+    def digest(state: Dict[str, Any]) -> str:
+        """상태 → 정규 해시"""
+        return make_response_cache_key("", state, namespace=f"{CACHE_NAMESPACE}:state")
+
+    def get(
+        self,
+        input_data: ExerciseRecommendationInput,
+        digest: str,
+    ) -> Optional[ExerciseRecommendationOutput]:
+        """저장된 루틴 (없거나 상태가 다르면 None)"""
+        entry = self.store.get(self._key(input_data.user_id, input_data.body_part))
+        output = None
+        if entry is not None and entry.get("digest") == digest:
+            try:
+                output = ExerciseRecommendationOutput.model_validate(entry["output"])
+            except Exception as e:
+                # 모델 변경 등으로 읽을 수 없는 항목은 미스로 처리
+                logger.warning(f"루틴 캐시 항목 파싱 실패 ({input_data.user_id}/{input_data.body_part}): {e}")
+        with self._stats_lock:
+            if output is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+                if entry is not None:
+                    self._stale += 1
+        return output
+
+    def contains(self, input_data: ExerciseRecommendationInput, digest: str) -> bool:
+        """같은 상태의 루틴 저장 여부 (적중/미스 통계에 넣지 않음, 사전 계산 작업용)"""
+        entry = self.store.get(self._key(input_data.user_id, input_data.body_part))
+        return entry is not None and entry.get("digest") == digest
+
+    def put(
+        self,
+        input_data: ExerciseRecommendationInput,
+        digest: str,
+        output: ExerciseRecommendationOutput,
+    ) -> None:
+        """루틴 저장 (같은 사용자/부위의 이전 루틴을 덮어씀)"""
+        self.store.set(
+            self._key(input_data.user_id, input_data.body_part),
+            {"digest": digest, "output": output.model_dump(mode="json")},
+        )
+
+    def invalidate(self, user_id: str, body_parts: Optional[List[str]] = None) -> None:
+        """
+        사용자 루틴 삭제 (새 사후 설문/버킷 수신 시)
+
+        Args:
+            user_id: 사용자 ID
+            body_parts: 부위 목록 (없으면 운동 DB가 있는 모든 부위)
+        """
+        if body_parts is None:
+            body_parts = exercise_body_parts()
+        for body_part in body_parts:
+            self.store.delete(self._key(user_id, body_part))
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 통계 (stale: 저장된 루틴이 있었지만 상태가 달라진 미스)"""
+        with self._stats_lock:
+            total = self._hits + self._misses
+            return {
+                "backend": self.store.backend,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale": self._stale,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0,
+            }
+
+
+_routine_cache: Optional[RoutineCache] = None
+_routine_cache_lock = threading.Lock()
+
+
+def get_routine_cache() -> Optional[RoutineCache]:
+    """설정 기반 공유 루틴 캐시 반환 (비활성화 시 None)"""
+    global _routine_cache
+
+    if not settings.routine_cache_enabled:
+        return None
+
+    with _routine_cache_lock:
+        if _routine_cache is None:
+            _routine_cache = RoutineCache(
+                create_response_cache(
+                    backend=settings.routine_cache_backend,
+                    ttl_seconds=settings.routine_cache_ttl,
+                    max_items=settings.routine_cache_max_items,
+                    path=settings.routine_cache_path,
+                    redis_url=settings.routine_cache_redis_url,
+                    name="routines",
+                )
+            )
+        return _routine_cache
@@ -0,0 +1,97 @@
+"""LLM 실패 시 규칙 기반 대체 루틴 테스트 (골든셋 페르소나)
+
+llm 모드에서 LLM 호출이 실패하면 DeterministicExerciseSelector로 대체한다.
+골든셋 페르소나마다 대체 루틴이 다음을 만족하는지 확인한다.
+- 운동 수: 레벨별 기본 수를 min_exercises~max_exercises로 제한한 값
+- 카테고리 균형: 후보에 있는 카테고리(warmup/main/cooldown)는 1개 이상 포함
+- 후보 안에서만 중복 없이 선택, 우선순위 1..N
+
+실행:
+    PYTHONPATH=. python -m pytest exercise_recommendation/tests/test_llm_fallback.py -q
+"""
+
+import json
+import os
+from typing import Dict, List
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from exercise_recommendation.models.input import ExerciseRecommendationInput
+from exercise_recommendation.pipeline.recommendation_pipeline import ExerciseRecommendationPipeline
+from exercise_recommendation.services.deterministic_selector import LEVEL_EXERCISE_COUNTS
+from exercise_recommendation.services.personalization import (
+    EXERCISE_CATEGORIES,
+    exercise_categories,
+)
+from exercise_recommendation.config import settings
+
+
+GOLDEN_SET_PATH = settings.data_dir / "evaluation" / "golden_set" / "knee_personas.json"
+
+
+def _golden_personas() -> List[Dict]:
+    with open(GOLDEN_SET_PATH, "r", encoding="utf-8") as f:
+        personas = json.load(f)["personas"]
+    # Red Flag 등으로 버킷이 없는 케이스는 운동 추천 대상 아님
+    return [p for p in personas if p["expected"].get("bucket")]
+
+
+@pytest.fixture(scope="module")
+def pipeline() -> ExerciseRecommendationPipeline:
+    return ExerciseRecommendationPipeline()
+
+
+def _input_from_persona(persona: Dict) -> ExerciseRecommendationInput:
+    data = persona["input"]
+    parts = data["body_parts"]
+    part = next((p for p in parts if p.get("primary")), parts[0])
+    return ExerciseRecommendationInput(
+        user_id=persona["id"],
+        body_part=part["code"],
+        bucket=persona["expected"]["bucket"],
+        physical_score=data.get("physical_score") or {"total_score": 50},
+        demographics=data["demographics"],
+        nrs=part.get("nrs", 5),
+        recommendation_mode="llm",
+    )
+
+
+@pytest.mark.parametrize("persona", _golden_personas(), ids=lambda p: p["id"])
+def test_llm_failure_falls_back_to_balanced_routine(persona: Dict, pipeline):
+    input_data = _input_from_persona(persona)
+    prepared = pipeline.prepare(input_data)
+    output = pipeline.complete(
+        input_data, prepared, include_excluded=False, llm_error="LLM 호출 실패 (테스트)"
+    )
+
+    assert output.llm_fallback
+    assert output.recommendation_mode == "llm"
+
+    # 운동 수
+    level_count = LEVEL_EXERCISE_COUNTS[input_data.physical_score.level]
+    expected_count = min(
+        max(settings.min_exercises, min(settings.max_exercises, level_count)),
+        len(prepared.ordered),
+    )
+    assert len(output.exercises) == expected_count
+    if len(prepared.ordered) >= settings.min_exercises:
+        assert settings.min_exercises <= len(output.exercises) <= settings.max_exercises
+
+    # 후보 안에서 중복 없이 선택
+    candidates = {ex["id"]: ex for ex in prepared.ordered}
+    selected_ids = [ex.exercise_id for ex in output.exercises]
+    assert len(set(selected_ids)) == len(selected_ids)
+    assert set(selected_ids) <= set(candidates)
+    assert [ex.priority for ex in output.exercises] == list(range(1, len(selected_ids) + 1))
+
+    # 카테고리 균형
+    available = {c for ex in prepared.ordered for c in exercise_categories(ex)}
+    covered = {c for ex_id in selected_ids for c in exercise_categories(candidates[ex_id])}
+    assert available <= set(EXERCISE_CATEGORIES)
+    assert covered >= available
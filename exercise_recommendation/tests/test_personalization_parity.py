@@ -0,0 +1,455 @@
+"""PersonalizationService.apply 동등성 테스트
+
+점수 벡터 방식 apply()가 단계별 dict 복사 방식(아래 LegacyPersonalizationService,
+변경 전 구현을 그대로 고정한 사본)과 같은 결과를 내는지 확인한다.
+
+- 골든셋 페르소나: 파이프라인과 같은 필터 후보
+- 나이/BMI/NRS/관절 상태 격자: 무릎 운동 DB 전체 후보
+- 비교: 정렬 순서, 세트/반복/휴식/플래그/우선순위 값 전체, 개인화 요약, 원본 dict 불변
+
+실행:
+    PYTHONPATH=. python -m pytest exercise_recommendation/tests/test_personalization_parity.py -q
+"""
+
+import copy
+import itertools
+import json
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.models import Demographics
+from exercise_recommendation.models.input import JointStatus, PhysicalScore
+from exercise_recommendation.services.exercise_filter import ExerciseFilter
+from exercise_recommendation.services.personalization import PersonalizationService
+from exercise_recommendation.config import settings
+
+
+GOLDEN_SET_PATH = settings.data_dir / "evaluation" / "golden_set" / "knee_personas.json"
+
+# 격자 (분기 경계값 양쪽을 모두 포함)
+AGES = (30, 45, 55, 65, 75)
+WEIGHTS_KG = (50, 65, 80, 95)          # 키 170cm 기준 BMI 17.3 / 22.5 / 27.7 / 32.9
+NRS_VALUES = (0, 3, 4, 5, 6, 7, 9)
+JOINT_CONDITIONS = ("normal", "limited", "unstable")
+ROM_STATUSES = ("normal", "restricted")
+PHASES = ("acute", "subacute", "chronic", "maintenance")
+WEIGHT_BEARING = ("none", "partial", "full")
+
+
+class LegacyPersonalizationService:
+    """변경 전 apply() 구현 (단계별 dict 복사) - 비교 기준으로 고정, 수정 금지"""
+
+    def apply(
+        self,
+        exercises: List[Dict],
+        demographics: Demographics,
+        nrs: int,
+        skipped_exercises: Optional[List[str]] = None,
+        joint_status: Optional[JointStatus] = None,
+    ) -> List[Dict]:
+        if joint_status is None:
+            joint_status = JointStatus()
+
+        personalized = []
+
+        for ex in exercises:
+            adjusted = ex.copy()
+            adjusted = self._adjust_for_age(adjusted, demographics.age)
+            adjusted = self._adjust_for_bmi(adjusted, demographics.bmi)
+            adjusted = self._adjust_for_pain(adjusted, nrs)
+            adjusted = self._adjust_for_joint_load(adjusted, joint_status, demographics)
+            adjusted = self._adjust_for_kinetic_chain(adjusted, joint_status)
+            adjusted = self._adjust_for_rom(adjusted, joint_status)
+            if skipped_exercises and ex.get("id") in skipped_exercises:
+                adjusted["_priority_penalty"] = adjusted.get("_priority_penalty", 0) + 0.1
+            adjusted = self._boost_appropriate_exercises(adjusted, demographics, nrs)
+            adjusted = self._boost_for_joint_status(adjusted, joint_status)
+            personalized.append(adjusted)
+
+        personalized.sort(
+            key=lambda x: (
+                x.get("_priority_boost", 0) - x.get("_priority_penalty", 0)
+            ),
+            reverse=True,
+        )
+
+        personalized = self._ensure_movement_pattern_diversity(personalized)
+
+        return personalized
+
+    def _adjust_for_bmi(self, exercise: Dict, bmi: float) -> Dict:
+        adjusted = exercise.copy()
+        function_tags = exercise.get("function_tags", [])
+
+        if bmi >= 30:
+            if "Strengthening" in function_tags:
+                current_sets = exercise.get("sets", 2)
+                adjusted["sets"] = max(1, current_sets - 1)
+                adjusted["_bmi_adjustment"] = "reduced_load"
+
+            rest_str = exercise.get("rest", "30초")
+            match = re.search(r"(\d+)", rest_str)
+            if match:
+                current_rest = int(match.group(1))
+                adjusted["rest"] = f"{current_rest + 15}초"
+
+        elif bmi >= 25:
+            rest_str = exercise.get("rest", "30초")
+            match = re.search(r"(\d+)", rest_str)
+            if match:
+                current_rest = int(match.group(1))
+                adjusted["rest"] = f"{current_rest + 5}초"
+            adjusted["_bmi_adjustment"] = "moderate"
+
+        return adjusted
+
+    def _boost_appropriate_exercises(
+        self,
+        exercise: Dict,
+        demographics: Demographics,
+        nrs: int,
+    ) -> Dict:
+        adjusted = exercise.copy()
+        function_tags = exercise.get("function_tags", [])
+        difficulty = exercise.get("difficulty", "medium")
+        boost = adjusted.get("_priority_boost", 0)
+
+        age = demographics.age
+        bmi = demographics.bmi
+
+        if age >= 65:
+            if "Balance" in function_tags or "Stability" in function_tags:
+                boost += 0.15
+            if difficulty == "low":
+                boost += 0.1
+
+        if bmi >= 30:
+            if "Mobility" in function_tags or "Stretching" in function_tags:
+                boost += 0.1
+            if difficulty == "low":
+                boost += 0.05
+
+        if nrs >= 6:
+            if "Mobility" in function_tags:
+                boost += 0.15
+            if difficulty == "low":
+                boost += 0.1
+
+        if age < 40 and nrs < 4:
+            if "Strengthening" in function_tags:
+                boost += 0.1
+
+        adjusted["_priority_boost"] = boost
+        return adjusted
+
+    def _adjust_for_age(self, exercise: Dict, age: int) -> Dict:
+        adjusted = exercise.copy()
+
+        if age >= 65:
+            current_sets = exercise.get("sets", 2)
+            adjusted["sets"] = max(1, current_sets - 1)
+
+            rest_str = exercise.get("rest", "30초")
+            current_rest = int(rest_str.replace("초", "").strip())
+            adjusted["rest"] = f"{current_rest + 15}초"
+
+            adjusted["_age_adjustment"] = "elderly_safe"
+
+        elif age >= 50:
+            rest_str = exercise.get("rest", "30초")
+            current_rest = int(rest_str.replace("초", "").strip())
+            adjusted["rest"] = f"{current_rest + 10}초"
+
+            adjusted["_age_adjustment"] = "moderate"
+
+        return adjusted
+
+    def _adjust_for_pain(self, exercise: Dict, nrs: int) -> Dict:
+        adjusted = exercise.copy()
+
+        if nrs >= 7:
+            current_sets = exercise.get("sets", 2)
+            adjusted["sets"] = max(1, current_sets - 1)
+
+            reps_str = exercise.get("reps", "10회")
+            match = re.search(r"(\d+)", reps_str)
+            if match:
+                current_reps = int(match.group(1))
+                adjusted["reps"] = f"{max(5, current_reps - 3)}회"
+
+            adjusted["_pain_adjustment"] = "reduced_intensity"
+
+        elif nrs >= 4:
+            reps_str = exercise.get("reps", "10회")
+            match = re.search(r"(\d+)", reps_str)
+            if match:
+                current_reps = int(match.group(1))
+                adjusted["reps"] = f"{max(5, current_reps - 2)}회"
+
+            adjusted["_pain_adjustment"] = "moderate_intensity"
+
+        return adjusted
+
+    def _adjust_for_joint_load(
+        self,
+        exercise: Dict,
+        joint_status: JointStatus,
+        demographics: Demographics,
+    ) -> Dict:
+        adjusted = exercise.copy()
+        joint_load = exercise.get("joint_load", "medium")
+        preferred_loads = joint_status.preferred_joint_load
+
+        if joint_load in preferred_loads:
+            boost = adjusted.get("_priority_boost", 0)
+            if joint_load == preferred_loads[0]:
+                boost += 0.2
+            else:
+                boost += 0.1
+            adjusted["_priority_boost"] = boost
+            adjusted["_joint_load_match"] = True
+        else:
+            penalty = adjusted.get("_priority_penalty", 0)
+            penalty += 0.15
+            adjusted["_priority_penalty"] = penalty
+            adjusted["_joint_load_match"] = False
+
+        if demographics.bmi >= 30 and joint_load == "medium":
+            current_sets = exercise.get("sets", 2)
+            adjusted["sets"] = max(1, current_sets - 1)
+            adjusted["_bmi_joint_load_adjustment"] = True
+
+        return adjusted
+
+    def _adjust_for_kinetic_chain(
+        self,
+        exercise: Dict,
+        joint_status: JointStatus,
+    ) -> Dict:
+        adjusted = exercise.copy()
+        kinetic_chain = exercise.get("kinetic_chain", "OKC")
+        preferred_chains = joint_status.preferred_kinetic_chain
+
+        boost = adjusted.get("_priority_boost", 0)
+
+        if kinetic_chain in preferred_chains:
+            if joint_status.rehabilitation_phase == "acute" and kinetic_chain == "OKC":
+                boost += 0.15
+            elif kinetic_chain in preferred_chains:
+                boost += 0.05
+            adjusted["_kinetic_chain_match"] = True
+        else:
+            if joint_status.rehabilitation_phase == "acute" and kinetic_chain == "CKC":
+                penalty = adjusted.get("_priority_penalty", 0)
+                penalty += 0.2
+                adjusted["_priority_penalty"] = penalty
+                adjusted["_kinetic_chain_warning"] = "급성기에 CKC 운동 주의"
+            adjusted["_kinetic_chain_match"] = False
+
+        adjusted["_priority_boost"] = boost
+        return adjusted
+
+    def _adjust_for_rom(
+        self,
+        exercise: Dict,
+        joint_status: JointStatus,
+    ) -> Dict:
+        adjusted = exercise.copy()
+        required_rom = exercise.get("required_rom", "medium")
+        preferred_rom = joint_status.preferred_rom
+
+        boost = adjusted.get("_priority_boost", 0)
+
+        if required_rom in preferred_rom:
+            if joint_status.rom_status == "restricted" and required_rom == "small":
+                boost += 0.15
+            else:
+                boost += 0.05
+            adjusted["_rom_match"] = True
+        else:
+            if joint_status.rom_status == "restricted" and required_rom == "medium":
+                penalty = adjusted.get("_priority_penalty", 0)
+                penalty += 0.1
+                adjusted["_priority_penalty"] = penalty
+                adjusted["_rom_warning"] = "가동범위 제한 시 주의"
+            adjusted["_rom_match"] = False
+
+        adjusted["_priority_boost"] = boost
+        return adjusted
+
+    def _boost_for_joint_status(
+        self,
+        exercise: Dict,
+        joint_status: JointStatus,
+    ) -> Dict:
+        adjusted = exercise.copy()
+        boost = adjusted.get("_priority_boost", 0)
+
+        movement_pattern = exercise.get("movement_pattern", "")
+        function_tags = exercise.get("function_tags", [])
+
+        phase = joint_status.rehabilitation_phase
+
+        if phase == "acute":
+            if movement_pattern == "모빌리티" or "Mobility" in function_tags:
+                boost += 0.15
+        elif phase == "subacute":
+            if movement_pattern in ["모빌리티", "브리지"]:
+                boost += 0.1
+        elif phase == "chronic":
+            if movement_pattern in ["스쿼트", "런지", "브리지"]:
+                boost += 0.1
+            if "Strength" in function_tags:
+                boost += 0.05
+        else:
+            if "Balance" in function_tags or "Stability" in function_tags:
+                boost += 0.05
+
+        if joint_status.joint_condition == "unstable":
+            if "Stability" in function_tags:
+                boost += 0.15
+
+        adjusted["_priority_boost"] = boost
+        return adjusted
+
+    def _ensure_movement_pattern_diversity(
+        self,
+        exercises: List[Dict],
+        max_same_pattern: int = 3,
+    ) -> List[Dict]:
+        if len(exercises) <= max_same_pattern:
+            return exercises
+
+        pattern_counts = Counter(
+            ex.get("movement_pattern", "기타") for ex in exercises
+        )
+
+        most_common_pattern, most_common_count = pattern_counts.most_common(1)[0]
+        if most_common_count > len(exercises) * 0.6:
+            by_pattern: Dict[str, List[Dict]] = {}
+            for ex in exercises:
+                pattern = ex.get("movement_pattern", "기타")
+                if pattern not in by_pattern:
+                    by_pattern[pattern] = []
+                by_pattern[pattern].append(ex)
+
+            reordered = []
+            pattern_lists = list(by_pattern.values())
+            max_len = max(len(lst) for lst in pattern_lists)
+
+            for i in range(max_len):
+                for lst in pattern_lists:
+                    if i < len(lst):
+                        reordered.append(lst[i])
+
+            return reordered
+
+        return exercises
+
+    def get_personalization_summary(self, exercises: List[Dict]) -> Dict:
+        return {
+            "total_exercises": len(exercises),
+            "joint_load_matched": sum(1 for ex in exercises if ex.get("_joint_load_match")),
+            "kinetic_chain_matched": sum(1 for ex in exercises if ex.get("_kinetic_chain_match")),
+            "rom_matched": sum(1 for ex in exercises if ex.get("_rom_match")),
+            "movement_patterns": Counter(ex.get("movement_pattern", "기타") for ex in exercises),
+            "warnings": [
+                ex.get("_rom_warning") or ex.get("_kinetic_chain_warning")
+                for ex in exercises
+                if ex.get("_rom_warning") or ex.get("_kinetic_chain_warning")
+            ],
+        }
+
+
+@pytest.fixture(scope="module")
+def exercise_filter() -> ExerciseFilter:
+    return ExerciseFilter()
+
+
+@pytest.fixture(scope="module")
+def knee_exercises(exercise_filter: ExerciseFilter) -> List[Dict]:
+    return exercise_filter._load_exercises("knee")
+
+
+def _assert_parity(
+    candidates: List[Dict],
+    demographics: Demographics,
+    nrs: int,
+    skipped: Optional[List[str]],
+    joint_status: Optional[JointStatus],
+) -> None:
+    """같은 입력으로 두 구현을 실행해 결과 비교"""
+    snapshot = copy.deepcopy(candidates)
+    service = PersonalizationService()
+
+    result = service.apply(candidates, demographics, nrs, skipped, joint_status)
+    # 원본 dict(필터 인덱스 공유)는 수정되지 않아야 함
+    assert candidates == snapshot
+    expected = LegacyPersonalizationService().apply(
+        copy.deepcopy(candidates), demographics, nrs, skipped, joint_status
+    )
+
+    assert [ex["id"] for ex in result] == [ex["id"] for ex in expected]
+    for actual, legacy in zip(result, expected):
+        assert actual.copy() == legacy, actual["id"]
+    assert service.get_personalization_summary(result) == (
+        LegacyPersonalizationService().get_personalization_summary(expected)
+    )
+
+
+def _golden_personas() -> List[Dict]:
+    with open(GOLDEN_SET_PATH, "r", encoding="utf-8") as f:
+        personas = json.load(f)["personas"]
+    # Red Flag 등으로 버킷이 없는 케이스는 운동 추천 대상 아님
+    return [p for p in personas if p["expected"].get("bucket")]
+
+
+@pytest.mark.parametrize("persona", _golden_personas(), ids=lambda p: p["id"])
+def test_golden_persona_parity(persona: Dict, exercise_filter: ExerciseFilter):
+    data = persona["input"]
+    parts = data["body_parts"]
+    part = next((p for p in parts if p.get("primary")), parts[0])
+    demographics = Demographics(**data["demographics"])
+    physical_score = PhysicalScore(**(data.get("physical_score") or {"total_score": 50}))
+    nrs = part.get("nrs", 5)
+
+    candidates, _ = exercise_filter.filter_for_bucket(
+        body_part=part["code"],
+        bucket=persona["expected"]["bucket"],
+        physical_score=physical_score,
+        nrs=nrs,
+    )
+    _assert_parity(list(candidates), demographics, nrs, None, None)
+
+
+@pytest.mark.parametrize("age", AGES)
+def test_grid_parity(age: int, knee_exercises: List[Dict]):
+    skipped = [knee_exercises[0]["id"], knee_exercises[-1]["id"]]
+    joint_statuses = [
+        JointStatus(
+            joint_condition=condition,
+            rom_status=rom,
+            rehabilitation_phase=phase,
+            weight_bearing_tolerance=weight_bearing,
+        )
+        for condition, rom, phase, weight_bearing in itertools.product(
+            JOINT_CONDITIONS, ROM_STATUSES, PHASES, WEIGHT_BEARING
+        )
+    ]
+    for weight_kg, nrs, joint_status in itertools.product(WEIGHTS_KG, NRS_VALUES, joint_statuses):
+        demographics = Demographics(age=age, sex="female", height_cm=170, weight_kg=weight_kg)
+        # 건너뛴 운동 유무는 NRS 짝/홀로 번갈아 적용
+        _assert_parity(
+            knee_exercises,
+            demographics,
+            nrs,
+            skipped if nrs % 2 else None,
+            joint_status,
+        )
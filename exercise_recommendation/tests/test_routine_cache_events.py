@@ -0,0 +1,76 @@
+"""루틴 캐시 적중 시 스트리밍 이벤트 테스트
+
+캐시된 루틴을 반환할 때도 계산 경로와 같은 exercise → llm_reasoning 이벤트를
+보내는지 확인한다 (스트리밍 클라이언트가 result만 받지 않도록).
+LLM 호출이 없도록 deterministic 선택 방식을 사용한다.
+
+실행:
+    PYTHONPATH=. python -m pytest exercise_recommendation/tests/test_routine_cache_events.py -q
+"""
+
+import os
+from typing import Dict, List, Tuple
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from shared.utils import create_response_cache
+from shared.utils.progress import EVENT_EXERCISE, EVENT_REASONING, progress_listener
+from exercise_recommendation.models.input import ExerciseRecommendationInput
+from exercise_recommendation.pipeline.recommendation_pipeline import ExerciseRecommendationPipeline
+from exercise_recommendation.services.routine_cache import RoutineCache
+
+
+def _input() -> ExerciseRecommendationInput:
+    return ExerciseRecommendationInput.model_validate(
+        {
+            "user_id": "stream-user",
+            "body_part": "knee",
+            "bucket": "OA",
+            "physical_score": {"total_score": 60},
+            "demographics": {"age": 58, "sex": "female", "height_cm": 160, "weight_kg": 62},
+            "nrs": 4,
+            "recommendation_mode": "deterministic",
+        }
+    )
+
+
+def _run_recording(pipeline, input_data) -> Tuple[object, List[Tuple[str, Dict]]]:
+    events: List[Tuple[str, Dict]] = []
+    with progress_listener(lambda event, data: events.append((event, data))):
+        output = pipeline.run(input_data, include_excluded=False)
+    return output, events
+
+
+def test_cache_hit_emits_same_events():
+    cache = RoutineCache(create_response_cache("memory", name="routines-test"))
+    pipeline = ExerciseRecommendationPipeline(routine_cache=cache)
+    input_data = _input()
+
+    computed, computed_events = _run_recording(pipeline, input_data)
+    cached, cached_events = _run_recording(pipeline, input_data)
+
+    assert cache.stats()["hits"] == 1
+    assert [e.exercise_id for e in cached.exercises] == [e.exercise_id for e in computed.exercises]
+
+    def summarize(events):
+        return (
+            [data["exercise"]["exercise_id"] for event, data in events if event == EVENT_EXERCISE],
+            "".join(data["delta"] for event, data in events if event == EVENT_REASONING),
+        )
+
+    assert summarize(computed_events)[0]
+    assert summarize(cached_events) == summarize(computed_events)
+    assert cached_events[-1][0] == EVENT_REASONING
+
+
+def test_cache_hit_without_listener_emits_nothing():
+    cache = RoutineCache(create_response_cache("memory", name="routines-test"))
+    pipeline = ExerciseRecommendationPipeline(routine_cache=cache)
+    input_data = _input()
+
+    pipeline.run(input_data, include_excluded=False)
+    assert pipeline.run(input_data, include_excluded=False).exercises
@@ -6,7 +6,10 @@
 포트: 8000 (기본)
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from contextlib import asynccontextmanager
+from contextvars import copy_context
 from datetime import datetime, date
 import json
 import os
@@ -15,10 +18,10 @@ import re
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, HTTPException, Body, Query
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
-from openai import OpenAI
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 import sys
 from pathlib import Path
@@ -32,25 +35,82 @@ from gateway.models import (
     AppExerciseRequest,
     AppExerciseResponse,
 )
-from gateway.services import OrchestrationService
+from gateway.services import (
+    OrchestrationService,
+    PipelineExecutor,
+    ExecutorSaturatedError,
+    PhysicalScoreEstimate,
+    get_physical_score_estimator,
+)
+from gateway.services.physical_score import log_calibration_sample
 from exercise_recommendation.models.input import ExerciseRecommendationInput
 from exercise_recommendation.models.output import ExerciseRecommendationOutput
 from bucket_inference.models.input import NaturalLanguageInput
+from bucket_inference.services.red_flag_service import shutdown_background_pool
 from shared.models import Demographics, BodyPartInput, PhysicalScore
+from shared.utils.openai_client import aclose_openai_clients, get_openai_client
+from shared.utils.progress import EVENT_EXERCISE, progress_listener
+from shared.utils.timing import (
+    STAGE_PHYSICAL_SCORE_LLM,
+    observe_request,
+    record_usage,
+    recording,
+    render_metrics,
+    span,
+)
 
 
 # 오케스트레이션 서비스 (싱글톤)
 orchestration_service: OrchestrationService = None
 
+# 블로킹 파이프라인 실행기 (싱글톤)
+pipeline_executor: PipelineExecutor = None
+
+# 신체 점수 산정 방식
+# - llm: GPT가 점수/근거 산정 (기본값, 로컬 추정은 보정 로그용으로만 계산)
+# - local: 로컬 추정기만 사용 (LLM 호출 없음, 근거는 템플릿 문장)
+# - local_then_llm_async: 점수는 로컬 추정, physicalScoreReasoning 문장만 GPT로 병행 생성
+# 로컬 계수는 아직 GPT 점수 로그로 보정되지 않았으므로, scripts/fit_physical_score.py
+# 재보정 결과가 커밋되기 전까지 local/local_then_llm_async는 명시적으로 선택할 때만 사용
+PHYSICAL_SCORE_MODES = ("local", "llm", "local_then_llm_async")
+PHYSICAL_SCORE_MODE = os.getenv("PHYSICAL_SCORE_MODE", "llm").lower()
+if PHYSICAL_SCORE_MODE not in PHYSICAL_SCORE_MODES:
+    raise ValueError(
+        f"지원하지 않는 PHYSICAL_SCORE_MODE: {PHYSICAL_SCORE_MODE} ({'/'.join(PHYSICAL_SCORE_MODES)})"
+    )
+# local_then_llm_async: 운동 추천 완료 후 근거 문장 추가 대기 상한 (초, 초과 시 템플릿 문장)
+PHYSICAL_SCORE_REASONING_TIMEOUT = float(os.getenv("PHYSICAL_SCORE_REASONING_TIMEOUT", "3"))
+
+# 신체 점수 LLM 호출과 운동 후보 준비(필터링/개인화)를 겹쳐 실행
+# (PHYSICAL_SCORE_MODE=llm(기본)에서만 적용, local 계열은 점수가 즉시 나오므로 사용하지 않음,
+#  SPECULATIVE_EXERCISE_PREPARE=false면 점수 확정 후 순차 실행)
+SPECULATIVE_EXERCISE_PREPARE = os.getenv("SPECULATIVE_EXERCISE_PREPARE", "true").lower() != "false"
+_physical_score_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GATEWAY_PHYSICAL_SCORE_WORKERS", "16")),
+    thread_name_prefix="physical-score",
+)
+# local_then_llm_async 근거 문장 호출 전용 풀 (대기 시간 초과 후에도 OpenAI 타임아웃까지
+# 작업자를 점유하므로 점수 산정 풀과 분리, 포화 시 대기열에서 기다리다 템플릿 근거 사용)
+_physical_score_reasoning_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GATEWAY_PHYSICAL_SCORE_REASONING_WORKERS", "4")),
+    thread_name_prefix="physical-score-reasoning",
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 라이프사이클 관리"""
-    global orchestration_service
+    global orchestration_service, pipeline_executor
     print("Gateway Service 시작 중...")
     orchestration_service = OrchestrationService()
+    pipeline_executor = PipelineExecutor()
     print("Gateway Service 준비 완료")
     yield
+    pipeline_executor.shutdown()
+    _physical_score_pool.shutdown(wait=False, cancel_futures=True)
+    _physical_score_reasoning_pool.shutdown(wait=False, cancel_futures=True)
+    shutdown_background_pool()
+    await aclose_openai_clients()
     print("Gateway Service 종료")
 
 
@@ -178,6 +238,18 @@ def _error_payload(error: Exception, hint: str = None) -> dict:
     }
 
 
+def _saturated_exception(error: ExecutorSaturatedError) -> HTTPException:
+    """대기열 초과 시 503 응답"""
+    return HTTPException(
+        status_code=503,
+        detail=_error_payload(
+            error,
+            hint="요청이 많아 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.",
+        ),
+        headers={"Retry-After": "1"},
+    )
+
+
 def _clamp_physical_score(score: int) -> int:
     return max(0, min(100, int(score)))
 
@@ -191,8 +263,7 @@ def _calc_bmi(height_cm: int, weight_kg: int) -> float:
 
 def _call_openai_json(prompt: str) -> dict | None:
     try:
-        client = OpenAI()
-        response = client.chat.completions.create(
+        response = get_openai_client().chat.completions.create(
             model=os.getenv("OPENAI_MODEL", "gpt-4o"),
             messages=[
                 {
@@ -204,13 +275,14 @@ def _call_openai_json(prompt: str) -> dict | None:
             response_format={"type": "json_object"},
             temperature=0.2,
         )
+        record_usage(getattr(response, "usage", None), call="physical_score")
         content = response.choices[0].message.content
         return json.loads(content) if content else None
     except Exception:
         return None
 
 
-def _gpt_physical_score_from_diagnose(request: AppDiagnoseRequest) -> int:
+def _gpt_physical_score_from_diagnose(request: AppDiagnoseRequest) -> int | None:
     age = _age_from_birthdate(request.birth_date)
     bmi = _calc_bmi(request.height, request.weight)
     prompt = (
@@ -228,12 +300,28 @@ def _gpt_physical_score_from_diagnose(request: AppDiagnoseRequest) -> int:
         f"- pain_duration: {request.pain_duration}\n"
         f"- pain_started: {request.pain_started_date}\n"
     )
-    data = _call_openai_json(prompt) or {}
+    with span(STAGE_PHYSICAL_SCORE_LLM):
+        data = _call_openai_json(prompt) or {}
     score = data.get("total_score") or data.get("totalScore")
     try:
         return _clamp_physical_score(int(float(score)))
     except (TypeError, ValueError):
-        return 50
+        return None
+
+
+def _physical_score_from_diagnose(request: AppDiagnoseRequest) -> int:
+    """진단 요청 신체 점수 (PHYSICAL_SCORE_MODE 기준, GPT 실패 시 로컬 추정)"""
+    age = _age_from_birthdate(request.birth_date)
+    bmi = _calc_bmi(request.height, request.weight)
+    estimate = get_physical_score_estimator().estimate_diagnose(age, bmi, request.pain_level)
+    # 진단 응답에는 근거 문장이 없으므로 llm 모드에서만 GPT 호출
+    if PHYSICAL_SCORE_MODE != "llm":
+        return estimate.total_score
+    score = _gpt_physical_score_from_diagnose(request)
+    if score is None:
+        return estimate.total_score
+    log_calibration_sample(estimate, score)
+    return score
 
 
 def _summarize_previous_routine(previous_routine) -> str:
@@ -248,28 +336,24 @@ def _summarize_previous_routine(previous_routine) -> str:
     return "; ".join(parts)
 
 
-def _gpt_physical_score_for_exercise(
+def _exercise_score_prompt_fields(
     request: AppExerciseRequest,
     demographics: Demographics,
     bucket: str,
     body_part: str,
     base_score: int | None,
-) -> tuple[int, str | None]:
-    bmi = demographics.bmi
+) -> str:
+    """운동 추천 신체 점수 프롬프트 공통 입력 항목"""
     routine_summary = _summarize_previous_routine(
         request.post_survey.previous_routine if request.post_survey else None
     )
-    prompt = (
-        "Estimate or update a physical ability score between 0 and 100.\n"
-        "If base_score is provided, adjust it using post-survey feedback and routine summary.\n"
-        "If base_score is not provided, estimate from profile and pre-survey responses.\n"
-        "Return JSON with keys total_score and reasoning (1-2 sentences).\n"
+    return (
         f"- base_score: {base_score if base_score is not None else 'None'}\n"
         f"- age: {demographics.age}\n"
         f"- gender: {demographics.sex}\n"
         f"- height_cm: {demographics.height_cm}\n"
         f"- weight_kg: {demographics.weight_kg}\n"
-        f"- bmi: {bmi:.1f}\n"
+        f"- bmi: {demographics.bmi:.1f}\n"
         f"- bucket: {bucket}\n"
         f"- body_part: {body_part}\n"
         f"- pain_level: {request.pain_level}/10\n"
@@ -282,13 +366,56 @@ def _gpt_physical_score_for_exercise(
         f"- post_survey_sweat: {request.post_survey.sweat_response if request.post_survey else None}\n"
         f"- previous_routine: {routine_summary}\n"
     )
-    data = _call_openai_json(prompt) or {}
+
+
+def _gpt_physical_score_for_exercise(
+    request: AppExerciseRequest,
+    demographics: Demographics,
+    bucket: str,
+    body_part: str,
+    base_score: int | None,
+) -> tuple[int | None, str | None]:
+    """GPT 신체 점수 산정 (실패 시 (None, None))"""
+    prompt = (
+        "Estimate or update a physical ability score between 0 and 100.\n"
+        "If base_score is provided, adjust it using post-survey feedback and routine summary.\n"
+        "If base_score is not provided, estimate from profile and pre-survey responses.\n"
+        "Return JSON with keys total_score and reasoning (1-2 sentences).\n"
+        + _exercise_score_prompt_fields(request, demographics, bucket, body_part, base_score)
+    )
+    with span(STAGE_PHYSICAL_SCORE_LLM):
+        data = _call_openai_json(prompt) or {}
     score = data.get("total_score") or data.get("totalScore")
     reasoning = data.get("reasoning")
     try:
         return _clamp_physical_score(int(float(score))), reasoning
     except (TypeError, ValueError):
-        return _clamp_physical_score(base_score if base_score is not None else 50), None
+        return None, None
+
+
+def _gpt_physical_score_reasoning(
+    request: AppExerciseRequest,
+    exercise_input: ExerciseRecommendationInput,
+    base_score: int | None,
+) -> str | None:
+    """확정된 신체 점수에 대한 근거 문장만 GPT로 생성 (점수는 변경하지 않음)"""
+    prompt = (
+        "A physical ability score between 0 and 100 has already been computed.\n"
+        f"- total_score: {exercise_input.physical_score.total_score}\n"
+        "Explain the score from the profile, pre-survey and post-survey inputs below.\n"
+        "Return JSON with key reasoning (1-2 sentences).\n"
+        + _exercise_score_prompt_fields(
+            request,
+            exercise_input.demographics,
+            exercise_input.bucket,
+            exercise_input.body_part,
+            base_score,
+        )
+    )
+    with span(STAGE_PHYSICAL_SCORE_LLM):
+        data = _call_openai_json(prompt) or {}
+    reasoning = data.get("reasoning")
+    return reasoning if isinstance(reasoning, str) and reasoning.strip() else None
 
 
 def _age_from_birthdate(birth_date: date) -> int:
@@ -435,7 +562,7 @@ def _build_unified_from_app(request: AppDiagnoseRequest) -> UnifiedRequest:
         "natural_language": nl,
         "raw_survey_responses": raw_responses,
     }
-    physical_score = _gpt_physical_score_from_diagnose(request)
+    physical_score = _physical_score_from_diagnose(request)
     data["physical_score"] = PhysicalScore(total_score=physical_score)
     return UnifiedRequest(**data)
 
@@ -459,9 +586,15 @@ def _map_bucket(value: str) -> str:
     return mapping[key]
 
 
-def _build_exercise_input_from_app(
+def _build_exercise_base_from_app(
     request: AppExerciseRequest,
-) -> tuple[ExerciseRecommendationInput, str | None]:
+) -> tuple[ExerciseRecommendationInput, int | None, bool]:
+    """앱 요청 → 운동 추천 입력 (신체 점수 산정 전)
+
+    Returns:
+        (입력, 기준 점수, 신체 점수 산정 필요 여부)
+        산정이 필요하면 입력의 physical_score는 임시값(기준 점수 또는 50)
+    """
     bucket_raw = request.bucket or request.diagnosis_type
     body_part_raw = request.body_part or request.pain_area
     demo_raw = request.demographics
@@ -511,59 +644,401 @@ def _build_exercise_input_from_app(
     if physical_score_override is not None:
         base_score = _clamp_physical_score(int(physical_score_override))
 
-    physical_score_reasoning = None
-    if request.post_survey or base_score is None:
-        total_score, physical_score_reasoning = _gpt_physical_score_for_exercise(
-            request=request,
-            demographics=demographics,
-            bucket=bucket,
-            body_part=body_part,
-            base_score=base_score,
-        )
-    else:
-        total_score = base_score
+    needs_score = bool(request.post_survey) or base_score is None
 
     return (
         ExerciseRecommendationInput(
             user_id=str(request.user_id),
             body_part=body_part,
             bucket=bucket,
-            physical_score=PhysicalScore(total_score=total_score),
+            physical_score=PhysicalScore(
+                total_score=base_score if base_score is not None else 50
+            ),
             demographics=demographics,
             nrs=request.pain_level,
+            recommendation_mode=request.recommendation_mode,
         ),
-        physical_score_reasoning,
+        base_score,
+        needs_score,
+    )
+
+
+def _local_physical_score_for_exercise(
+    request: AppExerciseRequest,
+    base_input: ExerciseRecommendationInput,
+    base_score: int | None,
+) -> PhysicalScoreEstimate:
+    """로컬 추정기로 운동 추천 신체 점수 산정"""
+    demographics = base_input.demographics
+    post_survey = request.post_survey
+    feedback = None
+    if post_survey:
+        feedback = {
+            "rpe": post_survey.rpe_response,
+            "muscle": post_survey.muscle_stimulation_response,
+            "sweat": post_survey.sweat_response,
+        }
+    return get_physical_score_estimator().estimate_exercise(
+        age=demographics.age,
+        sex=demographics.sex,
+        bmi=demographics.bmi,
+        pain_level=request.pain_level,
+        squat=request.squat_response,
+        pushup=request.pushup_response,
+        stepup=request.stepup_response,
+        plank=request.plank_response,
+        base_score=base_score,
+        feedback=feedback,
     )
 
 
+def _score_exercise_input(
+    request: AppExerciseRequest,
+    base_input: ExerciseRecommendationInput,
+    base_score: int | None,
+) -> tuple[ExerciseRecommendationInput, str | None]:
+    """신체 점수 산정 후 점수를 반영한 입력 반환
+
+    llm 모드에서만 GPT로 점수를 산정하고 (실패 시 로컬 추정),
+    나머지 모드는 로컬 추정 점수와 템플릿 근거를 사용한다.
+    """
+    estimate = _local_physical_score_for_exercise(request, base_input, base_score)
+    total_score, physical_score_reasoning = estimate.total_score, estimate.reasoning
+    if PHYSICAL_SCORE_MODE == "llm":
+        llm_score, llm_reasoning = _gpt_physical_score_for_exercise(
+            request=request,
+            demographics=base_input.demographics,
+            bucket=base_input.bucket,
+            body_part=base_input.body_part,
+            base_score=base_score,
+        )
+        if llm_score is not None:
+            log_calibration_sample(estimate, llm_score)
+            total_score, physical_score_reasoning = llm_score, llm_reasoning
+    exercise_input = base_input.model_copy(
+        update={"physical_score": PhysicalScore(total_score=total_score)}
+    )
+    return exercise_input, physical_score_reasoning
+
+
+def _build_exercise_input_from_app(
+    request: AppExerciseRequest,
+) -> tuple[ExerciseRecommendationInput, str | None]:
+    base_input, base_score, needs_score = _build_exercise_base_from_app(request)
+    if not needs_score:
+        return base_input, None
+    return _score_exercise_input(request, base_input, base_score)
+
+
+def _recommend_with_local_score(
+    request: AppExerciseRequest,
+) -> tuple[ExerciseRecommendationInput, str | None, ExerciseRecommendationOutput]:
+    """로컬 추정 점수로 즉시 운동 추천 (local / local_then_llm_async 모드)
+
+    local_then_llm_async는 근거 문장 GPT 호출을 운동 추천과 동시에 실행하고,
+    추천 완료 후 PHYSICAL_SCORE_REASONING_TIMEOUT까지만 기다린다
+    (시간 초과/실패 시 템플릿 근거 사용). 근거 호출은 전용 풀
+    (GATEWAY_PHYSICAL_SCORE_REASONING_WORKERS)에서 실행한다.
+    """
+    pipeline = orchestration_service.exercise_pipeline
+    base_input, base_score, needs_score = _build_exercise_base_from_app(request)
+
+    if not needs_score:
+        return base_input, None, pipeline.run(base_input, include_excluded=False)
+
+    exercise_input, score_reasoning = _score_exercise_input(request, base_input, base_score)
+    if PHYSICAL_SCORE_MODE != "local_then_llm_async":
+        return (
+            exercise_input,
+            score_reasoning,
+            pipeline.run(exercise_input, include_excluded=False),
+        )
+
+    reasoning_future = _physical_score_reasoning_pool.submit(
+        copy_context().run, _gpt_physical_score_reasoning, request, exercise_input, base_score
+    )
+    exercise_output = pipeline.run(exercise_input, include_excluded=False)
+    try:
+        llm_reasoning = reasoning_future.result(timeout=PHYSICAL_SCORE_REASONING_TIMEOUT)
+    except FutureTimeoutError:
+        # 호출은 끝까지 실행되지만 전용 풀이라 점수 산정 작업자는 점유하지 않음
+        llm_reasoning = None
+    return exercise_input, llm_reasoning or score_reasoning, exercise_output
+
+
+def _recommend_with_speculative_prepare(
+    request: AppExerciseRequest,
+) -> tuple[ExerciseRecommendationInput, str | None, ExerciseRecommendationOutput]:
+    """신체 점수 LLM 호출 중에 레벨별 운동 후보를 미리 준비
+
+    필터링/개인화는 신체 점수를 허용 난이도로만 사용하므로, 점수 추정과
+    동시에 A~D 레벨별 후보를 계산해 두고 점수가 나오면 해당 레벨 후보로
+    LLM 운동 추천만 실행한다 (임계 경로에서 LLM 왕복 1회 제거).
+    """
+    pipeline = orchestration_service.exercise_pipeline
+    base_input, base_score, needs_score = _build_exercise_base_from_app(request)
+
+    if not needs_score:
+        return base_input, None, pipeline.run(base_input, include_excluded=False)
+
+    # 점수 호출은 별도 스레드 (구간 기록을 위해 현재 컨텍스트 복사)
+    score_future = _physical_score_pool.submit(
+        copy_context().run, _score_exercise_input, request, base_input, base_score
+    )
+    try:
+        prepared_by_level = pipeline.prepare_for_levels(base_input)
+    finally:
+        exercise_input, score_reasoning = score_future.result()
+
+    # run()으로 완료해야 확정 입력 기준 루틴 캐시 조회/저장이 적용됨
+    prepared = prepared_by_level[exercise_input.physical_score.level]
+    return (
+        exercise_input,
+        score_reasoning,
+        pipeline.run(exercise_input, include_excluded=False, prepared=prepared),
+    )
+
+
+def _exercise_app_item(ex_dict: dict, order: int) -> dict:
+    return {
+        "exerciseId": ex_dict.get("exercise_id"),
+        "nameKo": ex_dict.get("name_kr"),
+        "difficulty": _map_difficulty_label(ex_dict.get("difficulty")),
+        "recommendedSets": ex_dict.get("sets"),
+        "recommendedReps": _parse_reps_value(ex_dict.get("reps")),
+        "exerciseOrder": order,
+        "videoUrl": ex_dict.get("youtube"),
+    }
+
+
 def _build_exercises_app(exercises: list) -> list[dict]:
-    exercises_app = []
-    for idx, ex in enumerate(exercises, start=1):
-        ex_dict = ex.model_dump()
-        exercises_app.append(
-            {
-                "exerciseId": ex_dict.get("exercise_id"),
-                "nameKo": ex_dict.get("name_kr"),
-                "difficulty": _map_difficulty_label(ex_dict.get("difficulty")),
-                "recommendedSets": ex_dict.get("sets"),
-                "recommendedReps": _parse_reps_value(ex_dict.get("reps")),
-                "exerciseOrder": idx,
-                "videoUrl": ex_dict.get("youtube"),
-            }
+    return [
+        _exercise_app_item(ex.model_dump(), idx)
+        for idx, ex in enumerate(exercises, start=1)
+    ]
+
+
+def _run_recommend_exercises(request: AppExerciseRequest) -> dict:
+    """운동 추천 동기 실행 (실행기 스레드에서 호출)"""
+    # postSurvey는 신체 점수에만 반영되고 레벨은 루틴 캐시 digest에 포함되므로 무효화하지 않음
+    if PHYSICAL_SCORE_MODE != "llm":
+        exercise_input, score_reasoning, exercise_output = _recommend_with_local_score(request)
+    elif SPECULATIVE_EXERCISE_PREPARE:
+        exercise_input, score_reasoning, exercise_output = _recommend_with_speculative_prepare(
+            request
         )
-    return exercises_app
+    else:
+        exercise_input, score_reasoning = _build_exercise_input_from_app(request)
+        exercise_output = orchestration_service.exercise_pipeline.run(
+            exercise_input, include_excluded=False
+        )
+    exercises_app = _build_exercises_app(exercise_output.exercises)
+    response_payload = {
+        "userId": request.user_id,
+        "routineDate": request.routine_date,
+        "physicalScore": exercise_input.physical_score.total_score,
+        "exercises": exercises_app,
+        "recommendationReason": exercise_output.llm_reasoning,
+    }
+    if score_reasoning:
+        response_payload["physicalScoreReasoning"] = score_reasoning
+    return response_payload
+
+
+def _run_diagnose(request: AppDiagnoseRequest) -> dict:
+    """버킷 추론 동기 실행 (실행기 스레드에서 호출)"""
+    # 앱 입력을 그대로 사용해 추론 (자동 매핑/변환 없음)
+    unified_request = _build_unified_from_app(request)
+    result = orchestration_service.process_diagnosis_only(unified_request)
+    diagnosis = result.diagnosis
+    physical_score_value = None
+    if unified_request.physical_score:
+        physical_score_value = unified_request.physical_score.total_score
+    elif result.survey_data and result.survey_data.physical_score:
+        physical_score_value = result.survey_data.physical_score.total_score
+    if physical_score_value is None:
+        physical_score_value = 50
+    diagnosis_payload = {
+        "body_part": diagnosis.body_part,
+        "final_bucket": diagnosis.final_bucket,
+        "confidence": diagnosis.confidence,
+        "physical_score": physical_score_value,
+        "diagnosisPercentage": diagnosis.diagnosis_percentage,
+        "diagnosisType": diagnosis.diagnosis_type,
+        "diagnosisDescription": diagnosis.diagnosis_description,
+    }
+    return {
+        "diagnosis": diagnosis_payload,
+    }
+
+
+async def _run_pipeline(endpoint: str, func, request, include_timings: bool = False) -> dict:
+    """실행기에서 파이프라인 실행 + 요청 단위 구간 기록
+
+    레코더는 실행기 스레드로 컨텍스트가 복사되므로 대기열 대기 시간을 포함한
+    전체 처리 시간과 단계별 시간이 함께 기록된다.
+    """
+    with recording() as recorder:
+        try:
+            payload = await pipeline_executor.run(endpoint, func, request)
+        finally:
+            observe_request(endpoint, recorder.elapsed_ms / 1000)
+
+    if include_timings:
+        payload["timings"] = recorder.summary()
+    return payload
+
+
+# 오류 응답 힌트 (상태 코드별, 일반/스트리밍 엔드포인트 공통)
+EXERCISE_ERROR_HINTS = {
+    400: "bucket/body_part/인구통계 정보가 백엔드에서 전달되어야 합니다.",
+    500: "환경 변수(OPENAI/PINECONE) 또는 외부 서비스 연결 상태를 확인하세요.",
+}
+DIAGNOSE_ERROR_HINTS = {
+    400: "필수 필드(birthDate/height/weight/gender/painArea/painLevel 등)를 확인하세요.",
+    500: "환경 변수(OPENAI/PINECONE) 또는 외부 서비스 연결 상태를 확인하세요.",
+}
+
+
+def _sse(event: str, data) -> str:
+    """SSE 프레임 (event + JSON data)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _stream_event_app(event: str, data: dict) -> dict:
+    """진행 이벤트 → 앱 형식 (운동은 일반 응답의 exercises 원소와 같은 필드)"""
+    if event == EVENT_EXERCISE:
+        exercise = data["exercise"]
+        return _exercise_app_item(exercise, exercise.get("priority"))
+    return data
+
+
+def _stream_error(error: Exception, hints: dict[int, str]) -> dict:
+    """스트림 도중 오류 → error 이벤트 (일반 엔드포인트의 HTTP 오류와 같은 상태 코드/본문)"""
+    if isinstance(error, ExecutorSaturatedError):
+        exc = _saturated_exception(error)
+        return {"status_code": exc.status_code, "detail": exc.detail}
+    status_code = 400 if isinstance(error, ValueError) else 500
+    return {"status_code": status_code, "detail": _error_payload(error, hint=hints.get(status_code))}
+
+
+def _stream_pipeline(
+    endpoint: str,
+    func,
+    request,
+    include_timings: bool,
+    hints: dict[int, str],
+) -> StreamingResponse:
+    """파이프라인 진행 이벤트를 SSE로 전달하고, 마지막에 일반 응답과 같은 result 이벤트
+
+    이벤트 순서: ranking → red_flag(감지 시) → bucket → exercise... → llm_reasoning... → result
+    (오류 시 error 이벤트로 종료). 중간 이벤트는 미리보기이며 최종 값은 result 기준이다
+    (예: LLM 실패로 규칙 기반 선택에 폴백하면 result의 운동 목록이 달라질 수 있음).
+
+    대기열 초과는 스트림을 열기 전에 확인해 일반 엔드포인트와 같은 503 + Retry-After로 응답한다
+    (확인 직후 대기열이 차는 경우에만 error 이벤트로 전달).
+    """
+    try:
+        pipeline_executor.admit(endpoint)
+    except ExecutorSaturatedError as e:
+        raise _saturated_exception(e)
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def listener(event: str, data: dict) -> None:
+            # 실행기 스레드에서 호출됨
+            loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+        async def run() -> dict:
+            with progress_listener(listener):
+                return await _run_pipeline(endpoint, func, request, include_timings)
+
+        task = asyncio.create_task(run())
+        try:
+            while not task.done():
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    event, data = getter.result()
+                    yield _sse(event, _stream_event_app(event, data))
+                else:
+                    getter.cancel()
+            while not queue.empty():
+                event, data = queue.get_nowait()
+                yield _sse(event, _stream_event_app(event, data))
+
+            try:
+                payload = task.result()
+            except Exception as e:
+                yield _sse("error", _stream_error(e, hints))
+            else:
+                yield _sse("result", payload)
+        finally:
+            # 클라이언트 연결이 끊기면 대기 중단 (실행기 스레드의 작업은 끝까지 실행되고,
+            # 실행 슬롯은 작업 스레드가 끝날 때 반환됨)
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _executor_metrics() -> tuple[dict, dict]:
+    """실행기 통계 → Prometheus 게이지/카운터"""
+    gauges = {
+        "orthocare_executor_in_flight": ("Requests running in the pipeline executor", {}),
+        "orthocare_executor_queue_depth": ("Requests waiting for an executor slot", {}),
+        "orthocare_executor_max_concurrency": ("Per-endpoint concurrency limit", {}),
+    }
+    counters = {
+        "orthocare_executor_completed_total": ("Requests completed successfully by the executor", {}),
+        "orthocare_executor_failed_total": ("Requests that raised or were cancelled in the executor", {}),
+        "orthocare_executor_rejected_total": ("Requests rejected because the queue was full", {}),
+    }
+    if pipeline_executor is None:
+        return gauges, counters
+
+    for name, stats in pipeline_executor.stats()["endpoints"].items():
+        label = f'endpoint="{name}"'
+        gauges["orthocare_executor_in_flight"][1][label] = stats["in_flight"]
+        gauges["orthocare_executor_queue_depth"][1][label] = stats["queue_depth"]
+        gauges["orthocare_executor_max_concurrency"][1][label] = stats["max_concurrency"]
+        counters["orthocare_executor_completed_total"][1][label] = stats["completed"]
+        counters["orthocare_executor_failed_total"][1][label] = stats["failed"]
+        counters["orthocare_executor_rejected_total"][1][label] = stats["rejected"]
+    return gauges, counters
 
 
 @app.get("/health")
 async def health_check():
     """헬스 체크"""
+    routine_cache = (
+        orchestration_service.exercise_pipeline.routine_cache if orchestration_service else None
+    )
     return {
         "status": "healthy",
         "service": "gateway",
         "timestamp": datetime.utcnow().isoformat(),
+        "executor": pipeline_executor.stats() if pipeline_executor else None,
+        "routine_cache": routine_cache.stats() if routine_cache else None,
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 메트릭 (단계별/엔드포인트별 지연 히스토그램 + 실행기 상태)"""
+    gauges, counters = _executor_metrics()
+    return PlainTextResponse(
+        render_metrics(gauges=gauges, counters=counters),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @app.post("/api/v1/recommend-exercises", response_model=AppExerciseResponse)
 async def recommend_exercises(
     request: AppExerciseRequest = Body(
@@ -584,44 +1059,52 @@ async def recommend_exercises(
             "weight": 65,
             "physicalScore": 70,
         },
-    )
+    ),
+    include_timings: bool = Query(False, description="응답에 단계별 처리 시간 포함"),
 ):
     """운동 추천만 실행 (버킷 추론 생략)
 
     앱/백엔드에서 이미 버킷과 사전평가가 있을 때 사용
     """
     try:
-        exercise_input, score_reasoning = _build_exercise_input_from_app(request)
-        exercise_output = orchestration_service.exercise_pipeline.run(exercise_input)
-        exercises_app = _build_exercises_app(exercise_output.exercises)
-        response_payload = {
-            "userId": request.user_id,
-            "routineDate": request.routine_date,
-            "physicalScore": exercise_input.physical_score.total_score,
-            "exercises": exercises_app,
-            "recommendationReason": exercise_output.llm_reasoning,
-        }
-        if score_reasoning:
-            response_payload["physicalScoreReasoning"] = score_reasoning
-        return response_payload
+        return await _run_pipeline(
+            "recommend_exercises", _run_recommend_exercises, request, include_timings
+        )
+    except ExecutorSaturatedError as e:
+        raise _saturated_exception(e)
     except ValueError as e:
         raise HTTPException(
             status_code=400,
-            detail=_error_payload(
-                e,
-                hint="bucket/body_part/인구통계 정보가 백엔드에서 전달되어야 합니다.",
-            ),
+            detail=_error_payload(e, hint=EXERCISE_ERROR_HINTS[400]),
         )
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=_error_payload(
-                e,
-                hint="환경 변수(OPENAI/PINECONE) 또는 외부 서비스 연결 상태를 확인하세요.",
-            ),
+            detail=_error_payload(e, hint=EXERCISE_ERROR_HINTS[500]),
         )
 
 
+@app.post("/api/v1/recommend-exercises/stream")
+async def recommend_exercises_stream(
+    request: AppExerciseRequest,
+    include_timings: bool = Query(False, description="result 이벤트에 단계별 처리 시간 포함"),
+):
+    """운동 추천 (SSE 스트리밍)
+
+    LLM이 선택하는 순서대로 exercise 이벤트(일반 응답의 exercises 원소와 같은 형식),
+    이어서 추천 근거를 llm_reasoning 이벤트({"delta": ...})로 토큰 단위 전달하고,
+    마지막에 일반 응답과 같은 본문을 result 이벤트로 보낸다 (오류 시 error 이벤트,
+    대기열 초과 시 스트림을 열지 않고 503).
+    """
+    return _stream_pipeline(
+        "recommend_exercises",
+        _run_recommend_exercises,
+        request,
+        include_timings,
+        EXERCISE_ERROR_HINTS,
+    )
+
+
 @app.post(
     "/api/v1/diagnose",
     response_model=None,
@@ -636,53 +1119,44 @@ async def recommend_exercises(
         }
     },
 )
-async def diagnose_only(request: AppDiagnoseRequest):
+async def diagnose_only(
+    request: AppDiagnoseRequest,
+    include_timings: bool = Query(False, description="응답에 단계별 처리 시간 포함"),
+):
     """버킷 추론만 실행 (운동 추천 제외)
 
     운동 추천 없이 버킷 추론 결과만 반환
     """
     try:
-        # 앱 입력을 그대로 사용해 추론 (자동 매핑/변환 없음)
-        unified_request = _build_unified_from_app(request)
-        result = orchestration_service.process_diagnosis_only(unified_request)
-        diagnosis = result.diagnosis
-        physical_score_value = None
-        if unified_request.physical_score:
-            physical_score_value = unified_request.physical_score.total_score
-        elif result.survey_data and result.survey_data.physical_score:
-            physical_score_value = result.survey_data.physical_score.total_score
-        if physical_score_value is None:
-            physical_score_value = 50
-        diagnosis_payload = {
-            "body_part": diagnosis.body_part,
-            "final_bucket": diagnosis.final_bucket,
-            "confidence": diagnosis.confidence,
-            "physical_score": physical_score_value,
-            "diagnosisPercentage": diagnosis.diagnosis_percentage,
-            "diagnosisType": diagnosis.diagnosis_type,
-            "diagnosisDescription": diagnosis.diagnosis_description,
-        }
-        return {
-            "diagnosis": diagnosis_payload,
-        }
+        return await _run_pipeline("diagnose", _run_diagnose, request, include_timings)
+    except ExecutorSaturatedError as e:
+        raise _saturated_exception(e)
     except ValueError as e:
         raise HTTPException(
             status_code=400,
-            detail=_error_payload(
-                e,
-                hint="필수 필드(birthDate/height/weight/gender/painArea/painLevel 등)를 확인하세요.",
-            ),
+            detail=_error_payload(e, hint=DIAGNOSE_ERROR_HINTS[400]),
         )
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=_error_payload(
-                e,
-                hint="환경 변수(OPENAI/PINECONE) 또는 외부 서비스 연결 상태를 확인하세요.",
-            ),
+            detail=_error_payload(e, hint=DIAGNOSE_ERROR_HINTS[500]),
         )
 
 
+@app.post("/api/v1/diagnose/stream")
+async def diagnose_stream(
+    request: AppDiagnoseRequest,
+    include_timings: bool = Query(False, description="result 이벤트에 단계별 처리 시간 포함"),
+):
+    """버킷 추론 (SSE 스트리밍)
+
+    가중치 순위(ranking) → Red Flag(red_flag, 감지 시) → 최종 버킷(bucket) 이벤트를
+    단계가 끝나는 대로 보내고, 마지막에 일반 응답과 같은 본문을 result 이벤트로 보낸다
+    (대기열 초과 시 스트림을 열지 않고 503).
+    """
+    return _stream_pipeline("diagnose", _run_diagnose, request, include_timings, DIAGNOSE_ERROR_HINTS)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -92,6 +92,10 @@ class AppDiagnoseResponse(BaseModel):
     )
 
     diagnosis: AppDiagnosisSummary
+    timings: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="단계별 처리 시간 (include_timings=true일 때)",
+    )
 
 
 class AppExerciseItem(BaseModel):
@@ -215,6 +219,11 @@ class AppExerciseRequest(BaseModel):
     birth_date: Optional[date] = Field(
         default=None, alias="birthDate", description="(백엔드) 생년월일 (YYYY-MM-DD)"
     )
+    recommendation_mode: Optional[Literal["llm", "deterministic", "hybrid"]] = Field(
+        default=None,
+        alias="recommendationMode",
+        description="(선택) 운동 선택 방식 (llm/deterministic/hybrid, 없으면 RECOMMENDATION_MODE 설정)",
+    )
 
     @field_validator("physical_score", mode="before")
     @classmethod
@@ -251,6 +260,10 @@ class AppExerciseResponse(BaseModel):
         alias="recommendationReason",
         description="운동 추천 추론 이유 (요약)",
     )
+    timings: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="단계별 처리 시간 (include_timings=true일 때)",
+    )
 
     model_config = ConfigDict(
         populate_by_name=True,
@@ -40,6 +40,10 @@ class RequestOptions(BaseModel):
         default=True,
         description="Red Flag 시 운동 추천 스킵"
     )
+    include_timings: bool = Field(
+        default=False,
+        description="응답에 단계별 처리 시간(timings) 포함"
+    )
 
 
 class DiagnosisContext(BaseModel):
@@ -230,6 +234,9 @@ class DiagnosisResult(BaseModel):
     llm_reasoning: str
     red_flag: Optional[RedFlagResult] = None
     inferred_at: datetime
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict, description="처리 메타데이터 (캐시 적중 여부/적중률 등)"
+    )
 
     # 앱 호환 필드 (선택)
     diagnosis_percentage: Optional[int] = Field(
@@ -288,6 +295,7 @@ class DiagnosisResult(BaseModel):
             llm_reasoning=output.llm_reasoning,
             red_flag=output.red_flag,
             inferred_at=output.inferred_at,
+            metadata=output.metadata,
             diagnosis_percentage=int(round(output.confidence * 100)),
             diagnosis_type=diag_type,
             diagnosis_description=diag_desc,
@@ -416,6 +424,10 @@ class UnifiedResponse(BaseModel):
         default=None,
         description="총 처리 시간 (밀리초)"
     )
+    timings: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="단계별 처리 시간 (options.include_timings=true일 때)"
+    )
 
     @property
     def has_red_flag(self) -> bool:
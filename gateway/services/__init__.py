@@ -1,5 +1,18 @@
 """Gateway Services"""
 
 from .orchestrator import OrchestrationService
+from .executor import PipelineExecutor, ExecutorSaturatedError
+from .physical_score import (
+    PhysicalScoreEstimator,
+    PhysicalScoreEstimate,
+    get_physical_score_estimator,
+)
 
-__all__ = ["OrchestrationService"]
+__all__ = [
+    "OrchestrationService",
+    "PipelineExecutor",
+    "ExecutorSaturatedError",
+    "PhysicalScoreEstimator",
+    "PhysicalScoreEstimate",
+    "get_physical_score_estimator",
+]
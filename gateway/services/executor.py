@@ -0,0 +1,208 @@
+"""파이프라인 실행기 (블로킹 작업 오프로드)
+
+async 엔드포인트에서 동기 파이프라인(OpenAI/Pinecone 왕복)을 직접 호출하면
+uvicorn 워커의 이벤트 루프가 막혀 /health까지 지연된다.
+블로킹 호출을 제한된 스레드 풀로 넘기고, 엔드포인트별 동시 실행 수와
+대기열 길이를 제한한다.
+
+환경변수:
+- GATEWAY_MAX_WORKERS: 스레드 풀 크기 (기본값: 32)
+- GATEWAY_MAX_CONCURRENCY: 엔드포인트별 동시 실행 수 기본값 (기본값: 16)
+- GATEWAY_MAX_QUEUE: 엔드포인트별 대기열 길이 기본값 (기본값: 32)
+- GATEWAY_LIMITS_{ENDPOINT}: 엔드포인트별 재정의 "동시실행,대기열" (예: "8,16")
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """대기열이 가득 차 요청을 받을 수 없음 (503 응답용)"""
+
+    def __init__(self, endpoint: str, max_queue: int):
+        self.endpoint = endpoint
+        self.max_queue = max_queue
+        super().__init__(
+            f"'{endpoint}' 대기열이 가득 찼습니다 (최대 {max_queue}건). 잠시 후 다시 시도하세요."
+        )
+
+
+class EndpointLimiter:
+    """엔드포인트별 동시 실행/대기열 제한
+
+    Semaphore는 이벤트 루프 안에서 지연 생성한다.
+    카운터는 이벤트 루프 스레드에서만 변경되므로 별도 락이 필요 없다
+    (작업 스레드 완료는 call_soon_threadsafe로 루프에 넘겨 반영).
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.in_flight = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def admit(self) -> None:
+        """대기열 여유 확인 (없으면 ExecutorSaturatedError)"""
+        if self.in_flight >= self.max_concurrency and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise ExecutorSaturatedError(self.name, self.max_queue)
+
+    def release(self, succeeded: bool) -> None:
+        """실행 슬롯 반환 (작업 스레드가 실제로 끝난 뒤 호출)"""
+        self.in_flight -= 1
+        if succeeded:
+            self.completed += 1
+        else:
+            self.failed += 1
+        self.semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+class PipelineExecutor:
+    """블로킹 파이프라인 호출용 제한 스레드 풀
+
+    사용 예시:
+        executor = PipelineExecutor()
+        result = await executor.run("diagnose", pipeline.run, input_data)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        default_concurrency: Optional[int] = None,
+        default_queue: Optional[int] = None,
+        limits: Optional[Dict[str, Tuple[int, int]]] = None,
+    ):
+        """
+        Args:
+            max_workers: 스레드 풀 크기 (없으면 GATEWAY_MAX_WORKERS)
+            default_concurrency: 엔드포인트별 동시 실행 수 기본값
+            default_queue: 엔드포인트별 대기열 길이 기본값
+            limits: {엔드포인트: (동시실행, 대기열)} 재정의
+        """
+        self.max_workers = max_workers or int(os.getenv("GATEWAY_MAX_WORKERS", "32"))
+        self.default_concurrency = default_concurrency or int(
+            os.getenv("GATEWAY_MAX_CONCURRENCY", "16")
+        )
+        self.default_queue = (
+            default_queue
+            if default_queue is not None
+            else int(os.getenv("GATEWAY_MAX_QUEUE", "32"))
+        )
+        self._limits = dict(limits or {})
+        self._limiters: Dict[str, EndpointLimiter] = {}
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="gateway-pipeline",
+        )
+
+    def limiter(self, endpoint: str) -> EndpointLimiter:
+        """엔드포인트 제한기 반환 (없으면 생성)"""
+        if endpoint not in self._limiters:
+            concurrency, queue = self._resolve_limits(endpoint)
+            self._limiters[endpoint] = EndpointLimiter(endpoint, concurrency, queue)
+        return self._limiters[endpoint]
+
+    def _resolve_limits(self, endpoint: str) -> Tuple[int, int]:
+        """생성자 인자 → 환경변수 → 기본값 순으로 제한값 결정"""
+        if endpoint in self._limits:
+            return self._limits[endpoint]
+
+        env_value = os.getenv(f"GATEWAY_LIMITS_{endpoint.upper()}")
+        if env_value:
+            try:
+                concurrency, queue = (int(v) for v in env_value.split(","))
+                return concurrency, queue
+            except ValueError:
+                pass
+
+        return self.default_concurrency, self.default_queue
+
+    def admit(self, endpoint: str) -> None:
+        """대기열 여유 확인만 수행 (스트리밍 응답 헤더 전송 전 503 판단용)
+
+        슬롯을 예약하지는 않으므로 run()에서 다시 확인한다.
+
+        Raises:
+            ExecutorSaturatedError: 동시 실행 수와 대기열이 모두 찬 경우
+        """
+        self.limiter(endpoint).admit()
+
+    async def run(self, endpoint: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """블로킹 함수를 스레드 풀에서 실행
+
+        contextvars(LangSmith 추적 컨텍스트 등)는 작업 스레드로 복사된다.
+
+        Raises:
+            ExecutorSaturatedError: 동시 실행 수와 대기열이 모두 찬 경우
+        """
+        limiter = self.limiter(endpoint)
+        limiter.admit()
+
+        limiter.queued += 1
+        try:
+            await limiter.semaphore.acquire()
+        finally:
+            limiter.queued -= 1
+
+        limiter.in_flight += 1
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        call = functools.partial(func, *args, **kwargs)
+        try:
+            future = self._pool.submit(ctx.run, call)
+        except BaseException:
+            limiter.release(succeeded=False)
+            raise
+
+        # 슬롯은 코루틴이 아니라 작업 스레드 완료 시점에 반환한다.
+        # 클라이언트 연결 끊김 등으로 await가 취소되어도 실행 중인 스레드는 멈추지 않으므로,
+        # finally에서 반환하면 동시 실행 제한과 in_flight가 실제 작업보다 적게 잡힌다.
+        def _on_done(done_future) -> None:
+            succeeded = not done_future.cancelled() and done_future.exception() is None
+            try:
+                loop.call_soon_threadsafe(limiter.release, succeeded)
+            except RuntimeError:
+                # 이벤트 루프 종료 후 완료된 작업 (반영할 대상 없음)
+                pass
+
+        future.add_done_callback(_on_done)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def stats(self) -> Dict[str, Any]:
+        """엔드포인트별 큐 깊이/처리량 통계"""
+        return {
+            "max_workers": self.max_workers,
+            "endpoints": {
+                name: limiter.stats() for name, limiter in self._limiters.items()
+            },
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """스레드 풀 종료"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
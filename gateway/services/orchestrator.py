@@ -18,6 +18,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.models import PhysicalScore
+from shared.utils.timing import ensure_recording
 from bucket_inference.models import BucketInferenceInput
 from bucket_inference.models.input import NaturalLanguageInput
 from bucket_inference.pipeline import BucketInferencePipeline, LangGraphBucketInferencePipeline
@@ -82,8 +83,18 @@ class OrchestrationService:
             request: 통합 요청
 
         Returns:
-            UnifiedResponse
+            UnifiedResponse (options.include_timings=true면 단계별 처리 시간 포함)
         """
+        # 상위(게이트웨이)에서 레코더를 열었으면 같은 레코더에 기록
+        with ensure_recording() as recorder:
+            response = self._process(request)
+
+        if request.options.include_timings:
+            response.timings = recorder.summary()
+        return response
+
+    def _process(self, request: UnifiedRequest) -> UnifiedResponse:
+        """통합 처리 본체"""
         start_time = time.time()
 
         # Step 1: 버킷 추론 입력 생성
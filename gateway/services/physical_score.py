@@ -0,0 +1,312 @@
+"""로컬 신체 점수 추정기
+
+신체 점수(0-100)는 나이/BMI/통증 수준/사전평가 4문항(스쿼트·푸시업·스텝업·플랭크)
+으로 정해지는 정수 하나이므로, LLM 호출 대신 표 기반 선형식으로 즉시 계산한다.
+
+- 사전평가 응답은 성별/연령대별 기준표로 L1~L4 레벨 → 0~1 값으로 변환
+- 모델별(diagnose / exercise / feedback) 절편 + 계수는 JSON 파일에서 로드
+- 계수는 scripts/fit_physical_score.py로 GPT 점수 로그에 맞춰 재보정
+
+환경변수:
+- PHYSICAL_SCORE_MODEL_PATH: 계수 파일 경로 (기본값: data/shared/physical_score_model.json)
+- PHYSICAL_SCORE_LOG_PATH: GPT 점수 보정용 로그(JSONL) 경로 (없으면 기록 안 함)
+"""
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+
+DEFAULT_MODEL_PATH = (
+    Path(__file__).parent.parent.parent / "data" / "shared" / "physical_score_model.json"
+)
+
+# 사전평가 문항 (test_levels 키)
+TEST_NAMES = ("squat", "pushup", "stepup", "plank")
+TEST_LABELS = {"squat": "스쿼트", "pushup": "푸시업", "stepup": "스텝업", "plank": "플랭크"}
+
+# 사후 설문 문항 (feedback_options 키)
+FEEDBACK_NAMES = ("rpe", "muscle", "sweat")
+
+
+def _parse_number(value: Union[str, int, None]) -> Optional[int]:
+    """'10개', '30초' 등에서 첫 정수 추출"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.search(r"\d+", str(value))
+    return int(match.group()) if match else None
+
+
+@dataclass
+class PhysicalScoreEstimate:
+    """로컬 추정 결과"""
+
+    total_score: int
+    model: str  # diagnose / exercise / feedback / exercise+feedback
+    features: Dict[str, float] = field(default_factory=dict)
+    levels: Dict[str, int] = field(default_factory=dict)  # 사전평가 문항별 L1~L4
+    base_score: Optional[int] = None
+    reasoning: Optional[str] = None
+
+
+class PhysicalScoreEstimator:
+    """표 기반 신체 점수 추정기
+
+    사용 예시:
+        estimator = PhysicalScoreEstimator()
+        estimate = estimator.estimate_exercise(
+            age=26, sex="female", bmi=22.5, pain_level=5,
+            squat="10개", pushup="5개", stepup="15개", plank="30초",
+        )
+        estimate.total_score  # 63
+    """
+
+    def __init__(self, model_path: Optional[Path] = None):
+        """
+        Args:
+            model_path: 계수 JSON 경로 (없으면 PHYSICAL_SCORE_MODEL_PATH 또는 기본 경로)
+        """
+        self.model_path = Path(
+            model_path or os.getenv("PHYSICAL_SCORE_MODEL_PATH") or DEFAULT_MODEL_PATH
+        )
+        with open(self.model_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+        self.version = config.get("_metadata", {}).get("version", "unknown")
+        self.senior_age = config.get("senior_age", 60)
+        self.fallback_sex = config.get("fallback_sex", "female")
+        self.bmi_normal_range = tuple(config.get("bmi_normal_range", [18.5, 25.0]))
+        self.test_levels: Dict[str, Dict[str, List[int]]] = config["test_levels"]
+        self.feedback_options: Dict[str, Dict[str, List[str]]] = config["feedback_options"]
+        self.models: Dict[str, Dict[str, Any]] = config["models"]
+
+        # 모델별 (특성 이름, 계수 벡터) - 예측 시 내적 한 번
+        self._weights: Dict[str, tuple] = {}
+        for name, spec in self.models.items():
+            names = list(spec["coefficients"].keys())
+            weights = np.array([spec["coefficients"][n] for n in names], dtype=np.float64)
+            self._weights[name] = (names, weights, float(spec.get("intercept", 0.0)))
+
+    # ------------------------------------------------------------------
+    # 특성 변환
+    # ------------------------------------------------------------------
+
+    def _group_keys(self, age: int, sex: Optional[str]) -> List[str]:
+        age_group = "senior" if age >= self.senior_age else "young"
+        sex = sex if sex in ("male", "female") else self.fallback_sex
+        return [f"{sex}_{age_group}", age_group]
+
+    def test_level(self, test: str, value: Union[str, int, None], age: int, sex: Optional[str]) -> int:
+        """사전평가 응답 → 레벨 (1~4, 응답 해석 불가 시 1)"""
+        number = _parse_number(value)
+        if number is None:
+            return 1
+        tables = self.test_levels[test]
+        for key in self._group_keys(age, sex):
+            if key in tables:
+                return 1 + sum(1 for threshold in tables[key] if number >= threshold)
+        return 1
+
+    def _profile_features(self, age: int, bmi: float, pain_level: int) -> Dict[str, float]:
+        low, high = self.bmi_normal_range
+        bmi_deviation = max(0.0, low - bmi, bmi - high) if bmi > 0 else 0.0
+        return {
+            "age_decades_over_40": max(0, age - 40) / 10,
+            "bmi_deviation": bmi_deviation,
+            "pain_level": max(0, min(10, pain_level)) / 10,
+        }
+
+    def diagnose_features(self, age: int, bmi: float, pain_level: int) -> Dict[str, float]:
+        """진단 엔드포인트 특성 (인구통계 + 통증)"""
+        return self._profile_features(age, bmi, pain_level)
+
+    def exercise_features(
+        self,
+        age: int,
+        sex: Optional[str],
+        bmi: float,
+        pain_level: int,
+        responses: Dict[str, Union[str, int, None]],
+    ) -> tuple:
+        """운동 추천 엔드포인트 특성 (사전평가 레벨 포함)
+
+        Returns:
+            (특성, 문항별 레벨)
+        """
+        levels = {
+            test: self.test_level(test, responses.get(test), age, sex) for test in TEST_NAMES
+        }
+        features = {test: (level - 1) / 3 for test, level in levels.items()}
+        features.update(self._profile_features(age, bmi, pain_level))
+        return features, levels
+
+    def match_feedback_option(self, question: str, response: Optional[str]) -> Optional[str]:
+        """사후 설문 응답 → 선택지 키 (키워드 순서대로 첫 일치)"""
+        if not response:
+            return None
+        text = response.strip()
+        for option, keywords in self.feedback_options.get(question, {}).items():
+            if option == text or any(keyword in text for keyword in keywords):
+                return option
+        return None
+
+    def feedback_features(self, responses: Dict[str, Optional[str]]) -> Dict[str, float]:
+        """사후 설문 특성 (문항:선택지 원-핫)"""
+        features: Dict[str, float] = {}
+        for question in FEEDBACK_NAMES:
+            option = self.match_feedback_option(question, responses.get(question))
+            if option is not None:
+                features[f"{question}:{option}"] = 1.0
+        return features
+
+    # ------------------------------------------------------------------
+    # 예측
+    # ------------------------------------------------------------------
+
+    def predict(self, model: str, features: Dict[str, float]) -> float:
+        """모델 절편 + 계수·특성 내적 (범위 제한 전 원값)"""
+        names, weights, intercept = self._weights[model]
+        vector = np.array([features.get(n, 0.0) for n in names], dtype=np.float64)
+        return intercept + float(weights @ vector)
+
+    @staticmethod
+    def _clamp(score: float) -> int:
+        return max(0, min(100, int(round(score))))
+
+    def estimate_diagnose(self, age: int, bmi: float, pain_level: int) -> PhysicalScoreEstimate:
+        """진단 엔드포인트 신체 점수"""
+        features = self.diagnose_features(age, bmi, pain_level)
+        total = self._clamp(self.predict("diagnose", features))
+        return PhysicalScoreEstimate(
+            total_score=total,
+            model="diagnose",
+            features=features,
+            reasoning=(
+                f"나이 {age}세, BMI {bmi:.1f}, 통증 {pain_level}/10을 반영해 "
+                f"{total}점으로 산정했습니다."
+            ),
+        )
+
+    def estimate_exercise(
+        self,
+        age: int,
+        sex: Optional[str],
+        bmi: float,
+        pain_level: int,
+        squat: Union[str, int, None],
+        pushup: Union[str, int, None],
+        stepup: Union[str, int, None],
+        plank: Union[str, int, None],
+        base_score: Optional[int] = None,
+        feedback: Optional[Dict[str, Optional[str]]] = None,
+    ) -> PhysicalScoreEstimate:
+        """운동 추천 엔드포인트 신체 점수
+
+        기준 점수가 있으면 사후 설문으로만 조정하고(최대 ±max_step),
+        없으면 사전평가로 추정한 뒤 사후 설문이 있으면 이어서 조정한다.
+
+        Args:
+            base_score: 백엔드 전달 신체 점수
+            feedback: 사후 설문 {"rpe", "muscle", "sweat"}
+        """
+        features, levels = self.exercise_features(
+            age, sex, bmi, pain_level,
+            {"squat": squat, "pushup": pushup, "stepup": stepup, "plank": plank},
+        )
+        level_text = ", ".join(f"{TEST_LABELS[t]} L{levels[t]}" for t in TEST_NAMES)
+
+        if base_score is None:
+            model = "exercise"
+            start = self._clamp(self.predict("exercise", features))
+            reasoning = (
+                f"사전평가({level_text})와 통증 {pain_level}/10, 나이/BMI를 반영해 "
+                f"{start}점으로 산정했습니다."
+            )
+        else:
+            model = "feedback"
+            start = self._clamp(base_score)
+            reasoning = None
+
+        total = start
+        if feedback:
+            feedback_features = self.feedback_features(feedback)
+            max_step = float(self.models["feedback"].get("max_step", 10))
+            delta = max(-max_step, min(max_step, self.predict("feedback", feedback_features)))
+            total = self._clamp(start + delta)
+            features.update(feedback_features)
+            if base_score is None:
+                model = "exercise+feedback"
+            answered = [
+                f"{label} '{feedback[q]}'"
+                for q, label in (("rpe", "운동 강도"), ("muscle", "근육 자극"), ("sweat", "땀"))
+                if feedback.get(q)
+            ]
+            feedback_text = ", ".join(answered) if answered else "응답 없음"
+            if total == start:
+                change = f"{start}점을 유지했습니다."
+            else:
+                change = f"{start}점에서 {total}점으로 조정했습니다."
+            reasoning = f"{reasoning + ' ' if reasoning else ''}사후 설문({feedback_text})을 반영해 {change}"
+
+        return PhysicalScoreEstimate(
+            total_score=total,
+            model=model,
+            features=features,
+            levels=levels,
+            base_score=base_score,
+            reasoning=reasoning,
+        )
+
+
+_estimator: Optional[PhysicalScoreEstimator] = None
+_estimator_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+def get_physical_score_estimator() -> PhysicalScoreEstimator:
+    """프로세스 공용 추정기 (첫 호출 시 계수 로드)"""
+    global _estimator
+    if _estimator is None:
+        with _estimator_lock:
+            if _estimator is None:
+                _estimator = PhysicalScoreEstimator()
+    return _estimator
+
+
+def log_calibration_sample(
+    estimate: PhysicalScoreEstimate,
+    llm_score: int,
+    path: Optional[str] = None,
+) -> None:
+    """로컬 추정 + GPT 점수를 보정용 JSONL에 추가 (경로 미설정 시 무시)
+
+    Args:
+        estimate: 같은 입력의 로컬 추정 결과
+        llm_score: GPT가 반환한 점수
+        path: 로그 경로 (없으면 PHYSICAL_SCORE_LOG_PATH)
+    """
+    path = path or os.getenv("PHYSICAL_SCORE_LOG_PATH")
+    if not path:
+        return
+    record = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "model": estimate.model,
+        "features": estimate.features,
+        "base_score": estimate.base_score,
+        "local_score": estimate.total_score,
+        "llm_score": llm_score,
+    }
+    line = json.dumps(record, ensure_ascii=False)
+    with _log_lock:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
@@ -0,0 +1,110 @@
+"""PipelineExecutor 슬롯 반환 / 대기열 초과 테스트
+
+await가 취소되어도(클라이언트 연결 끊김, SSE task.cancel()) 작업 스레드가 끝날 때까지
+동시 실행 슬롯과 in_flight가 유지되는지, 완료/실패가 따로 집계되는지,
+스트리밍 엔드포인트가 대기열 초과 시 스트림을 열기 전에 503을 반환하는지 확인한다.
+
+실행:
+    PYTHONPATH=. python -m pytest gateway/tests/test_executor.py -q
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gateway.services.executor import ExecutorSaturatedError, PipelineExecutor
+
+
+async def _settle(limiter, timeout: float = 2.0) -> None:
+    """작업 스레드 완료 콜백이 루프에 반영될 때까지 대기"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while limiter.in_flight and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.01)
+
+
+def test_cancelled_await_keeps_slot_until_thread_finishes():
+    async def scenario():
+        executor = PipelineExecutor(max_workers=2, limits={"diagnose": (1, 0)})
+        limiter = executor.limiter("diagnose")
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        task = asyncio.create_task(executor.run("diagnose", blocking))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # 스레드는 아직 실행 중 → 슬롯 유지, 새 요청은 거절
+        assert limiter.in_flight == 1
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run("diagnose", lambda: None)
+
+        release.set()
+        await _settle(limiter)
+        assert limiter.in_flight == 0
+        assert limiter.completed == 1
+        assert limiter.failed == 0
+        assert limiter.rejected == 1
+
+        # 슬롯이 반환되어 다음 요청 실행 가능
+        assert await executor.run("diagnose", lambda: "next") == "next"
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_exceptions_counted_as_failed():
+    async def scenario():
+        executor = PipelineExecutor(max_workers=1, limits={"recommend": (1, 1)})
+        limiter = executor.limiter("recommend")
+
+        def broken():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await executor.run("recommend", broken)
+        assert await executor.run("recommend", lambda: 1) == 1
+        await _settle(limiter)
+
+        stats = limiter.stats()
+        assert stats["completed"] == 1
+        assert stats["failed"] == 1
+        assert stats["in_flight"] == 0
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_stream_rejects_with_503_before_opening_stream(monkeypatch):
+    from fastapi import HTTPException
+    import gateway.main as gateway_main
+
+    executor = PipelineExecutor(max_workers=1, limits={"recommend_exercises": (1, 0)})
+    executor.limiter("recommend_exercises").in_flight = 1  # 실행 슬롯 점유 상태
+    monkeypatch.setattr(gateway_main, "pipeline_executor", executor)
+
+    with pytest.raises(HTTPException) as exc_info:
+        gateway_main._stream_pipeline(
+            "recommend_exercises",
+            gateway_main._run_recommend_exercises,
+            None,
+            False,
+            gateway_main.EXERCISE_ERROR_HINTS,
+        )
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "1"
+    assert executor.limiter("recommend_exercises").rejected == 1
+    executor.shutdown()
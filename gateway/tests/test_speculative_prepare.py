@@ -0,0 +1,110 @@
+"""신체 점수 병행 후보 준비 경로 테스트 (PHYSICAL_SCORE_MODE=llm)
+
+SPECULATIVE_EXERCISE_PREPARE 경로(_recommend_with_speculative_prepare)는 llm 모드에서만
+실행된다. GPT 점수를 레벨별 값으로 고정하고, 순차 경로(점수 확정 후 pipeline.run)와
+같은 루틴을 내는지 확인한다. OpenAI는 결정적 가짜 클라이언트(후보 앞 5개 선택)로 대체한다.
+
+실행:
+    PYTHONPATH=. python -m pytest gateway/tests/test_speculative_prepare.py -q
+"""
+
+import json
+import os
+import re
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+os.environ["PHYSICAL_SCORE_MODE"] = "llm"
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["VECTOR_STORE_BACKEND"] = "local"
+os.environ["VECTOR_STORE_DIR"] = tempfile.mkdtemp(prefix="orthocare-test-")
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+
+from shared.utils.openai_client import set_openai_clients
+
+
+class _FakeCompletions:
+    """프롬프트 후보 목록("- E01: ...")의 앞 5개를 선택하는 결정적 응답"""
+
+    EXERCISE_LINE = re.compile(r"^- ([A-Z]+\d+):", re.MULTILINE)
+
+    def create(self, messages, model: str = "fake", **_):
+        prompt = "\n".join(m.get("content", "") for m in messages)
+        content = json.dumps(
+            {"selected_exercises": self.EXERCISE_LINE.findall(prompt)[:5], "reasoning": "fake"}
+        )
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1),
+        )
+
+
+class _FakeOpenAI:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=_FakeCompletions())
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def gateway():
+    set_openai_clients(_FakeOpenAI())
+    import gateway.main as gateway_main
+    from gateway.services import OrchestrationService
+
+    assert gateway_main.PHYSICAL_SCORE_MODE == "llm"
+    gateway_main.orchestration_service = OrchestrationService()
+    yield gateway_main
+    gateway_main.orchestration_service = None
+    set_openai_clients(None)
+
+
+def _request(gateway_main, pain_level: int):
+    return gateway_main.AppExerciseRequest.model_validate(
+        {
+            "userId": 1,
+            "routineDate": "2026-01-01",
+            "painLevel": pain_level,
+            "squatResponse": "10개",
+            "pushupResponse": "5개",
+            "stepupResponse": "10개",
+            "plankResponse": "30초",
+            "bucket": "OA",
+            "bodyPart": "knee",
+            "age": 58,
+            "gender": "FEMALE",
+            "height": 160,
+            "weight": 62,
+        }
+    )
+
+
+@pytest.mark.parametrize("gpt_score", [20, 45, 70, 90])
+@pytest.mark.parametrize("pain_level", [2, 5, 8])
+def test_speculative_matches_sequential(gateway, monkeypatch, gpt_score, pain_level):
+    monkeypatch.setattr(
+        gateway, "_gpt_physical_score_for_exercise", lambda **_: (gpt_score, "gpt")
+    )
+    request = _request(gateway, pain_level)
+
+    spec_input, spec_reasoning, spec_output = gateway._recommend_with_speculative_prepare(request)
+    seq_input, seq_reasoning = gateway._build_exercise_input_from_app(request)
+    seq_output = gateway.orchestration_service.exercise_pipeline.run(
+        seq_input, include_excluded=False
+    )
+
+    assert spec_input.physical_score.total_score == gpt_score
+    assert spec_input == seq_input
+    assert spec_reasoning == seq_reasoning == "gpt"
+    assert spec_output.exercises
+    assert [e.model_dump() for e in spec_output.exercises] == [
+        e.model_dump() for e in seq_output.exercises
+    ]
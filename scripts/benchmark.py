@@ -0,0 +1,754 @@
+#!/usr/bin/env python3
+"""골든셋 벤치마크 / 회귀 검사
+
+data/evaluation/golden_set/knee_personas.json을 각 파이프라인과 게이트웨이로
+동시 실행하여 지연 시간(p50/p95/p99, 단계별), 요청당 토큰, 버킷 정확도를 측정하고
+JSON 리포트로 저장합니다. 기준 리포트(--baseline)와 비교해 회귀가 있으면
+--fail-on-regression으로 종료 코드 1을 반환합니다 (배포 전 CI 검사용).
+
+대상 (--targets):
+- bucket: BucketInferencePipeline 직접 실행 (정확도: expected.bucket / red_flag)
+- exercise: ExerciseRecommendationPipeline 직접 실행 (expected.bucket 기준 추천, 유효 응답 비율)
+- gateway: 게이트웨이 /api/v1/diagnose + /api/v1/recommend-exercises
+  (기본: 프로세스 내 TestClient, --gateway-url 지정 시 실행 중인 서버)
+
+백엔드 (--backend):
+- mock: 결정적 가짜 OpenAI 응답 + 빈 로컬 벡터 스토어 (API 키/비용 없음)
+  LLM 중재는 빈 응답 → 가중치 1순위 사용, 토큰은 UTF-8 바이트 / 4 추정치
+- live: 실제 OpenAI / 벡터 스토어
+- replay: --cassette에 녹화된 응답만 사용 (네트워크/API 키 없음, 카세트에 없는 요청은 오류)
+  지연은 --replay-latency (recorded: 녹화 시간 그대로, lognormal: 녹화 분포 표본, none, <ms>)
+
+녹화: mock/live 백엔드에 --cassette를 지정하면 OpenAI / 벡터 조회 응답과 소요 시간을 기록한다
+(shared/utils/cassette.py). 한 번 live로 녹화해 두면 이후 오프라인에서 결정적으로 재실행할 수 있다.
+
+캐시: 반복 실행이 캐시 적중으로 측정되지 않도록 기본적으로 임베딩/중재 캐시를 끈다
+(--keep-caches로 환경 설정 유지).
+
+실행:
+    PYTHONPATH=. python scripts/benchmark.py --backend mock -c 4 --repeat 5 -o reports/bench.json
+    PYTHONPATH=. python scripts/benchmark.py --backend mock --baseline reports/baseline.json --fail-on-regression
+    PYTHONPATH=. python scripts/benchmark.py --backend live --targets bucket --repeat 1
+    PYTHONPATH=. python scripts/benchmark.py --backend live --repeat 1 --cassette reports/golden.cassette.jsonl
+    PYTHONPATH=. python scripts/benchmark.py --backend replay --cassette reports/golden.cassette.jsonl -c 16
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+DEFAULT_PERSONAS = project_root / "data" / "evaluation" / "golden_set" / "knee_personas.json"
+TARGETS = ("bucket", "exercise", "gateway")
+PERCENTILES = (50, 95, 99)
+REPORT_VERSION = 1
+# prompt에 이미 포함된 토큰 종류 (요청당 합계에서 제외, shared.utils.timing.TOKENS_CACHED_PROMPT)
+CACHED_PROMPT_KIND = "cached_prompt"
+
+
+# ============================================================
+# mock 백엔드
+# ============================================================
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (UTF-8 바이트 / 4)"""
+    return max(1, len(text.encode("utf-8")) // 4)
+
+
+class _MockChatCompletions:
+    """결정적 chat completions 응답
+
+    하나의 JSON에 중재/운동 선택/신체 점수 응답 키를 모두 담는다.
+    - final_bucket 없음 → 중재는 가중치 1순위 사용
+    - selected_exercises: 프롬프트 후보 목록("- E01: ...")의 앞 5개
+    """
+
+    EXERCISE_LINE = re.compile(r"^- ([A-Z]+\d+):", re.MULTILINE)
+
+    def __init__(self, latency_ms: float):
+        self._latency = latency_ms / 1000
+
+    def _respond(self, messages: List[Dict[str, str]], model: str = "mock", **_: Any):
+        prompt = "\n".join(m.get("content", "") for m in messages)
+        content = json.dumps(
+            {
+                "selected_exercises": self.EXERCISE_LINE.findall(prompt)[:5],
+                "total_score": 50,
+                "reasoning": "mock",
+            },
+            ensure_ascii=False,
+        )
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=estimate_tokens(prompt),
+                completion_tokens=estimate_tokens(content),
+            ),
+        )
+
+    def create(self, messages, **kwargs):
+        if self._latency:
+            time.sleep(self._latency)
+        return self._respond(messages, **kwargs)
+
+
+class _AsyncMockChatCompletions(_MockChatCompletions):
+    async def create(self, messages, **kwargs):
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return self._respond(messages, **kwargs)
+
+
+class _MockEmbeddings:
+    """텍스트 해시 기반 결정적 임베딩"""
+
+    def __init__(self, latency_ms: float, dimensions: int = 64):
+        self._latency = latency_ms / 1000
+        self._dimensions = dimensions
+
+    def _respond(self, input, **_: Any):
+        texts = [input] if isinstance(input, str) else list(input)
+        data = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(self._dimensions)
+            data.append(SimpleNamespace(embedding=vector.tolist()))
+        return SimpleNamespace(
+            data=data,
+            usage=SimpleNamespace(prompt_tokens=sum(estimate_tokens(t) for t in texts)),
+        )
+
+    def create(self, input, **kwargs):
+        if self._latency:
+            time.sleep(self._latency)
+        return self._respond(input, **kwargs)
+
+
+class _AsyncMockEmbeddings(_MockEmbeddings):
+    async def create(self, input, **kwargs):
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return self._respond(input, **kwargs)
+
+
+class MockOpenAI:
+    """OpenAI 클라이언트 대역 (chat.completions / embeddings만)"""
+
+    def __init__(self, llm_latency_ms: float = 0.0, embedding_latency_ms: float = 0.0):
+        self.chat = SimpleNamespace(completions=_MockChatCompletions(llm_latency_ms))
+        self.embeddings = _MockEmbeddings(embedding_latency_ms)
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncMockOpenAI:
+    """AsyncOpenAI 클라이언트 대역"""
+
+    def __init__(self, llm_latency_ms: float = 0.0, embedding_latency_ms: float = 0.0):
+        self.chat = SimpleNamespace(completions=_AsyncMockChatCompletions(llm_latency_ms))
+        self.embeddings = _AsyncMockEmbeddings(embedding_latency_ms)
+
+    async def close(self) -> None:
+        pass
+
+
+def configure_backend(args):
+    """백엔드/캐시 환경 설정 (파이프라인 import 전에 호출)
+
+    Returns:
+        설치된 카세트 (--cassette 미지정 시 None)
+    """
+    if not args.keep_caches:
+        os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+        os.environ["ARBITRATION_CACHE_ENABLED"] = "false"
+
+    if args.backend == "mock":
+        os.environ.setdefault("OPENAI_API_KEY", "mock")
+        os.environ["VECTOR_STORE_BACKEND"] = "local"
+        os.environ["VECTOR_STORE_DIR"] = tempfile.mkdtemp(prefix="orthocare-bench-")
+
+        from shared.utils.openai_client import set_openai_clients
+
+        set_openai_clients(
+            MockOpenAI(args.mock_llm_ms, args.mock_embedding_ms),
+            AsyncMockOpenAI(args.mock_llm_ms, args.mock_embedding_ms),
+        )
+    elif args.backend == "replay":
+        os.environ.setdefault("OPENAI_API_KEY", "replay")
+
+    if args.cassette is None:
+        return None
+
+    from shared.utils.cassette import install_cassette
+
+    return install_cassette(
+        args.cassette,
+        mode="replay" if args.backend == "replay" else "record",
+        latency=args.replay_latency,
+        latency_scale=args.replay_latency_scale,
+    )
+
+
+# ============================================================
+# 골든셋 → 요청 변환
+# ============================================================
+
+def load_personas(path: Path, persona_ids: Optional[List[str]] = None) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        personas = json.load(f).get("personas", [])
+    if persona_ids:
+        personas = [p for p in personas if p["id"] in persona_ids]
+    return personas
+
+
+def _primary_part(persona: Dict) -> Dict:
+    parts = persona["input"]["body_parts"]
+    return next((p for p in parts if p.get("primary")), parts[0])
+
+
+def _exercise_bucket(persona: Dict) -> Optional[str]:
+    """운동 추천 대상 버킷 (Red Flag로 버킷이 없는 케이스는 제외)"""
+    return persona["expected"].get("bucket")
+
+
+def exercise_input_from_persona(persona: Dict) -> Dict:
+    data = persona["input"]
+    part = _primary_part(persona)
+    return {
+        "user_id": persona["id"],
+        "body_part": part["code"],
+        "bucket": _exercise_bucket(persona),
+        "physical_score": data.get("physical_score") or {"total_score": 50},
+        "demographics": data["demographics"],
+        "nrs": part.get("nrs", 5),
+    }
+
+
+def diagnose_request_from_persona(persona: Dict) -> Dict:
+    """골든셋 입력 → 앱 진단 요청 (/api/v1/diagnose)"""
+    data = persona["input"]
+    demo = data["demographics"]
+    part = _primary_part(persona)
+    nl = data.get("natural_language") or {}
+    today = date.today()
+    return {
+        "birthDate": date(today.year - demo["age"], 1, 1).isoformat(),
+        "height": demo["height_cm"],
+        "weight": demo["weight_kg"],
+        "gender": {"male": "MALE", "female": "FEMALE"}.get(demo.get("sex"), "PREFER_NOT_TO_SAY"),
+        "painArea": part["code"],
+        "affectedSide": part.get("side") or "both",
+        "painStartedDate": nl.get("history") or "",
+        "painLevel": part.get("nrs", 5),
+        "painTrigger": nl.get("chief_complaint") or "",
+        "painSensation": nl.get("pain_description") or "",
+        "painDuration": nl.get("additional_notes") or "",
+        "redFlags": ", ".join(part.get("red_flags_checked", [])),
+    }
+
+
+def exercise_request_from_persona(persona: Dict, index: int) -> Dict:
+    """골든셋 입력 → 앱 운동 추천 요청 (/api/v1/recommend-exercises)"""
+    data = persona["input"]
+    demo = data["demographics"]
+    part = _primary_part(persona)
+    return {
+        "userId": index + 1,
+        "routineDate": date.today().isoformat(),
+        "painLevel": part.get("nrs", 5),
+        "squatResponse": "10개",
+        "pushupResponse": "5개",
+        "stepupResponse": "10개",
+        "plankResponse": "30초",
+        "bucket": _exercise_bucket(persona),
+        "bodyPart": part["code"],
+        "age": demo["age"],
+        "gender": {"male": "MALE", "female": "FEMALE"}.get(demo.get("sex"), "FEMALE"),
+        "height": demo["height_cm"],
+        "weight": demo["weight_kg"],
+        "physicalScore": (data.get("physical_score") or {}).get("total_score"),
+    }
+
+
+# ============================================================
+# 실행
+# ============================================================
+
+class Sample:
+    """요청 1건 측정값"""
+
+    __slots__ = ("persona_id", "ok", "error", "total_ms", "stages", "tokens", "expected", "actual")
+
+    def __init__(self, persona_id: str):
+        self.persona_id = persona_id
+        self.ok = False
+        self.error: Optional[str] = None
+        self.total_ms = 0.0
+        self.stages: Dict[str, float] = {}
+        self.tokens: Dict[str, int] = {}
+        self.expected: Optional[str] = None
+        self.actual: Optional[str] = None
+
+
+def _apply_timings(sample: Sample, timings: Dict[str, Any]) -> None:
+    sample.stages = {name: stage["ms"] for name, stage in timings.get("stages", {}).items()}
+    sample.tokens = dict(timings.get("tokens", {}))
+
+
+def _expected_label(persona: Dict) -> str:
+    expected = persona["expected"]
+    return "RED_FLAG" if expected.get("red_flag") else expected.get("bucket")
+
+
+class BucketTarget:
+    name = "bucket"
+
+    def __init__(self):
+        from bucket_inference.models import BucketInferenceInput
+        from bucket_inference.pipeline import BucketInferencePipeline
+
+        self._input_model = BucketInferenceInput
+        self.pipeline = BucketInferencePipeline()
+
+    def cases(self, personas: List[Dict]) -> List[Tuple[str, Dict, Any]]:
+        return [(p["id"], p, self._input_model.model_validate(p["input"])) for p in personas]
+
+    def run(self, persona: Dict, payload, sample: Sample) -> None:
+        from shared.utils.timing import recording
+
+        with recording() as recorder:
+            results = self.pipeline.run(payload)
+        sample.total_ms = recorder.elapsed_ms
+        _apply_timings(sample, recorder.summary())
+
+        output = results[_primary_part(persona)["code"]]
+        sample.expected = _expected_label(persona)
+        sample.actual = (
+            "RED_FLAG" if output.red_flag and output.red_flag.triggered else output.final_bucket
+        )
+        sample.ok = True
+
+
+class ExerciseTarget:
+    name = "exercise"
+    evaluates_accuracy = False
+
+    def __init__(self):
+        from exercise_recommendation.models.input import ExerciseRecommendationInput
+        from exercise_recommendation.pipeline import ExerciseRecommendationPipeline
+
+        self._input_model = ExerciseRecommendationInput
+        self.pipeline = ExerciseRecommendationPipeline()
+
+    def cases(self, personas: List[Dict]) -> List[Tuple[str, Dict, Any]]:
+        return [
+            (p["id"], p, self._input_model.model_validate(exercise_input_from_persona(p)))
+            for p in personas
+            if _exercise_bucket(p)
+        ]
+
+    def run(self, persona: Dict, payload, sample: Sample) -> None:
+        from shared.utils.timing import recording
+
+        with recording() as recorder:
+            output = self.pipeline.run(payload, include_excluded=False)
+        sample.total_ms = recorder.elapsed_ms
+        _apply_timings(sample, recorder.summary())
+        sample.ok = len(output.exercises) > 0
+        if not sample.ok:
+            sample.error = "추천 운동 없음"
+
+
+class GatewayTarget:
+    """게이트웨이 진단 + 운동 추천 (HTTP)"""
+
+    def __init__(self, endpoint: str, base_url: Optional[str]):
+        self.endpoint = endpoint
+        self.name = f"gateway_{endpoint}"
+        self.evaluates_accuracy = endpoint == "diagnose"
+        self._base_url = base_url
+        self._client = None
+
+    def __enter__(self):
+        if self._base_url:
+            import httpx
+
+            self._client = httpx.Client(base_url=self._base_url, timeout=120)
+        else:
+            from fastapi.testclient import TestClient
+            from gateway.main import app
+
+            self._client = TestClient(app).__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        if self._base_url:
+            self._client.close()
+        else:
+            self._client.__exit__(*exc)
+
+    def cases(self, personas: List[Dict]) -> List[Tuple[str, Dict, Any]]:
+        if self.endpoint == "diagnose":
+            # 앱 진단 응답에는 Red Flag 여부가 없으므로 버킷 케이스만
+            return [
+                (p["id"], p, diagnose_request_from_persona(p))
+                for p in personas
+                if not p["expected"].get("red_flag")
+            ]
+        return [
+            (p["id"], p, exercise_request_from_persona(p, i))
+            for i, p in enumerate(personas)
+            if _exercise_bucket(p)
+        ]
+
+    def run(self, persona: Dict, payload, sample: Sample) -> None:
+        path = "/api/v1/diagnose" if self.endpoint == "diagnose" else "/api/v1/recommend-exercises"
+        started = time.perf_counter()
+        response = self._client.post(path, params={"include_timings": "true"}, json=payload)
+        sample.total_ms = (time.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            sample.error = f"HTTP {response.status_code}: {response.text[:200]}"
+            return
+
+        body = response.json()
+        _apply_timings(sample, body.get("timings") or {})
+        if self.endpoint == "diagnose":
+            sample.expected = _expected_label(persona)
+            sample.actual = body["diagnosis"]["final_bucket"]
+            sample.ok = True
+        else:
+            sample.ok = len(body.get("exercises", [])) > 0
+            if not sample.ok:
+                sample.error = "추천 운동 없음"
+
+
+def run_target(target, personas: List[Dict], concurrency: int, repeat: int, warmup: int) -> Tuple[List[Sample], float]:
+    """대상 실행 → (측정값, 전체 소요 초)"""
+    cases = target.cases(personas)
+
+    def execute(case) -> Sample:
+        persona_id, persona, payload = case
+        sample = Sample(persona_id)
+        try:
+            target.run(persona, payload, sample)
+        except Exception as e:
+            sample.ok = False
+            sample.error = f"{type(e).__name__}: {e}"
+        return sample
+
+    for case in cases[:warmup]:
+        execute(case)
+
+    schedule = [case for _ in range(repeat) for case in cases]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"bench-{target.name}") as pool:
+        samples = list(pool.map(execute, schedule))
+    return samples, time.perf_counter() - started
+
+
+# ============================================================
+# 집계
+# ============================================================
+
+def distribution(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    array = np.asarray(values, dtype=np.float64)
+    result = {f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, np.percentile(array, PERCENTILES))}
+    result["mean"] = round(float(array.mean()), 2)
+    result["max"] = round(float(array.max()), 2)
+    return result
+
+
+def summarize(target, samples: List[Sample], wall_sec: float) -> Dict[str, Any]:
+    ok = [s for s in samples if s.ok]
+    errors = [s for s in samples if not s.ok]
+
+    stage_values: Dict[str, List[float]] = {}
+    for sample in ok:
+        for stage, ms in sample.stages.items():
+            stage_values.setdefault(stage, []).append(ms)
+
+    token_kinds = sorted({kind for s in ok for kind in s.tokens})
+    tokens_total = {kind: sum(s.tokens.get(kind, 0) for s in ok) for kind in token_kinds}
+    per_request = {kind: round(total / len(ok), 1) for kind, total in tokens_total.items()} if ok else {}
+    if per_request:
+        per_request["total"] = round(
+            sum(v for kind, v in per_request.items() if kind != CACHED_PROMPT_KIND), 1
+        )
+    tokens: Dict[str, Any] = {"per_request": per_request, "total": tokens_total}
+    if tokens_total.get("prompt"):
+        # 제공자 측 프롬프트 캐시 적중 비율 (mock은 항상 0)
+        tokens["prompt_cache_hit_rate"] = round(
+            tokens_total.get(CACHED_PROMPT_KIND, 0) / tokens_total["prompt"], 4
+        )
+
+    summary: Dict[str, Any] = {
+        "requests": len(samples),
+        "ok": len(ok),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(samples), 4) if samples else 0.0,
+        "wall_sec": round(wall_sec, 3),
+        "throughput_rps": round(len(samples) / wall_sec, 2) if wall_sec > 0 else 0.0,
+        "latency_ms": {
+            "total": distribution([s.total_ms for s in ok]),
+            "stages": {stage: distribution(values) for stage, values in sorted(stage_values.items())},
+        },
+        "tokens": tokens,
+    }
+    if errors:
+        summary["error_samples"] = sorted({f"{s.persona_id}: {s.error}" for s in errors})[:10]
+
+    if getattr(target, "evaluates_accuracy", True):
+        evaluated = [s for s in ok if s.expected is not None]
+        correct = [s for s in evaluated if s.actual == s.expected]
+        by_bucket: Dict[str, Dict[str, Any]] = {}
+        for sample in evaluated:
+            bucket = by_bucket.setdefault(sample.expected, {"evaluated": 0, "correct": 0})
+            bucket["evaluated"] += 1
+            bucket["correct"] += int(sample.actual == sample.expected)
+        for bucket in by_bucket.values():
+            bucket["accuracy"] = round(bucket["correct"] / bucket["evaluated"], 4)
+        summary["accuracy"] = {
+            "evaluated": len(evaluated),
+            "correct": len(correct),
+            "accuracy": round(len(correct) / len(evaluated), 4) if evaluated else None,
+            "by_bucket": dict(sorted(by_bucket.items())),
+            "mismatches": sorted(
+                {f"{s.persona_id}: {s.expected} → {s.actual}" for s in evaluated if s.actual != s.expected}
+            ),
+        }
+    return summary
+
+
+# ============================================================
+# 기준 비교
+# ============================================================
+
+def comparable_metrics(report: Dict[str, Any]) -> Dict[str, Tuple[str, float]]:
+    """비교 대상 지표 → {경로: (종류, 값)}
+
+    종류: latency (높을수록 나쁨, 상대+절대 허용치), tokens (높을수록 나쁨, 상대 허용치),
+          accuracy (낮을수록 나쁨), error_rate (높을수록 나쁨)
+    """
+    metrics: Dict[str, Tuple[str, float]] = {}
+    for name, target in report.get("targets", {}).items():
+        latency = target.get("latency_ms", {})
+        for q in PERCENTILES:
+            key = f"p{q}"
+            if key in latency.get("total", {}):
+                metrics[f"{name}.latency_ms.total.{key}"] = ("latency", latency["total"][key])
+            for stage, values in latency.get("stages", {}).items():
+                if key in values:
+                    metrics[f"{name}.latency_ms.stages.{stage}.{key}"] = ("latency", values[key])
+        if "total" in target.get("tokens", {}).get("per_request", {}):
+            metrics[f"{name}.tokens.per_request.total"] = ("tokens", target["tokens"]["per_request"]["total"])
+        accuracy = (target.get("accuracy") or {}).get("accuracy")
+        if accuracy is not None:
+            metrics[f"{name}.accuracy"] = ("accuracy", accuracy)
+        metrics[f"{name}.error_rate"] = ("error_rate", target.get("error_rate", 0.0))
+    return metrics
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], args) -> Dict[str, Any]:
+    current = comparable_metrics(report)
+    previous = comparable_metrics(baseline)
+
+    changes: Dict[str, Dict[str, Any]] = {}
+    regressions: List[str] = []
+    for key, (kind, value) in current.items():
+        if key not in previous:
+            continue
+        base = previous[key][1]
+        delta = value - base
+        ratio = value / base if base else None
+        changes[key] = {
+            "baseline": base,
+            "current": value,
+            "delta": round(delta, 4),
+            "ratio": round(ratio, 4) if ratio is not None else None,
+        }
+
+        regressed = False
+        if kind == "latency":
+            regressed = delta > args.latency_min_delta_ms and (ratio is None or ratio > 1 + args.latency_tolerance)
+        elif kind == "tokens":
+            regressed = ratio is not None and ratio > 1 + args.token_tolerance
+        elif kind == "accuracy":
+            regressed = delta < -args.accuracy_tolerance
+        elif kind == "error_rate":
+            regressed = delta > 0
+        if regressed:
+            regressions.append(key)
+
+    return {
+        "baseline_meta": baseline.get("meta", {}),
+        # 이번에 실행한 대상 중 기준에만 있는 지표 (단계 누락 등)
+        "missing_in_current": sorted(
+            key for key in set(previous) - set(current)
+            if key.split(".", 1)[0] in report.get("targets", {})
+        ),
+        "changes": changes,
+        "regressions": regressions,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+# ============================================================
+# main
+# ============================================================
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="골든셋 벤치마크 (지연/토큰/정확도, 기준 비교)")
+    parser.add_argument("--personas", type=Path, default=DEFAULT_PERSONAS, help="골든셋 JSON")
+    parser.add_argument("--persona", action="append", default=None, help="특정 페르소나 ID만 (반복 가능)")
+    parser.add_argument(
+        "--targets", default=",".join(TARGETS),
+        help=f"실행 대상 (쉼표 구분, 기본값: {','.join(TARGETS)})",
+    )
+    parser.add_argument("--backend", choices=["mock", "live", "replay"], default="mock", help="LLM/벡터 백엔드 (기본값: mock)")
+    parser.add_argument("--cassette", type=Path, default=None, help="카세트 JSONL (mock/live: 녹화, replay: 재생)")
+    parser.add_argument(
+        "--replay-latency", default="recorded",
+        help="재생 지연: recorded | lognormal | none | 고정 ms (기본값: recorded)",
+    )
+    parser.add_argument("--replay-latency-scale", type=float, default=1.0, help="재생 지연 배율 (기본값: 1.0)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="동시 요청 수 (기본값: 4)")
+    parser.add_argument("--repeat", type=int, default=3, help="페르소나별 반복 횟수 (기본값: 3)")
+    parser.add_argument("--warmup", type=int, default=2, help="측정 전 워밍업 요청 수 (기본값: 2)")
+    parser.add_argument("--gateway-url", default=None, help="실행 중인 게이트웨이 URL (없으면 프로세스 내 실행)")
+    parser.add_argument("--keep-caches", action="store_true", help="임베딩/중재 캐시 설정 유지 (기본: 끔)")
+    parser.add_argument("--mock-llm-ms", type=float, default=0.0, help="mock LLM 응답 지연 (ms)")
+    parser.add_argument("--mock-embedding-ms", type=float, default=0.0, help="mock 임베딩 응답 지연 (ms)")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="리포트 JSON 경로 (없으면 표준 출력)")
+    parser.add_argument("--baseline", type=Path, default=None, help="비교할 기준 리포트 JSON")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    parser.add_argument("--latency-tolerance", type=float, default=0.2, help="지연 회귀 허용 비율 (기본값: 0.2)")
+    parser.add_argument("--latency-min-delta-ms", type=float, default=5.0, help="지연 회귀 최소 증가량 (ms, 기본값: 5)")
+    parser.add_argument("--token-tolerance", type=float, default=0.05, help="토큰 회귀 허용 비율 (기본값: 0.05)")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.0, help="정확도 하락 허용치 (기본값: 0)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        raise SystemExit(f"알 수 없는 대상: {', '.join(sorted(unknown))}")
+
+    if args.backend == "replay" and args.cassette is None:
+        raise SystemExit("--backend replay에는 --cassette가 필요합니다")
+
+    cassette = configure_backend(args)
+    personas = load_personas(args.personas, args.persona)
+
+    report: Dict[str, Any] = {
+        "version": REPORT_VERSION,
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "backend": args.backend,
+            "personas_file": str(args.personas),
+            "personas": len(personas),
+            "concurrency": args.concurrency,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "caches": "env" if args.keep_caches else "disabled",
+            "openai_model": os.getenv("OPENAI_MODEL", "gpt-4o"),
+            "physical_score_mode": os.getenv("PHYSICAL_SCORE_MODE"),
+            "gateway_url": args.gateway_url,
+        },
+        "targets": {},
+    }
+
+    def record(target) -> None:
+        print(f"[{target.name}] 실행 중...", file=sys.stderr)
+        samples, wall_sec = run_target(target, personas, args.concurrency, args.repeat, args.warmup)
+        report["targets"][target.name] = summarize(target, samples, wall_sec)
+        result = report["targets"][target.name]
+        accuracy = (result.get("accuracy") or {}).get("accuracy")
+        print(
+            f"[{target.name}] {result['ok']}/{result['requests']} 성공, "
+            f"p50 {result['latency_ms']['total'].get('p50')}ms / "
+            f"p95 {result['latency_ms']['total'].get('p95')}ms"
+            + (f", 정확도 {accuracy}" if accuracy is not None else ""),
+            file=sys.stderr,
+        )
+
+    if "bucket" in targets:
+        record(BucketTarget())
+    if "exercise" in targets:
+        record(ExerciseTarget())
+    if "gateway" in targets:
+        for endpoint in ("diagnose", "recommend_exercises"):
+            with GatewayTarget(endpoint, args.gateway_url) as target:
+                record(target)
+
+    if cassette is not None:
+        stats = cassette.stats()
+        report["meta"]["cassette"] = stats
+        print(
+            f"[cassette] {stats['mode']}: 적중 {stats['hits']}, 미스 {stats['misses']}, 녹화 {stats['recorded']}",
+            file=sys.stderr,
+        )
+        if stats["mode"] == "replay" and stats["misses"]:
+            # LLM 실패는 파이프라인 폴백으로 처리되므로 성공 수만으로는 드러나지 않는다
+            print("경고: 카세트 미스가 있어 일부 결과가 폴백 경로입니다 (카세트 재녹화 필요)", file=sys.stderr)
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["baseline"] = compare_to_baseline(report, baseline, args)
+        regressions = report["baseline"]["regressions"]
+        for key in regressions:
+            change = report["baseline"]["changes"][key]
+            print(f"회귀: {key} {change['baseline']} → {change['current']}", file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"리포트 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
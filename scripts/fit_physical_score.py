@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""로컬 신체 점수 계수 재보정
+
+PHYSICAL_SCORE_MODE=llm + PHYSICAL_SCORE_LOG_PATH로 쌓인 GPT 점수 로그(JSONL)에
+모델별 선형식을 최소제곱(numpy lstsq, 선택적 릿지)으로 맞춰 계수 파일을 갱신합니다.
+
+- diagnose / exercise: 목표값 = GPT 점수
+- feedback: 목표값 = GPT 점수 - 기준 점수 (절편 없음)
+- exercise+feedback 등 복합 샘플은 사용하지 않음
+
+실행:
+    PYTHONPATH=. python scripts/fit_physical_score.py --log logs/physical_score.jsonl --dry-run
+    PYTHONPATH=. python scripts/fit_physical_score.py --log logs/physical_score.jsonl --ridge 1.0
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from gateway.services.physical_score import DEFAULT_MODEL_PATH, PhysicalScoreEstimator
+
+
+def load_samples(log_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """로그 → 모델별 샘플 (GPT 점수 없는 줄은 건너뜀)"""
+    samples: Dict[str, List[Dict[str, Any]]] = {}
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("llm_score") is None:
+                continue
+            samples.setdefault(record.get("model", ""), []).append(record)
+    return samples
+
+
+def design_matrix(
+    records: List[Dict[str, Any]],
+    feature_names: List[str],
+    model: str,
+) -> tuple:
+    """(특성 행렬, 목표값)"""
+    X = np.array(
+        [[float(r["features"].get(n, 0.0)) for n in feature_names] for r in records],
+        dtype=np.float64,
+    )
+    y = np.array([float(r["llm_score"]) for r in records], dtype=np.float64)
+    if model == "feedback":
+        y = y - np.array([float(r.get("base_score") or 0) for r in records], dtype=np.float64)
+    return X, y
+
+
+def fit_linear(X: np.ndarray, y: np.ndarray, fit_intercept: bool, ridge: float) -> tuple:
+    """최소제곱 (ridge > 0이면 계수에만 L2 페널티, 절편 제외)
+
+    Returns:
+        (절편, 계수 벡터)
+    """
+    n_features = X.shape[1]
+    A = np.hstack([np.ones((X.shape[0], 1)), X]) if fit_intercept else X
+    b = y
+    if ridge > 0:
+        penalty = np.sqrt(ridge) * np.eye(A.shape[1])
+        if fit_intercept:
+            penalty = penalty[1:]
+        A = np.vstack([A, penalty])
+        b = np.concatenate([y, np.zeros(penalty.shape[0])])
+    solution, *_ = np.linalg.lstsq(A, b, rcond=None)
+    if fit_intercept:
+        return float(solution[0]), solution[1:]
+    return 0.0, solution[:n_features]
+
+
+def level_of(score: float) -> str:
+    score = max(0, min(100, round(score)))
+    if score >= 76:
+        return "A"
+    if score >= 51:
+        return "B"
+    if score >= 26:
+        return "C"
+    return "D"
+
+
+def evaluate(
+    pred: np.ndarray,
+    y: np.ndarray,
+    records: List[Dict[str, Any]],
+    model: str,
+) -> Dict[str, float]:
+    """MAE / RMSE / 레벨(A~D) 일치율"""
+    error = pred - y
+    if model == "feedback":
+        base = np.array([float(r.get("base_score") or 0) for r in records])
+        pred_scores, true_scores = pred + base, y + base
+    else:
+        pred_scores, true_scores = pred, y
+    level_match = np.mean(
+        [level_of(p) == level_of(t) for p, t in zip(pred_scores, true_scores)]
+    )
+    return {
+        "mae": round(float(np.mean(np.abs(error))), 2),
+        "rmse": round(float(np.sqrt(np.mean(error ** 2))), 2),
+        "level_match": round(float(level_match), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 신체 점수 계수 재보정")
+    parser.add_argument("--log", type=Path, required=True, help="GPT 점수 로그 (JSONL)")
+    parser.add_argument(
+        "--model-path", type=Path, default=DEFAULT_MODEL_PATH, help="계수 파일 (입력)"
+    )
+    parser.add_argument("--out", type=Path, default=None, help="출력 경로 (기본값: --model-path 덮어쓰기)")
+    parser.add_argument("--ridge", type=float, default=1.0, help="L2 페널티 (기본값: 1.0, 0이면 일반 최소제곱)")
+    parser.add_argument("--min-samples", type=int, default=30, help="모델별 최소 샘플 수 (기본값: 30)")
+    parser.add_argument("--dry-run", action="store_true", help="평가만 출력 (파일 저장 없음)")
+    args = parser.parse_args()
+
+    with open(args.model_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    estimator = PhysicalScoreEstimator(args.model_path)
+    samples = load_samples(args.log)
+
+    print("=" * 50)
+    print("로컬 신체 점수 계수 재보정")
+    print("=" * 50)
+    print(f"로그: {args.log} ({sum(len(v) for v in samples.values())}건)")
+
+    fitted_counts: Dict[str, int] = {}
+    for model, spec in config["models"].items():
+        records = samples.get(model, [])
+        print(f"\n[{model}] 샘플 {len(records)}개")
+        if len(records) < args.min_samples:
+            print(f"  최소 샘플 수({args.min_samples}) 미만 - 기존 계수 유지")
+            continue
+
+        feature_names = list(spec["coefficients"].keys())
+        fit_intercept = spec.get("fit_intercept", True)
+        X, y = design_matrix(records, feature_names, model)
+
+        before = np.array([estimator.predict(model, r["features"]) for r in records])
+        intercept, coefs = fit_linear(X, y, fit_intercept, args.ridge)
+        after = intercept + X @ coefs
+
+        print(f"  기존: {evaluate(before, y, records, model)}")
+        print(f"  재보정: {evaluate(after, y, records, model)}")
+
+        if fit_intercept:
+            spec["intercept"] = round(intercept, 3)
+        spec["coefficients"] = {
+            name: round(float(value), 3) for name, value in zip(feature_names, coefs)
+        }
+        fitted_counts[model] = len(records)
+
+    if args.dry_run or not fitted_counts:
+        print("\n저장하지 않음" + (" (--dry-run)" if args.dry_run else ""))
+        return config
+
+    metadata = config.setdefault("_metadata", {})
+    metadata["fitted_at"] = datetime.now().isoformat(timespec="seconds")
+    metadata["samples"] = {**metadata.get("samples", {}), **fitted_counts}
+
+    out_path = args.out or args.model_path
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"\n저장 완료: {out_path}")
+    return config
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,17 @@
 벡터 DB: orthocare-diagnosis
 소스: verified_paper, orthobullets, pubmed
 
+기본은 증분 인덱싱: 매니페스트(논문은 data/medical/<part>/papers/index_manifest.json,
+OrthoBullets는 캐시 파일 옆 data/crawled/index_manifest.json)의 콘텐츠 해시와 비교하여
+신규/변경 청크만 임베딩·업서트하고, 사라진 ID는 삭제한다.
+
 사용법:
     PYTHONPATH=. python scripts/index_diagnosis_db.py
     PYTHONPATH=. python scripts/index_diagnosis_db.py --papers-only
+    PYTHONPATH=. python scripts/index_diagnosis_db.py --full
     PYTHONPATH=. python scripts/index_diagnosis_db.py --clear-first
+    PYTHONPATH=. python scripts/index_diagnosis_db.py --dry-run --body-part all
+    PYTHONPATH=. python scripts/index_diagnosis_db.py --backend local --body-part all
 """
 
 import argparse
@@ -22,6 +29,15 @@ load_dotenv(override=True)  # .env 파일 우선
 from pinecone import Pinecone, ServerlessSpec
 from openai import OpenAI
 
+from shared.utils.batch_embedder import BatchEmbedder, EmbeddingRecord
+from shared.utils.index_manifest import MANIFEST_FILENAME, IndexManifest, sync_records
+from shared.utils.openai_client import get_openai_client
+from shared.utils.vector_store import (
+    LocalVectorStore,
+    get_local_store_path,
+    get_vector_store_backend,
+)
+
 # 설정 (환경변수 무시, 하드코딩)
 PINECONE_INDEX = "orthocare-diagnosis"
 EMBEDDING_MODEL = "text-embedding-3-small"
@@ -29,13 +45,20 @@ EMBEDDING_DIM = 1536
 DATA_DIR = Path(__file__).parent.parent / "data"
 
 
-def get_clients():
-    """Pinecone, OpenAI 클라이언트 반환"""
-    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-    openai = OpenAI()
+def get_clients(backend: str = "pinecone"):
+    """Pinecone, OpenAI 클라이언트 반환 (로컬 백엔드면 Pinecone은 None)"""
+    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY")) if backend == "pinecone" else None
+    openai = get_openai_client()
     return pc, openai
 
 
+def open_index(pc: Pinecone, backend: str = "pinecone"):
+    """업서트 대상 인덱스 반환 (Pinecone Index 또는 LocalVectorStore)"""
+    if backend == "local":
+        return LocalVectorStore(get_local_store_path(PINECONE_INDEX), mmap=False)
+    return pc.Index(PINECONE_INDEX)
+
+
 def ensure_index_exists(pc: Pinecone, recreate: bool = False):
     """인덱스 존재 확인 및 생성"""
     if PINECONE_INDEX in pc.list_indexes().names():
@@ -59,13 +82,9 @@ def ensure_index_exists(pc: Pinecone, recreate: bool = False):
     print(f"인덱스 '{PINECONE_INDEX}' 생성 완료")
 
 
-def embed_text(openai: OpenAI, text: str) -> List[float]:
-    """텍스트 임베딩"""
-    response = openai.embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=text,
-    )
-    return response.data[0].embedding
+def get_embedder(openai: OpenAI) -> BatchEmbedder:
+    """배치 임베딩기 반환 (EMBED_BATCH_SIZE / EMBED_WORKERS 환경변수로 조정)"""
+    return BatchEmbedder(openai, model=EMBEDDING_MODEL)
 
 
 def load_paper_metadata(body_part: str) -> Dict:
@@ -77,34 +96,46 @@ def load_paper_metadata(body_part: str) -> Dict:
     return {}
 
 
-def index_papers(pc: Pinecone, openai: OpenAI, body_part: str = "knee"):
-    """논문 인덱싱"""
-    print(f"\n=== 논문 인덱싱 ({body_part}) ===")
+def manifest_path(body_part: str) -> Path:
+    """부위별 매니페스트 경로 (papers/processed 옆)"""
+    return DATA_DIR / "medical" / body_part / "papers" / MANIFEST_FILENAME
+
+
+def orthobullets_manifest_path() -> Path:
+    """OrthoBullets 매니페스트 경로 (캐시 파일 옆, 부위별 그룹은 캐시 파일명)
 
-    index = pc.Index(PINECONE_INDEX)
+    부위 papers/ 아래에 두면 논문이 없는 부위에 원본 데이터 디렉토리가 생기므로 분리한다.
+    """
+    return DATA_DIR / "crawled" / MANIFEST_FILENAME
+
+
+def build_paper_records(body_part: str) -> List[EmbeddingRecord]:
+    """논문 청크 → 임베딩 레코드"""
     paper_metadata = load_paper_metadata(body_part)
 
     processed_dir = DATA_DIR / "medical" / body_part / "papers" / "processed"
     if not processed_dir.exists():
         print(f"처리된 논문 디렉토리 없음: {processed_dir}")
-        return 0
+        return []
 
-    vectors = []
-    for chunk_file in processed_dir.glob("*.json"):
+    records = []
+    for chunk_file in sorted(processed_dir.glob("*.json")):
         with open(chunk_file, "r", encoding="utf-8") as f:
             chunks = json.load(f)
 
-        for chunk in chunks:
-            paper_id = chunk.get("paper_id", chunk_file.stem)
+        # 청크 파일명: {paper_id}_chunks.json
+        file_paper_id = chunk_file.stem
+        if file_paper_id.endswith("_chunks"):
+            file_paper_id = file_paper_id[: -len("_chunks")]
+
+        for chunk_index, chunk in enumerate(chunks):
+            paper_id = chunk.get("paper_id", file_paper_id)
             paper_info = paper_metadata.get(paper_id, {})
 
-            # 임베딩
             text = chunk.get("text", "")
             if not text:
                 continue
 
-            embedding = embed_text(openai, text)
-
             # 메타데이터
             bucket_tags = paper_info.get("buckets", [])
             source_type = paper_info.get("source_type", "verified_paper")
@@ -120,92 +151,202 @@ def index_papers(pc: Pinecone, openai: OpenAI, body_part: str = "knee"):
             if paper_info.get("year"):
                 metadata["year"] = paper_info["year"]
 
-            vec_id = f"paper_{paper_id}_{chunk.get('chunk_id', 0)}"
-            vectors.append({
-                "id": vec_id,
-                "values": embedding,
-                "metadata": metadata,
-            })
-
-    # 배치 업서트
-    if vectors:
-        batch_size = 100
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i:i + batch_size]
-            index.upsert(vectors=batch)
-            print(f"  업서트: {i + len(batch)}/{len(vectors)}")
+            # 청크 ID: chunk_id → id → 파일 내 순번
+            chunk_id = chunk.get("chunk_id", chunk.get("id", chunk_index))
+            vec_id = f"paper_{paper_id}_{chunk_id}"
+            records.append(EmbeddingRecord(id=vec_id, text=text, metadata=metadata))
 
-    print(f"논문 인덱싱 완료: {len(vectors)}개")
-    return len(vectors)
+    return records
 
 
-def index_orthobullets(pc: Pinecone, openai: OpenAI, body_part: str = None):
-    """OrthoBullets 인덱싱
+def index_papers(
+    index,
+    embedder: BatchEmbedder,
+    body_part: str = "knee",
+    backend: str = "pinecone",
+    full: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """논문 인덱싱 (매니페스트 기준 증분)
 
-    Args:
-        body_part: 특정 부위만 인덱싱 (None이면 모든 파일)
+    Returns:
+        업서트된 벡터 수
     """
-    print("\n=== OrthoBullets 인덱싱 ===")
+    print(f"\n=== 논문 인덱싱 ({body_part}) ===")
+
+    records = build_paper_records(body_part)
+    manifest = IndexManifest(manifest_path(body_part), PINECONE_INDEX, backend, group="papers")
+    result = sync_records(
+        index, embedder, records, manifest,
+        full=full, dry_run=dry_run, label=f"papers/{body_part}",
+    )
 
-    index = pc.Index(PINECONE_INDEX)
+    print(f"논문 인덱싱 완료: 업서트 {result['upserted']}개, 삭제 {result['deleted']}개")
+    return result["upserted"]
 
-    # OrthoBullets 캐시 파일들 찾기
-    crawled_dir = DATA_DIR / "crawled"
-    cache_files = []
 
+def orthobullets_cache_files(body_part: str = None) -> List[Path]:
+    """OrthoBullets 캐시 파일 목록 (body_part가 None이면 전체)"""
+    crawled_dir = DATA_DIR / "crawled"
     if body_part:
-        # 특정 부위만
         if body_part == "knee":
-            cache_files = [crawled_dir / "orthobullets_cache.json"]
-        else:
-            cache_files = [crawled_dir / f"orthobullets_{body_part}_cache.json"]
-    else:
-        # 모든 OrthoBullets 파일
-        cache_files = list(crawled_dir.glob("orthobullets*.json"))
+            return [crawled_dir / "orthobullets_cache.json"]
+        return [crawled_dir / f"orthobullets_{body_part}_cache.json"]
+    return sorted(crawled_dir.glob("orthobullets*.json"))
 
-    total_vectors = []
-    for cache_path in cache_files:
+
+def build_orthobullets_records(cache_path: Path) -> List[EmbeddingRecord]:
+    """OrthoBullets 캐시 → 임베딩 레코드"""
+    with open(cache_path, "r", encoding="utf-8") as f:
+        articles = json.load(f)
+
+    records = []
+    for article_id, article in articles.items():
+        content = article.get("content", "")
+        if not content:
+            continue
+
+        metadata = {
+            "body_part": article.get("body_part", "knee"),
+            "source": "orthobullets",
+            "bucket": article.get("category", ""),
+            "title": article.get("title", ""),
+            "text": content[:1000],
+            "url": article.get("url", ""),
+        }
+
+        records.append(
+            EmbeddingRecord(id=f"orthobullets_{article_id}", text=content, metadata=metadata)
+        )
+    return records
+
+
+def index_orthobullets(
+    index,
+    embedder: BatchEmbedder,
+    body_part: str = None,
+    backend: str = "pinecone",
+    full: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """OrthoBullets 인덱싱 (매니페스트 기준 증분)
+
+    Args:
+        index: 업서트 대상 인덱스 (open_index 반환값)
+        embedder: 배치 임베딩기
+        body_part: 특정 부위만 인덱싱 (None이면 모든 파일)
+        backend: 벡터 스토어 백엔드 (매니페스트 섹션)
+        full: 전체 재인덱싱 여부
+        dry_run: 변경 사항만 출력
+
+    Returns:
+        업서트된 벡터 수
+    """
+    print("\n=== OrthoBullets 인덱싱 ===")
+
+    total = 0
+    for cache_path in orthobullets_cache_files(body_part):
         if not cache_path.exists():
             print(f"OrthoBullets 캐시 없음: {cache_path}")
             continue
 
         print(f"  파일: {cache_path.name}")
 
-        with open(cache_path, "r", encoding="utf-8") as f:
-            articles = json.load(f)
+        # 매니페스트는 크롤링 캐시 옆에 파일별 그룹으로 저장
+        manifest = IndexManifest(
+            orthobullets_manifest_path(),
+            PINECONE_INDEX,
+            backend,
+            group=cache_path.stem,
+        )
+        result = sync_records(
+            index, embedder, build_orthobullets_records(cache_path), manifest,
+            full=full, dry_run=dry_run, label=cache_path.stem,
+        )
+        print(f"    -> 업서트 {result['upserted']}개, 삭제 {result['deleted']}개")
+        total += result["upserted"]
+
+    print(f"OrthoBullets 인덱싱 완료: 총 {total}개")
+    return total
+
+
+def paper_body_parts(body_part: str) -> List[str]:
+    """인덱싱 대상 부위 목록 (all이면 papers/가 있는 모든 부위)"""
+    if body_part != "all":
+        return [body_part]
+    return [
+        bp_dir.name
+        for bp_dir in sorted((DATA_DIR / "medical").iterdir())
+        if (bp_dir / "papers").exists()
+    ]
+
+
+def reset_manifests(backend: str) -> None:
+    """인덱스 전체 삭제 시 모든 부위 매니페스트의 해당 백엔드 기록 초기화"""
+    paths = sorted((DATA_DIR / "medical").glob(f"*/papers/{MANIFEST_FILENAME}"))
+    paths += [path for path in (orthobullets_manifest_path(),) if path.exists()]
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("backends", {}).pop(backend, None) is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.write("\n")
+
+
+def run(
+    body_part: str = "knee",
+    backend: str = "pinecone",
+    papers: bool = True,
+    orthobullets: bool = True,
+    full: bool = False,
+    clear_first: bool = False,
+    recreate_index: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """진단용 벡터 DB 인덱싱 실행 (run_indexing.py에서도 사용)
+
+    Returns:
+        업서트된 벡터 수
+    """
+    print(f"=== 진단용 벡터 DB 인덱싱 시작 ({datetime.now()}) ===")
+    print(f"인덱스: {PINECONE_INDEX} (백엔드: {backend})")
+    print(f"임베딩 모델: {EMBEDDING_MODEL} (차원: {EMBEDDING_DIM})")
+    print(f"모드: {'전체' if full or clear_first else '증분'}{' (dry-run)' if dry_run else ''}")
 
-        vectors = []
-        for article_id, article in articles.items():
-            content = article.get("content", "")
-            if not content:
-                continue
+    pc, openai = get_clients(backend)
+    if backend == "pinecone" and not dry_run:
+        ensure_index_exists(pc, recreate=recreate_index)
+    index = open_index(pc, backend)
+    embedder = get_embedder(openai)
 
-            embedding = embed_text(openai, content)
+    if (clear_first or recreate_index) and not dry_run:
+        print("\n기존 데이터 삭제 중...")
+        if backend == "local" or clear_first:
+            index.delete(delete_all=True)
+        reset_manifests(backend)
+        full = True
+        print("삭제 완료")
 
-            metadata = {
-                "body_part": article.get("body_part", "knee"),
-                "source": "orthobullets",
-                "bucket": article.get("category", ""),
-                "title": article.get("title", ""),
-                "text": content[:1000],
-                "url": article.get("url", ""),
-            }
+    total = 0
 
-            vectors.append({
-                "id": f"orthobullets_{article_id}",
-                "values": embedding,
-                "metadata": metadata,
-            })
+    if papers:
+        for bp in paper_body_parts(body_part):
+            total += index_papers(index, embedder, bp, backend=backend, full=full, dry_run=dry_run)
 
-        # 배치 업서트
-        if vectors:
-            index.upsert(vectors=vectors)
-            print(f"    -> {len(vectors)}개 인덱싱")
+    if orthobullets:
+        # body_part 인자가 없거나 특정 부위면 해당 부위만, all이면 모든 부위
+        ob_body_part = None if body_part == "all" else body_part
+        total += index_orthobullets(
+            index, embedder, body_part=ob_body_part, backend=backend, full=full, dry_run=dry_run,
+        )
 
-        total_vectors.extend(vectors)
+    if backend == "local" and not dry_run:
+        index.save()
+        print(f"로컬 인덱스 저장: {index.path}")
 
-    print(f"OrthoBullets 인덱싱 완료: 총 {len(total_vectors)}개")
-    return len(total_vectors)
+    print(f"\n=== 인덱싱 완료: 총 {total}개 벡터 업서트 ===")
+    return total
 
 
 def main():
@@ -214,33 +355,27 @@ def main():
     parser.add_argument("--orthobullets-only", action="store_true", help="OrthoBullets만 인덱싱")
     parser.add_argument("--clear-first", action="store_true", help="기존 데이터 삭제 후 인덱싱")
     parser.add_argument("--recreate-index", action="store_true", help="인덱스 삭제 후 재생성")
-    parser.add_argument("--body-part", default="knee", help="부위 코드")
+    parser.add_argument("--full", action="store_true", help="매니페스트 무시, 전체 재임베딩/업서트")
+    parser.add_argument("--dry-run", action="store_true", help="변경 사항만 출력 (임베딩/업서트 없음)")
+    parser.add_argument("--body-part", default="knee", help="부위 코드 (all: 전체)")
+    parser.add_argument(
+        "--backend",
+        choices=["pinecone", "local"],
+        default=get_vector_store_backend(),
+        help="벡터 스토어 백엔드 (기본값: VECTOR_STORE_BACKEND)",
+    )
     args = parser.parse_args()
 
-    print(f"=== 진단용 벡터 DB 인덱싱 시작 ({datetime.now()}) ===")
-    print(f"인덱스: {PINECONE_INDEX}")
-    print(f"임베딩 모델: {EMBEDDING_MODEL} (차원: {EMBEDDING_DIM})")
-
-    pc, openai = get_clients()
-    ensure_index_exists(pc, recreate=args.recreate_index)
-
-    if args.clear_first:
-        print("\n기존 데이터 삭제 중...")
-        index = pc.Index(PINECONE_INDEX)
-        index.delete(delete_all=True)
-        print("삭제 완료")
-
-    total = 0
-
-    if not args.orthobullets_only:
-        total += index_papers(pc, openai, args.body_part)
-
-    if not args.papers_only:
-        # body_part 인자가 없거나 특정 부위면 해당 부위만, all이면 모든 부위
-        ob_body_part = None if args.body_part == "all" else args.body_part
-        total += index_orthobullets(pc, openai, body_part=ob_body_part)
-
-    print(f"\n=== 인덱싱 완료: 총 {total}개 벡터 ===")
+    run(
+        body_part=args.body_part,
+        backend=args.backend,
+        papers=not args.orthobullets_only,
+        orthobullets=not args.papers_only,
+        full=args.full,
+        clear_first=args.clear_first,
+        recreate_index=args.recreate_index,
+        dry_run=args.dry_run,
+    )
 
 
 if __name__ == "__main__":
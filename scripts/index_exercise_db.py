@@ -3,10 +3,16 @@
 벡터 DB: orthocare-exercise
 소스: exercise
 
+기본은 증분 인덱싱: data/exercise/<part>/index_manifest.json의
+콘텐츠 해시와 비교하여 신규/변경 운동만 임베딩·업서트하고, 사라진 운동은 삭제한다.
+
 사용법:
     PYTHONPATH=. python scripts/index_exercise_db.py
+    PYTHONPATH=. python scripts/index_exercise_db.py --full
+    PYTHONPATH=. python scripts/index_exercise_db.py --dry-run
     PYTHONPATH=. python scripts/index_exercise_db.py --clear-first
     PYTHONPATH=. python scripts/index_exercise_db.py --body-part shoulder
+    PYTHONPATH=. python scripts/index_exercise_db.py --backend local
 """
 
 import argparse
@@ -22,6 +28,15 @@ load_dotenv(override=True)  # .env 파일 우선
 from pinecone import Pinecone, ServerlessSpec
 from openai import OpenAI
 
+from shared.utils.batch_embedder import BatchEmbedder, EmbeddingRecord
+from shared.utils.index_manifest import MANIFEST_FILENAME, IndexManifest, sync_records
+from shared.utils.openai_client import get_openai_client
+from shared.utils.vector_store import (
+    LocalVectorStore,
+    get_local_store_path,
+    get_vector_store_backend,
+)
+
 # 설정 (환경변수 무시, 하드코딩)
 PINECONE_INDEX = "orthocare-exercise"
 EMBEDDING_MODEL = "text-embedding-3-small"
@@ -29,13 +44,20 @@ EMBEDDING_DIM = 1536
 DATA_DIR = Path(__file__).parent.parent / "data"
 
 
-def get_clients():
-    """Pinecone, OpenAI 클라이언트 반환"""
-    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-    openai = OpenAI()
+def get_clients(backend: str = "pinecone"):
+    """Pinecone, OpenAI 클라이언트 반환 (로컬 백엔드면 Pinecone은 None)"""
+    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY")) if backend == "pinecone" else None
+    openai = get_openai_client()
     return pc, openai
 
 
+def open_index(pc: Pinecone, backend: str = "pinecone"):
+    """업서트 대상 인덱스 반환 (Pinecone Index 또는 LocalVectorStore)"""
+    if backend == "local":
+        return LocalVectorStore(get_local_store_path(PINECONE_INDEX), mmap=False)
+    return pc.Index(PINECONE_INDEX)
+
+
 def ensure_index_exists(pc: Pinecone):
     """인덱스 존재 확인 및 생성"""
     if PINECONE_INDEX not in pc.list_indexes().names():
@@ -51,13 +73,9 @@ def ensure_index_exists(pc: Pinecone):
         print(f"인덱스 '{PINECONE_INDEX}' 이미 존재")
 
 
-def embed_text(openai: OpenAI, text: str) -> List[float]:
-    """텍스트 임베딩"""
-    response = openai.embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=text,
-    )
-    return response.data[0].embedding
+def get_embedder(openai: OpenAI) -> BatchEmbedder:
+    """배치 임베딩기 반환 (EMBED_BATCH_SIZE / EMBED_WORKERS 환경변수로 조정)"""
+    return BatchEmbedder(openai, model=EMBEDDING_MODEL)
 
 
 def build_exercise_text(exercise: Dict) -> str:
@@ -86,16 +104,18 @@ def build_exercise_text(exercise: Dict) -> str:
     return " ".join(parts)
 
 
-def index_exercises(pc: Pinecone, openai: OpenAI, body_part: str = "knee"):
-    """운동 인덱싱"""
-    print(f"\n=== 운동 인덱싱 ({body_part}) ===")
+def manifest_path(body_part: str) -> Path:
+    """부위별 매니페스트 경로 (exercises.json 옆)"""
+    return DATA_DIR / "exercise" / body_part / MANIFEST_FILENAME
 
-    index = pc.Index(PINECONE_INDEX)
+
+def build_exercise_records(body_part: str) -> List[EmbeddingRecord]:
+    """exercises.json → 임베딩 레코드"""
     exercises_path = DATA_DIR / "exercise" / body_part / "exercises.json"
 
     if not exercises_path.exists():
         print(f"운동 파일 없음: {exercises_path}")
-        return 0
+        return []
 
     with open(exercises_path, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -105,11 +125,10 @@ def index_exercises(pc: Pinecone, openai: OpenAI, body_part: str = "knee"):
     if isinstance(exercises, dict) and "_metadata" in data:
         exercises = data["exercises"]
 
-    vectors = []
+    records = []
     for ex_id, ex_data in exercises.items():
         # 임베딩용 텍스트 생성
         text = build_exercise_text(ex_data)
-        embedding = embed_text(openai, text)
 
         # 버킷 태그
         diagnosis_tags = ex_data.get("diagnosis_tags", [])
@@ -152,45 +171,123 @@ def index_exercises(pc: Pinecone, openai: OpenAI, body_part: str = "knee"):
         if "kinetic_chain" in ex_data:
             metadata["kinetic_chain"] = ex_data["kinetic_chain"]
 
-        vectors.append({
-            "id": f"exercise_{body_part}_{ex_id}",
-            "values": embedding,
-            "metadata": metadata,
-        })
+        records.append(
+            EmbeddingRecord(id=f"exercise_{body_part}_{ex_id}", text=text, metadata=metadata)
+        )
 
-    # 배치 업서트
-    if vectors:
-        batch_size = 100
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i:i + batch_size]
-            index.upsert(vectors=batch)
-            print(f"  업서트: {i + len(batch)}/{len(vectors)}")
+    return records
 
-    print(f"운동 인덱싱 완료: {len(vectors)}개")
-    return len(vectors)
 
+def index_exercises(
+    index,
+    embedder: BatchEmbedder,
+    body_part: str = "knee",
+    backend: str = "pinecone",
+    full: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """운동 인덱싱 (매니페스트 기준 증분)
 
-def main():
-    parser = argparse.ArgumentParser(description="운동용 벡터 DB 인덱싱")
-    parser.add_argument("--clear-first", action="store_true", help="기존 데이터 삭제 후 인덱싱")
-    parser.add_argument("--body-part", default="knee", help="부위 코드")
-    args = parser.parse_args()
+    Returns:
+        업서트된 벡터 수
+    """
+    print(f"\n=== 운동 인덱싱 ({body_part}) ===")
+
+    records = build_exercise_records(body_part)
+    manifest = IndexManifest(manifest_path(body_part), PINECONE_INDEX, backend, group="exercises")
+    result = sync_records(
+        index, embedder, records, manifest,
+        full=full, dry_run=dry_run, label=f"exercise/{body_part}",
+    )
 
+    print(f"운동 인덱싱 완료: 업서트 {result['upserted']}개, 삭제 {result['deleted']}개")
+    return result["upserted"]
+
+
+def exercise_body_parts(body_part: str) -> List[str]:
+    """인덱싱 대상 부위 목록 (all이면 exercises.json이 있는 모든 부위)"""
+    if body_part != "all":
+        return [body_part]
+    return [
+        bp_dir.name
+        for bp_dir in sorted((DATA_DIR / "exercise").iterdir())
+        if (bp_dir / "exercises.json").exists()
+    ]
+
+
+def reset_manifests(backend: str) -> None:
+    """인덱스 전체 삭제 시 모든 부위 매니페스트의 해당 백엔드 기록 초기화"""
+    for path in sorted((DATA_DIR / "exercise").glob(f"*/{MANIFEST_FILENAME}")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("backends", {}).pop(backend, None) is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.write("\n")
+
+
+def run(
+    body_part: str = "knee",
+    backend: str = "pinecone",
+    full: bool = False,
+    clear_first: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """운동용 벡터 DB 인덱싱 실행 (run_indexing.py에서도 사용)
+
+    Returns:
+        업서트된 벡터 수
+    """
     print(f"=== 운동용 벡터 DB 인덱싱 시작 ({datetime.now()}) ===")
-    print(f"인덱스: {PINECONE_INDEX}")
+    print(f"인덱스: {PINECONE_INDEX} (백엔드: {backend})")
+    print(f"모드: {'전체' if full or clear_first else '증분'}{' (dry-run)' if dry_run else ''}")
 
-    pc, openai = get_clients()
-    ensure_index_exists(pc)
+    pc, openai = get_clients(backend)
+    if backend == "pinecone" and not dry_run:
+        ensure_index_exists(pc)
+    index = open_index(pc, backend)
+    embedder = get_embedder(openai)
 
-    if args.clear_first:
+    if clear_first and not dry_run:
         print("\n기존 데이터 삭제 중...")
-        index = pc.Index(PINECONE_INDEX)
         index.delete(delete_all=True)
+        reset_manifests(backend)
+        full = True
         print("삭제 완료")
 
-    total = index_exercises(pc, openai, args.body_part)
+    total = 0
+    for bp in exercise_body_parts(body_part):
+        total += index_exercises(index, embedder, bp, backend=backend, full=full, dry_run=dry_run)
+
+    if backend == "local" and not dry_run:
+        index.save()
+        print(f"로컬 인덱스 저장: {index.path}")
+
+    print(f"\n=== 인덱싱 완료: 총 {total}개 벡터 업서트 ===")
+    return total
+
 
-    print(f"\n=== 인덱싱 완료: 총 {total}개 벡터 ===")
+def main():
+    parser = argparse.ArgumentParser(description="운동용 벡터 DB 인덱싱")
+    parser.add_argument("--clear-first", action="store_true", help="기존 데이터 삭제 후 인덱싱")
+    parser.add_argument("--full", action="store_true", help="매니페스트 무시, 전체 재임베딩/업서트")
+    parser.add_argument("--dry-run", action="store_true", help="변경 사항만 출력 (임베딩/업서트 없음)")
+    parser.add_argument("--body-part", default="knee", help="부위 코드 (all: 전체)")
+    parser.add_argument(
+        "--backend",
+        choices=["pinecone", "local"],
+        default=get_vector_store_backend(),
+        help="벡터 스토어 백엔드 (기본값: VECTOR_STORE_BACKEND)",
+    )
+    args = parser.parse_args()
+
+    run(
+        body_part=args.body_part,
+        backend=args.backend,
+        full=args.full,
+        clear_first=args.clear_first,
+        dry_run=args.dry_run,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""OpenAI Batch API 로컬 스텁 서버
+
+API 키/비용 없이 Batch API 모드(run_batch_diagnosis.py --llm batch,
+BatchRecommendationRunner)의 업로드 → 제출 → 폴링 → 결과 다운로드 흐름을 시험합니다.
+메모리에만 저장하며, 배치는 --delay초 뒤 완료되고 그때 결과 파일이 생성됩니다.
+
+지원 엔드포인트 (OpenAI SDK가 호출하는 경로):
+    POST /v1/files                  (multipart: file, purpose)
+    GET  /v1/files/{id}
+    GET  /v1/files/{id}/content
+    POST /v1/batches
+    GET  /v1/batches/{id}
+    POST /v1/batches/{id}/cancel
+
+응답 content:
+    --responses 픽스처(JSONL, 줄마다 {"custom_id": ..., "content": ...})에 있으면 그 값,
+    {"custom_id": ..., "error": "..."}이면 해당 요청을 HTTP 500 오류로 응답,
+    없으면 --default-content (기본값: "{}")
+
+실행:
+    PYTHONPATH=. python scripts/openai_batch_stub_server.py --port 8900 --delay 2
+    OPENAI_BASE_URL=http://localhost:8900/v1 OPENAI_API_KEY=stub \\
+        PYTHONPATH=. python scripts/run_batch_diagnosis.py in.jsonl -o out.jsonl --llm batch --poll-interval 1
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import PlainTextResponse
+
+
+def create_app(
+    delay: float = 2.0,
+    responses: Optional[Dict[str, Dict[str, Any]]] = None,
+    default_content: str = "{}",
+) -> FastAPI:
+    """스텁 앱 생성
+
+    Args:
+        delay: 배치 생성 후 완료까지 걸리는 시간 (초)
+        responses: custom_id → {"content": ...} 또는 {"error": ...}
+        default_content: 픽스처에 없는 요청의 응답 content
+    """
+    app = FastAPI(title="OpenAI Batch API Stub")
+    responses = responses or {}
+    files: Dict[str, Dict[str, Any]] = {}
+    contents: Dict[str, bytes] = {}
+    batches: Dict[str, Dict[str, Any]] = {}
+    lock = threading.Lock()
+
+    def new_id(prefix: str) -> str:
+        return f"{prefix}-{uuid.uuid4().hex[:24]}"
+
+    def store_file(data: bytes, filename: str, purpose: str) -> Dict[str, Any]:
+        file_id = new_id("file")
+        files[file_id] = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(data),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+        contents[file_id] = data
+        return files[file_id]
+
+    def respond(request: Dict[str, Any]) -> Dict[str, Any]:
+        """요청 한 줄 → 결과 한 줄"""
+        custom_id = request["custom_id"]
+        fixture = responses.get(custom_id, {})
+        if "error" in fixture:
+            return {
+                "id": new_id("batch_req"),
+                "custom_id": custom_id,
+                "response": {
+                    "status_code": 500,
+                    "request_id": new_id("req"),
+                    "body": {"error": {"message": fixture["error"], "type": "server_error"}},
+                },
+                "error": None,
+            }
+        body = request.get("body", {})
+        return {
+            "id": new_id("batch_req"),
+            "custom_id": custom_id,
+            "response": {
+                "status_code": 200,
+                "request_id": new_id("req"),
+                "body": {
+                    "id": new_id("chatcmpl"),
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": fixture.get("content", default_content),
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                },
+            },
+            "error": None,
+        }
+
+    def advance(batch: Dict[str, Any]) -> None:
+        """경과 시간에 따라 상태 전이 (validating → in_progress → completed)"""
+        if batch["status"] in ("completed", "failed", "expired", "cancelled"):
+            return
+        elapsed = time.time() - batch["created_at"]
+        if elapsed < delay / 2:
+            batch["status"] = "validating"
+            return
+        if elapsed < delay:
+            batch["status"] = "in_progress"
+            return
+
+        lines = [
+            json.loads(line)
+            for line in contents[batch["input_file_id"]].decode("utf-8").splitlines()
+            if line.strip()
+        ]
+        results = [respond(request) for request in lines]
+        output = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in results)
+        batch["output_file_id"] = store_file(
+            output.encode("utf-8"), f"{batch['id']}_output.jsonl", "batch_output"
+        )["id"]
+        failed = sum(1 for r in results if r["response"]["status_code"] != 200)
+        batch["request_counts"] = {
+            "total": len(results),
+            "completed": len(results) - failed,
+            "failed": failed,
+        }
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+
+    @app.post("/v1/files")
+    async def create_file(file: UploadFile = File(...), purpose: str = Form(...)):
+        data = await file.read()
+        with lock:
+            return store_file(data, file.filename or "upload.jsonl", purpose)
+
+    @app.get("/v1/files/{file_id}")
+    def retrieve_file(file_id: str):
+        if file_id not in files:
+            raise HTTPException(status_code=404, detail=f"파일 없음: {file_id}")
+        return files[file_id]
+
+    @app.get("/v1/files/{file_id}/content")
+    def file_content(file_id: str):
+        if file_id not in contents:
+            raise HTTPException(status_code=404, detail=f"파일 없음: {file_id}")
+        return PlainTextResponse(contents[file_id].decode("utf-8"))
+
+    @app.post("/v1/batches")
+    def create_batch(payload: Dict[str, Any]):
+        input_file_id = payload.get("input_file_id")
+        if input_file_id not in contents:
+            raise HTTPException(status_code=400, detail=f"입력 파일 없음: {input_file_id}")
+        batch_id = new_id("batch")
+        with lock:
+            batches[batch_id] = {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": payload.get("endpoint"),
+                "input_file_id": input_file_id,
+                "completion_window": payload.get("completion_window", "24h"),
+                "status": "validating",
+                "created_at": int(time.time()),
+                "output_file_id": None,
+                "error_file_id": None,
+                "request_counts": {"total": 0, "completed": 0, "failed": 0},
+                "metadata": payload.get("metadata"),
+            }
+            return batches[batch_id]
+
+    @app.get("/v1/batches/{batch_id}")
+    def retrieve_batch(batch_id: str):
+        if batch_id not in batches:
+            raise HTTPException(status_code=404, detail=f"배치 없음: {batch_id}")
+        with lock:
+            advance(batches[batch_id])
+            return batches[batch_id]
+
+    @app.post("/v1/batches/{batch_id}/cancel")
+    def cancel_batch(batch_id: str):
+        if batch_id not in batches:
+            raise HTTPException(status_code=404, detail=f"배치 없음: {batch_id}")
+        with lock:
+            batch = batches[batch_id]
+            if batch["status"] not in ("completed", "failed", "expired"):
+                batch["status"] = "cancelled"
+                batch["cancelled_at"] = int(time.time())
+            return batch
+
+    return app
+
+
+def load_responses(path: Path) -> Dict[str, Dict[str, Any]]:
+    """응답 픽스처 JSONL → custom_id → {"content"} / {"error"}"""
+    responses: Dict[str, Dict[str, Any]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                responses[record.pop("custom_id")] = record
+    return responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI Batch API 로컬 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--delay", type=float, default=2.0, help="배치 완료까지 걸리는 시간 (초, 기본값: 2)")
+    parser.add_argument("--responses", type=Path, default=None, help="응답 픽스처 JSONL")
+    parser.add_argument("--default-content", default="{}", help="픽스처에 없는 요청의 응답 content")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(
+        delay=args.delay,
+        responses=load_responses(args.responses) if args.responses else None,
+        default_content=args.default_content,
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""운동 루틴 사전 계산 (루틴 캐시 예열)
+
+활성 사용자의 다음 날 입력(JSONL, 줄마다 ExerciseRecommendationInput 또는 {id, input})으로
+운동 추천을 미리 실행해 루틴 캐시(RoutineCache)에 저장합니다. 다음 날 같은 상태의
+요청은 파이프라인 없이 캐시 조회로 응답합니다.
+
+- 상태 digest가 같은 루틴이 이미 있으면 건너뜀 (--refresh면 다시 계산)
+- LLM 실패로 대체된 루틴은 저장하지 않음 (요청 시 다시 시도)
+- 서빙과 같은 캐시를 써야 하므로 ROUTINE_CACHE_BACKEND는 sqlite/redis
+  (ROUTINE_CACHE_ENABLED 값과 관계없이 설정된 백엔드에 기록)
+- 게이트웨이는 제외 목록 없이(include_excluded=False) 호출하므로 기본값도 동일
+
+실행:
+    PYTHONPATH=. python scripts/precompute_routines.py exports/active_users.jsonl
+    PYTHONPATH=. python scripts/precompute_routines.py exports/active_users.jsonl -c 16 --mode deterministic
+    PYTHONPATH=. python scripts/precompute_routines.py exports/active_users.jsonl --at 03:00   # 다음 03:00까지 대기 후 실행
+
+cron (매일 03:00, 한산한 시간):
+    0 3 * * * cd /app && PYTHONPATH=. python scripts/precompute_routines.py exports/active_users.jsonl -o logs/precompute.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils import create_response_cache
+from exercise_recommendation.config import settings
+from exercise_recommendation.models import ExerciseRecommendationInput
+from exercise_recommendation.pipeline import ExerciseRecommendationPipeline
+from exercise_recommendation.services.routine_cache import RoutineCache
+
+
+def iter_inputs(path: Path, limit: Optional[int]) -> Iterator[Tuple[int, Optional[str], Any]]:
+    """(줄 번호, ID, ExerciseRecommendationInput 또는 파싱 예외)"""
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, raw in enumerate(f, start=1):
+            raw = raw.strip()
+            if not raw:
+                continue
+            if limit is not None and count >= limit:
+                return
+            count += 1
+            record_id = None
+            try:
+                data = json.loads(raw)
+                if isinstance(data, dict) and "input" in data:
+                    record_id = data.get("id")
+                    data = data["input"]
+                yield line_no, record_id, ExerciseRecommendationInput.model_validate(data)
+            except Exception as e:
+                yield line_no, record_id, e
+
+
+def seconds_until(at: str) -> float:
+    """다음 HH:MM까지 남은 시간 (초)"""
+    hour, minute = (int(part) for part in at.split(":"))
+    now = datetime.now()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def ordered_map(
+    pool: ThreadPoolExecutor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_pending: int,
+) -> Iterator[Any]:
+    """fn(항목)을 스레드 풀로 실행하고 입력 순서대로 반환
+
+    미완료 작업은 max_pending개로 제한해 활성 사용자 수와 관계없이 메모리를 일정하게 유지하고,
+    중단(close/예외) 시 남은 작업은 취소한다 (BatchDiagnosisRunner._ordered와 동일).
+    """
+    pending: "deque[Future]" = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def precompute_one(
+    pipeline: ExerciseRecommendationPipeline,
+    input_data: ExerciseRecommendationInput,
+    include_excluded: bool,
+    refresh: bool,
+) -> Dict[str, Any]:
+    """한 사용자 루틴 계산 → 결과 요약"""
+    cache = pipeline.routine_cache
+    assessment_result = pipeline._process_assessment(input_data)
+    digest = pipeline.routine_digest(input_data, assessment_result, include_excluded)
+    # get()은 서빙 적중률(/health)에 집계되므로 존재 여부만 확인
+    if not refresh and cache.contains(input_data, digest):
+        return {"status": "fresh"}
+
+    output = pipeline.run(input_data, include_excluded=include_excluded, refresh=True)
+    return {
+        "status": "fallback" if output.llm_fallback else "computed",
+        "exercises": output.routine_order,
+        "mode": output.recommendation_mode,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="운동 루틴 사전 계산 (루틴 캐시 예열)")
+    parser.add_argument("input", type=Path, help="활성 사용자 입력 JSONL (줄마다 ExerciseRecommendationInput 또는 {id, input})")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="줄별 결과 로그 JSONL (선택)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="동시 계산 수 (기본값: 8)")
+    parser.add_argument(
+        "--mode", choices=["llm", "deterministic", "hybrid"], default=None,
+        help="recommendation_mode 일괄 지정 (기본값: 입력값 또는 RECOMMENDATION_MODE)",
+    )
+    parser.add_argument("--include-excluded", action="store_true", help="제외 운동 목록 포함 (서빙 호출과 같아야 캐시 적중)")
+    parser.add_argument("--refresh", action="store_true", help="같은 상태의 루틴이 있어도 다시 계산")
+    parser.add_argument("--limit", type=int, default=None, help="처리할 최대 줄 수")
+    parser.add_argument("--at", default=None, help="다음 HH:MM(로컬 시간)까지 대기 후 실행 (예: 03:00)")
+    args = parser.parse_args()
+
+    if settings.routine_cache_backend.lower() == "memory":
+        print("ROUTINE_CACHE_BACKEND=memory는 서빙 프로세스와 공유되지 않습니다 (sqlite/redis 사용)")
+        sys.exit(1)
+
+    if args.at:
+        wait = seconds_until(args.at)
+        print(f"{args.at}까지 대기 ({wait / 3600:.1f}시간)")
+        time.sleep(wait)
+
+    cache = RoutineCache(
+        create_response_cache(
+            backend=settings.routine_cache_backend,
+            ttl_seconds=settings.routine_cache_ttl,
+            max_items=settings.routine_cache_max_items,
+            path=settings.routine_cache_path,
+            redis_url=settings.routine_cache_redis_url,
+            name="routines",
+        )
+    )
+    pipeline = ExerciseRecommendationPipeline(routine_cache=cache)
+
+    print("=" * 50)
+    print("운동 루틴 사전 계산")
+    print("=" * 50)
+    print(f"입력: {args.input}")
+    print(f"캐시: {settings.routine_cache_backend}, TTL {settings.routine_cache_ttl}초")
+    print(f"동시 실행: {args.concurrency}, 모드: {args.mode or '입력값/설정'}")
+
+    def work(item: Tuple[int, Optional[str], Any]) -> Dict[str, Any]:
+        line_no, record_id, input_data = item
+        record: Dict[str, Any] = {"line": line_no, "id": record_id}
+        try:
+            if isinstance(input_data, Exception):
+                raise input_data
+            if args.mode:
+                input_data = input_data.model_copy(update={"recommendation_mode": args.mode})
+            record["user_id"] = input_data.user_id
+            record.update(precompute_one(pipeline, input_data, args.include_excluded, args.refresh))
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    started = time.perf_counter()
+    counts: Dict[str, int] = {"computed": 0, "fresh": 0, "fallback": 0, "error": 0}
+    log = open(args.output, "w", encoding="utf-8") if args.output else None
+    try:
+        concurrency = max(1, args.concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            records = ordered_map(pool, work, iter_inputs(args.input, args.limit), concurrency * 2)
+            for record in records:
+                counts[record["status"]] += 1
+                if log:
+                    log.write(json.dumps(record, ensure_ascii=False) + "\n")
+                if record["status"] == "error":
+                    print(f"  줄 {record['line']}: {record['error']}")
+    finally:
+        if log:
+            log.close()
+
+    elapsed = time.perf_counter() - started
+    print("-" * 50)
+    print(
+        f"완료: 계산 {counts['computed']}, 유지(같은 상태) {counts['fresh']}, "
+        f"LLM 실패(미저장) {counts['fallback']}, 오류 {counts['error']} ({elapsed:.1f}초)"
+    )
+    if counts["error"] or counts["fallback"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
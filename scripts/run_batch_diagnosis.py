@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""버킷 추론 배치 실행
+
+과거 설문 내보내기(JSONL, 줄마다 BucketInferenceInput)를 다시 추론하여
+결과를 JSONL로 기록합니다. 중단 후 같은 명령을 다시 실행하면
+체크포인트(<출력>.checkpoint.json)부터 이어서 처리합니다.
+
+실행:
+    PYTHONPATH=. python scripts/run_batch_diagnosis.py exports/surveys.jsonl -o exports/surveys.results.jsonl
+    PYTHONPATH=. python scripts/run_batch_diagnosis.py exports/surveys.jsonl -o out.jsonl --pipeline langgraph -c 16
+    PYTHONPATH=. python scripts/run_batch_diagnosis.py exports/surveys.jsonl -o out.jsonl --restart
+
+LLM 중재를 OpenAI Batch API로 (비용 50%, 완료까지 최대 24시간, 같은 --work-dir로 재실행 시 이어서):
+    PYTHONPATH=. python scripts/run_batch_diagnosis.py exports/surveys.jsonl -o out.jsonl --llm batch --work-dir exports/surveys.batch
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from bucket_inference.pipeline import (
+    BatchDiagnosisRunner,
+    BucketInferencePipeline,
+    LangGraphBucketInferencePipeline,
+)
+from shared.utils.openai_batch import OpenAIBatchRunner
+
+
+def _print_batch_progress(batch) -> None:
+    counts = batch.request_counts
+    done = f" {counts.completed + counts.failed}/{counts.total}" if counts else ""
+    print(f"  배치 {batch.id}: {batch.status}{done}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="버킷 추론 배치 실행 (JSONL → JSONL)")
+    parser.add_argument("input", type=Path, help="입력 JSONL (줄마다 BucketInferenceInput 또는 {id, input})")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="출력 JSONL (기본값: <입력>.results.jsonl)")
+    parser.add_argument(
+        "--pipeline", choices=["default", "langgraph"], default="default",
+        help="추론 파이프라인 (기본값: default)",
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="동시 추론 수 (기본값: 8)")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="체크포인트 저장 간격 (기본값: 100줄)")
+    parser.add_argument("--limit", type=int, default=None, help="이번 실행에서 처리할 최대 줄 수")
+    parser.add_argument("--restart", action="store_true", help="체크포인트 무시하고 처음부터 실행")
+    parser.add_argument(
+        "--llm", choices=["sync", "batch"], default="sync",
+        help="LLM 중재 방식 (batch: OpenAI Batch API, default 파이프라인만, 기본값: sync)",
+    )
+    parser.add_argument("--work-dir", type=Path, default=None, help="Batch API 작업 디렉토리 (기본값: <출력>.batch)")
+    parser.add_argument("--poll-interval", type=float, default=30.0, help="Batch API 상태 조회 간격 (초, 기본값: 30)")
+    args = parser.parse_args()
+
+    output = args.output or args.input.with_name(args.input.stem + ".results.jsonl")
+    pipeline = (
+        LangGraphBucketInferencePipeline()
+        if args.pipeline == "langgraph"
+        else BucketInferencePipeline()
+    )
+    runner = BatchDiagnosisRunner(
+        pipeline,
+        concurrency=args.concurrency,
+        checkpoint_every=args.checkpoint_every,
+    )
+
+    print("=" * 50)
+    print("버킷 추론 배치 실행")
+    print("=" * 50)
+    print(f"입력: {args.input}")
+    print(f"출력: {output}")
+    print(f"파이프라인: {args.pipeline}, 동시 실행: {args.concurrency}")
+
+    if args.llm == "batch":
+        work_dir = args.work_dir or output.with_name(output.name + ".batch")
+        print(f"LLM 중재: Batch API (작업 디렉토리: {work_dir})")
+        summary = runner.run_llm_batch(
+            args.input,
+            output,
+            work_dir,
+            batch_runner=OpenAIBatchRunner(
+                poll_interval=args.poll_interval, on_poll=_print_batch_progress
+            ),
+            limit=args.limit,
+        )
+        print(f"\n요청: {summary['requests']}건 (응답 캐시 적중 {summary['cached']}건)")
+        print(f"처리: {summary['lines']}줄 (성공 {summary['ok']}, 오류 {summary['errors']})")
+        print(f"소요: {summary['elapsed_sec']}초")
+        return summary
+
+    summary = runner.run(args.input, output, restart=args.restart, limit=args.limit)
+
+    if summary["resumed_from_line"]:
+        print(f"\n체크포인트에서 재개: {summary['resumed_from_line']}줄 이후")
+    print(f"\n처리: {summary['processed']}건 (성공 {summary['ok']}, 오류 {summary['errors']} - 누적)")
+    print(f"소요: {summary['elapsed_sec']}초 ({summary['rows_per_sec']}건/초)")
+    if "embedding_cache" in summary:
+        print(f"임베딩 캐시: {json.dumps(summary['embedding_cache'], ensure_ascii=False)}")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
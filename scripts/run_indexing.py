@@ -1,72 +1,75 @@
 #!/usr/bin/env python3
 """벡터 DB 인덱싱 실행
 
-운동 데이터를 Pinecone에 인덱싱합니다.
+진단용(orthocare-diagnosis) / 운동용(orthocare-exercise) 벡터 DB를 순서대로 인덱싱합니다.
+기본은 증분 모드로, 매니페스트(index_manifest.json)의 콘텐츠 해시와 비교하여
+신규/변경된 청크·운동만 임베딩하고 원본에서 사라진 벡터는 삭제합니다.
 
 실행:
-    python scripts/run_indexing.py
-    python scripts/run_indexing.py --exercises-only
+    PYTHONPATH=. python scripts/run_indexing.py
+    PYTHONPATH=. python scripts/run_indexing.py --dry-run
+    PYTHONPATH=. python scripts/run_indexing.py --full
+    PYTHONPATH=. python scripts/run_indexing.py --exercises-only
+    PYTHONPATH=. python scripts/run_indexing.py --backend local
 """
 
+import argparse
 import sys
 from pathlib import Path
 
 # 프로젝트 루트를 path에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
 
-from orthocare.config import settings
-from openai import OpenAI
-from pinecone import Pinecone
+import index_diagnosis_db
+import index_exercise_db
+from shared.utils.vector_store import get_vector_store_backend
 
 
 def main():
+    parser = argparse.ArgumentParser(description="OrthoCare 벡터 DB 인덱싱 (증분)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--diagnosis-only", action="store_true", help="진단용 벡터 DB만 인덱싱")
+    group.add_argument("--exercises-only", action="store_true", help="운동용 벡터 DB만 인덱싱")
+    parser.add_argument("--full", action="store_true", help="매니페스트 무시, 전체 재임베딩/업서트")
+    parser.add_argument("--dry-run", action="store_true", help="변경 사항만 출력 (임베딩/업서트 없음)")
+    parser.add_argument("--body-part", default="all", help="부위 코드 (기본값: all)")
+    parser.add_argument(
+        "--backend",
+        choices=["pinecone", "local"],
+        default=get_vector_store_backend(),
+        help="벡터 스토어 백엔드 (기본값: VECTOR_STORE_BACKEND)",
+    )
+    args = parser.parse_args()
+
     print("=" * 50)
     print("OrthoCare 벡터 DB 인덱싱")
     print("=" * 50)
 
-    # 클라이언트 초기화
-    print("\n[1] 클라이언트 연결...")
-    openai_client = OpenAI(api_key=settings.openai_api_key)
-    pc = Pinecone(api_key=settings.pinecone_api_key)
-
-    # Pinecone 인덱스 연결
-    if settings.pinecone_host:
-        index = pc.Index(host=settings.pinecone_host)
-    else:
-        index = pc.Index(settings.pinecone_index)
-
-    # 현재 상태 확인
-    stats = index.describe_index_stats()
-    print(f"  현재 벡터 수: {stats.total_vector_count:,}")
-    print(f"  차원: {stats.dimension}")
-
-    # 인덱싱 파이프라인 초기화
-    print("\n[2] 인덱싱 파이프라인 초기화...")
-    from orthocare.data_ops.indexing import IndexingPipeline, IndexingConfig
-
-    config = IndexingConfig(
-        namespace="",  # 기본 네임스페이스
-        chunk_max_tokens=512,
-        chunk_overlap_tokens=100,
-        batch_size=50,
-        show_progress=True,
-    )
-
-    pipeline = IndexingPipeline(
-        pinecone_index=index,
-        openai_client=openai_client,
-        config=config,
-    )
-
-    # 전체 인덱싱 실행
-    print("\n[3] 인덱싱 실행...")
-    results = pipeline.run_full_indexing()
-
-    # 결과 확인
-    print("\n[4] 결과 확인...")
-    final_stats = index.describe_index_stats()
-    print(f"  최종 벡터 수: {final_stats.total_vector_count:,}")
+    results = {}
+
+    if not args.exercises_only:
+        results["diagnosis"] = index_diagnosis_db.run(
+            body_part=args.body_part,
+            backend=args.backend,
+            full=args.full,
+            dry_run=args.dry_run,
+        )
+        print()
+
+    if not args.diagnosis_only:
+        results["exercise"] = index_exercise_db.run(
+            body_part=args.body_part,
+            backend=args.backend,
+            full=args.full,
+            dry_run=args.dry_run,
+        )
+
+    print("\n" + "=" * 50)
+    for name, upserted in results.items():
+        print(f"  {name}: {upserted}개 업서트")
+    print("=" * 50)
 
     return results
 
@@ -195,30 +195,17 @@ class BodyPartConfigLoader:
 
     @classmethod
     def _get_default_prompt_template(cls) -> str:
-        """기본 프롬프트 템플릿"""
-        return """
-## 환자 정보
-{patient_info}
-
-## 증상
-{symptoms}
-
-## 버킷별 점수 (가중치 기반)
-{bucket_scores}
-
-## 순위 비교
-- 가중치 순위: {weight_ranking}
-- 검색 순위: {search_ranking}
-{discrepancy_info}
-
-## 검색된 근거 자료
-{evidence}
+        """기본 프롬프트 템플릿
 
+        고정 부분(버킷 설명, 요청, JSON 형식)을 앞에, 환자별 데이터를 뒤에 둔다
+        (제공자 측 프롬프트 캐시는 앞부분이 같은 요청끼리만 적중).
+        """
+        return """
 ## 버킷 설명
 {bucket_descriptions}
 
 ## 요청
-위 정보를 종합하여 가장 가능성 높은 진단 버킷을 결정하세요.
+아래 환자 데이터와 근거 자료를 종합하여 가장 가능성 높은 진단 버킷을 결정하세요.
 
 **중요**: final_bucket은 반드시 {valid_buckets} 중 하나만 선택하세요.
 
@@ -237,6 +224,26 @@ class BodyPartConfigLoader:
         }}
     ]
 }}
+
+---
+# 환자 데이터
+
+## 환자 정보
+{patient_info}
+
+## 증상
+{symptoms}
+
+## 버킷별 점수 (가중치 기반)
+{bucket_scores}
+
+## 순위 비교
+- 가중치 순위: {weight_ranking}
+- 검색 순위: {search_ranking}
+{discrepancy_info}
+
+## 검색된 근거 자료
+{evidence}
 """
 
     @classmethod
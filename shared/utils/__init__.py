@@ -1,9 +1,54 @@
 """Shared utilities"""
 
 from .pinecone_client import PineconeClient
+from .vector_store import (
+    VectorStore,
+    LocalVectorStore,
+    SearchResult,
+    SearchResults,
+    create_vector_store,
+    set_vector_store_factory,
+)
 from .logging import get_logger
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .response_cache import (
+    ResponseCache,
+    make_response_cache_key,
+    create_response_cache,
+)
+from .openai_client import (
+    get_openai_client,
+    get_async_openai_client,
+    set_openai_clients,
+    close_openai_clients,
+    aclose_openai_clients,
+)
+from .cassette import (
+    Cassette,
+    CassetteMissError,
+    install_cassette,
+)
 
 __all__ = [
     "PineconeClient",
+    "VectorStore",
+    "LocalVectorStore",
+    "SearchResult",
+    "SearchResults",
+    "create_vector_store",
+    "set_vector_store_factory",
     "get_logger",
+    "EmbeddingCache",
+    "get_embedding_cache",
+    "ResponseCache",
+    "make_response_cache_key",
+    "create_response_cache",
+    "get_openai_client",
+    "get_async_openai_client",
+    "set_openai_clients",
+    "close_openai_clients",
+    "aclose_openai_clients",
+    "Cassette",
+    "CassetteMissError",
+    "install_cassette",
 ]
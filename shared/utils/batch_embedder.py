@@ -0,0 +1,316 @@
+"""배치 임베딩 + 업서트 파이프라인 (인덱싱 스크립트용)
+
+청크/운동마다 embeddings.create를 한 번씩 호출하면 전체 인덱싱 시간이
+왕복 지연에 좌우된다. 입력을 묶어 한 번에 임베딩하고, 임베딩과 업서트를
+제한된 스레드 풀에서 겹쳐 실행한다.
+
+- 요청당 최대 입력 수 / 추정 토큰 수 제한
+- 레이트 리밋·연결 오류 시 지수 백오프 + 지터 재시도
+- 진행률 / 처리량 요약 출력
+
+환경변수:
+- EMBED_BATCH_SIZE: 요청당 최대 입력 수 (기본값: 256, API 상한 2048)
+- EMBED_BATCH_TOKENS: 요청당 최대 추정 토큰 수 (기본값: 250000, API 상한 300000)
+- EMBED_WORKERS: 동시 배치 수 (기본값: 4)
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
+
+from .openai_client import get_openai_client
+
+
+T = TypeVar("T")
+
+# API 상한
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 300_000
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 보수적 추정 (tiktoken 없이)
+
+    영문은 약 4바이트/토큰, 한글은 약 1글자(3바이트)/토큰이므로
+    UTF-8 바이트 수 / 3을 상한 추정치로 사용한다.
+    """
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+@dataclass
+class EmbeddingRecord:
+    """임베딩 대상 레코드 (벡터 ID + 텍스트 + 메타데이터)"""
+
+    id: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BatchEmbedStats:
+    """배치 임베딩 통계"""
+
+    total: int = 0
+    embedded: int = 0
+    upserted: int = 0
+    batches: int = 0
+    api_calls: int = 0
+    retries: int = 0
+    estimated_tokens: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        elapsed = self.elapsed
+        return self.embedded / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"임베딩 {self.embedded}/{self.total}건, 업서트 {self.upserted}건 | "
+            f"배치 {self.batches}개, API 호출 {self.api_calls}회, 재시도 {self.retries}회 | "
+            f"추정 토큰 {self.estimated_tokens:,} | "
+            f"{self.elapsed:.1f}초 ({self.throughput:.1f}건/s)"
+        )
+
+
+class BatchEmbedder:
+    """배치 임베딩기
+
+    사용 예시:
+        embedder = BatchEmbedder(get_openai_client(), model="text-embedding-3-small")
+        vectors = embedder.embed(["텍스트1", "텍스트2"])
+
+        # 임베딩 + 업서트 파이프라인
+        records = [EmbeddingRecord(id="paper_1", text="...", metadata={...})]
+        stats = embedder.embed_and_upsert(records, index)
+    """
+
+    def __init__(
+        self,
+        openai_client: Optional[OpenAI] = None,
+        model: str = "text-embedding-3-small",
+        max_batch_size: Optional[int] = None,
+        max_batch_tokens: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        verbose: bool = True,
+    ):
+        """
+        Args:
+            openai_client: OpenAI 클라이언트 (없으면 공용 클라이언트)
+            model: 임베딩 모델
+            max_batch_size: 요청당 최대 입력 수 (없으면 EMBED_BATCH_SIZE)
+            max_batch_tokens: 요청당 최대 추정 토큰 수 (없으면 EMBED_BATCH_TOKENS)
+            max_workers: 동시 배치 수 (없으면 EMBED_WORKERS)
+            max_retries: 재시도 가능한 오류의 최대 재시도 횟수
+            base_delay: 백오프 기본 대기 (초)
+            max_delay: 백오프 최대 대기 (초)
+            verbose: 진행률 출력 여부
+        """
+        self._openai = openai_client or get_openai_client()
+        self.model = model
+        self.max_batch_size = min(
+            MAX_INPUTS_PER_REQUEST,
+            max_batch_size or int(os.getenv("EMBED_BATCH_SIZE", "256")),
+        )
+        self.max_batch_tokens = min(
+            MAX_TOKENS_PER_REQUEST,
+            max_batch_tokens or int(os.getenv("EMBED_BATCH_TOKENS", "250000")),
+        )
+        self.max_workers = max(1, max_workers or int(os.getenv("EMBED_WORKERS", "4")))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.verbose = verbose
+        self._stats_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 배치 구성
+    # ------------------------------------------------------------------
+
+    def iter_batches(self, items: Sequence[T], text_of: Callable[[T], str]) -> Iterator[List[T]]:
+        """입력 수 / 추정 토큰 수 제한에 맞춰 순서대로 배치 분할"""
+        batch: List[T] = []
+        batch_tokens = 0
+
+        for item in items:
+            tokens = estimate_tokens(text_of(item))
+            if batch and (
+                len(batch) >= self.max_batch_size
+                or batch_tokens + tokens > self.max_batch_tokens
+            ):
+                yield batch
+                batch, batch_tokens = [], 0
+            batch.append(item)
+            batch_tokens += tokens
+
+        if batch:
+            yield batch
+
+    # ------------------------------------------------------------------
+    # 재시도
+    # ------------------------------------------------------------------
+
+    def _backoff(self, attempt: int) -> float:
+        """지수 백오프 + 지터 대기 시간"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _with_retry(
+        self,
+        func: Callable[[], T],
+        retryable: tuple,
+        stats: Optional[BatchEmbedStats],
+        label: str,
+    ) -> T:
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except retryable as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                attempt += 1
+                if stats is not None:
+                    with self._stats_lock:
+                        stats.retries += 1
+                if self.verbose:
+                    print(
+                        f"  [재시도 {attempt}/{self.max_retries}] {label}: "
+                        f"{type(e).__name__} - {delay:.1f}초 대기"
+                    )
+                time.sleep(delay)
+
+    # ------------------------------------------------------------------
+    # 임베딩
+    # ------------------------------------------------------------------
+
+    def _embed_batch(self, texts: List[str], stats: Optional[BatchEmbedStats] = None) -> List[List[float]]:
+        def call() -> List[List[float]]:
+            if stats is not None:
+                with self._stats_lock:
+                    stats.api_calls += 1
+            response = self._openai.embeddings.create(model=self.model, input=texts)
+            # 응답 순서는 index 기준으로 정렬 (입력 순서 보장)
+            data = sorted(response.data, key=lambda d: d.index)
+            return [d.embedding for d in data]
+
+        return self._with_retry(call, RETRYABLE_ERRORS, stats, f"임베딩 {len(texts)}건")
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """텍스트 목록 임베딩 (입력 순서 유지)"""
+        batches = list(self.iter_batches(list(texts), lambda t: t))
+        if not batches:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="embed") as pool:
+            results = list(pool.map(self._embed_batch, batches))
+
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+    # ------------------------------------------------------------------
+    # 임베딩 + 업서트 파이프라인
+    # ------------------------------------------------------------------
+
+    def embed_and_upsert(
+        self,
+        records: Iterable[EmbeddingRecord],
+        index,
+        upsert_batch_size: int = 100,
+        label: str = "",
+    ) -> BatchEmbedStats:
+        """레코드 임베딩 후 인덱스에 업서트
+
+        각 작업자는 "배치 임베딩 → 업서트"를 수행하므로 한 배치의 업서트와
+        다음 배치의 임베딩이 겹쳐 실행된다. 메모리 사용을 제한하기 위해
+        동시에 대기 중인 배치는 작업자 수의 2배로 제한한다.
+
+        Args:
+            records: EmbeddingRecord 목록
+            index: upsert(vectors=[...])를 지원하는 인덱스 (Pinecone Index / VectorStore)
+            upsert_batch_size: 업서트 요청당 벡터 수
+            label: 진행률 출력용 이름
+
+        Returns:
+            BatchEmbedStats
+        """
+        records = [r for r in records if r.text]
+        stats = BatchEmbedStats(total=len(records))
+        if not records:
+            return stats
+
+        prefix = f"  [{label}] " if label else "  "
+
+        def process(batch: List[EmbeddingRecord]) -> int:
+            vectors = self._embed_batch([r.text for r in batch], stats)
+            payload = [
+                {"id": r.id, "values": v, "metadata": r.metadata}
+                for r, v in zip(batch, vectors)
+            ]
+            with self._stats_lock:
+                stats.embedded += len(batch)
+
+            for i in range(0, len(payload), upsert_batch_size):
+                chunk = payload[i:i + upsert_batch_size]
+                self._with_retry(
+                    lambda: index.upsert(vectors=chunk),
+                    (Exception,),
+                    stats,
+                    f"업서트 {len(chunk)}건",
+                )
+                with self._stats_lock:
+                    stats.upserted += len(chunk)
+            return len(batch)
+
+        max_pending = self.max_workers * 2
+        pending: set = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="embed-upsert") as pool:
+            for batch in self.iter_batches(records, lambda r: r.text):
+                stats.batches += 1
+                stats.estimated_tokens += sum(estimate_tokens(r.text) for r in batch)
+                pending.add(pool.submit(process, batch))
+
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._report(done, stats, prefix)
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                self._report(done, stats, prefix)
+
+        if self.verbose:
+            print(f"{prefix}완료: {stats.summary()}")
+        return stats
+
+    def _report(self, done: Iterable[Future], stats: BatchEmbedStats, prefix: str) -> None:
+        """완료된 배치 결과 확인 및 진행률 출력 (작업 예외는 여기서 전파)"""
+        for future in done:
+            future.result()
+        if self.verbose:
+            pct = stats.embedded / stats.total * 100 if stats.total else 100.0
+            print(
+                f"{prefix}진행: {stats.embedded}/{stats.total} ({pct:.1f}%), "
+                f"{stats.throughput:.1f}건/s"
+            )
@@ -0,0 +1,506 @@
+"""OpenAI / 벡터 스토어 호출 녹화·재생 (공유)
+
+오프라인 장비에서 파이프라인을 결정적으로 부하 테스트/프로파일링/회귀 검사하기 위해
+외부 호출(chat.completions.create, embeddings.create, VectorStore.query)을
+요청 → 응답 쌍으로 카세트 파일(JSONL)에 녹화하고 그대로 재생한다.
+
+- 키: (호출 종류, 모델/인덱스, 정규화된 요청 인자)의 SHA-256
+  (make_response_cache_key와 같은 정렬 JSON 해시, 벡터는 소수점 6자리로 반올림)
+- 모드:
+  - record: 실제 클라이언트 호출 후 응답과 소요 시간을 기록 (같은 키는 덮어씀)
+  - replay: 카세트에서만 응답 (없으면 CassetteMissError)
+  - auto: 카세트에 있으면 재생, 없으면 녹화
+- 재생 지연 (LatencyModel):
+  - none: 지연 없음
+  - recorded: 녹화된 소요 시간 그대로
+  - lognormal: 호출 종류별 녹화 지연에 맞춘 로그정규 분포에서 표본 (시드 고정)
+  - <ms>: 고정 지연
+  scale로 배율 조정 (예: 0.5 → 절반)
+
+카세트 한 줄 형식:
+    {"key": "...", "kind": "chat|embedding|vector", "request": {...},
+     "response": {...}, "latency_ms": 812.4}
+
+사용 예시 (서비스 생성 전에 설치):
+    cassette = install_cassette("reports/golden.cassette.jsonl", mode="replay", latency="recorded")
+    ...
+    print(cassette.stats())
+"""
+
+import asyncio
+import json
+import math
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .logging import get_logger
+from .response_cache import make_response_cache_key
+from .vector_store import SearchResult, SearchResults, VectorStore
+
+
+logger = get_logger(__name__)
+
+CASSETTE_MODES = ("record", "replay", "auto")
+KIND_CHAT = "chat"
+KIND_EMBEDDING = "embedding"
+KIND_VECTOR = "vector"
+
+# 응답 내용과 무관한 요청 인자 (키 계산에서 제외)
+_IGNORED_KWARGS = ("timeout", "extra_headers", "extra_query", "extra_body")
+_VECTOR_DECIMALS = 6
+
+
+class CassetteMissError(KeyError):
+    """replay 모드에서 카세트에 없는 요청"""
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """SDK 응답(pydantic) / SimpleNamespace / 데이터클래스 → JSON 호환 값"""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return _to_jsonable(asdict(obj))
+    if isinstance(obj, SimpleNamespace):
+        return {k: _to_jsonable(v) for k, v in vars(obj).items()}
+    if isinstance(obj, dict):
+        return {k: _to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_jsonable(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def _to_namespace(value: Any) -> Any:
+    """JSON → 속성 접근 가능한 객체 (response.choices[0].message.content 등)"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(v) for v in value]
+    return value
+
+
+def _restore_response(kind: str, data: Dict[str, Any]) -> Any:
+    """녹화된 응답 → SDK 응답 객체 (형식이 다르면 SimpleNamespace)"""
+    try:
+        if kind == KIND_CHAT:
+            from openai.types.chat import ChatCompletion
+
+            return ChatCompletion.model_validate(data)
+        if kind == KIND_EMBEDDING:
+            from openai.types import CreateEmbeddingResponse
+
+            return CreateEmbeddingResponse.model_validate(data)
+    except Exception:
+        pass
+    return _to_namespace(data)
+
+
+def _round_vector(vector: Any) -> List[float]:
+    return [round(float(v), _VECTOR_DECIMALS) for v in vector]
+
+
+def _request_payload(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: _to_jsonable(v)
+        for k, v in kwargs.items()
+        if k not in _IGNORED_KWARGS and v is not None
+    }
+
+
+class LatencyModel:
+    """재생 지연 모델
+
+    Args:
+        spec: none | recorded | lognormal | 고정 지연(ms, 숫자 문자열)
+        scale: 지연 배율
+        seed: lognormal 표본 시드
+    """
+
+    def __init__(self, spec: str = "none", scale: float = 1.0, seed: int = 0):
+        self.spec = str(spec).lower()
+        self.scale = scale
+        self._fixed_ms: Optional[float] = None
+        if self.spec not in ("none", "recorded", "lognormal"):
+            try:
+                self._fixed_ms = float(self.spec)
+            except ValueError:
+                raise ValueError(f"지원하지 않는 재생 지연 설정: {spec}")
+        self._rng = np.random.default_rng(seed)
+        self._rng_lock = threading.Lock()
+        # 종류별 (log 평균, log 표준편차)
+        self._params: Dict[str, tuple] = {}
+
+    def fit(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """녹화된 지연으로 종류별 로그정규 모수 추정"""
+        samples: Dict[str, List[float]] = {}
+        for entry in entries.values():
+            latency = entry.get("latency_ms")
+            if latency and latency > 0:
+                samples.setdefault(entry["kind"], []).append(math.log(latency))
+        self._params = {
+            kind: (float(np.mean(logs)), float(np.std(logs)))
+            for kind, logs in samples.items()
+        }
+
+    def delay_sec(self, entry: Dict[str, Any]) -> float:
+        """재생 1건의 지연 (초)"""
+        if self.spec == "none":
+            return 0.0
+        if self._fixed_ms is not None:
+            ms = self._fixed_ms
+        elif self.spec == "recorded":
+            ms = entry.get("latency_ms") or 0.0
+        else:
+            params = self._params.get(entry["kind"])
+            if params is None:
+                ms = entry.get("latency_ms") or 0.0
+            else:
+                with self._rng_lock:
+                    ms = float(self._rng.lognormal(params[0], params[1]))
+        return max(ms, 0.0) * self.scale / 1000
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "spec": self.spec,
+            "scale": self.scale,
+            "lognormal": {
+                kind: {"mu": round(mu, 4), "sigma": round(sigma, 4)}
+                for kind, (mu, sigma) in self._params.items()
+            } if self.spec == "lognormal" else None,
+        }
+
+
+class Cassette:
+    """요청 키 → 녹화 응답 저장소 (JSONL, 시작 시 전체 로드)
+
+    record/auto 모드의 신규 녹화는 즉시 파일에 추가한다 (중단되어도 유지).
+    같은 키가 여러 번 기록되면 마지막 줄이 우선한다.
+    """
+
+    def __init__(self, path, mode: str = "replay", latency: Optional[LatencyModel] = None):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"지원하지 않는 카세트 모드: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency or LatencyModel()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "recorded": 0}
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+        elif mode == "replay":
+            raise FileNotFoundError(f"카세트 파일 없음: {self.path}")
+        self.latency.fit(self._entries)
+        logger.info(f"카세트 로드: {self.path} ({len(self._entries)}건, {mode})")
+
+    @staticmethod
+    def make_key(kind: str, model: str, payload: Dict[str, Any]) -> str:
+        return make_response_cache_key(model, payload, namespace=f"cassette:{kind}")
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """녹화 항목 조회 (replay 모드에서 없으면 CassetteMissError)"""
+        entry = self._entries.get(key)
+        with self._lock:
+            self._counts["hits" if entry is not None else "misses"] += 1
+        if entry is None and self.mode == "replay":
+            raise CassetteMissError(f"카세트에 없는 요청: {key[:16]}")
+        return entry
+
+    def record(
+        self,
+        key: str,
+        kind: str,
+        request: Dict[str, Any],
+        response: Any,
+        latency_ms: float,
+    ) -> None:
+        entry = {
+            "key": key,
+            "kind": kind,
+            "request": request,
+            "response": response,
+            "latency_ms": round(latency_ms, 2),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._entries[key] = entry
+            self._counts["recorded"] += 1
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def call(
+        self,
+        kind: str,
+        model: str,
+        payload: Dict[str, Any],
+        invoke: Optional[Callable[[], Any]],
+    ) -> Any:
+        """동기 호출: 재생 또는 (invoke 실행 + 녹화)"""
+        key = self.make_key(kind, model, payload)
+        entry = None if self.mode == "record" else self.lookup(key)
+        if entry is not None:
+            delay = self.latency.delay_sec(entry)
+            if delay:
+                time.sleep(delay)
+            return entry["response"]
+
+        if invoke is None:
+            raise CassetteMissError(f"카세트에 없는 요청 (녹화 대상 클라이언트 없음): {key[:16]}")
+        started = time.perf_counter()
+        response = _to_jsonable(invoke())
+        self.record(key, kind, payload, response, (time.perf_counter() - started) * 1000)
+        return response
+
+    async def acall(
+        self,
+        kind: str,
+        model: str,
+        payload: Dict[str, Any],
+        invoke: Optional[Callable[[], Any]],
+    ) -> Any:
+        """비동기 호출: 재생 또는 (await invoke() + 녹화)"""
+        key = self.make_key(kind, model, payload)
+        entry = None if self.mode == "record" else self.lookup(key)
+        if entry is not None:
+            delay = self.latency.delay_sec(entry)
+            if delay:
+                await asyncio.sleep(delay)
+            return entry["response"]
+
+        if invoke is None:
+            raise CassetteMissError(f"카세트에 없는 요청 (녹화 대상 클라이언트 없음): {key[:16]}")
+        started = time.perf_counter()
+        response = _to_jsonable(await invoke())
+        self.record(key, kind, payload, response, (time.perf_counter() - started) * 1000)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "path": str(self.path),
+            "mode": self.mode,
+            "entries": len(self._entries),
+            **counts,
+            "latency": self.latency.describe(),
+        }
+
+
+# ============================================================
+# OpenAI 클라이언트 래퍼
+# ============================================================
+
+class _ChatCompletions:
+    def __init__(self, cassette: Cassette, client):
+        self._cassette = cassette
+        self._client = client
+
+    def create(self, **kwargs):
+        invoke = None
+        if self._client is not None:
+            invoke = lambda: self._client.chat.completions.create(**kwargs)  # noqa: E731
+        data = self._cassette.call(KIND_CHAT, kwargs.get("model", ""), _request_payload(kwargs), invoke)
+        return _restore_response(KIND_CHAT, data)
+
+
+class _AsyncChatCompletions(_ChatCompletions):
+    async def create(self, **kwargs):
+        invoke = None
+        if self._client is not None:
+            invoke = lambda: self._client().chat.completions.create(**kwargs)  # noqa: E731
+        data = await self._cassette.acall(KIND_CHAT, kwargs.get("model", ""), _request_payload(kwargs), invoke)
+        return _restore_response(KIND_CHAT, data)
+
+
+class _Embeddings:
+    def __init__(self, cassette: Cassette, client):
+        self._cassette = cassette
+        self._client = client
+
+    def create(self, **kwargs):
+        invoke = None
+        if self._client is not None:
+            invoke = lambda: self._client.embeddings.create(**kwargs)  # noqa: E731
+        data = self._cassette.call(KIND_EMBEDDING, kwargs.get("model", ""), _request_payload(kwargs), invoke)
+        return _restore_response(KIND_EMBEDDING, data)
+
+
+class _AsyncEmbeddings(_Embeddings):
+    async def create(self, **kwargs):
+        invoke = None
+        if self._client is not None:
+            invoke = lambda: self._client().embeddings.create(**kwargs)  # noqa: E731
+        data = await self._cassette.acall(KIND_EMBEDDING, kwargs.get("model", ""), _request_payload(kwargs), invoke)
+        return _restore_response(KIND_EMBEDDING, data)
+
+
+class CassetteOpenAI:
+    """OpenAI 클라이언트 대체 (chat.completions.create / embeddings.create)
+
+    Args:
+        cassette: 카세트
+        client: 녹화 시 실제 호출할 클라이언트 (replay 모드에서는 없어도 됨)
+    """
+
+    def __init__(self, cassette: Cassette, client=None):
+        self._client = client
+        self.chat = SimpleNamespace(completions=_ChatCompletions(cassette, client))
+        self.embeddings = _Embeddings(cassette, client)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+
+
+class AsyncCassetteOpenAI:
+    """AsyncOpenAI 클라이언트 대체
+
+    Args:
+        cassette: 카세트
+        client: 녹화 시 실제 호출할 클라이언트를 반환하는 함수
+            (비동기 클라이언트는 이벤트 루프에 묶이므로 호출 시점에 가져온다)
+    """
+
+    def __init__(self, cassette: Cassette, client: Optional[Callable[[], Any]] = None):
+        self.chat = SimpleNamespace(completions=_AsyncChatCompletions(cassette, client))
+        self.embeddings = _AsyncEmbeddings(cassette, client)
+
+    async def close(self) -> None:
+        # 실제 클라이언트는 openai_client 모듈이 관리 (aclose_openai_clients)
+        return None
+
+
+# ============================================================
+# 벡터 스토어 래퍼
+# ============================================================
+
+class CassetteVectorStore(VectorStore):
+    """VectorStore.query 녹화/재생 (PineconeClient / LocalVectorStore 공통)
+
+    Args:
+        cassette: 카세트
+        index_name: 인덱스 이름 (키에 포함)
+        namespace: Pinecone 네임스페이스 (키에 포함)
+        store: 녹화 시 실제 조회할 스토어 (replay 모드에서는 없어도 됨)
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        index_name: str,
+        namespace: str = "",
+        store: Optional[VectorStore] = None,
+    ):
+        self._cassette = cassette
+        self.index_name = index_name
+        self.namespace = namespace
+        self._store = store
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+        min_score: float = 0.0,
+    ) -> SearchResults:
+        payload = {
+            "namespace": self.namespace,
+            "vector": _round_vector(vector),
+            "top_k": top_k,
+            "filter": filter,
+            "include_metadata": include_metadata,
+            "min_score": min_score,
+        }
+        invoke = None
+        if self._store is not None:
+            invoke = lambda: self._store.query(  # noqa: E731
+                vector=vector,
+                top_k=top_k,
+                filter=filter,
+                include_metadata=include_metadata,
+                min_score=min_score,
+            )
+        data = self._cassette.call(KIND_VECTOR, self.index_name, payload, invoke)
+        return SearchResults(
+            items=[SearchResult(**item) for item in data["items"]],
+            query=data.get("query", ""),
+            total_count=data.get("total_count", len(data["items"])),
+        )
+
+    def _require_store(self) -> VectorStore:
+        if self._store is None:
+            raise RuntimeError("재생 전용 벡터 스토어는 조회만 지원합니다")
+        return self._store
+
+    def upsert(self, vectors: List[Dict[str, Any]], batch_size: int = 100) -> int:
+        return self._require_store().upsert(vectors, batch_size=batch_size)
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        delete_all: bool = False,
+    ) -> None:
+        self._require_store().delete(ids=ids, filter=filter, delete_all=delete_all)
+
+    def describe_stats(self) -> Dict[str, Any]:
+        return self._require_store().describe_stats()
+
+
+# ============================================================
+# 설치
+# ============================================================
+
+def install_cassette(
+    path,
+    mode: str = "replay",
+    latency: str = "none",
+    latency_scale: float = 1.0,
+    seed: int = 0,
+) -> Cassette:
+    """
+    공용 OpenAI 클라이언트와 벡터 스토어 생성을 카세트로 교체
+
+    서비스(파이프라인/게이트웨이) 생성 전에 호출해야 한다.
+    record/auto 모드는 기존 공용 클라이언트와 기본 벡터 스토어를 실제 호출에 사용한다.
+
+    Returns:
+        설치된 카세트 (stats()로 적중/미스/녹화 건수 확인)
+    """
+    from . import openai_client
+    from .vector_store import set_vector_store_factory
+
+    cassette = Cassette(path, mode=mode, latency=LatencyModel(latency, latency_scale, seed))
+
+    client = async_client = None
+    if mode != "replay":
+        # 이미 교체된 클라이언트(벤치마크 mock 등)가 있으면 그것을 녹화한다
+        client = openai_client.get_openai_client()
+        previous_async = openai_client._async_override
+        async_client = (lambda: previous_async) if previous_async is not None else openai_client._loop_async_client
+    openai_client.set_openai_clients(
+        CassetteOpenAI(cassette, client), AsyncCassetteOpenAI(cassette, async_client)
+    )
+
+    def factory(index_name: str, namespace: str, create: Callable[[], VectorStore]) -> VectorStore:
+        store = None if mode == "replay" else create()
+        return CassetteVectorStore(cassette, index_name, namespace, store)
+
+    set_vector_store_factory(factory)
+    return cassette
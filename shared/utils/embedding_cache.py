@@ -0,0 +1,331 @@
+"""임베딩 캐시 (공유)
+
+검색 쿼리는 "{age}세 {sex} 환자, 증상: ..." 같은 템플릿 문자열이라
+사용자 간 반복이 많다. (모델, 정규화 텍스트) 기준 콘텐츠 주소 캐시로
+임베딩 API 호출을 줄인다.
+
+- 1단계: 프로세스 내 LRU (OrderedDict)
+- 2단계: SQLite 디스크 캐시 (float32 BLOB, 최대 건수 초과 시 오래된 항목 제거)
+  디스크 적중의 last_access 갱신은 모아 두었다가 저장/제거 시 한 번에 기록
+- get_or_compute는 같은 키 동시 요청을 한 번의 계산으로 합침 (single-flight)
+
+환경변수:
+- EMBEDDING_CACHE_ENABLED: 캐시 사용 여부 (기본값: true)
+- EMBEDDING_CACHE_DIR: 디스크 캐시 디렉토리 (기본값: <repo>/.cache/embeddings)
+- EMBEDDING_CACHE_MEMORY_SIZE: 메모리 LRU 최대 건수 (기본값: 4096)
+- EMBEDDING_CACHE_DISK_SIZE: 디스크 최대 건수 (기본값: 200000, 0이면 디스크 미사용)
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / ".cache" / "embeddings"
+
+# 모아 둔 last_access 갱신이 이 건수를 넘으면 조회 중에도 기록
+TOUCH_FLUSH_SIZE = 256
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (NFC + 공백 정리)"""
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """(모델, 정규화 텍스트) → SHA-256 키"""
+    payload = f"{model}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """2단계 임베딩 캐시 (메모리 LRU + SQLite)
+
+    사용 예시:
+        cache = EmbeddingCache()
+        vector = cache.get_or_compute("text-embedding-3-small", query, embed_fn)
+        print(cache.stats())
+    """
+
+    def __init__(
+        self,
+        max_memory_items: int = 4096,
+        db_path: Optional[Path] = None,
+        max_disk_items: int = 200_000,
+    ):
+        """
+        Args:
+            max_memory_items: 메모리 LRU 최대 건수
+            db_path: SQLite 파일 경로 (없으면 디스크 캐시 미사용)
+            max_disk_items: 디스크 최대 건수 (초과 시 마지막 접근 순으로 제거)
+        """
+        self.max_memory_items = max(0, max_memory_items)
+        self.max_disk_items = max(0, max_disk_items)
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+        self._hits_memory = 0
+        self._hits_disk = 0
+        self._misses = 0
+        self._evicted = 0
+        self._coalesced = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_count = 0  # 디스크 행 수 (삽입마다 COUNT(*) 하지 않도록 유지)
+        self._pending_touches: Dict[str, float] = {}  # 기록 대기 중인 {키: last_access}
+        self._db_lock = threading.Lock()
+        if db_path is not None and self.max_disk_items > 0:
+            self._open_db(Path(db_path))
+
+    # ------------------------------------------------------------------
+    # 디스크 계층
+    # ------------------------------------------------------------------
+
+    def _open_db(self, db_path: Path) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)"
+        )
+        self._db.commit()
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _disk_get(self, key: str) -> Optional[List[float]]:
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            # 조회마다 UPDATE + commit하면 읽기 경로가 직렬화된 쓰기가 되므로 모아서 기록
+            self._pending_touches[key] = time.time()
+            if len(self._pending_touches) >= TOUCH_FLUSH_SIZE:
+                self._flush_touches_locked()
+                self._db.commit()
+        vector = array("f")
+        vector.frombytes(row[0])
+        return vector.tolist()
+
+    def _disk_put(self, key: str, model: str, vector: List[float]) -> None:
+        if self._db is None:
+            return
+        blob = array("f", vector).tobytes()
+        with self._db_lock:
+            exists = self._db.execute(
+                "SELECT 1 FROM embeddings WHERE key = ?", (key,)
+            ).fetchone() is not None
+            self._db.execute(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, len(vector), blob, time.time()),
+            )
+            if not exists:
+                self._disk_count += 1
+            self._flush_touches_locked()
+            self._evict_disk_locked()
+            self._db.commit()
+
+    def _flush_touches_locked(self) -> None:
+        """모아 둔 last_access 갱신 기록 (커밋은 호출 측에서)"""
+        if not self._pending_touches:
+            return
+        self._db.executemany(
+            "UPDATE embeddings SET last_access = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self._pending_touches.items()],
+        )
+        self._pending_touches.clear()
+
+    def _evict_disk_locked(self) -> None:
+        """최대 건수 초과 시 마지막 접근이 오래된 항목 제거 (10% 여유 확보)
+
+        행 수는 유지 중인 카운터로 판단하고, 초과했을 때만 COUNT(*)로 다시 맞춘다
+        (같은 파일을 쓰는 다른 프로세스의 삽입/제거 반영).
+        """
+        if self._disk_count <= self.max_disk_items:
+            return
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if self._disk_count <= self.max_disk_items:
+            return
+        excess = self._disk_count - self.max_disk_items + max(1, self.max_disk_items // 10)
+        deleted = self._db.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (excess,),
+        ).rowcount
+        self._disk_count -= deleted
+        self._evicted += deleted
+
+    # ------------------------------------------------------------------
+    # 메모리 계층
+    # ------------------------------------------------------------------
+
+    def _memory_put_locked(self, key: str, vector: List[float]) -> None:
+        if self.max_memory_items == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """캐시 조회 (메모리 → 디스크 순, 없으면 None)"""
+        key = make_cache_key(model, text)
+
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._hits_memory += 1
+                return vector
+
+        vector = self._disk_get(key)
+        with self._lock:
+            if vector is not None:
+                self._hits_disk += 1
+                self._memory_put_locked(key, vector)
+            else:
+                self._misses += 1
+        return vector
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        """캐시 저장 (메모리 + 디스크)"""
+        key = make_cache_key(model, text)
+        with self._lock:
+            self._memory_put_locked(key, vector)
+        self._disk_put(key, model, vector)
+
+    def get_or_compute(
+        self,
+        model: str,
+        text: str,
+        compute: Callable[[str], List[float]],
+    ) -> List[float]:
+        """캐시 조회 후 없으면 compute(text) 결과를 저장하여 반환
+
+        같은 키를 다른 스레드가 계산 중이면 그 결과를 기다린다.
+        (배치 실행 시 동일 쿼리의 임베딩 API 중복 호출 방지)
+        """
+        vector = self.get(model, text)
+        if vector is not None:
+            return vector
+
+        key = make_cache_key(model, text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                return vector
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = Future()
+                self._inflight[key] = pending
+            else:
+                self._coalesced += 1
+
+        if not owner:
+            return pending.result()
+
+        try:
+            vector = compute(text)
+            self.put(model, text, vector)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        pending.set_result(vector)
+        return vector
+
+    def stats(self) -> Dict[str, float]:
+        """적중/미스 통계"""
+        with self._lock:
+            hits = self._hits_memory + self._hits_disk
+            total = hits + self._misses
+            stats = {
+                "hits_memory": self._hits_memory,
+                "hits_disk": self._hits_disk,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "memory_items": len(self._memory),
+                "disk_evicted": self._evicted,
+            }
+        if self._db is not None:
+            stats["disk_items"] = self._disk_count
+        return stats
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+                self._disk_count = 0
+                self._pending_touches.clear()
+
+    def close(self) -> None:
+        """디스크 연결 종료"""
+        if self._db is not None:
+            with self._db_lock:
+                self._flush_touches_locked()
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """환경변수 기반 공유 임베딩 캐시 반환 (비활성화 시 None)"""
+    global _default_cache
+
+    if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            cache_dir = Path(os.getenv("EMBEDDING_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+            disk_size = int(os.getenv("EMBEDDING_CACHE_DISK_SIZE", "200000"))
+            _default_cache = EmbeddingCache(
+                max_memory_items=int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "4096")),
+                db_path=cache_dir / "embeddings.sqlite3" if disk_size > 0 else None,
+                max_disk_items=disk_size,
+            )
+        return _default_cache
@@ -0,0 +1,217 @@
+"""인덱싱 매니페스트 (증분 재인덱싱용)
+
+벡터 ID별 콘텐츠 해시(임베딩 모델 + 텍스트 + 메타데이터)를 저장하여
+재인덱싱 시 신규/변경된 항목만 임베딩·업서트하고, 원본에서 사라진 ID는 삭제한다.
+
+파일 형식:
+    {
+        "version": 1,
+        "backends": {
+            "pinecone": {
+                "index": "orthocare-diagnosis",
+                "groups": {
+                    "papers": {"updated_at": "...", "count": 95, "entries": {"<벡터 ID>": "<sha256>"}},
+                    "orthobullets": {...}
+                }
+            },
+            "local": {...}
+        }
+    }
+
+백엔드별로 섹션을 분리하여 Pinecone / 로컬 인덱스 상태를 독립적으로 추적하고,
+한 파일에 여러 소스 그룹(논문, OrthoBullets 등)을 둘 수 있다.
+고아 ID 판정은 그룹 안에서만 이뤄진다.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .batch_embedder import EmbeddingRecord
+
+
+MANIFEST_FILENAME = "index_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def content_hash(model: str, text: str, metadata: Dict[str, Any]) -> str:
+    """임베딩 모델 + 텍스트 + 메타데이터 기준 SHA-256"""
+    payload = json.dumps(
+        {"model": model, "text": text, "metadata": metadata},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IndexManifest:
+    """소스 그룹(부위별 논문, OrthoBullets, 부위별 운동) 단위 매니페스트
+
+    사용 예시:
+        manifest = IndexManifest(
+            papers_dir / "index_manifest.json", "orthocare-diagnosis", "pinecone", group="papers"
+        )
+        changed, orphans = manifest.diff(records, model)
+        ... 임베딩/업서트(changed), 삭제(orphans) ...
+        manifest.apply(changed, orphans, model)
+        manifest.save()
+
+        # 또는 sync_records()로 한 번에 처리
+    """
+
+    def __init__(self, path: Path, index_name: str, backend: str, group: str = "default"):
+        """
+        Args:
+            path: 매니페스트 파일 경로
+            index_name: 벡터 인덱스 이름
+            backend: 벡터 스토어 백엔드 (pinecone / local)
+            group: 소스 그룹 이름
+        """
+        self.path = Path(path)
+        self.index_name = index_name
+        self.backend = backend
+        self.group = group
+
+        section = self._load()["backends"].get(backend, {})
+        if section.get("index") not in (None, index_name):
+            # 다른 인덱스를 가리키던 기록은 무효
+            section = {}
+        group_data = section.get("groups", {}).get(group, {})
+        self.entries: Dict[str, str] = dict(group_data.get("entries", {}))
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {"version": MANIFEST_VERSION, "backends": {}}
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data.setdefault("backends", {})
+        return data
+
+    def diff(
+        self,
+        records: Iterable[EmbeddingRecord],
+        model: str,
+        full: bool = False,
+    ) -> Tuple[List[EmbeddingRecord], List[str]]:
+        """신규/변경 레코드와 고아 ID 계산
+
+        Args:
+            records: 현재 원본 기준 전체 레코드
+            model: 임베딩 모델
+            full: True면 해시와 무관하게 전체를 변경으로 간주
+
+        Returns:
+            (임베딩/업서트할 레코드, 삭제할 벡터 ID)
+        """
+        current: Dict[str, EmbeddingRecord] = {}
+        for record in records:
+            if record.text:
+                current[record.id] = record  # 같은 ID는 마지막 레코드 사용
+
+        changed = [
+            record for vec_id, record in current.items()
+            if full or self.entries.get(vec_id) != content_hash(model, record.text, record.metadata)
+        ]
+        orphans = sorted(vec_id for vec_id in self.entries if vec_id not in current)
+        return changed, orphans
+
+    def apply(
+        self,
+        upserted: Iterable[EmbeddingRecord],
+        deleted: Iterable[str],
+        model: str,
+    ) -> None:
+        """업서트/삭제 결과 반영"""
+        for record in upserted:
+            self.entries[record.id] = content_hash(model, record.text, record.metadata)
+        for vec_id in deleted:
+            self.entries.pop(vec_id, None)
+
+    def reset(self) -> None:
+        """현재 백엔드 기록 초기화 (인덱스 전체 삭제 시)"""
+        self.entries = {}
+
+    def save(self) -> None:
+        """매니페스트 저장 (다른 그룹 기록은 유지, 임시 파일 작성 후 교체)"""
+        data = self._load()
+        data["version"] = MANIFEST_VERSION
+
+        section = data["backends"].get(self.backend, {})
+        if section.get("index") != self.index_name:
+            section = {"index": self.index_name, "groups": {}}
+        section.setdefault("groups", {})[self.group] = {
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "count": len(self.entries),
+            "entries": dict(sorted(self.entries.items())),
+        }
+        data["backends"][self.backend] = section
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+def sync_records(
+    index,
+    embedder,
+    records: List[EmbeddingRecord],
+    manifest: IndexManifest,
+    full: bool = False,
+    dry_run: bool = False,
+    label: str = "",
+) -> Dict[str, int]:
+    """매니페스트 기준 증분 동기화 (신규/변경 업서트 + 고아 삭제)
+
+    로컬 인덱스는 매니페스트보다 먼저 저장하여, 중간 실패 시
+    매니페스트가 실제 인덱스보다 앞서지 않도록 한다.
+
+    Args:
+        index: upsert/delete를 지원하는 인덱스 (Pinecone Index / VectorStore)
+        embedder: BatchEmbedder
+        records: 현재 원본 기준 전체 레코드
+        manifest: 소스 그룹 매니페스트
+        full: 전체 재인덱싱 여부
+        dry_run: True면 변경 사항만 출력
+
+    Returns:
+        {"total", "upserted", "deleted", "unchanged"}
+    """
+    changed, orphans = manifest.diff(records, embedder.model, full=full)
+    total = len({r.id for r in records if r.text})
+    result = {
+        "total": total,
+        "upserted": 0,
+        "deleted": 0,
+        "unchanged": total - len(changed),
+    }
+
+    prefix = f"  [{label}] " if label else "  "
+    print(
+        f"{prefix}전체 {total}개 | 신규/변경 {len(changed)}개 | "
+        f"변경 없음 {result['unchanged']}개 | 삭제 대상 {len(orphans)}개"
+    )
+    if dry_run or (not changed and not orphans):
+        return result
+
+    if changed:
+        stats = embedder.embed_and_upsert(changed, index, label=label)
+        result["upserted"] = stats.upserted
+
+    if orphans:
+        for i in range(0, len(orphans), 1000):
+            index.delete(ids=orphans[i:i + 1000])
+        result["deleted"] = len(orphans)
+
+    if hasattr(index, "save"):
+        index.save()
+
+    manifest.apply(changed, orphans, embedder.model)
+    manifest.save()
+    return result
@@ -0,0 +1,143 @@
+"""스트리밍 JSON 필드 추출 (공유)
+
+LLM이 JSON 객체를 토큰 단위로 스트리밍할 때, 전체 응답을 기다리지 않고
+최상위 필드 일부를 도착하는 대로 꺼낸다.
+
+- array_keys: 최상위 문자열 배열의 원소 (원소 문자열이 닫히는 즉시)
+- string_keys: 최상위 문자열 값의 조각 (이스케이프가 완성된 부분까지)
+
+사용 예시:
+    scanner = JsonFieldScanner(array_keys=("selected_exercises",), string_keys=("reasoning",))
+    for chunk in stream:
+        for kind, key, value in scanner.feed(chunk):
+            ...  # ("item", "selected_exercises", "E01") / ("delta", "reasoning", "무릎 ")
+    result = json.loads(scanner.text)
+"""
+
+import json
+from typing import Iterable, List, Optional, Tuple
+
+
+class JsonFieldScanner:
+    """문자 단위 상태 기계 (중첩 깊이 / 문자열 / 이스케이프 / 현재 최상위 키)"""
+
+    def __init__(self, array_keys: Iterable[str] = (), string_keys: Iterable[str] = ()):
+        self.array_keys = set(array_keys)
+        self.string_keys = set(string_keys)
+        self._parts: List[str] = []
+        self._stack: List[str] = []  # "{" / "["
+        self._expect_key = False
+        self._key: Optional[str] = None  # 현재 최상위 키
+        self._in_string = False
+        # 이스케이프 진행: 0 없음, -1 역슬래시 직후, n \uXXXX의 남은 자릿수
+        self._pending = 0
+        self._string_is_key = False
+        self._raw: List[str] = []  # 현재 문자열 원문 (따옴표 제외)
+        self._safe = 0  # 이스케이프가 완성된 원문 길이
+        self._emitted = 0  # 스트리밍 문자열에서 이미 내보낸 디코딩 길이
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트"""
+        return "".join(self._parts)
+
+    def _streamed_string(self) -> bool:
+        return (
+            not self._string_is_key
+            and len(self._stack) == 1
+            and self._key in self.string_keys
+        )
+
+    def _array_item(self) -> bool:
+        return (
+            not self._string_is_key
+            and len(self._stack) == 2
+            and self._stack[-1] == "["
+            and self._key in self.array_keys
+        )
+
+    @staticmethod
+    def _decode(raw: str) -> str:
+        return json.loads(f'"{raw}"')
+
+    def _string_delta(self) -> Optional[str]:
+        """스트리밍 문자열의 새로 디코딩 가능한 부분"""
+        # 끝의 미완성 이스케이프(\, \uXXX)는 다음 조각까지 보류
+        raw = "".join(self._raw[:self._safe])
+        try:
+            decoded = self._decode(raw)
+        except ValueError:
+            return None
+        # 서로게이트 쌍(\ud83d\ude00)의 앞 절반만 왔으면 보류
+        if decoded and "\ud800" <= decoded[-1] <= "\udbff":
+            decoded = decoded[:-1]
+        delta = decoded[self._emitted:]
+        self._emitted = len(decoded)
+        return delta or None
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, str]]:
+        """텍스트 조각 처리 → [(종류, 키, 값)]"""
+        self._parts.append(chunk)
+        events: List[Tuple[str, str, str]] = []
+        streamed = self._in_string and self._streamed_string()
+
+        for ch in chunk:
+            if self._in_string:
+                if self._pending:
+                    self._raw.append(ch)
+                    if self._pending == -1:
+                        self._pending = 4 if ch == "u" else 0
+                    else:
+                        self._pending -= 1
+                    if not self._pending:
+                        self._safe = len(self._raw)
+                elif ch == "\\":
+                    self._raw.append(ch)
+                    self._pending = -1
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(events)
+                    streamed = False
+                else:
+                    self._raw.append(ch)
+                    self._safe = len(self._raw)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_is_key = bool(self._stack) and self._stack[-1] == "{" and self._expect_key
+                self._raw = []
+                self._safe = 0
+                self._emitted = 0
+                streamed = self._streamed_string()
+            elif ch in "{[":
+                self._stack.append(ch)
+                self._expect_key = ch == "{"
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._expect_key = False
+            elif ch == ",":
+                self._expect_key = bool(self._stack) and self._stack[-1] == "{"
+            elif ch == ":":
+                self._expect_key = False
+
+        # 조각 끝에서 아직 열린 스트리밍 문자열은 지금까지 분량을 내보냄
+        if streamed and self._in_string:
+            delta = self._string_delta()
+            if delta:
+                events.append(("delta", self._key, delta))
+        return events
+
+    def _close_string(self, events: List[Tuple[str, str, str]]) -> None:
+        raw = "".join(self._raw)
+        if self._string_is_key:
+            if len(self._stack) == 1:
+                self._key = self._decode(raw)
+            return
+        if self._streamed_string():
+            delta = self._decode(raw)[self._emitted:]
+            if delta:
+                events.append(("delta", self._key, delta))
+        elif self._array_item():
+            events.append(("item", self._key, self._decode(raw)))
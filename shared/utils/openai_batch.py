@@ -0,0 +1,269 @@
+"""OpenAI Batch API 실행 (공유)
+
+오프라인 재평가(골든셋 회귀, 과거 설문 재추론)에서 chat completions를
+동기 호출 대신 Batch API(비용 50%, 24시간 내 완료)로 처리한다.
+
+흐름:
+1. 요청 JSONL 작성 - 줄마다 batch_request_line(custom_id, body)
+2. OpenAIBatchRunner.run(요청 파일, 작업 디렉토리)
+   - 최대 요청 수/파일 크기 기준으로 분할 업로드 → 배치 생성 → 완료까지 폴링
+   - 배치 ID를 작업 디렉토리에 기록하여 재실행 시 재제출 없이 이어서 폴링
+3. 결과는 custom_id → 응답 본문을 SQLite(BatchResultStore)에 적재 (메모리 일정)
+
+OPENAI_BASE_URL로 로컬 스텁 서버(scripts/openai_batch_stub_server.py)를 지정하면
+API 키/비용 없이 전체 흐름을 시험할 수 있다.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from openai import OpenAI
+
+from .logging import get_logger
+from .openai_client import get_openai_client
+
+
+logger = get_logger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch API 제한 (배치당 요청 수 / 입력 파일 크기) - 여유를 두고 분할
+MAX_BATCH_REQUESTS = 50_000
+MAX_BATCH_FILE_BYTES = 190 * 1024 * 1024
+
+# 종료 상태 (completed 외에는 일부 결과만 있을 수 있음)
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def batch_request_line(custom_id: str, body: Dict[str, Any]) -> str:
+    """Batch API 요청 한 줄 (JSON, 개행 없음)"""
+    return json.dumps(
+        {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body},
+        ensure_ascii=False,
+    )
+
+
+def parse_result_line(line: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """결과/오류 파일 한 줄 → (custom_id, 응답 content, 오류 메시지)"""
+    record = json.loads(line)
+    custom_id = record["custom_id"]
+
+    error = record.get("error")
+    if error:
+        return custom_id, None, f"{error.get('code', 'error')}: {error.get('message', '')}"
+
+    response = record.get("response") or {}
+    body = response.get("body") or {}
+    if response.get("status_code") != 200:
+        message = (body.get("error") or {}).get("message", "")
+        return custom_id, None, f"HTTP {response.get('status_code')}: {message}"
+
+    try:
+        return custom_id, body["choices"][0]["message"]["content"], None
+    except (KeyError, IndexError, TypeError):
+        return custom_id, None, "응답 형식 오류 (choices 없음)"
+
+
+class BatchResultStore:
+    """custom_id → (content, 오류) SQLite 저장소
+
+    결과 파일 순서는 요청 순서와 다르므로, 수십만 건도 메모리에 올리지 않고
+    디스크에서 custom_id로 조회한다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "custom_id TEXT PRIMARY KEY, content TEXT, error TEXT)"
+        )
+        self._db.commit()
+
+    def add_lines(self, lines: Iterable[str]) -> int:
+        """결과/오류 파일 줄 적재 (같은 custom_id는 덮어씀)"""
+        rows = (parse_result_line(line) for line in lines if line.strip())
+        with self._db:
+            cursor = self._db.executemany(
+                "INSERT OR REPLACE INTO results (custom_id, content, error) VALUES (?, ?, ?)",
+                rows,
+            )
+        return cursor.rowcount
+
+    def get(self, custom_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """(content, 오류) - 결과가 없으면 (None, '결과 없음')"""
+        row = self._db.execute(
+            "SELECT content, error FROM results WHERE custom_id = ?", (custom_id,)
+        ).fetchone()
+        if row is None:
+            return None, "결과 없음 (배치 만료/실패)"
+        return row[0], row[1]
+
+    def counts(self) -> Dict[str, int]:
+        """성공/오류 건수"""
+        ok, errors = self._db.execute(
+            "SELECT SUM(error IS NULL), SUM(error IS NOT NULL) FROM results"
+        ).fetchone()
+        return {"ok": ok or 0, "errors": errors or 0}
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class OpenAIBatchRunner:
+    """요청 JSONL → Batch API 제출/폴링 → BatchResultStore
+
+    사용 예시:
+        runner = OpenAIBatchRunner(poll_interval=60)
+        store = runner.run(Path("work/requests.jsonl"), Path("work"))
+        content, error = store.get("12:knee")
+    """
+
+    def __init__(
+        self,
+        client: Optional[OpenAI] = None,
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+        completion_window: str = "24h",
+        max_requests: int = MAX_BATCH_REQUESTS,
+        max_bytes: int = MAX_BATCH_FILE_BYTES,
+        on_poll: Optional[Callable[[Any], None]] = None,
+    ):
+        """
+        Args:
+            client: OpenAI 클라이언트 (없으면 공용 클라이언트)
+            poll_interval: 상태 조회 간격 (초)
+            timeout: 최대 대기 시간 (초, 없으면 무제한)
+            completion_window: Batch API 완료 기한
+            max_requests: 분할 기준 요청 수
+            max_bytes: 분할 기준 파일 크기
+            on_poll: 폴링마다 호출 (배치 객체 전달, 진행률 출력용)
+        """
+        self._client = client or get_openai_client()
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.completion_window = completion_window
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.on_poll = on_poll
+
+    def split(self, requests_path: Path, work_dir: Path) -> List[Path]:
+        """요청 파일을 배치 제한 이하 청크로 분할 (한 줄씩 복사)"""
+        chunks: List[Path] = []
+        out = None
+        count = size = 0
+        with open(requests_path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                if out is None or count >= self.max_requests or size + len(line) > self.max_bytes:
+                    if out is not None:
+                        out.close()
+                    chunk_path = work_dir / f"requests.part{len(chunks):03d}.jsonl"
+                    chunks.append(chunk_path)
+                    out = open(chunk_path, "wb")
+                    count = size = 0
+                out.write(line)
+                count += 1
+                size += len(line)
+        if out is not None:
+            out.close()
+        return chunks
+
+    def submit(self, chunk_path: Path, metadata: Optional[Dict[str, str]] = None) -> str:
+        """청크 업로드 + 배치 생성 → 배치 ID"""
+        with open(chunk_path, "rb") as f:
+            uploaded = self._client.files.create(file=f, purpose="batch")
+        batch = self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+            metadata=metadata,
+        )
+        logger.info(f"배치 제출: {batch.id} ({chunk_path.name})")
+        return batch.id
+
+    def wait(self, batch_id: str):
+        """종료 상태까지 폴링 → 배치 객체"""
+        started = time.monotonic()
+        while True:
+            batch = self._client.batches.retrieve(batch_id)
+            if self.on_poll is not None:
+                self.on_poll(batch)
+            if batch.status in TERMINAL_STATUSES:
+                if batch.status != "completed":
+                    logger.warning(f"배치 {batch_id} 종료 상태: {batch.status}")
+                return batch
+            if self.timeout is not None and time.monotonic() - started > self.timeout:
+                raise TimeoutError(f"배치 대기 시간 초과: {batch_id} ({batch.status})")
+            time.sleep(self.poll_interval)
+
+    def download(self, batch, store: BatchResultStore) -> int:
+        """결과/오류 파일을 저장소에 적재 → 적재 줄 수"""
+        loaded = 0
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = self._client.files.content(file_id)
+            loaded += store.add_lines(content.text.splitlines())
+        return loaded
+
+    def run(
+        self,
+        requests_path: Path,
+        work_dir: Path,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> BatchResultStore:
+        """
+        분할 → 제출 → 폴링 → 결과 적재
+
+        work_dir/batches.json에 청크별 배치 ID/적재 여부를 기록하므로,
+        중단 후 같은 work_dir로 다시 실행하면 제출된 배치는 재제출하지 않는다.
+
+        Returns:
+            결과 저장소 (work_dir/results.sqlite3)
+        """
+        requests_path = Path(requests_path)
+        work_dir = Path(work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        state_path = work_dir / "batches.json"
+
+        if state_path.exists():
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        else:
+            state = {
+                "chunks": [
+                    {"path": str(p), "batch_id": None, "loaded": False}
+                    for p in self.split(requests_path, work_dir)
+                ]
+            }
+            self._save_state(state_path, state)
+
+        # 전부 먼저 제출해야 배치들이 병행 처리된다
+        for chunk in state["chunks"]:
+            if chunk["batch_id"] is None:
+                chunk["batch_id"] = self.submit(Path(chunk["path"]), metadata)
+                self._save_state(state_path, state)
+
+        store = BatchResultStore(work_dir / "results.sqlite3")
+        for chunk in state["chunks"]:
+            if chunk["loaded"]:
+                continue
+            batch = self.wait(chunk["batch_id"])
+            self.download(batch, store)
+            chunk["status"] = batch.status
+            chunk["loaded"] = True
+            self._save_state(state_path, state)
+        return store
+
+    @staticmethod
+    def _save_state(state_path: Path, state: Dict[str, Any]) -> None:
+        tmp_path = state_path.with_name(state_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(state_path)
@@ -0,0 +1,151 @@
+"""공유 OpenAI 클라이언트 (공유)
+
+서비스마다 OpenAI()를 새로 만들면 클라이언트별 커넥션 풀이 따로 생기고,
+요청마다 생성하면 매번 TCP/TLS 핸드셰이크가 발생한다.
+프로세스 전역 클라이언트 하나를 재사용하여 keep-alive 연결을 공유한다.
+
+- 동기: 프로세스 전역 싱글톤 (스레드 안전)
+- 비동기: 이벤트 루프별 싱글톤 (httpx 비동기 연결은 생성된 루프에 묶임)
+- HTTP/2: h2 패키지가 설치되어 있으면 사용 (pip install "httpx[http2]")
+- set_openai_clients(): 벤치마크/녹화 재생용 클라이언트로 교체 (서비스 생성 전에 호출)
+
+환경변수:
+- OPENAI_MAX_CONNECTIONS: 최대 동시 연결 수 (기본값: 100)
+- OPENAI_MAX_KEEPALIVE: 유지할 유휴 연결 수 (기본값: 20)
+- OPENAI_KEEPALIVE_EXPIRY: 유휴 연결 유지 시간 (초, 기본값: 60)
+- OPENAI_TIMEOUT: 요청 타임아웃 (초, 기본값: 60)
+- OPENAI_CONNECT_TIMEOUT: 연결 타임아웃 (초, 기본값: 5)
+- OPENAI_MAX_RETRIES: SDK 재시도 횟수 (기본값: 2)
+- OPENAI_HTTP2: auto / true / false (기본값: auto - h2 설치 시 사용)
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI, Timeout
+
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_clients_lock = threading.Lock()
+_override: Optional[OpenAI] = None
+_async_override: Optional[AsyncOpenAI] = None
+
+
+def http2_enabled() -> bool:
+    """HTTP/2 사용 여부 (OPENAI_HTTP2 + h2 설치 여부)"""
+    setting = os.getenv("OPENAI_HTTP2", "auto").lower()
+    if setting in ("0", "false", "no"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _http_options() -> Dict[str, Any]:
+    """httpx 클라이언트 공통 옵션 (연결 제한 / keep-alive / 타임아웃)"""
+    return {
+        "http2": http2_enabled(),
+        "limits": httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60")),
+        ),
+        # SDK가 사용하는 httpx 구현의 Timeout (SDK 버전에 따라 httpx 패키지와 다를 수 있음)
+        "timeout": Timeout(
+            float(os.getenv("OPENAI_TIMEOUT", "60")),
+            connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5")),
+        ),
+    }
+
+
+def _max_retries() -> int:
+    return int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+
+def get_openai_client() -> OpenAI:
+    """프로세스 공용 OpenAI 클라이언트 (첫 호출 시 생성)"""
+    global _client
+    if _override is not None:
+        return _override
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(
+                    http_client=DefaultHttpxClient(**_http_options()),
+                    max_retries=_max_retries(),
+                )
+    return _client
+
+
+def set_openai_clients(client: Optional[OpenAI], async_client: Optional[AsyncOpenAI] = None) -> None:
+    """공용 클라이언트 교체 (None이면 기본 클라이언트로 복귀)
+
+    서비스는 생성 시점에 클라이언트를 잡으므로 파이프라인 생성 전에 호출해야 한다.
+    교체한 클라이언트는 close_openai_clients()로 닫히지 않는다 (서버 재시작 후에도 유지).
+    """
+    global _override, _async_override
+    with _client_lock:
+        _override = client
+    with _async_clients_lock:
+        _async_override = async_client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """현재 이벤트 루프용 공용 AsyncOpenAI 클라이언트
+
+    코루틴 안에서만 호출해야 한다. 루프 밖에서 호출하면 RuntimeError
+    (호출마다 새 연결 풀이 생기는 것을 막기 위함).
+    """
+    if _async_override is not None:
+        return _async_override
+    return _loop_async_client()
+
+
+def _loop_async_client() -> AsyncOpenAI:
+    """교체 여부와 무관한 기본 비동기 클라이언트 (이벤트 루프별)"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        raise RuntimeError(
+            "get_async_openai_client()는 실행 중인 이벤트 루프 안에서 호출해야 합니다 "
+            "(동기 코드는 get_openai_client() 사용)"
+        ) from None
+
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(
+                http_client=DefaultAsyncHttpxClient(**_http_options()),
+                max_retries=_max_retries(),
+            )
+            _async_clients[loop] = client
+        return client
+
+
+def close_openai_clients() -> None:
+    """공용 동기 클라이언트 종료 (서버 종료 시)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def aclose_openai_clients() -> None:
+    """현재 이벤트 루프의 비동기 클라이언트와 동기 클라이언트 종료 (async lifespan용)"""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+    close_openai_clients()
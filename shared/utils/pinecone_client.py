@@ -2,36 +2,13 @@
 
 import os
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
 
 from pinecone import Pinecone
 
+from .vector_store import VectorStore, SearchResult, SearchResults
 
-@dataclass
-class SearchResult:
-    """검색 결과"""
 
-    id: str
-    score: float
-    metadata: Dict[str, Any]
-
-
-@dataclass
-class SearchResults:
-    """검색 결과 목록"""
-
-    items: List[SearchResult]
-    query: str
-    total_count: int
-
-    def __iter__(self):
-        return iter(self.items)
-
-    def __len__(self):
-        return len(self.items)
-
-
-class PineconeClient:
+class PineconeClient(VectorStore):
     """Pinecone 벡터 DB 클라이언트
 
     사용 예시:
@@ -0,0 +1,63 @@
+"""파이프라인 진행 이벤트 (공유)
+
+SSE 스트리밍 응답처럼 최종 결과 전에 중간 산출물을 내보내야 할 때,
+요청 단위 리스너를 contextvar에 두고 각 단계가 emit()으로 이벤트를 보낸다.
+(timing.SpanRecorder와 같은 방식 - 실행기 스레드/LangGraph 노드로 컨텍스트가 복사됨)
+
+리스너가 없으면 emit()은 아무것도 하지 않으므로 일반 요청 경로에는 영향이 없다.
+LLM 스트리밍 호출처럼 비용이 드는 경로는 listening()으로 분기한다.
+
+이벤트:
+- ranking: 가중치 기반 버킷 순위 (WeightService)
+- red_flag: Red Flag 감지
+- bucket: 최종 버킷 (LLM 중재 완료)
+- exercise: LLM이 선택한 운동 (선택 순서대로)
+- llm_reasoning: 운동 추천 근거 텍스트 조각 (토큰 스트리밍)
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .logging import get_logger
+
+
+logger = get_logger(__name__)
+
+EVENT_RANKING = "ranking"
+EVENT_RED_FLAG = "red_flag"
+EVENT_BUCKET = "bucket"
+EVENT_EXERCISE = "exercise"
+EVENT_REASONING = "llm_reasoning"
+
+ProgressListener = Callable[[str, Dict[str, Any]], None]
+
+_current_listener: ContextVar[Optional[ProgressListener]] = ContextVar(
+    "orthocare_progress_listener", default=None
+)
+
+
+def listening() -> bool:
+    """현재 컨텍스트에 진행 이벤트 리스너가 있는지"""
+    return _current_listener.get() is not None
+
+
+@contextmanager
+def progress_listener(listener: ProgressListener) -> Iterator[None]:
+    """진행 이벤트 리스너를 현재 컨텍스트에 설정"""
+    token = _current_listener.set(listener)
+    try:
+        yield
+    finally:
+        _current_listener.reset(token)
+
+
+def emit(event: str, data: Dict[str, Any]) -> None:
+    """진행 이벤트 전달 (리스너 없으면 무시, 리스너 오류는 파이프라인에 전파하지 않음)"""
+    listener = _current_listener.get()
+    if listener is None:
+        return
+    try:
+        listener(event, data)
+    except Exception as e:
+        logger.warning(f"진행 이벤트 전달 실패 ({event}): {e}")
@@ -0,0 +1,366 @@
+"""LLM 응답 캐시 (공유)
+
+동일한 프롬프트 입력(모델 + 메시지 + 파라미터)에 대한 LLM 결정을
+TTL/LRU 기반으로 재사용한다. 앱 설문은 선택지 조합이 제한적이라
+같은 입력이 반복되는 경우가 많다.
+
+백엔드:
+- memory: 프로세스 내 OrderedDict (TTL + LRU)
+- sqlite: 로컬 파일 (프로세스 간 공유, TTL + 마지막 접근 기준 제거)
+- redis: Redis 서버 (redis 패키지 필요, TTL은 서버 만료 사용)
+
+값은 JSON 직렬화 가능한 dict만 저장한다.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / ".cache" / "responses"
+
+
+def make_response_cache_key(model: str, payload: Any, namespace: str = "") -> str:
+    """(네임스페이스, 모델, 입력) → SHA-256 키
+
+    payload는 정렬된 키로 JSON 직렬화하여 dict 순서와 무관한 정규 해시를 만든다.
+    """
+    canonical = json.dumps(
+        {"namespace": namespace, "model": model, "payload": payload},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(ABC):
+    """응답 캐시 기본 클래스
+
+    하위 클래스는 _get/_set/_delete/_clear/_size를 구현한다.
+    적중/미스 통계는 기본 클래스에서 관리한다.
+    """
+
+    backend = "base"
+
+    def __init__(self, ttl_seconds: float = 86400.0, max_items: int = 10000):
+        """
+        Args:
+            ttl_seconds: 항목 유효 시간 (초, 0 이하면 만료 없음)
+            max_items: 최대 항목 수 (초과 시 LRU 제거)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max(1, max_items)
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._sets = 0
+
+    def _expires_at(self) -> float:
+        return time.time() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """캐시 저장"""
+        self._set(key, value)
+        with self._stats_lock:
+            self._sets += 1
+
+    def delete(self, key: str) -> None:
+        """항목 삭제 (없으면 무시)"""
+        self._delete(key)
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        self._clear()
+
+    def stats(self, include_size: bool = True) -> Dict[str, Any]:
+        """적중/미스 통계
+
+        Args:
+            include_size: 항목 수 포함 여부 (Redis는 키 스캔이 필요하므로 응답마다 호출 시 False)
+        """
+        with self._stats_lock:
+            total = self._hits + self._misses
+            stats = {
+                "backend": self.backend,
+                "hits": self._hits,
+                "misses": self._misses,
+                "sets": self._sets,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0,
+            }
+        if include_size:
+            stats["items"] = self._size()
+        return stats
+
+    # 백엔드 구현
+    @abstractmethod
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, value: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def _clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def _size(self) -> int:
+        ...
+
+
+class MemoryResponseCache(ResponseCache):
+    """프로세스 내 TTL + LRU 캐시"""
+
+    backend = "memory"
+
+    def __init__(self, ttl_seconds: float = 86400.0, max_items: int = 10000):
+        super().__init__(ttl_seconds, max_items)
+        self._items: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at and expires_at < time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._items[key] = (self._expires_at(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def _size(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """SQLite 파일 캐시 (여러 워커 프로세스 간 공유)"""
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_seconds: float = 86400.0,
+        max_items: int = 10000,
+    ):
+        super().__init__(ttl_seconds, max_items)
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+        )
+        self._db.commit()
+        self._count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] and row[1] < now:
+                self._count -= self._db.execute(
+                    "DELETE FROM responses WHERE key = ?", (key,)
+                ).rowcount
+                self._db.commit()
+                return None
+            self._db.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            exists = self._db.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)
+            ).fetchone() is not None
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), self._expires_at(), now),
+            )
+            if not exists:
+                self._count += 1
+            self._evict_locked(now)
+            self._db.commit()
+
+    def _evict_locked(self, now: float) -> None:
+        """최대 건수 초과 시 만료 항목 제거 후 남은 초과분을 마지막 접근 순으로 제거
+
+        행 수는 유지 중인 카운터로 판단하고, 초과했을 때만 COUNT(*)로 다시 맞춘다
+        (같은 파일을 쓰는 다른 프로세스의 삽입/제거 반영). 만료 항목은 조회 시에도 제거된다.
+        """
+        if self._count <= self.max_items:
+            return
+        self._db.execute(
+            "DELETE FROM responses WHERE expires_at > 0 AND expires_at < ?", (now,)
+        )
+        self._count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if self._count > self.max_items:
+            self._count -= self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (self._count - self.max_items,),
+            ).rowcount
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._count -= self._db.execute(
+                "DELETE FROM responses WHERE key = ?", (key,)
+            ).rowcount
+            self._db.commit()
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._count = 0
+
+    def _size(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """연결 종료"""
+        with self._lock:
+            self._db.close()
+
+
+class RedisResponseCache(ResponseCache):
+    """Redis 캐시 (redis 패키지 필요)
+
+    TTL은 Redis 만료(EX)를 사용하고, 최대 건수는 서버의
+    maxmemory-policy(allkeys-lru 권장)에 맡긴다.
+    """
+
+    backend = "redis"
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        ttl_seconds: float = 86400.0,
+        max_items: int = 10000,
+        prefix: str = "orthocare:response:",
+    ):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "Redis 응답 캐시를 사용하려면 redis 패키지가 필요합니다: pip install redis"
+            ) from e
+
+        super().__init__(ttl_seconds, max_items)
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def _set(self, key: str, value: Dict[str, Any]) -> None:
+        ttl = int(self.ttl_seconds) if self.ttl_seconds > 0 else None
+        self._client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=ttl)
+
+    def _delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def _clear(self) -> None:
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+    def _size(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=self.prefix + "*"))
+
+
+def create_response_cache(
+    backend: str = "memory",
+    ttl_seconds: float = 86400.0,
+    max_items: int = 10000,
+    path: Optional[Path] = None,
+    redis_url: str = "redis://localhost:6379/0",
+    name: str = "responses",
+) -> ResponseCache:
+    """백엔드 이름으로 응답 캐시 생성
+
+    Args:
+        backend: memory / sqlite / redis
+        ttl_seconds: 항목 유효 시간 (초)
+        max_items: 최대 항목 수
+        path: SQLite 파일 경로 (없으면 <repo>/.cache/responses/{name}.sqlite3)
+        redis_url: Redis 접속 URL
+        name: 캐시 이름 (SQLite 파일명 / Redis 키 접두사)
+    """
+    backend = backend.lower()
+    if backend == "memory":
+        return MemoryResponseCache(ttl_seconds=ttl_seconds, max_items=max_items)
+    if backend == "sqlite":
+        db_path = Path(path) if path else DEFAULT_CACHE_DIR / f"{name}.sqlite3"
+        return SQLiteResponseCache(db_path, ttl_seconds=ttl_seconds, max_items=max_items)
+    if backend == "redis":
+        return RedisResponseCache(
+            url=redis_url,
+            ttl_seconds=ttl_seconds,
+            max_items=max_items,
+            prefix=f"orthocare:{name}:",
+        )
+    raise ValueError(f"지원하지 않는 응답 캐시 백엔드: {backend}")
@@ -0,0 +1,334 @@
+"""단계별 지연 시간 계측 (LangSmith와 독립)
+
+요청 단위 SpanRecorder를 contextvar에 두고, 각 단계는 span()으로 감싼다.
+PipelineExecutor / LangGraph / asyncio.gather는 컨텍스트를 복사하므로
+작업 스레드·병렬 노드에서 기록한 구간도 같은 요청의 레코더에 모인다.
+
+모든 구간은 레코더 유무와 관계없이 프로세스 전역 히스토그램에도 기록되어
+/metrics (Prometheus 텍스트 형식)로 노출된다.
+
+OpenAI 호출 토큰 사용량(record_usage)도 같은 방식으로 요청 레코더와
+전역 카운터에 누적된다. 프롬프트 토큰 중 제공자 측 프롬프트 캐시로 처리된 양
+(usage.prompt_tokens_details.cached_tokens)은 cached_prompt로 따로 집계하고,
+호출 지점(call)을 넘기면 호출 지점별 캐시/비캐시 입력 토큰도 기록한다.
+
+사용 예시:
+    with recording() as recorder:
+        with span("embedding"):
+            ...
+    recorder.summary()
+    # {"total_ms": 812.4, "stages": {"embedding": {"ms": 120.3, "count": 1}}}
+    # 토큰이 기록되면 "tokens": {"prompt": 1830, "completion": 212, "embedding": 24} 추가
+    # (cached_prompt는 prompt의 일부, 호출 지점별 내역은 "prompt_cache")
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# 단계 이름 (요청 본문의 timings.stages 키)
+STAGE_CONFIG_LOAD = "config_load"
+STAGE_WEIGHT_SCORING = "weight_scoring"
+STAGE_EMBEDDING = "embedding"
+STAGE_VECTOR_QUERY = "vector_query"
+STAGE_LLM_ARBITRATION = "llm_arbitration"
+STAGE_ROUTINE_CACHE = "routine_cache"
+STAGE_EXERCISE_FILTER = "exercise_filter"
+STAGE_PERSONALIZATION = "personalization"
+STAGE_EXERCISE_SELECTION = "exercise_selection"
+STAGE_LLM_RECOMMENDATION = "llm_recommendation"
+STAGE_PHYSICAL_SCORE_LLM = "physical_score_llm"
+
+# 토큰 종류 (timings.tokens 키)
+TOKENS_PROMPT = "prompt"
+TOKENS_COMPLETION = "completion"
+TOKENS_EMBEDDING = "embedding"
+# prompt 중 프롬프트 캐시 적중분 (prompt에 이미 포함, 합계 계산 시 제외)
+TOKENS_CACHED_PROMPT = "cached_prompt"
+
+# Prometheus 기본 버킷 + 장시간 LLM 호출용 (초)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+class SpanRecorder:
+    """요청 단위 구간 기록기 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: List[Tuple[str, float]] = []
+        self._tokens: Dict[str, int] = {}
+        self._prompt_cache: Dict[str, Dict[str, int]] = {}
+        self._started = time.perf_counter()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._spans.append((name, seconds))
+
+    def add_tokens(self, counts: Dict[str, int]) -> None:
+        with self._lock:
+            for kind, count in counts.items():
+                self._tokens[kind] = self._tokens.get(kind, 0) + count
+
+    def add_prompt_cache(self, call: str, cached: int, uncached: int) -> None:
+        """호출 지점별 캐시/비캐시 입력 토큰 누적"""
+        with self._lock:
+            _accumulate_prompt_cache(self._prompt_cache, call, cached, uncached)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def summary(self) -> Dict[str, object]:
+        """단계별 합계 (병렬 단계의 합은 total_ms보다 클 수 있음)"""
+        stages: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            spans = list(self._spans)
+            tokens = dict(self._tokens)
+            prompt_cache = {call: dict(counts) for call, counts in self._prompt_cache.items()}
+        for name, seconds in spans:
+            stage = stages.setdefault(name, {"ms": 0.0, "count": 0})
+            stage["ms"] += seconds * 1000
+            stage["count"] += 1
+        for stage in stages.values():
+            stage["ms"] = round(stage["ms"], 1)
+        summary: Dict[str, object] = {"total_ms": round(self.elapsed_ms, 1), "stages": stages}
+        if tokens:
+            summary["tokens"] = tokens
+        if prompt_cache:
+            summary["prompt_cache"] = prompt_cache
+        return summary
+
+
+def _accumulate_prompt_cache(
+    totals: Dict[str, Dict[str, int]], call: str, cached: int, uncached: int
+) -> None:
+    """{호출 지점: {calls, cached, uncached}} 누적 (호출자가 잠금 보유)"""
+    entry = totals.setdefault(call, {"calls": 0, "cached": 0, "uncached": 0})
+    entry["calls"] += 1
+    entry["cached"] += cached
+    entry["uncached"] += uncached
+
+
+_current_recorder: ContextVar[Optional[SpanRecorder]] = ContextVar(
+    "orthocare_span_recorder", default=None
+)
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (레이블 조합별 누적)"""
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # 레이블 값 → (버킷별 카운트, 합계, 전체 카운트)
+        self._series: Dict[str, Tuple[List[int], float, int]] = {}
+
+    def observe(self, label_value: str, seconds: float) -> None:
+        with self._lock:
+            counts, total, count = self._series.get(
+                label_value, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            self._series[label_value] = (counts, total + seconds, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = {k: (list(c), s, n) for k, (c, s, n) in self._series.items()}
+        for label_value in sorted(series):
+            counts, total, count = series[label_value]
+            label = f'{self.label}="{label_value}"'
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{label}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+STAGE_HISTOGRAM = Histogram(
+    "orthocare_stage_duration_seconds",
+    "Pipeline stage duration in seconds",
+    label="stage",
+)
+REQUEST_HISTOGRAM = Histogram(
+    "orthocare_request_duration_seconds",
+    "End-to-end request duration in seconds",
+    label="endpoint",
+)
+
+_token_totals: Dict[str, int] = {}
+_prompt_cache_totals: Dict[str, Dict[str, int]] = {}
+_token_totals_lock = threading.Lock()
+
+
+def current_recorder() -> Optional[SpanRecorder]:
+    """현재 컨텍스트의 레코더 (없으면 None)"""
+    return _current_recorder.get()
+
+
+@contextmanager
+def recording() -> Iterator[SpanRecorder]:
+    """새 요청 레코더를 현재 컨텍스트에 설정"""
+    recorder = SpanRecorder()
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+@contextmanager
+def ensure_recording() -> Iterator[SpanRecorder]:
+    """현재 레코더가 있으면 재사용, 없으면 새로 설정 (중첩 호출용)"""
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        yield recorder
+        return
+    with recording() as recorder:
+        yield recorder
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """구간 계측 (현재 레코더 + 전역 히스토그램)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        STAGE_HISTOGRAM.observe(name, seconds)
+        recorder = _current_recorder.get()
+        if recorder is not None:
+            recorder.record(name, seconds)
+
+
+def timed(name: str) -> Callable:
+    """함수 전체를 span(name)으로 감싸는 데코레이터 (동기/비동기 지원)"""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def _cached_prompt_tokens(usage) -> int:
+    """usage.prompt_tokens_details.cached_tokens (SDK 객체/dict, 없으면 0)"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        return details.get("cached_tokens", 0) or 0
+    return getattr(details, "cached_tokens", 0) or 0
+
+
+def record_usage(usage, kind: str = "llm", call: Optional[str] = None) -> Dict[str, int]:
+    """OpenAI 응답 usage → 현재 레코더 + 전역 토큰 카운터
+
+    Args:
+        usage: response.usage (없으면 무시)
+        kind: llm(chat completions, prompt/completion) / embedding
+        call: 호출 지점 이름 (llm만, 지정하면 호출 지점별 캐시/비캐시 입력 토큰 기록)
+
+    Returns:
+        이번 호출의 토큰 수 (usage가 없으면 빈 dict)
+    """
+    if usage is None:
+        return {}
+    if kind == "embedding":
+        counts = {TOKENS_EMBEDDING: getattr(usage, "prompt_tokens", 0) or 0}
+    else:
+        counts = {
+            TOKENS_PROMPT: getattr(usage, "prompt_tokens", 0) or 0,
+            TOKENS_COMPLETION: getattr(usage, "completion_tokens", 0) or 0,
+            TOKENS_CACHED_PROMPT: _cached_prompt_tokens(usage),
+        }
+    track_cache = kind != "embedding" and call is not None
+    if track_cache:
+        cached = counts[TOKENS_CACHED_PROMPT]
+        uncached = max(0, counts[TOKENS_PROMPT] - cached)
+    with _token_totals_lock:
+        for name, count in counts.items():
+            _token_totals[name] = _token_totals.get(name, 0) + count
+        if track_cache:
+            _accumulate_prompt_cache(_prompt_cache_totals, call, cached, uncached)
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.add_tokens(counts)
+        if track_cache:
+            recorder.add_prompt_cache(call, cached, uncached)
+    return counts
+
+
+def observe_request(endpoint: str, seconds: float) -> None:
+    """엔드포인트 전체 처리 시간 기록"""
+    REQUEST_HISTOGRAM.observe(endpoint, seconds)
+
+
+MetricValues = Dict[str, Tuple[str, Dict[str, float]]]
+
+
+def render_metrics(
+    gauges: Optional[MetricValues] = None,
+    counters: Optional[MetricValues] = None,
+) -> str:
+    """Prometheus 텍스트 형식 출력
+
+    Args:
+        gauges: {메트릭 이름: (설명, {레이블 문자열: 값})} 추가 게이지
+            레이블 문자열 예: 'endpoint="diagnose"' (없으면 "")
+        counters: gauges와 같은 형식의 누적 카운터
+    """
+    lines: List[str] = []
+    lines.extend(STAGE_HISTOGRAM.render())
+    lines.extend(REQUEST_HISTOGRAM.render())
+
+    with _token_totals_lock:
+        token_totals = dict(_token_totals)
+        prompt_cache_totals = {call: dict(counts) for call, counts in _prompt_cache_totals.items()}
+    if token_totals:
+        lines.append("# HELP orthocare_openai_tokens_total OpenAI tokens used")
+        lines.append("# TYPE orthocare_openai_tokens_total counter")
+        for kind in sorted(token_totals):
+            lines.append(f'orthocare_openai_tokens_total{{kind="{kind}"}} {token_totals[kind]}')
+    if prompt_cache_totals:
+        lines.append("# HELP orthocare_openai_prompt_tokens_total OpenAI input tokens by call site and prompt cache hit")
+        lines.append("# TYPE orthocare_openai_prompt_tokens_total counter")
+        for call in sorted(prompt_cache_totals):
+            for cache in ("cached", "uncached"):
+                lines.append(
+                    f'orthocare_openai_prompt_tokens_total{{call="{call}",cache="{cache}"}} '
+                    f"{prompt_cache_totals[call][cache]}"
+                )
+
+    for kind, metrics in (("gauge", gauges), ("counter", counters)):
+        for name, (help_text, values) in (metrics or {}).items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for label, value in values.items():
+                lines.append(f"{name}{{{label}}} {value}" if label else f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,474 @@
+"""벡터 스토어 인터페이스 (공유)
+
+백엔드:
+- pinecone: Pinecone 관리형 인덱스 (PineconeClient)
+- local: 프로세스 내 NumPy 인덱스 (LocalVectorStore)
+  - 정규화된 float32 행렬 + 단일 행렬곱으로 정확한 코사인 top-k
+  - 시작 시 메모리 맵(np.load mmap_mode="r")으로 로드
+  - Pinecone과 동일한 메타데이터 필터 / min_score 의미
+
+환경변수:
+- VECTOR_STORE_BACKEND: pinecone | local (기본값: pinecone)
+- VECTOR_STORE_DIR: 로컬 인덱스 루트 디렉토리 (기본값: <repo>/.cache/vector_store)
+  인덱스별 하위 디렉토리(<VECTOR_STORE_DIR>/<index_name>/)에 저장
+
+set_vector_store_factory(): 스토어 생성을 교체 (녹화/재생 카세트 등, 서비스 생성 전에 호출)
+"""
+
+import asyncio
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+DEFAULT_VECTOR_STORE_DIR = Path(__file__).parent.parent.parent / ".cache" / "vector_store"
+
+VECTORS_FILE = "vectors.npy"
+METADATA_FILE = "metadata.json"
+
+
+@dataclass
+class SearchResult:
+    """검색 결과"""
+
+    id: str
+    score: float
+    metadata: Dict[str, Any]
+
+
+@dataclass
+class SearchResults:
+    """검색 결과 목록"""
+
+    items: List[SearchResult]
+    query: str
+    total_count: int
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class VectorStore:
+    """벡터 스토어 인터페이스
+
+    백엔드는 query / upsert / delete / describe_stats를 구현한다.
+    aquery는 기본적으로 query를 스레드 풀에서 실행한다.
+    """
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+        min_score: float = 0.0,
+    ) -> SearchResults:
+        raise NotImplementedError
+
+    async def aquery(
+        self,
+        vector: List[float],
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+        min_score: float = 0.0,
+    ) -> SearchResults:
+        """벡터 검색 (비동기)
+
+        동기 query()를 기본 스레드 풀에서 실행하여 이벤트 루프를 막지 않는다.
+        """
+        return await asyncio.to_thread(
+            self.query,
+            vector=vector,
+            top_k=top_k,
+            filter=filter,
+            include_metadata=include_metadata,
+            min_score=min_score,
+        )
+
+    def upsert(self, vectors: List[Dict[str, Any]], batch_size: int = 100) -> int:
+        raise NotImplementedError
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        delete_all: bool = False,
+    ) -> None:
+        raise NotImplementedError
+
+    def describe_stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    """단일 필드 조건 평가 (Pinecone 필터 연산자 부분 지원)
+
+    지원: 값 직접 비교, $eq, $ne, $in, $nin
+    메타데이터 값이 리스트면 원소 중 하나라도 일치하면 일치로 본다.
+    """
+    if isinstance(condition, dict):
+        for op, operand in condition.items():
+            if op == "$eq":
+                if not _matches_condition(value, operand):
+                    return False
+            elif op == "$ne":
+                if _matches_condition(value, operand):
+                    return False
+            elif op == "$in":
+                if not any(_matches_condition(value, v) for v in operand):
+                    return False
+            elif op == "$nin":
+                if any(_matches_condition(value, v) for v in operand):
+                    return False
+            else:
+                raise ValueError(f"지원하지 않는 필터 연산자: {op}")
+        return True
+
+    if isinstance(value, list):
+        return condition in value
+    return value == condition
+
+
+def matches_filter(metadata: Dict[str, Any], filter: Optional[Dict[str, Any]]) -> bool:
+    """메타데이터가 필터를 만족하는지 여부 ($and/$or 포함)"""
+    if not filter:
+        return True
+
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, f) for f in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, f) for f in condition):
+                return False
+        elif key not in metadata:
+            # 필드가 없으면 $ne/$nin만 통과
+            if not (isinstance(condition, dict) and set(condition) <= {"$ne", "$nin"}):
+                return False
+        elif not _matches_condition(metadata[key], condition):
+            return False
+    return True
+
+
+class LocalVectorStore(VectorStore):
+    """프로세스 내 NumPy 벡터 인덱스
+
+    파일 구성 (<path>/):
+    - vectors.npy: (N, D) float32, 행 단위 L2 정규화
+    - metadata.json: [{"id": str, "metadata": {...}}, ...] (행 순서 동일)
+
+    사용 예시:
+        store = LocalVectorStore(".cache/vector_store/orthocare-diagnosis")
+        results = store.query(vector=embedding, top_k=10, filter={"body_part": "knee"})
+    """
+
+    def __init__(self, path: Path, mmap: bool = True):
+        """
+        Args:
+            path: 인덱스 디렉토리
+            mmap: True면 vectors.npy를 읽기 전용 메모리 맵으로 로드
+        """
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._matrix: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        # 필터 결과 캐시 (동일 필터 반복 시 마스크 재사용)
+        self._mask_cache: Dict[str, np.ndarray] = {}
+        self._load(mmap)
+
+    # ------------------------------------------------------------------
+    # 저장/로드
+    # ------------------------------------------------------------------
+
+    def _load(self, mmap: bool) -> None:
+        vectors_path = self.path / VECTORS_FILE
+        metadata_path = self.path / METADATA_FILE
+        if not vectors_path.exists() or not metadata_path.exists():
+            return
+
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+
+        self._matrix = np.load(vectors_path, mmap_mode="r" if mmap else None)
+        self._ids = [r["id"] for r in records]
+        self._metadata = [r.get("metadata", {}) for r in records]
+        self._id_to_row = {vec_id: i for i, vec_id in enumerate(self._ids)}
+
+        if self._matrix.shape[0] != len(self._ids):
+            raise ValueError(
+                f"로컬 인덱스 손상: 벡터 {self._matrix.shape[0]}개, 메타데이터 {len(self._ids)}개"
+            )
+
+    def save(self) -> None:
+        """인덱스를 디스크에 저장 (임시 파일 작성 후 교체)"""
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            vectors_tmp = self.path / (VECTORS_FILE + ".tmp")
+            metadata_tmp = self.path / (METADATA_FILE + ".tmp")
+
+            with open(vectors_tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(self._matrix, dtype=np.float32))
+            with open(metadata_tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    [{"id": i, "metadata": m} for i, m in zip(self._ids, self._metadata)],
+                    f,
+                    ensure_ascii=False,
+                )
+
+            os.replace(vectors_tmp, self.path / VECTORS_FILE)
+            os.replace(metadata_tmp, self.path / METADATA_FILE)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).astype(np.float32, copy=False)
+
+    def _filter_mask(self, filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        if not filter:
+            return None
+        cache_key = json.dumps(filter, sort_keys=True, ensure_ascii=False, default=str)
+        mask = self._mask_cache.get(cache_key)
+        if mask is None:
+            mask = np.fromiter(
+                (matches_filter(m, filter) for m in self._metadata),
+                dtype=bool,
+                count=len(self._metadata),
+            )
+            self._mask_cache[cache_key] = mask
+        return mask
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+        min_score: float = 0.0,
+    ) -> SearchResults:
+        """벡터 검색 (정확한 코사인 유사도 top-k)
+
+        Args:
+            vector: 쿼리 벡터 (임베딩)
+            top_k: 반환할 최대 결과 수
+            filter: 메타데이터 필터 (Pinecone 문법)
+            include_metadata: 메타데이터 포함 여부
+            min_score: 최소 유사도 점수
+
+        Returns:
+            SearchResults: 검색 결과
+        """
+        with self._lock:
+            if len(self._ids) == 0 or top_k <= 0:
+                return SearchResults(items=[], query="", total_count=0)
+
+            query_vec = self._normalize(np.asarray(vector, dtype=np.float32))
+            scores = self._matrix @ query_vec
+
+            mask = self._filter_mask(filter)
+            if mask is not None:
+                candidates = np.flatnonzero(mask)
+                scores = scores[candidates]
+            else:
+                candidates = None
+
+            k = min(top_k, scores.shape[0])
+            if k == 0:
+                return SearchResults(items=[], query="", total_count=0)
+
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            items = []
+            for idx in top:
+                score = float(scores[idx])
+                if score < min_score:
+                    continue
+                row = int(candidates[idx]) if candidates is not None else int(idx)
+                items.append(
+                    SearchResult(
+                        id=self._ids[row],
+                        score=score,
+                        metadata=dict(self._metadata[row]) if include_metadata else {},
+                    )
+                )
+
+        return SearchResults(
+            items=items,
+            query="",  # 원본 쿼리 텍스트는 호출자가 설정
+            total_count=len(items),
+        )
+
+    # ------------------------------------------------------------------
+    # 변경 (인덱싱 스크립트용, 변경 후 save() 호출 필요)
+    # ------------------------------------------------------------------
+
+    def upsert(self, vectors: List[Dict[str, Any]], batch_size: int = 100) -> int:
+        """벡터 업서트 (같은 ID는 교체)
+
+        Args:
+            vectors: [{"id": str, "values": List[float], "metadata": Dict}]
+            batch_size: 인터페이스 호환용 (무시)
+
+        Returns:
+            업서트된 벡터 수
+        """
+        if not vectors:
+            return 0
+
+        with self._lock:
+            new_values = self._normalize(
+                np.asarray([v["values"] for v in vectors], dtype=np.float32)
+            )
+            matrix = np.array(self._matrix, dtype=np.float32)  # 메모리 맵 → 쓰기 가능 복사
+            if matrix.size == 0:
+                matrix = np.zeros((0, new_values.shape[1]), dtype=np.float32)
+            elif matrix.shape[1] != new_values.shape[1]:
+                raise ValueError(
+                    f"벡터 차원 불일치: 인덱스 {matrix.shape[1]}, 입력 {new_values.shape[1]}"
+                )
+
+            existing = len(self._ids)
+            appended: Dict[str, int] = {}  # 신규 ID → new_values 행 (배치 내 중복은 마지막 값)
+            for i, vec in enumerate(vectors):
+                row = self._id_to_row.get(vec["id"])
+                if row is not None and row < existing:
+                    matrix[row] = new_values[i]
+                    self._metadata[row] = vec.get("metadata", {})
+                else:
+                    if vec["id"] not in appended:
+                        self._id_to_row[vec["id"]] = existing + len(appended)
+                    appended[vec["id"]] = i
+
+            if appended:
+                matrix = np.vstack([matrix, new_values[list(appended.values())]])
+                for vec_id, i in appended.items():
+                    self._ids.append(vec_id)
+                    self._metadata.append(vectors[i].get("metadata", {}))
+
+            self._matrix = matrix
+            self._mask_cache.clear()
+        return len(vectors)
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        delete_all: bool = False,
+    ) -> None:
+        """벡터 삭제"""
+        with self._lock:
+            if delete_all:
+                keep = np.zeros(len(self._ids), dtype=bool)
+            elif ids:
+                remove = set(ids)
+                keep = np.array([i not in remove for i in self._ids], dtype=bool)
+            elif filter:
+                keep = ~self._filter_mask(filter)
+            else:
+                return
+
+            rows = np.flatnonzero(keep)
+            dim = self._matrix.shape[1] if self._matrix.ndim == 2 else 0
+            self._matrix = (
+                np.array(self._matrix[rows], dtype=np.float32)
+                if len(rows)
+                else np.zeros((0, dim), dtype=np.float32)
+            )
+            self._ids = [self._ids[i] for i in rows]
+            self._metadata = [self._metadata[i] for i in rows]
+            self._id_to_row = {vec_id: i for i, vec_id in enumerate(self._ids)}
+            self._mask_cache.clear()
+
+    def describe_stats(self) -> Dict[str, Any]:
+        """인덱스 통계 반환"""
+        with self._lock:
+            return {
+                "backend": "local",
+                "path": str(self.path),
+                "total_vector_count": len(self._ids),
+                "dimension": int(self._matrix.shape[1]) if self._matrix.ndim == 2 else 0,
+            }
+
+
+def get_vector_store_backend() -> str:
+    """환경변수 기반 백엔드 이름"""
+    return os.getenv("VECTOR_STORE_BACKEND", "pinecone").lower()
+
+
+def get_local_store_path(index_name: str) -> Path:
+    """로컬 인덱스 디렉토리"""
+    root = Path(os.getenv("VECTOR_STORE_DIR", str(DEFAULT_VECTOR_STORE_DIR)))
+    return root / index_name
+
+
+_local_stores: Dict[str, LocalVectorStore] = {}
+_local_stores_lock = threading.Lock()
+
+
+# (index_name, namespace, 기본 스토어 생성 함수) → VectorStore
+_store_factory: Optional[Callable[[str, str, Callable[[], VectorStore]], VectorStore]] = None
+
+
+def set_vector_store_factory(
+    factory: Optional[Callable[[str, str, Callable[[], VectorStore]], VectorStore]],
+) -> None:
+    """create_vector_store() 교체 (None이면 기본 생성으로 복귀)
+
+    factory는 기본 스토어 생성 함수를 받아, 필요할 때만 호출하여 감쌀 수 있다.
+    """
+    global _store_factory
+    _store_factory = factory
+
+
+def create_vector_store(
+    index_name: str,
+    backend: Optional[str] = None,
+    namespace: str = "",
+) -> VectorStore:
+    """벡터 스토어 생성
+
+    Args:
+        index_name: 인덱스 이름 (Pinecone 인덱스명 / 로컬 하위 디렉토리명)
+        backend: pinecone | local (없으면 VECTOR_STORE_BACKEND)
+        namespace: Pinecone 네임스페이스
+
+    로컬 백엔드는 인덱스별로 한 번만 로드하여 공유한다.
+    """
+    if _store_factory is not None:
+        return _store_factory(
+            index_name, namespace, lambda: _create_default_store(index_name, backend, namespace)
+        )
+    return _create_default_store(index_name, backend, namespace)
+
+
+def _create_default_store(index_name: str, backend: Optional[str], namespace: str) -> VectorStore:
+    backend = (backend or get_vector_store_backend()).lower()
+
+    if backend == "local":
+        with _local_stores_lock:
+            if index_name not in _local_stores:
+                _local_stores[index_name] = LocalVectorStore(get_local_store_path(index_name))
+            return _local_stores[index_name]
+
+    if backend == "pinecone":
+        from .pinecone_client import PineconeClient
+
+        return PineconeClient(index_name=index_name, namespace=namespace)
+
+    raise ValueError(f"지원하지 않는 VECTOR_STORE_BACKEND: {backend}")